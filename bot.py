@@ -15,15 +15,17 @@ from typing import Final
 import discord
 from discord.ext import commands
 
-from config import DISABLED_COGS, GUILD_ID, LEVEL_FEED_CHANNEL_ID
+from config import DISABLED_COGS, GUILD_ID
 import cogs
 
 from storage.db import database
+from storage.refuge_casino_activity_store import refuge_casino_activity_store
 from storage.xp_store import xp_store
 from ui.radio_view import RadioView
 from utils.api_meter import api_meter
 from utils.background_tasks import background_tasks
 from utils.discord_api_trace import create_discord_http_trace
+from utils.persistence import write_service
 from utils.rename_manager import rename_manager
 from utils.rate_limit import GlobalRateLimiter, limiter as _limiter
 from utils.ytdlp_auth import configure_ytdlp_auth
@@ -153,51 +155,47 @@ class RefugeBot(commands.Bot):
         """Send a level-up notification to the configured channel.
 
         The method is invoked by XP-related cogs when a member gains a level.
-        It tries to resolve ``LEVEL_FEED_CHANNEL_ID`` within the provided
-        guild, and silently returns when the channel cannot be used.
+        The announcement goes through the level-feed router, which resolves
+        ``LEVEL_FEED_CHANNEL_ID`` once and merges bursts of level-ups into a
+        single message; it is silently dropped when the channel cannot be used.
         """
 
-        channel = guild.get_channel(LEVEL_FEED_CHANNEL_ID)
-        if channel is None:
-            try:
-                channel = await self.fetch_channel(LEVEL_FEED_CHANNEL_ID)
-            except Exception:
-                channel = None
-
-        if not isinstance(channel, discord.abc.Messageable):
-            logger.warning("level feed channel unavailable or invalid")
-            return
-
         xp_gain = max(new_xp - old_xp, 0)
         embed = discord.Embed(
-            title="⬆️ LEVEL UP DANS LE REFUGE ! 🎮",
+            title=level_feed.LEVEL_UP_TITLE,
             description=(
                 f"🔥 {member.mention} passe **niveau {new_level}**\n"
                 f"+{xp_gain} XP – activité détectée 💬⚡\n\n"
                 "GG ! Le Refuge te voit 👀"
             ),
-            color=discord.Color(0xFF5DA2),
+            color=level_feed.REFUGE_GAMER_COLOR,
         )
         avatar_url = getattr(getattr(member, "display_avatar", None), "url", None)
         if avatar_url:
             embed.set_thumbnail(url=avatar_url)
 
-        try:
-            await channel.send(embed=embed)
-        except discord.Forbidden:
-            logger.warning("missing permission to send level feed message")
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.warning("failed to send level feed message: %s", exc)
+        await level_feed.router.publish(
+            level_feed.FeedAnnouncement(
+                embed=embed,
+                line=level_feed.announcement_line(member.mention, "up", new_level, xp_gain),
+                direction="up",
+                source="announce",
+            )
+        )
 
     async def close(self) -> None:  # type: ignore[override]
         """Ensure background helpers are stopped before shutting down."""
         # Cancel application-owned fire-and-forget work before closing the
         # helpers/storage it may still depend on.
         await background_tasks.aclose()
+        # Debounced store writes were cancelled above; persist them now.
+        await refuge_casino_activity_store.aclose()
         await limiter.aclose()
         await api_meter.aclose()
         await rename_manager.aclose()
         await xp_store.aclose()
+        # Writes whose caller was cancelled still run to completion.
+        await write_service().drain()
         await database.aclose()
         await super().close()
 
@@ -1,15 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime, timezone
-from pathlib import Path
-from typing import Any, Mapping
+from datetime import datetime, time as dtime, timezone
+from typing import Any, Callable, Mapping
 
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 
-from config import DATA_DIR
+from services.casino_totals import casino_totals
 from storage.achievement_store import achievement_store
 from storage.xp_store import xp_store
 from ui.achievements_view import (
@@ -21,26 +21,30 @@ from utils.achievements import (
     ACHIEVEMENTS,
     CATEGORY_LABELS,
     achievement_progress,
+    achievements_for_metric,
     qualifying_achievement_ids,
 )
-from utils.persistence import read_json_safe
+from utils.background_tasks import background_tasks
+from utils.level_feed import LevelChange, router as level_feed_router
 
 
 logger = logging.getLogger(__name__)
-CASINO_STATE_FILE = Path(DATA_DIR) / "pari_xp_state.json"
 
+# Délai de regroupement des déverrouillages déclenchés par événement.
+UNLOCK_DEBOUNCE_SECONDS = 5.0
+# Nombre de membres traités entre deux rendus de main à la boucle.
+MEMBER_SCAN_CHUNK = 500
+
+
+def _level_snapshot() -> dict[str, dict[str, Any]]:
+    """Copy only the levels from the XP store records.
+
+    The comprehension never awaits, so it is consistent with respect to other
+    coroutines without holding ``xp_store.lock``.
+    """
 
-def _load_casino_players() -> dict[str, dict[str, Any]]:
-    raw = read_json_safe(CASINO_STATE_FILE, {})
-    if not isinstance(raw, dict):
-        return {}
-    players = raw.get("players", {})
-    if not isinstance(players, dict):
-        return {}
     return {
-        str(user_id): dict(payload)
-        for user_id, payload in players.items()
-        if isinstance(payload, dict)
+        str(user_id): {"level": level} for user_id, level in xp_store.iter_levels()
     }
 
 
@@ -92,62 +96,149 @@ def _format_progress(metric: str, current: int, target: int) -> str:
 
 
 class AchievementsCog(commands.Cog):
-    """Persistent achievements derived from existing XP, casino and tenure data."""
+    """Persistent achievements derived from existing XP, casino and tenure data.
+
+    Levels and casino bets unlock badges from their own events; tenure is
+    checked once a day. ``achievement_sync`` remains a low-frequency safety net.
+    """
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self._pending: dict[int, set[str]] = {}
+        self._flush_task: asyncio.Task[None] | None = None
+        self._flushing = False
 
     async def cog_load(self) -> None:
+        level_feed_router.add_listener(self._on_level_change)
+        casino_totals.add_listener(self._on_casino_player)
         self.achievement_sync.start()
+        self.tenure_pass.start()
 
-    def cog_unload(self) -> None:
+    async def cog_unload(self) -> None:
+        level_feed_router.remove_listener(self._on_level_change)
+        casino_totals.remove_listener(self._on_casino_player)
         self.achievement_sync.cancel()
+        self.tenure_pass.cancel()
+        task = self._flush_task
+        if task is not None and not task.done():
+            # Annuler seulement l'attente : une écriture en cours va au bout.
+            if not self._flushing:
+                task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await self._flush_pending()
+
+    # ---------- déverrouillages incrémentaux ----------
+
+    def _queue_unlocks(self, user_id: int, achievement_ids: list[str]) -> None:
+        if not achievement_ids:
+            return
+        self._pending.setdefault(int(user_id), set()).update(achievement_ids)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = background_tasks.create_task(
+                self._flush_later(), name="achievements:unlock"
+            )
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(UNLOCK_DEBOUNCE_SECONDS)
+        try:
+            await self._flush_pending()
+        except Exception:
+            logger.exception("[Achievements] déverrouillages différés impossibles")
+
+    async def _flush_pending(self) -> dict[int, list[str]]:
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return {}
+        self._flushing = True
+        try:
+            return await achievement_store.unlock_batch(
+                {user_id: sorted(ids) for user_id, ids in pending.items()}
+            )
+        except BaseException:
+            # Échec ou annulation : remettre le lot en file pour le prochain essai.
+            for user_id, ids in pending.items():
+                self._pending.setdefault(user_id, set()).update(ids)
+            raise
+        finally:
+            self._flushing = False
+
+    def _on_level_change(self, event: LevelChange) -> None:
+        if event.new_level > event.old_level:
+            self._queue_unlocks(
+                event.user_id, achievements_for_metric("level", event.new_level)
+            )
+
+    def _on_casino_player(self, user_id: str, totals: Mapping[str, int]) -> None:
+        self._queue_unlocks(
+            int(user_id), achievements_for_metric("casino_bets", totals.get("bets", 0))
+        )
+
+    async def _member_metrics_for(self, member: discord.Member) -> dict[str, int]:
+        """Metrics for one member without copying the XP or casino maps."""
 
-    async def _xp_snapshot(self) -> dict[str, dict[str, Any]]:
-        async with xp_store.lock:
-            return {
-                str(user_id): dict(payload)
-                for user_id, payload in xp_store.data.items()
-                if isinstance(payload, dict)
-            }
+        xp_payload = xp_store.data.get(str(member.id), {})
+        _version, players = await casino_totals.get_players()
+        return _member_metrics(
+            member,
+            {str(member.id): xp_payload},
+            {str(member.id): players.get(str(member.id), {})},
+        )
 
     async def _sync_member(
         self,
         member: discord.Member,
-        casino_players: Mapping[str, Mapping[str, Any]] | None = None,
     ) -> tuple[dict[str, int], list[str]]:
-        xp_snapshot = await self._xp_snapshot()
-        players = casino_players if casino_players is not None else _load_casino_players()
-        metrics = _member_metrics(member, xp_snapshot, players)
+        metrics = await self._member_metrics_for(member)
         newly_unlocked = await achievement_store.unlock_many(
             member.id,
             qualifying_achievement_ids(metrics),
         )
         return metrics, newly_unlocked
 
-    @tasks.loop(minutes=15)
-    async def achievement_sync(self) -> None:
-        """Recognize newly reached badges without requiring the slash command."""
+    async def _scan_members(
+        self, qualify: Callable[[discord.Member], list[str]]
+    ) -> dict[int, list[str]]:
+        """Apply ``qualify(member)`` to every human member, yielding regularly."""
 
-        xp_snapshot = await self._xp_snapshot()
-        casino_players = _load_casino_players()
-        current = datetime.now(timezone.utc)
         unlocks: dict[int, list[str]] = {}
-
+        scanned = 0
         for guild in self.bot.guilds:
-            for member in guild.members:
+            for member in list(guild.members):
                 if member.bot:
                     continue
-                metrics = _member_metrics(
-                    member,
-                    xp_snapshot,
-                    casino_players,
-                    now=current,
-                )
-                qualified = qualifying_achievement_ids(metrics)
+                qualified = qualify(member)
                 if qualified:
-                    unlocks[member.id] = qualified
+                    unlocks.setdefault(member.id, []).extend(qualified)
+                scanned += 1
+                if scanned % MEMBER_SCAN_CHUNK == 0:
+                    await asyncio.sleep(0)
+        return unlocks
+
+    @tasks.loop(time=dtime(hour=3, tzinfo=timezone.utc))
+    async def tenure_pass(self) -> None:
+        """Passe quotidienne : seuls les badges d'ancienneté dépendent du temps."""
 
+        current = datetime.now(timezone.utc)
+        unlocks = await self._scan_members(
+            lambda member: achievements_for_metric(
+                "tenure_days", _member_metrics(member, {}, {}, now=current)["tenure_days"]
+            )
+        )
+        if unlocks:
+            await achievement_store.unlock_batch(unlocks, unlocked_at=current)
+
+    @tasks.loop(hours=6)
+    async def achievement_sync(self) -> None:
+        """Full reconciliation, as a safety net for missed events."""
+
+        xp_snapshot = _level_snapshot()
+        _version, casino_players = await casino_totals.get_players()
+        current = datetime.now(timezone.utc)
+        unlocks = await self._scan_members(
+            lambda member: qualifying_achievement_ids(
+                _member_metrics(member, xp_snapshot, casino_players, now=current)
+            )
+        )
         if unlocks:
             await achievement_store.unlock_batch(unlocks, unlocked_at=current)
 
@@ -155,6 +246,10 @@ class AchievementsCog(commands.Cog):
     async def before_achievement_sync(self) -> None:
         await self.bot.wait_until_ready()
 
+    @tenure_pass.before_loop
+    async def before_tenure_pass(self) -> None:
+        await self.bot.wait_until_ready()
+
     @app_commands.command(
         name="succes",
         description="Affiche les succès et badges d'un membre",
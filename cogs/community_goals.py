@@ -16,7 +16,6 @@ from ui.community_goals_view import CommunityGoalDisplay, CommunityGoalsView
 from utils.community_goals import (
     COMMUNITY_GOAL_METRICS,
     COMMUNITY_GOAL_METRICS_BY_KEY,
-    aggregate_metric_total,
     format_goal_value,
     goal_progress,
     progress_bar,
@@ -40,13 +39,7 @@ class CommunityGoalsCog(commands.Cog):
         self.evaluate_community_goals.cancel()
 
     async def _metric_total(self, field: str) -> int:
-        season_ids = await season_store.list_seasons()
-        payloads: list[dict[str, Any]] = []
-        for season_id in season_ids:
-            payload = await season_store.get_season(season_id)
-            if isinstance(payload, dict):
-                payloads.append(payload)
-        return aggregate_metric_total(payloads, field)
+        return await season_store.metric_total(field)
 
     async def _goal_progress(self, goal: dict[str, Any]) -> int:
         metric = COMMUNITY_GOAL_METRICS_BY_KEY.get(str(goal.get("metric_key", "")))
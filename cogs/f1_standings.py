@@ -8,17 +8,21 @@ session dans un salon Discord dédié.
 from __future__ import annotations
 
 import asyncio
+import copy
+import hashlib
+import json
 import logging
 import os
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional
 
 import aiohttp
 import discord
 from discord.ext import commands
 
 from config import DATA_DIR, F1_CHANNEL_ID
-from utils.persistence import read_json_safe, atomic_write_json, ensure_dir
+from utils.persistence import atomic_write_json_async, ensure_dir, read_json_safe
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +31,10 @@ OPENF1_API = "https://api.openf1.org/v1"
 F1_DATA_DIR = os.path.join(DATA_DIR, "f1")
 F1_STATE_FILE = os.path.join(F1_DATA_DIR, "f1_state.json")
 ensure_dir(F1_DATA_DIR)
+# Requêtes pilotes simultanées en repli, quand l'appel groupé échoue.
+DRIVER_FETCH_CONCURRENCY = 5
+# Nombre de sessions dont la liste des pilotes reste en mémoire.
+DRIVER_CACHE_SESSIONS = 12
 
 # Session types à surveiller
 SESSION_TYPES = {
@@ -39,6 +47,48 @@ SESSION_TYPES = {
 }
 
 
+@dataclass(slots=True)
+class _PollValidators:
+    """Empreinte de la dernière réponse ``/position`` traitée pour un type."""
+
+    session_key: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    digest: str
+
+
+def _time_key(entry: Mapping[str, Any]) -> float:
+    """Retourne un ordre approximatif pour déterminer la plus récente."""
+    date = entry.get("date") or entry.get("session_time")
+    if isinstance(date, str):
+        try:
+            return datetime.fromisoformat(date.replace("Z", "+00:00")).timestamp()
+        except Exception:  # pragma: no cover - format inattendu
+            return 0.0
+    try:
+        return float(date)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _is_int(value: Any) -> bool:
+    try:
+        int(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _driver_info(driver: Mapping[str, Any]) -> Dict[str, str]:
+    name = (
+        driver.get("full_name")
+        or driver.get("name")
+        or f"{driver.get('first_name', '')} {driver.get('last_name', '')}".strip()
+    )
+    team = driver.get("team_name") or driver.get("team") or driver.get("constructor")
+    return {"name": name, "team": team}
+
+
 class F1Standings(commands.Cog):
     """Cog de surveillance des sessions F1."""
 
@@ -48,6 +98,11 @@ class F1Standings(commands.Cog):
         self._task: Optional[asyncio.Task] = None
         self._current_year = datetime.now(timezone.utc).year
         self._driver_cache: Dict[int, Dict[str, str]] = {}
+        # session_key -> numéro -> pilote, rempli par un seul /drivers groupé.
+        self._session_drivers: Dict[Any, Dict[int, Dict[str, str]]] = {}
+        self._poll_validators: Dict[str, _PollValidators] = {}
+        self._last_results: Dict[str, List[Dict]] = {}
+        self._state: Optional[Dict[str, Any]] = None
         self._state_lock = asyncio.Lock()
 
     async def cog_load(self) -> None:
@@ -75,11 +130,19 @@ class F1Standings(commands.Cog):
             await session.close()
 
     # ── Méthodes de persistance ──────────────────────────────
-    def _read_state(self) -> Dict[str, Any]:
-        return read_json_safe(F1_STATE_FILE)
-
-    def _write_state(self, data: Dict[str, Any]) -> None:
-        atomic_write_json(F1_STATE_FILE, data)
+    async def _load_state(self) -> Dict[str, Any]:
+        """Charge l'état une seule fois (hors boucle), puis le sert en mémoire."""
+        if self._state is None:
+            state = await asyncio.to_thread(read_json_safe, F1_STATE_FILE)
+            self._state = state if isinstance(state, dict) else {}
+        return self._state
+
+    async def _save_state(self) -> None:
+        if self._state is None:
+            return
+        # Instantané : l'écriture se fait dans un thread pendant que la boucle
+        # peut encore modifier l'état.
+        await atomic_write_json_async(F1_STATE_FILE, copy.deepcopy(self._state))
 
     # ── Boucle principale ────────────────────────────────────
     async def _f1_monitor(self) -> None:
@@ -97,8 +160,16 @@ class F1Standings(commands.Cog):
         """Vérifie toutes les sessions définies."""
         for stype in SESSION_TYPES.keys():
             results = await self._get_session_results(stype)
-            if results:
-                await self._update_session_message(stype, results)
+            # Un classement identique au dernier publié n'édite pas Discord.
+            if results and results != self._last_results.get(stype):
+                try:
+                    await self._update_session_message(stype, results)
+                except Exception:
+                    # Le message n'a pas suivi : on oublie l'empreinte pour
+                    # retraiter ces résultats au prochain passage.
+                    self._poll_validators.pop(stype, None)
+                    raise
+                self._last_results[stype] = results
 
     # ── Gestion des messages ─────────────────────────────────
     async def _update_session_message(self, session_type: str, results: List[Dict]) -> None:
@@ -108,7 +179,7 @@ class F1Standings(commands.Cog):
             return
 
         async with self._state_lock:
-            state = self._read_state()
+            state = await self._load_state()
             messages = state.get("messages", {})
             msg_id = messages.get(session_type, {}).get("message_id")
 
@@ -129,13 +200,13 @@ class F1Standings(commands.Cog):
             new_id = message.id
 
         async with self._state_lock:
-            state = self._read_state()
+            state = await self._load_state()
             messages = state.get("messages", {})
             entry = messages.setdefault(session_type, {})
             entry["message_id"] = new_id
             entry["last_update"] = datetime.now(timezone.utc).isoformat()
             state["messages"] = messages
-            self._write_state(state)
+            await self._save_state()
 
     async def _create_session_embed(self, session_type: str, results: List[Dict]) -> discord.Embed:
         """Crée l'embed pour une session."""
@@ -228,48 +299,95 @@ class F1Standings(commands.Cog):
         if not session_key:
             return None
 
+        positions = await self._fetch_positions(session_type, session_key)
+        if positions is None:
+            return None
+
+        return await self._parse_openf1_positions(positions, session_key=session_key)
+
+    async def _fetch_positions(self, session_type: str, session_key: Any) -> Optional[List[Dict]]:
+        """Télécharge les positions, ou ``None`` si rien n'a changé depuis le dernier passage.
+
+        La requête est conditionnelle (ETag / Last-Modified) et le corps reçu
+        est comparé à l'empreinte précédente : un classement inchangé ne
+        coûte ni décodage, ni mise à jour Discord.
+        """
+        previous = self._poll_validators.get(session_type)
+        if previous is not None and previous.session_key != session_key:
+            previous = None
+
+        headers: Dict[str, str] = {}
+        if previous is not None:
+            if previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+
+        pos_url = f"{OPENF1_API}/position?session_key={session_key}"
         try:
-            pos_url = f"{OPENF1_API}/position?session_key={session_key}"
-            async with self.session.get(pos_url, timeout=10) as resp:
+            async with self.session.get(pos_url, timeout=10, headers=headers) as resp:
+                if resp.status == 304:
+                    return None
                 if resp.status != 200:
                     return None
-                positions = await resp.json()
+                body = await resp.read()
+                etag = resp.headers.get("ETag")
+                last_modified = resp.headers.get("Last-Modified")
         except Exception as e:  # pragma: no cover - network dependent
             logger.error("Erreur API OpenF1 positions %s: %s", session_type, e)
             return None
 
-        return await self._parse_openf1_positions(positions)
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        if previous is not None and previous.digest == digest:
+            return None
+        try:
+            positions = json.loads(body)
+        except ValueError as e:
+            logger.error("Réponse OpenF1 positions invalide %s: %s", session_type, e)
+            return None
+        if not isinstance(positions, list):
+            return None
 
-    async def _parse_openf1_positions(self, positions: List[Dict]) -> List[Dict]:
+        self._poll_validators[session_type] = _PollValidators(
+            session_key=session_key,
+            etag=etag,
+            last_modified=last_modified,
+            digest=digest,
+        )
+        return positions
+
+    async def _parse_openf1_positions(
+        self,
+        positions: List[Dict],
+        *,
+        session_key: Any = None,
+    ) -> List[Dict]:
         """Convertit les données de position OpenF1 dans un format commun."""
         # L'API renvoie plusieurs lignes par pilote au fil de la session.
-        # On ne conserve que la dernière mise à jour pour chaque numéro.
-        latest: Dict[int, Dict] = {}
-
-        def _time_key(entry: Dict) -> float:
-            """Retourne un ordre approximatif pour déterminer la plus récente."""
-            date = entry.get("date") or entry.get("session_time")
-            if isinstance(date, str):
-                try:
-                    return datetime.fromisoformat(date.replace("Z", "+00:00")).timestamp()
-                except Exception:  # pragma: no cover - format inattendu
-                    return 0.0
-            try:
-                return float(date)
-            except (TypeError, ValueError):
-                return 0.0
-
-        for p in sorted(positions, key=_time_key):
+        # On ne conserve que la dernière mise à jour pour chaque numéro : un
+        # seul passage, chaque horodatage n'étant décodé qu'une fois. À
+        # égalité, la ligne la plus tardive dans la réponse l'emporte.
+        latest: Dict[int, tuple[float, Dict]] = {}
+        for p in positions:
             try:
                 num = int(p.get("driver_number"))
             except (TypeError, ValueError):
                 continue
-            latest[num] = p  # la dernière entrée (triée) reste
+            key = _time_key(p)
+            current = latest.get(num)
+            if current is None or key >= current[0]:
+                latest[num] = (key, p)
+
+        top = sorted((entry for _key, entry in latest.values()), key=lambda r: r.get("position", 0))[:20]
+        drivers = await self._resolve_drivers(
+            [p.get("driver_number") for p in top],
+            session_key=session_key,
+        )
 
         parsed: List[Dict[str, str]] = []
-        for p in sorted(latest.values(), key=lambda r: r.get("position", 0))[:20]:
+        for p in top:
             driver_num = p.get("driver_number")
-            info = await self._get_driver_info(driver_num)
+            info = drivers.get(driver_num, {})
             time_str = "No Time"
             for key in ("best_lap_time", "time", "interval", "gap_to_leader"):
                 val = p.get(key)
@@ -285,6 +403,63 @@ class F1Standings(commands.Cog):
             )
         return parsed
 
+    async def _resolve_drivers(
+        self,
+        driver_numbers: List[Any],
+        *,
+        session_key: Any = None,
+    ) -> Dict[Any, Dict[str, str]]:
+        """Associe chaque numéro à son pilote, avec un appel groupé par session."""
+        drivers: Dict[Any, Dict[str, str]] = {}
+        if session_key is not None:
+            roster = await self._get_session_drivers(session_key)
+            drivers.update(
+                (number, roster[int(number)])
+                for number in driver_numbers
+                if _is_int(number) and int(number) in roster
+            )
+
+        missing = list(dict.fromkeys(n for n in driver_numbers if n not in drivers))
+        if missing:
+            semaphore = asyncio.Semaphore(DRIVER_FETCH_CONCURRENCY)
+
+            async def fetch(number: Any) -> Dict[str, str]:
+                async with semaphore:
+                    return await self._get_driver_info(number)
+
+            infos = await asyncio.gather(*(fetch(number) for number in missing))
+            drivers.update(zip(missing, infos, strict=True))
+        return drivers
+
+    async def _get_session_drivers(self, session_key: Any) -> Dict[int, Dict[str, str]]:
+        """Récupère tous les pilotes d'une session en une requête, mise en cache."""
+        cached = self._session_drivers.get(session_key)
+        if cached is not None:
+            return cached
+
+        url = f"{OPENF1_API}/drivers?session_key={session_key}"
+        try:
+            async with self.session.get(url, timeout=10) as resp:
+                if resp.status != 200:
+                    return {}
+                data = await resp.json()
+        except Exception as e:  # pragma: no cover - network dependent
+            logger.error("Erreur API OpenF1 pilotes session %s: %s", session_key, e)
+            return {}
+
+        roster: Dict[int, Dict[str, str]] = {}
+        for driver in data or []:
+            if not isinstance(driver, dict) or not _is_int(driver.get("driver_number")):
+                continue
+            number = int(driver["driver_number"])
+            roster[number] = _driver_info(driver)
+            self._driver_cache[number] = roster[number]
+
+        self._session_drivers[session_key] = roster
+        while len(self._session_drivers) > DRIVER_CACHE_SESSIONS:
+            self._session_drivers.pop(next(iter(self._session_drivers)))
+        return roster
+
     async def _get_driver_info(self, driver_number: int) -> Dict[str, str]:
         """Récupère les informations d'un pilote via OpenF1."""
         if driver_number in self._driver_cache:
@@ -303,14 +478,7 @@ class F1Standings(commands.Cog):
         if not data:
             return {}
 
-        driver = data[0]
-        name = (
-            driver.get("full_name")
-            or driver.get("name")
-            or f"{driver.get('first_name', '')} {driver.get('last_name', '')}".strip()
-        )
-        team = driver.get("team_name") or driver.get("team") or driver.get("constructor")
-        info = {"name": name, "team": team}
+        info = _driver_info(data[0])
         self._driver_cache[driver_number] = info
         return info
 
@@ -346,21 +514,25 @@ class F1Standings(commands.Cog):
                 continue
             if abs((race_dt - now).days) <= 3:
                 gp_name = race.get("meeting_name") or race.get("country_name") or ""
-                state = self._read_state()
-                state["current_gp"] = gp_name
-                self._write_state(state)
+                async with self._state_lock:
+                    state = await self._load_state()
+                    # Ce contrôle tourne toutes les 30 s : on n'écrit que si
+                    # le GP change réellement.
+                    if state.get("current_gp") != gp_name:
+                        state["current_gp"] = gp_name
+                        await self._save_state()
                 return True
         return False
 
     async def _get_current_gp_name(self) -> str:
         """Retourne le nom du GP actuel."""
-        state = self._read_state()
+        state = await self._load_state()
         if state.get("current_gp"):
             return state["current_gp"]
         # Essayer de déterminer à partir du calendrier
         try:
             await self._is_f1_weekend()
-            state = self._read_state()
+            state = await self._load_state()
             return state.get("current_gp", "Inconnu")
         except Exception:
             return "Inconnu"
@@ -11,7 +11,7 @@ from zoneinfo import ZoneInfo
 
 from utils.metrics import measure
 from storage.roulette_store import RouletteStore
-from ..xp import award_xp, add_xp_boost
+from ..xp import award_xp, award_xp_many, add_xp_boost
 from config import (
     ANNOUNCE_CHANNEL_ID,
     ROLE_NOTIFICATION as NOTIF_ROLE_ID,
@@ -26,6 +26,7 @@ from config import (
 )
 from utils.discord_utils import safe_message_edit
 from utils.economy_tickets import consume_any_ticket, consume_free_ticket
+from utils.voice_presence import voice_presence
 logger = logging.getLogger(__name__)
 
 PARIS_TZ = "Europe/Paris"
@@ -185,35 +186,25 @@ class MachineASousView(discord.ui.LayoutView):
             cog.store.mark_claimed_today(str(interaction.user.id), tz=PARIS_TZ)
         other = None
         if interaction.guild:
-            pool = [
-                m
-                for vc in interaction.guild.voice_channels
-                for m in vc.members
-                if not m.bot and m.id != interaction.user.id
-            ]
-            if pool:
-                other = random.choice(pool)
-        try:
-            old_lvl, new_lvl, old_xp, total_xp = await award_xp(
-                interaction.user.id,
-                50,
-                guild_id=interaction.guild_id,
-                source="machine_a_sous",
+            sample = voice_presence.sample(
+                interaction.guild, exclude=(interaction.user.id,)
             )
+            if sample:
+                other = sample[0]
+        awards = [(interaction.user.id, 50, "machine_a_sous")]
+        if other:
+            awards.append((other.id, 50, "machine_a_sous"))
+        try:
+            # Les deux gains passent sous une seule prise du verrou XP.
+            results = await award_xp_many(awards, interaction.guild_id)
         except Exception as e:
-            logger.exception("[MachineASous] award_xp a échoué: %s", e)
+            logger.exception("[MachineASous] award_xp_many a échoué: %s", e)
             await interaction.followup.send(
                 "❌ Erreur interne (XP). Réessaie plus tard.",
                 ephemeral=True,
             )
             return None
-        if other:
-            try:
-                await award_xp(
-                    other.id, 50, guild_id=interaction.guild_id, source="machine_a_sous"
-                )
-            except Exception as e:
-                logger.exception("[MachineASous] award_xp (shared) échec: %s", e)
+        old_lvl, new_lvl, old_xp, total_xp = results[0]
         if other:
             msg = f"🤝 XP partagé ! Toi et {other.mention} gagnez chacun 50 XP."
         else:
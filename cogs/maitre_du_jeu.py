@@ -12,14 +12,15 @@ import json
 import math
 import re
 import time
-import unicodedata
 from datetime import datetime, timezone
 from enum import Enum
+from functools import lru_cache
+from typing import Callable, Iterable
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 
-from cogs.maitre_du_jeu_ai import AIReply, AIStatus, MaitreDuJeuAI
+from cogs.maitre_du_jeu_ai import AIReply, AIStatus, MaitreDuJeuAI, normalize_question
 from config import (
     CASINO_CLOSE_HOUR,
     CASINO_OPEN_HOUR,
@@ -32,7 +33,9 @@ from config import (
 from services.refuge_casino import casino_is_open
 from storage.economy import SHOP_FILE
 from storage.xp_store import xp_store
+from utils.discord_utils import safe_message_edit
 from utils.persistence import read_json_safe
+from utils.rate_limit import limiter
 
 
 class AssistantIntent(str, Enum):
@@ -52,15 +55,8 @@ class AssistantIntent(str, Enum):
     UNKNOWN = "unknown"
 
 
-def _normalize_text(value: str) -> str:
-    """Normalise une question pour une détection simple et robuste."""
-
-    decomposed = unicodedata.normalize("NFKD", value.casefold())
-    without_accents = "".join(
-        char for char in decomposed if not unicodedata.combining(char)
-    )
-    normalized = re.sub(r"[^a-z0-9]+", " ", without_accents)
-    return " ".join(normalized.split())
+# La normalisation est partagée avec le cache de réponses du client Mistral.
+_normalize_text = normalize_question
 
 
 def extract_question(content: str, bot_user_id: int) -> str:
@@ -70,122 +66,177 @@ def extract_question(content: str, bot_user_id: int) -> str:
     return re.sub(mention_pattern, " ", content).strip(" \t\n,:;-")
 
 
+# Tables de marqueurs (texte normalisé, recherche par sous-chaîne). Chaque
+# groupe occupe un bit ; un marqueur peut appartenir à plusieurs groupes.
+_MARKER_GROUPS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    (
+        "diagnostic",
+        (
+            "pourquoi je n ai pas gagne",
+            "pourquoi j ai pas gagne",
+            "pourquoi je n ai pas recu",
+            "pourquoi j ai pas recu",
+            "pas gagne d xp",
+            "pas recu d xp",
+            "aucun xp",
+        ),
+    ),
+    (
+        "created",
+        (
+            "quand est ce qu on t a cree",
+            "quand est ce qu on ta cree",
+            "tu as ete cree quand",
+            "quand as tu ete cree",
+            "date de creation",
+            "tu existes depuis quand",
+            "depuis quand tu existes",
+        ),
+    ),
+    (
+        "member",
+        (
+            "combien de membres",
+            "combien sommes nous",
+            "on est combien",
+            "nous sommes combien",
+            "nombre de membres",
+        ),
+    ),
+    (
+        "refuge",
+        (
+            "refuge vivant",
+            "comment jouer au refuge",
+            "comment on joue au refuge",
+            "comment fonctionne le refuge",
+            "a quoi sert le refuge",
+        ),
+    ),
+    ("casino", ("casino",)),
+    (
+        "casino_time",
+        ("heure", "horaire", "ouvre", "ouverture", "ferme", "fermeture", "ouvert"),
+    ),
+    ("shop", ("boutique", "acheter", "achat", "ticket royal", "ticket")),
+    ("product", ("double xp", "boost", "ticket")),
+    ("price", ("prix", "coute", "combien vaut", "combien coute")),
+    ("commands", ("commande", "commandes", "slash", "que peux tu faire")),
+    ("radio", ("radio", "musique", "youtube", "chanson", "morceau")),
+    ("boost", ("double xp", "boost xp", "boost")),
+    ("xp", ("xp", "niveau", "rang", "level", "progression")),
+    ("help", ("aide", "help", "bonjour", "salut")),
+)
+_GROUP_BITS: dict[str, int] = {
+    name: 1 << index for index, (name, _markers) in enumerate(_MARKER_GROUPS)
+}
+
+
+def _fold_prefix_masks(marker: str, masks: dict[str, int]) -> int:
+    mask = 0
+    for candidate, candidate_mask in masks.items():
+        if marker.startswith(candidate):
+            mask |= candidate_mask
+    return mask
+
+
+def _trie_pattern(markers: Iterable[str]) -> str:
+    """Factorise les marqueurs en arbre de préfixes pour le moteur `re`.
+
+    Une alternance plate est essayée branche par branche à chaque position ;
+    l'arbre n'en suit qu'une seule. Les suffixes optionnels sont gourmands,
+    donc le marqueur le plus long est retenu à chaque position.
+    """
+
+    trie: dict[str, dict] = {}
+    for marker in markers:
+        node = trie
+        for char in marker:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict[str, dict]) -> str:
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def _compile_marker_matcher() -> tuple[re.Pattern[str], dict[str, int]]:
+    masks: dict[str, int] = {}
+    for name, markers in _MARKER_GROUPS:
+        for marker in markers:
+            masks[marker] = masks.get(marker, 0) | _GROUP_BITS[name]
+    # Une seule correspondance (la plus longue) est rapportée par position :
+    # chaque marqueur porte donc aussi les bits des marqueurs dont il est un
+    # préfixe (« ticket royal » implique « ticket »). Le lookahead autorise
+    # les chevauchements, ce qui reproduit exactement les tests
+    # `marker in text` en une seule passe.
+    folded = {marker: _fold_prefix_masks(marker, masks) for marker in masks}
+    return re.compile(rf"(?=({_trie_pattern(masks)}))"), folded
+
+
+_MARKER_PATTERN, _MARKER_MASKS = _compile_marker_matcher()
+
+# Règles par priorité décroissante : une intention est retenue dès qu'une de
+# ses clauses (ensemble de groupes tous présents) est satisfaite.
+# Les intentions d'achat/prix passent avant Double XP :
+# « où acheter un double XP ? » doit être traité comme une question boutique.
+_INTENT_RULES: tuple[tuple[AssistantIntent, tuple[int, ...]], ...] = tuple(
+    (
+        intent,
+        tuple(
+            sum(_GROUP_BITS[name] for name in clause)
+            for clause in clauses
+        ),
+    )
+    for intent, clauses in (
+        (AssistantIntent.DIAGNOSTIC, (("diagnostic",),)),
+        (AssistantIntent.BOT_CREATED, (("created",),)),
+        (AssistantIntent.MEMBER_COUNT, (("member",),)),
+        (AssistantIntent.REFUGE_GUIDE, (("refuge",),)),
+        (AssistantIntent.CASINO_HOURS, (("casino", "casino_time"),)),
+        (AssistantIntent.SHOP, (("shop",), ("product", "price"))),
+        (AssistantIntent.COMMANDS, (("commands",),)),
+        (AssistantIntent.RADIO, (("radio",),)),
+        (AssistantIntent.BOOST, (("boost",),)),
+        (AssistantIntent.XP, (("xp",),)),
+        (AssistantIntent.HELP, (("help",),)),
+    )
+)
+
+
+def _matched_groups(text: str) -> int:
+    mask = 0
+    for match in _MARKER_PATTERN.finditer(text):
+        mask |= _MARKER_MASKS[match.group(1)]
+    return mask
+
+
+@lru_cache(maxsize=None)
+def _intent_for_groups(found: int) -> AssistantIntent:
+    # Au plus 2**len(_MARKER_GROUPS) combinaisons : le cache est borné.
+    for intent, clauses in _INTENT_RULES:
+        for clause in clauses:
+            if found & clause == clause:
+                return intent
+    return AssistantIntent.UNKNOWN
+
+
 def classify_question(question: str) -> AssistantIntent:
     """Classe une question dans le périmètre déterministe de l'assistant."""
 
     text = _normalize_text(question)
     if not text:
         return AssistantIntent.HELP
-
-    diagnostic_markers = (
-        "pourquoi je n ai pas gagne",
-        "pourquoi j ai pas gagne",
-        "pourquoi je n ai pas recu",
-        "pourquoi j ai pas recu",
-        "pas gagne d xp",
-        "pas recu d xp",
-        "aucun xp",
-    )
-    if any(marker in text for marker in diagnostic_markers):
-        return AssistantIntent.DIAGNOSTIC
-
-    created_markers = (
-        "quand est ce qu on t a cree",
-        "quand est ce qu on ta cree",
-        "tu as ete cree quand",
-        "quand as tu ete cree",
-        "date de creation",
-        "tu existes depuis quand",
-        "depuis quand tu existes",
-    )
-    if any(marker in text for marker in created_markers):
-        return AssistantIntent.BOT_CREATED
-
-    member_markers = (
-        "combien de membres",
-        "combien sommes nous",
-        "on est combien",
-        "nous sommes combien",
-        "nombre de membres",
-    )
-    if any(marker in text for marker in member_markers):
-        return AssistantIntent.MEMBER_COUNT
-
-    refuge_markers = (
-        "refuge vivant",
-        "comment jouer au refuge",
-        "comment on joue au refuge",
-        "comment fonctionne le refuge",
-        "a quoi sert le refuge",
-    )
-    if any(marker in text for marker in refuge_markers):
-        return AssistantIntent.REFUGE_GUIDE
-
-    casino_time_markers = (
-        "heure",
-        "horaire",
-        "ouvre",
-        "ouverture",
-        "ferme",
-        "fermeture",
-        "ouvert",
-    )
-    if "casino" in text and any(marker in text for marker in casino_time_markers):
-        return AssistantIntent.CASINO_HOURS
-
-    # Les intentions d'achat/prix passent avant Double XP :
-    # « où acheter un double XP ? » doit être traité comme une question boutique.
-    shop_markers = ("boutique", "acheter", "achat", "ticket royal", "ticket")
-    product_markers = ("double xp", "boost", "ticket")
-    price_markers = ("prix", "coute", "combien vaut", "combien coute")
-    if any(token in text for token in shop_markers) or (
-        any(token in text for token in product_markers)
-        and any(token in text for token in price_markers)
-    ):
-        return AssistantIntent.SHOP
-
-    if any(
-        token in text
-        for token in (
-            "commande",
-            "commandes",
-            "slash",
-            "que peux tu faire",
-        )
-    ):
-        return AssistantIntent.COMMANDS
-
-    if any(
-        token in text
-        for token in (
-            "radio",
-            "musique",
-            "youtube",
-            "chanson",
-            "morceau",
-        )
-    ):
-        return AssistantIntent.RADIO
-
-    if any(token in text for token in ("double xp", "boost xp", "boost")):
-        return AssistantIntent.BOOST
-
-    if any(
-        token in text
-        for token in (
-            "xp",
-            "niveau",
-            "rang",
-            "level",
-            "progression",
-        )
-    ):
-        return AssistantIntent.XP
-
-    if any(token in text for token in ("aide", "help", "bonjour", "salut")):
-        return AssistantIntent.HELP
-
-    return AssistantIntent.UNKNOWN
+    return _intent_for_groups(_matched_groups(text))
 
 
 async def _read_xp_snapshot(user_id: int) -> dict:
@@ -193,9 +244,9 @@ async def _read_xp_snapshot(user_id: int) -> dict:
 
     uid = str(user_id)
     async with xp_store.lock:
-        cached = xp_store.data.get(uid)
-        if isinstance(cached, dict):
-            return dict(cached)
+        record = xp_store.get_record(user_id)
+        if record is not None:
+            return dict(record.payload())
 
     disk_data = await asyncio.to_thread(read_json_safe, xp_store.path)
     if isinstance(disk_data, dict):
@@ -689,21 +740,89 @@ def build_ai_response(reply: AIReply) -> discord.Embed:
     return embed
 
 
+def build_ai_partial_response(text: str) -> discord.Embed:
+    """Embed intermédiaire affiché pendant la rédaction d'une réponse IA."""
+
+    embed = discord.Embed(
+        title="🤖 Maître du jeu · Conversation",
+        description=f"{text} ▌",
+        colour=discord.Colour.blurple(),
+    )
+    embed.set_footer(text="Maître du jeu · Assistant V3 · rédaction en cours…")
+    return embed
+
+
+class _ProgressiveReply:
+    """Publie puis édite une réponse IA au fil du flux Mistral.
+
+    Les éditions sont espacées d'au moins ``interval`` secondes et passent par
+    le bucket ``channel:`` du limiteur global, comme tout envoi du bot.
+    """
+
+    def __init__(
+        self,
+        message: discord.Message,
+        *,
+        interval: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._message = message
+        self._interval = interval
+        self._clock = clock
+        self._reply: discord.Message | None = None
+        self._last_update: float | None = None
+
+    async def _send(self, embed: discord.Embed) -> None:
+        if self._reply is None:
+            await limiter.acquire(bucket=f"channel:{self._message.channel.id}")
+            self._reply = await self._message.reply(
+                embed=embed,
+                mention_author=False,
+                allowed_mentions=discord.AllowedMentions.none(),
+            )
+        else:
+            await safe_message_edit(self._reply, embed=embed)
+
+    async def update(self, text: str) -> None:
+        now = self._clock()
+        if self._last_update is not None and now - self._last_update < self._interval:
+            return
+        self._last_update = now
+        await self._send(build_ai_partial_response(text))
+
+    async def finish(self, embed: discord.Embed) -> None:
+        await self._send(embed)
+
+
 class MaitreDuJeuCog(commands.Cog):
     """Répond aux messages qui mentionnent directement le compte du bot."""
 
     COOLDOWN_SECONDS = 3.0
+    STREAM_EDIT_INTERVAL = 1.5
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
         self._last_reply_at: dict[int, float] = {}
         self.ai = MaitreDuJeuAI()
 
+    async def cog_load(self) -> None:
+        self.sweep_state.start()
+
     async def cog_unload(self) -> None:
         """Ferme proprement le client HTTP Mistral lors du retrait du Cog."""
 
+        self.sweep_state.cancel()
         await self.ai.aclose()
 
+    @tasks.loop(minutes=5)
+    async def sweep_state(self) -> None:
+        """Oublie les membres inactifs pour garder un état borné."""
+
+        self.ai.sweep()
+        cutoff = time.monotonic() - self.COOLDOWN_SECONDS
+        for user_id in [uid for uid, at in self._last_reply_at.items() if at < cutoff]:
+            del self._last_reply_at[user_id]
+
     def _is_on_cooldown(self, user_id: int) -> bool:
         now = time.monotonic()
         previous = self._last_reply_at.get(user_id)
@@ -732,6 +851,15 @@ class MaitreDuJeuCog(commands.Cog):
 
         question = extract_question(message.content, bot_user.id)
         intent = classify_question(question)
+        if intent is AssistantIntent.UNKNOWN and self.ai.streaming:
+            progress = _ProgressiveReply(message, interval=self.STREAM_EDIT_INTERVAL)
+            ai_reply = await self.ai.answer(
+                message.author.id,
+                question,
+                on_partial=progress.update,
+            )
+            await progress.finish(build_ai_response(ai_reply))
+            return
         if intent is AssistantIntent.UNKNOWN:
             ai_reply = await self.ai.answer(message.author.id, question)
             embed = build_ai_response(ai_reply)
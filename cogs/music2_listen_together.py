@@ -9,6 +9,7 @@ import discord
 from discord.ext import commands, tasks
 
 from config import RADIO_VC_ID
+from utils.voice_presence import voice_presence
 
 
 logger = logging.getLogger(__name__)
@@ -121,13 +122,11 @@ class Music2ListenTogetherCog(commands.Cog):
             return None
 
         voice_channel = self._voice_channel()
-        members = tuple(getattr(voice_channel, "members", ()) or ())
         listener_ids = tuple(
             sorted(
                 int(member.id)
-                for member in members
-                if not getattr(member, "bot", False)
-                and getattr(member, "id", None) is not None
+                for member in voice_presence.channel_humans(voice_channel)
+                if getattr(member, "id", None) is not None
             )
         )
         if not listener_ids:
@@ -4,12 +4,12 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 import logging
 import os
 import sqlite3
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
 
 import aiohttp
 import discord
@@ -34,6 +34,27 @@ INJURIES_API_URL = os.getenv("NHL_INJURIES_API_URL")
 SCHEDULE_API = "https://statsapi.web.nhl.com/api/v1/schedule"
 TEAM_STATS_API = "https://statsapi.web.nhl.com/api/v1/teams/{team_id}/stats"
 
+# Concurrent xG/odds requests allowed during one schedule pass.
+NHL_FETCH_CONCURRENCY = max(1, int(os.getenv("NHL_FETCH_CONCURRENCY", "4")))
+XG_CACHE_TTL = timedelta(hours=12)
+ODDS_CACHE_TTL = timedelta(minutes=10)
+
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER is 999 on older builds.
+_SQLITE_MAX_PARAMS = 500
+_NOTIFICATION_FLAGS = frozenset(
+    {"notified_preview", "notified_2h", "notified_final", "notified_upcoming"}
+)
+_UPSERT_MATCH_SQL = """
+    INSERT INTO matches (match_id, home_team, away_team, start_time, status, scores)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(match_id) DO UPDATE SET
+        home_team=excluded.home_team,
+        away_team=excluded.away_team,
+        start_time=excluded.start_time,
+        status=excluded.status,
+        scores=excluded.scores
+"""
+
 
 @dataclass
 class MatchInfo:
@@ -51,6 +72,41 @@ class MatchInfo:
     def score_label(self) -> str:
         return f"{self.away_score}-{self.home_score}"
 
+    def row_values(self) -> Tuple[str, str, str, str, str, str]:
+        return (
+            self.match_id,
+            self.home_team,
+            self.away_team,
+            self.start_time.isoformat(),
+            self.status,
+            self.score_label,
+        )
+
+    def differs_from(self, row: Optional[sqlite3.Row]) -> bool:
+        if row is None:
+            return True
+        stored = (
+            row["match_id"],
+            row["home_team"],
+            row["away_team"],
+            row["start_time"],
+            row["status"],
+            row["scores"],
+        )
+        return stored != self.row_values()
+
+
+@dataclass
+class MatchUpdatePlan:
+    """Messages and database writes produced by one schedule pass."""
+
+    upserts: List[Tuple[str, str, str, str, str, str]] = field(default_factory=list)
+    messages: List[str] = field(default_factory=list)
+    flags: Dict[str, Set[str]] = field(default_factory=dict)
+
+    def flag(self, column: str, match_id: str) -> None:
+        self.flags.setdefault(column, set()).add(match_id)
+
 
 class NHLDatabase:
     def __init__(self, db_path: str) -> None:
@@ -130,6 +186,56 @@ class NHLDatabase:
         cursor.execute(query, params)
         return cursor.fetchone()
 
+    async def fetch_matches(self, match_ids: Sequence[str]) -> Dict[str, sqlite3.Row]:
+        """Load the stored rows of ``match_ids`` with bulk ``IN`` queries."""
+
+        if not match_ids:
+            return {}
+        async with self._lock:
+            return await asyncio.to_thread(self._fetch_matches_sync, list(match_ids))
+
+    def _fetch_matches_sync(self, match_ids: List[str]) -> Dict[str, sqlite3.Row]:
+        rows: Dict[str, sqlite3.Row] = {}
+        cursor = self._conn.cursor()
+        for start in range(0, len(match_ids), _SQLITE_MAX_PARAMS):
+            chunk = match_ids[start:start + _SQLITE_MAX_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(
+                f"SELECT * FROM matches WHERE match_id IN ({placeholders})",
+                chunk,
+            )
+            rows.update((row["match_id"], row) for row in cursor.fetchall())
+        return rows
+
+    async def save_matches(
+        self,
+        upserts: Sequence[Tuple[Any, ...]],
+        flags: Mapping[str, Iterable[str]],
+    ) -> None:
+        """Upsert matches and set notification flags in one transaction."""
+
+        unknown = set(flags) - _NOTIFICATION_FLAGS
+        if unknown:
+            raise ValueError(f"unknown notification flags: {sorted(unknown)}")
+        if not upserts and not any(flags.values()):
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._save_matches_sync, upserts, flags)
+
+    def _save_matches_sync(
+        self,
+        upserts: Sequence[Tuple[Any, ...]],
+        flags: Mapping[str, Iterable[str]],
+    ) -> None:
+        with self._conn:
+            if upserts:
+                self._conn.executemany(_UPSERT_MATCH_SQL, upserts)
+            for column, match_ids in flags.items():
+                self._conn.executemany(
+                    f"UPDATE matches SET {column} = 1 WHERE match_id = ?",
+                    [(match_id,) for match_id in match_ids],
+                )
+
     async def close(self) -> None:
         async with self._lock:
             await asyncio.to_thread(self._conn.close)
@@ -209,6 +315,11 @@ class NHLNotificationsCog(commands.Cog):
         self.queue = MessageQueue(bot)
         self.queue.start()
         self._xg_cache: Dict[int, Tuple[float, datetime]] = {}
+        self._odds_cache: Dict[Tuple[str, str], Tuple[str, datetime]] = {}
+        self._fetch_semaphore = asyncio.Semaphore(NHL_FETCH_CONCURRENCY)
+        # live_score_task and betting_alerts_task share the same pass; running
+        # them one after the other keeps notifications from being sent twice.
+        self._match_update_lock = asyncio.Lock()
 
         self.live_score_task.start()
         self.betting_alerts_task.start()
@@ -270,31 +381,6 @@ class NHLNotificationsCog(commands.Cog):
                 )
         return games
 
-    async def _get_match_row(self, match_id: str) -> Optional[sqlite3.Row]:
-        return await self.db.fetchone("SELECT * FROM matches WHERE match_id = ?", (match_id,))
-
-    async def _upsert_match(self, match: MatchInfo) -> None:
-        await self.db.execute(
-            """
-            INSERT INTO matches (match_id, home_team, away_team, start_time, status, scores)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(match_id) DO UPDATE SET
-                home_team=excluded.home_team,
-                away_team=excluded.away_team,
-                start_time=excluded.start_time,
-                status=excluded.status,
-                scores=excluded.scores
-            """,
-            (
-                match.match_id,
-                match.home_team,
-                match.away_team,
-                match.start_time.isoformat(),
-                match.status,
-                match.score_label,
-            ),
-        )
-
     async def _fetch_schedule(self) -> List[MatchInfo]:
         today = datetime.now(timezone.utc).date()
         tomorrow = today + timedelta(days=1)
@@ -313,10 +399,11 @@ class NHLNotificationsCog(commands.Cog):
             return None
 
         cached = self._xg_cache.get(team_id)
-        if cached and datetime.now(timezone.utc) - cached[1] < timedelta(hours=12):
+        if cached and datetime.now(timezone.utc) - cached[1] < XG_CACHE_TTL:
             return cached[0]
 
-        payload = await self._fetch_json(TEAM_STATS_API.format(team_id=team_id))
+        async with self._fetch_semaphore:
+            payload = await self._fetch_json(TEAM_STATS_API.format(team_id=team_id))
         splits = payload.get("stats", [{}])[0].get("splits", [])
         if not splits:
             return None
@@ -335,15 +422,21 @@ class NHLNotificationsCog(commands.Cog):
         if not ODDS_API_URL or not ODDS_API_KEY:
             return "Cotes indisponibles"
 
+        key = (match.home_team, match.away_team)
+        cached = self._odds_cache.get(key)
+        if cached and datetime.now(timezone.utc) - cached[1] < ODDS_CACHE_TTL:
+            return cached[0]
+
         try:
-            payload = await self._fetch_json(
-                ODDS_API_URL,
-                params={
-                    "home": match.home_team,
-                    "away": match.away_team,
-                    "api_key": ODDS_API_KEY,
-                },
-            )
+            async with self._fetch_semaphore:
+                payload = await self._fetch_json(
+                    ODDS_API_URL,
+                    params={
+                        "home": match.home_team,
+                        "away": match.away_team,
+                        "api_key": ODDS_API_KEY,
+                    },
+                )
         except Exception as exc:
             logger.warning("Odds API error: %s", exc)
             return "Cotes indisponibles"
@@ -353,9 +446,18 @@ class NHLNotificationsCog(commands.Cog):
             home = odds.get("home")
             away = odds.get("away")
             if home and away:
-                return f"{match.away_team} {away} | {match.home_team} {home}"
+                line = f"{match.away_team} {away} | {match.home_team} {home}"
+                self._odds_cache[key] = (line, datetime.now(timezone.utc))
+                return line
         return "Cotes indisponibles"
 
+    async def _safe_team_xg(self, team_id: int) -> Optional[float]:
+        try:
+            return await self._fetch_team_xg(team_id)
+        except Exception as exc:
+            logger.warning("Team stats API error for %s: %s", team_id, exc)
+            return None
+
     async def _fetch_injuries(self) -> Iterable[Dict[str, str]]:
         if not INJURIES_API_URL:
             return []
@@ -371,7 +473,9 @@ class NHLNotificationsCog(commands.Cog):
             return payload.get("injuries", [])
         return []
 
-    async def _announce_live_game(self, match: MatchInfo, row: Optional[sqlite3.Row]) -> None:
+    def _plan_live_game(
+        self, plan: MatchUpdatePlan, match: MatchInfo, row: Optional[sqlite3.Row]
+    ) -> None:
         current_score = match.score_label
         stored_score = row["scores"] if row else ""
 
@@ -382,63 +486,89 @@ class NHLNotificationsCog(commands.Cog):
             return
 
         emoji = "🔴 LIVE" if match.status != "Final" else "✅ FINAL"
-        message = f"{emoji} | {match.away_team} @ {match.home_team} | {current_score}"
-        await self.queue.enqueue(NHL_LIVE_CHANNEL_ID, message)
+        plan.messages.append(f"{emoji} | {match.away_team} @ {match.home_team} | {current_score}")
 
         if match.status == "Final":
-            await self.db.execute(
-                "UPDATE matches SET notified_final = 1 WHERE match_id = ?",
-                (match.match_id,),
-            )
+            plan.flag("notified_final", match.match_id)
 
-    async def _maybe_send_preview(self, match: MatchInfo, row: Optional[sqlite3.Row]) -> None:
-        now = datetime.now(timezone.utc)
+    @staticmethod
+    def _needs_preview(match: MatchInfo, row: Optional[sqlite3.Row], now: datetime) -> bool:
         delta = match.start_time - now
-
         # ~8h before start
-        if timedelta(hours=7, minutes=30) <= delta <= timedelta(hours=8, minutes=30):
-            if row and row["notified_preview"]:
-                return
+        if not timedelta(hours=7, minutes=30) <= delta <= timedelta(hours=8, minutes=30):
+            return False
+        return not (row and row["notified_preview"])
 
-            home_xg = await self._fetch_team_xg(match.home_id)
-            away_xg = await self._fetch_team_xg(match.away_id)
-            odds_line = await self._fetch_odds(match)
+    @staticmethod
+    def _needs_last_call(match: MatchInfo, row: Optional[sqlite3.Row], now: datetime) -> bool:
+        delta = match.start_time - now
+        # ~2h before start
+        if not timedelta(hours=1, minutes=30) <= delta <= timedelta(hours=2, minutes=30):
+            return False
+        return not (row and row["notified_2h"])
+
+    @staticmethod
+    def _preview_message(
+        match: MatchInfo,
+        home_xg: Optional[float],
+        away_xg: Optional[float],
+        odds_line: str,
+    ) -> str:
+        xg_line = "xG indisponible"
+        if home_xg is not None and away_xg is not None:
+            xg_line = f"{match.away_team} {away_xg:.2f} | {match.home_team} {home_xg:.2f}"
+
+        return (
+            f"💰 PARIS | {match.away_team} @ {match.home_team}\n"
+            f"📊 xG | {xg_line}\n"
+            f"✅ +EV PICKS | {odds_line}"
+        )
 
-            xg_line = "xG indisponible"
-            if home_xg is not None and away_xg is not None:
-                xg_line = f"{match.away_team} {away_xg:.2f} | {match.home_team} {home_xg:.2f}"
+    @staticmethod
+    def _last_call_message(match: MatchInfo, odds_line: str) -> str:
+        return (
+            f"💰 PARIS | Dernière chance | {match.away_team} @ {match.home_team}\n"
+            f"📊 xG | cotes actualisées\n"
+            f"✅ +EV PICKS | {odds_line}"
+        )
 
-            message = (
-                f"💰 PARIS | {match.away_team} @ {match.home_team}\n"
-                f"📊 xG | {xg_line}\n"
-                f"✅ +EV PICKS | {odds_line}"
-            )
-            await self.queue.enqueue(NHL_LIVE_CHANNEL_ID, message)
-            await self.db.execute(
-                "UPDATE matches SET notified_preview = 1 WHERE match_id = ?",
-                (match.match_id,),
-            )
+    async def _plan_betting_alerts(
+        self,
+        plan: MatchUpdatePlan,
+        previews: Sequence[MatchInfo],
+        last_calls: Sequence[MatchInfo],
+    ) -> None:
+        """Fetch xG and odds once per team/match, concurrently, then plan alerts."""
 
-    async def _maybe_send_last_call(self, match: MatchInfo, row: Optional[sqlite3.Row]) -> None:
-        now = datetime.now(timezone.utc)
-        delta = match.start_time - now
-
-        # ~2h before start
-        if timedelta(hours=1, minutes=30) <= delta <= timedelta(hours=2, minutes=30):
-            if row and row["notified_2h"]:
-                return
+        if not previews and not last_calls:
+            return
 
-            odds_line = await self._fetch_odds(match)
-            message = (
-                f"💰 PARIS | Dernière chance | {match.away_team} @ {match.home_team}\n"
-                f"📊 xG | cotes actualisées\n"
-                f"✅ +EV PICKS | {odds_line}"
-            )
-            await self.queue.enqueue(NHL_LIVE_CHANNEL_ID, message)
-            await self.db.execute(
-                "UPDATE matches SET notified_2h = 1 WHERE match_id = ?",
-                (match.match_id,),
+        team_ids = sorted(
+            {team_id for match in previews for team_id in (match.home_id, match.away_id) if team_id}
+        )
+        odds_matches: Dict[str, MatchInfo] = {
+            match.match_id: match for match in (*previews, *last_calls)
+        }
+        xg_values, odds_values = await asyncio.gather(
+            asyncio.gather(*(self._safe_team_xg(team_id) for team_id in team_ids)),
+            asyncio.gather(*(self._fetch_odds(match) for match in odds_matches.values())),
+        )
+        xg_by_team = dict(zip(team_ids, xg_values, strict=True))
+        odds_by_match = dict(zip(odds_matches, odds_values, strict=True))
+
+        for match in previews:
+            plan.messages.append(
+                self._preview_message(
+                    match,
+                    xg_by_team.get(match.home_id),
+                    xg_by_team.get(match.away_id),
+                    odds_by_match[match.match_id],
+                )
             )
+            plan.flag("notified_preview", match.match_id)
+        for match in last_calls:
+            plan.messages.append(self._last_call_message(match, odds_by_match[match.match_id]))
+            plan.flag("notified_2h", match.match_id)
 
     async def _process_injuries(self) -> None:
         injuries = await self._fetch_injuries()
@@ -470,30 +600,46 @@ class NHLNotificationsCog(commands.Cog):
             await self.queue.enqueue(NHL_LIVE_CHANNEL_ID, message)
 
     async def _run_match_updates(self) -> None:
-        games = await self._fetch_schedule()
+        async with self._match_update_lock:
+            games = await self._fetch_schedule()
+            plan = await self._plan_match_updates(games)
+            for message in plan.messages:
+                await self.queue.enqueue(NHL_LIVE_CHANNEL_ID, message)
+            await self.db.save_matches(plan.upserts, plan.flags)
+
+    async def _plan_match_updates(self, games: Sequence[MatchInfo]) -> MatchUpdatePlan:
+        """Diff the schedule against the stored rows and plan every write."""
+
+        rows = await self.db.fetch_matches([match.match_id for match in games])
+        plan = MatchUpdatePlan()
+        previews: List[MatchInfo] = []
+        last_calls: List[MatchInfo] = []
+        now = datetime.now(timezone.utc)
 
         for match in games:
-            row = await self._get_match_row(match.match_id)
-            await self._upsert_match(match)
+            row = rows.get(match.match_id)
+            if match.differs_from(row):
+                plan.upserts.append(match.row_values())
 
             if match.status in {"In Progress", "Final"}:
-                await self._announce_live_game(match, row)
+                self._plan_live_game(plan, match, row)
                 continue
 
             if match.status in {"Scheduled", "Pre-Game"}:
                 if not (row and row["notified_upcoming"]):
-                    message = (
+                    plan.messages.append(
                         f"⏰ À venir | {match.away_team} @ {match.home_team} | "
                         f"{match.start_time.astimezone(timezone.utc).strftime('%H:%M UTC')}"
                     )
-                    await self.queue.enqueue(NHL_LIVE_CHANNEL_ID, message)
-                    await self.db.execute(
-                        "UPDATE matches SET notified_upcoming = 1 WHERE match_id = ?",
-                        (match.match_id,),
-                    )
+                    plan.flag("notified_upcoming", match.match_id)
+
+                if self._needs_preview(match, row, now):
+                    previews.append(match)
+                if self._needs_last_call(match, row, now):
+                    last_calls.append(match)
 
-                await self._maybe_send_preview(match, row)
-                await self._maybe_send_last_call(match, row)
+        await self._plan_betting_alerts(plan, previews, last_calls)
+        return plan
 
     @tasks.loop(minutes=15)
     async def live_score_task(self) -> None:
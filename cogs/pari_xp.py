@@ -5,6 +5,7 @@ import copy
 import logging
 import os
 import random
+import weakref
 from datetime import datetime
 from typing import Optional
 
@@ -22,8 +23,10 @@ from config import (
     CASINO_SCHEDULE_LABEL,
 )
 from rendering.casino_royal import CASINO_ROYAL_FILENAME
+from services.casino_totals import casino_totals
 from services.casino_visual_cache import CasinoVisualAsset, casino_visual_cache
 from services.refuge_casino import refuge_casino_service
+from storage.roulette_bet_journal import RouletteBetJournal
 from storage.roulette_history_store import roulette_history_store
 from storage.xp_store import xp_store
 from cogs.xp import award_xp
@@ -31,7 +34,7 @@ from ui.casino_views import CasinoLeaderboardEntry, CasinoLeaderboardView
 from ui.casino_visual_panel import add_casino_visual_block
 from utils import xp_adapter
 from utils.timezones import PARIS_TZ
-from utils.persistence import atomic_write_json_async, read_json_safe
+from utils.persistence import COMPACT, atomic_write_json_async, read_json_safe
 from utils.interactions import safe_respond
 from utils.metrics import measure
 from utils.discord_utils import safe_message_edit
@@ -39,6 +42,7 @@ from utils.discord_utils import safe_message_edit
 logger = logging.getLogger(__name__)
 
 STATE_FILE = os.path.join(DATA_DIR, "pari_xp_state.json")
+JOURNAL_FILE = os.path.join(DATA_DIR, "pari_xp_journal.jsonl")
 PARI_XP_MIN_BET = int(os.getenv("PARI_XP_MIN_BET", "10"))
 PARI_XP_MAX_BET = int(os.getenv("PARI_XP_MAX_BET", "500"))
 HOUSE_ZERO_CHANCE = 0.03
@@ -463,6 +467,22 @@ class PariXPCog(commands.Cog):
         self.state.setdefault("total_bets", 0)
         self.state.setdefault("total_winnings", 0)
         self.state.setdefault("players", {})
+        self._journal = RouletteBetJournal(JOURNAL_FILE)
+        self._persisted_seq = int(self.state.get("journal_seq", 0))
+        self._journal_seq = self._persisted_seq
+        # Rejoue les paris réglés depuis le dernier checkpoint du fichier d'état.
+        for entry in self._journal.read_after(self._persisted_seq):
+            try:
+                self._apply_bet_result(
+                    int(entry["user_id"]),
+                    int(entry["wagered"]),
+                    int(entry["payout"]),
+                    at=str(entry.get("at") or ""),
+                    seq=int(entry["seq"]),
+                )
+            except (KeyError, TypeError, ValueError):
+                logger.warning("[PariXP] entrée de journal ignorée: %r", entry)
+        casino_totals.publish(self.state, source_path=STATE_FILE)
         self.is_open: bool = bool(self.state.get("is_open"))
         self.living_state: dict[str, object] = _empty_living_state()
         self.casino_visual_asset: CasinoVisualAsset | None = None
@@ -470,10 +490,14 @@ class PariXPCog(commands.Cog):
         self._last_announced_state: Optional[bool] = None
         self._last_panel_signature: tuple[object, ...] | None = None
         self._last_visual_signature: str | None = None
-        # Sérialise la séquence débit → tirage → crédit → état pour éviter
-        # que deux paris simultanés n'entrelacent les compteurs du casino.
-        self._bet_lock = asyncio.Lock()
+        # Un verrou par joueur sérialise uniquement contrôle du solde → débit.
+        # Les compteurs du casino sont modifiés sans await, donc les paris de
+        # joueurs différents ne s'attendent plus les uns les autres.
+        self._bet_locks: weakref.WeakValueDictionary[int, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
         self.check_schedule.start()
+        self.prune_history.start()
 
     # ── Schedule handling ──
     def _is_open_now(self, dt: Optional[datetime] = None) -> bool:
@@ -491,6 +515,8 @@ class PariXPCog(commands.Cog):
             self.state["is_open"] = self.is_open
             await self._save_state()
             await self._announce_state()
+        elif self._journal_seq != self._persisted_seq:
+            await self._save_state()
         await self._refresh_casino_visual()
         await self._ensure_roulette_message()
 
@@ -498,6 +524,22 @@ class PariXPCog(commands.Cog):
     async def before_check(self) -> None:
         await self.bot.wait_until_ready()
 
+    @tasks.loop(hours=1)
+    async def prune_history(self) -> None:
+        # La rétention de l'historique vivant est appliquée par lots, hors du
+        # chemin d'enregistrement des paris.
+        try:
+            deleted = await roulette_history_store.prune_expired()
+        except Exception:
+            logger.exception("[PariXP] purge de l'historique de roulette impossible")
+            return
+        if deleted:
+            logger.info("[PariXP] historique de roulette purgé: %d paris", deleted)
+
+    @prune_history.before_loop
+    async def before_prune_history(self) -> None:
+        await self.bot.wait_until_ready()
+
     async def _announce_state(self) -> None:
         if self._last_announced_state == self.is_open:
             return
@@ -527,8 +569,65 @@ class PariXPCog(commands.Cog):
         # Ne jamais envoyer l'objet mutable partagé au thread de sérialisation.
         # Le snapshot est construit sans await, donc aucune autre coroutine ne
         # peut modifier self.state pendant la copie.
+        seq = self._journal_seq
         snapshot = copy.deepcopy(self.state)
-        await atomic_write_json_async(STATE_FILE, snapshot)
+        snapshot["journal_seq"] = seq
+        # Gros document réécrit à chaque checkpoint : format compact.
+        await atomic_write_json_async(STATE_FILE, snapshot, profile=COMPACT)
+        # Le document couvre désormais tous les paris jusqu'à ``seq`` : le
+        # préfixe correspondant du journal peut être supprimé.
+        self._persisted_seq = max(self._persisted_seq, seq)
+        try:
+            await self._journal.compact(seq)
+        except OSError:
+            logger.exception("[PariXP] compaction du journal des paris impossible")
+
+    def _bet_lock_for(self, user_id: int) -> asyncio.Lock:
+        lock = self._bet_locks.get(user_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._bet_locks[user_id] = lock
+        return lock
+
+    def _apply_bet_result(
+        self,
+        user_id: int,
+        amount: int,
+        payout: int,
+        *,
+        at: str,
+        seq: int | None = None,
+    ) -> dict[str, object]:
+        """Apply one settled bet to the in-memory counters and return its journal entry."""
+        self.state["total_bets"] = int(self.state.get("total_bets", 0)) + amount
+        if payout > 0:
+            self.state["total_winnings"] = (
+                int(self.state.get("total_winnings", 0)) + payout
+            )
+            self.state["last_winner"] = {
+                "user_id": user_id,
+                "amount": payout,
+                "timestamp": at,
+            }
+        if seq is None:
+            seq = self._journal_seq + 1
+        self._journal_seq = max(self._journal_seq, seq)
+        self._record_player_result(user_id, amount, payout)
+        return {
+            "seq": seq,
+            "user_id": user_id,
+            "wagered": amount,
+            "payout": payout,
+            "at": at,
+        }
+
+    async def _journal_bet(self, entry: dict[str, object]) -> None:
+        try:
+            await self._journal.append(entry)
+        except OSError:
+            # Le pari reste comptabilisé en mémoire et sera écrit au prochain
+            # checkpoint de l'état complet.
+            logger.exception("[PariXP] écriture du journal des paris impossible")
 
     async def _refresh_casino_visual(self) -> None:
         """Refresh the visual read model without touching roulette probability logic."""
@@ -737,6 +836,13 @@ class PariXPCog(commands.Cog):
         stats["bets"] = int(stats.get("bets", 0)) + 1
         stats["wagered"] = int(stats.get("wagered", 0)) + bet_amount
         stats["winnings"] = int(stats.get("winnings", 0)) + payout
+        casino_totals.record_player(
+            user_key,
+            stats,
+            total_bets=int(self.state.get("total_bets", 0)),
+            total_winnings=int(self.state.get("total_winnings", 0)),
+            source_path=STATE_FILE,
+        )
 
     # ── Betting logic ──
     async def _handle_bet(
@@ -766,7 +872,7 @@ class PariXPCog(commands.Cog):
                 return
 
             winner_role: Optional[discord.Role] = None
-            async with self._bet_lock:
+            async with self._bet_lock_for(interaction.user.id):
                 data = await xp_store.get_user_data(interaction.user.id)
                 balance = int(data.get("xp", 0))
                 if balance < amount:
@@ -789,84 +895,80 @@ class PariXPCog(commands.Cog):
                     await safe_respond(interaction, "❌ Erreur interne.", ephemeral=True)
                     return
 
-                roll = random.random()
-                drawn_number: Optional[int] = None
-                if bet_type == "number":
-                    assert number is not None
-                    drawn_number = _draw_number_for_roll(number, roll)
-                    zero_hit = drawn_number == 0
-                    win = drawn_number == number
-                    multiplier = 0 if zero_hit else 10
-                else:
-                    zero_hit, win = _resolve_simple_bet_roll(roll)
-                    multiplier = 2 if win else 0
+            roll = random.random()
+            drawn_number: Optional[int] = None
+            if bet_type == "number":
+                assert number is not None
+                drawn_number = _draw_number_for_roll(number, roll)
+                zero_hit = drawn_number == 0
+                win = drawn_number == number
+                multiplier = 0 if zero_hit else 10
+            else:
+                zero_hit, win = _resolve_simple_bet_roll(roll)
+                multiplier = 2 if win else 0
 
-                payout = amount * multiplier if win else 0
-                if win:
+            payout = amount * multiplier if win else 0
+            if win:
+                try:
+                    await award_xp(
+                        interaction.user.id,
+                        payout,
+                        guild_id=interaction.guild_id,
+                        source="pari_xp",
+                    )
+                except Exception as e:  # pragma: no cover - defensive
+                    logger.exception("[PariXP] credit failed: %s", e)
                     try:
-                        await award_xp(
+                        await xp_adapter.refund_xp_exact(
                             interaction.user.id,
-                            payout,
-                            guild_id=interaction.guild_id,
-                            source="pari_xp",
+                            amount,
+                            guild_id=interaction.guild_id or 0,
+                            source="pari_xp_refund",
                         )
-                    except Exception as e:  # pragma: no cover - defensive
-                        logger.exception("[PariXP] credit failed: %s", e)
-                        try:
-                            await xp_adapter.refund_xp_exact(
-                                interaction.user.id,
-                                amount,
-                                guild_id=interaction.guild_id or 0,
-                                source="pari_xp_refund",
-                            )
-                        except Exception as refund_exc:  # pragma: no cover - defensive
-                            logger.critical(
-                                "[PariXP] payout failed and stake refund failed for user %s: %s",
-                                interaction.user.id,
-                                refund_exc,
-                                exc_info=True,
-                            )
-                            await safe_respond(
-                                interaction,
-                                "❌ Erreur interne. Le remboursement automatique a échoué ; l'incident a été journalisé.",
-                                ephemeral=True,
-                            )
-                        else:
-                            await safe_respond(
-                                interaction,
-                                "❌ Erreur interne pendant le paiement. Ta mise a été remboursée.",
-                                ephemeral=True,
-                            )
-                        return
-                    msg = f"🎉 Gagné ! Tu remportes {payout} XP."
-                    self.state["total_winnings"] = (
-                        self.state.get("total_winnings", 0) + payout
-                    )
-                    self.state["last_winner"] = {
-                        "user_id": interaction.user.id,
-                        "amount": payout,
-                        "timestamp": datetime.now(self.tz).isoformat(),
-                    }
-                    if PARI_XP_ROLE_ID and interaction.guild:
-                        role = interaction.guild.get_role(PARI_XP_ROLE_ID)
-                        me = interaction.guild.me
-                        if role and me and role < me.top_role:
-                            winner_role = role
-                else:
-                    msg = "❌ Perdu."
-                if zero_hit:
-                    outcome_line: str | None = (
-                        "🟢 Zéro Vert (0) ! La Maison reprend la table."
-                    )
-                elif bet_type == "number":
-                    outcome_line = (
-                        f"🎯 Numéro tiré : {drawn_number} — ton choix : {number}."
-                    )
-                else:
-                    outcome_line = None
-                self.state["total_bets"] = self.state.get("total_bets", 0) + amount
-                self._record_player_result(interaction.user.id, amount, payout)
-                await self._save_state()
+                    except Exception as refund_exc:  # pragma: no cover - defensive
+                        logger.critical(
+                            "[PariXP] payout failed and stake refund failed for user %s: %s",
+                            interaction.user.id,
+                            refund_exc,
+                            exc_info=True,
+                        )
+                        await safe_respond(
+                            interaction,
+                            "❌ Erreur interne. Le remboursement automatique a échoué ; l'incident a été journalisé.",
+                            ephemeral=True,
+                        )
+                    else:
+                        await safe_respond(
+                            interaction,
+                            "❌ Erreur interne pendant le paiement. Ta mise a été remboursée.",
+                            ephemeral=True,
+                        )
+                    return
+                msg = f"🎉 Gagné ! Tu remportes {payout} XP."
+                if PARI_XP_ROLE_ID and interaction.guild:
+                    role = interaction.guild.get_role(PARI_XP_ROLE_ID)
+                    me = interaction.guild.me
+                    if role and me and role < me.top_role:
+                        winner_role = role
+            else:
+                msg = "❌ Perdu."
+            if zero_hit:
+                outcome_line: str | None = (
+                    "🟢 Zéro Vert (0) ! La Maison reprend la table."
+                )
+            elif bet_type == "number":
+                outcome_line = (
+                    f"🎯 Numéro tiré : {drawn_number} — ton choix : {number}."
+                )
+            else:
+                outcome_line = None
+            entry = self._apply_bet_result(
+                interaction.user.id,
+                amount,
+                payout,
+                at=datetime.now(self.tz).isoformat(),
+            )
+            await self._journal_bet(entry)
 
             await self._record_living_event(
                 user_id=interaction.user.id,
@@ -986,8 +1088,15 @@ class PariXPCog(commands.Cog):
             pass
         await self._ensure_roulette_message()
 
-    def cog_unload(self) -> None:
+    async def cog_unload(self) -> None:
         self.check_schedule.cancel()
+        self.prune_history.cancel()
+        if self._journal_seq != self._persisted_seq:
+            try:
+                await self._save_state()
+            except OSError:
+                # Le journal reste sur disque et sera rejoué au prochain démarrage.
+                logger.exception("[PariXP] sauvegarde finale de l'état impossible")
 
 
 async def setup(bot: commands.Bot) -> None:
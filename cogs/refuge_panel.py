@@ -27,6 +27,7 @@ from ui.refuge_panel_view import (
 )
 from utils.discord_utils import safe_message_edit
 from utils.timezones import PARIS_TZ
+from utils.voice_presence import voice_presence
 
 
 logger = logging.getLogger(__name__)
@@ -109,12 +110,7 @@ def refuge_member_count(guild: discord.Guild) -> int:
 def refuge_voice_count(guild: discord.Guild) -> int:
     """Count humans currently connected to any guild voice channel."""
 
-    return sum(
-        1
-        for channel in (getattr(guild, "voice_channels", ()) or ())
-        for member in (getattr(channel, "members", ()) or ())
-        if not getattr(member, "bot", False)
-    )
+    return voice_presence.human_count(guild)
 
 
 def refuge_radio_status(bot: commands.Bot) -> str:
@@ -1,21 +1,19 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Mapping
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import Any
 
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 
-from config import DATA_DIR
+from services.casino_totals import casino_totals
 from storage.season_store import season_store
 from ui.season_leaderboard_view import (
     SeasonLeaderboardEntry,
     SeasonLeaderboardView,
 )
-from utils.persistence import read_json_safe
 from utils.seasons import (
     SEASON_METRICS,
     SEASON_METRICS_BY_KEY,
@@ -26,22 +24,7 @@ from utils.seasons import (
     season_label,
     split_interval_by_season,
 )
-
-
-CASINO_STATE_FILE = Path(DATA_DIR) / "pari_xp_state.json"
-
-
-def _casino_players_from_raw(raw: Any) -> dict[str, dict[str, Any]]:
-    if not isinstance(raw, dict):
-        return {}
-    players = raw.get("players", {})
-    if not isinstance(players, dict):
-        return {}
-    return {
-        str(user_id): dict(payload)
-        for user_id, payload in players.items()
-        if isinstance(payload, dict)
-    }
+from utils.voice_presence import voice_presence
 
 
 class SeasonalLeaderboardsCog(commands.Cog):
@@ -50,10 +33,16 @@ class SeasonalLeaderboardsCog(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
         self._voice_sessions: dict[int, datetime] = {}
+        self._casino_synced_version: int | None = None
 
     async def _sync_casino(self) -> None:
-        raw = await asyncio.to_thread(read_json_safe, CASINO_STATE_FILE, {})
-        await season_store.sync_casino_totals(_casino_players_from_raw(raw))
+        version, players = await casino_totals.get_players()
+        # Published totals are versioned: an idle casino skips the diff of the
+        # whole player map. File fallbacks (version None) are always diffed.
+        if version is not None and version == self._casino_synced_version:
+            return
+        await season_store.sync_casino_totals(players)
+        self._casino_synced_version = version
 
     async def cog_load(self) -> None:
         await season_store.ensure_tracking_started()
@@ -77,12 +66,9 @@ class SeasonalLeaderboardsCog(commands.Cog):
         now = datetime.now(timezone.utc)
         active_ids: set[int] = set()
         for guild in self.bot.guilds:
-            for channel in guild.voice_channels:
-                for member in channel.members:
-                    if member.bot:
-                        continue
-                    active_ids.add(member.id)
-                    self._voice_sessions.setdefault(member.id, now)
+            for member in voice_presence.humans(guild):
+                active_ids.add(member.id)
+                self._voice_sessions.setdefault(member.id, now)
 
         for user_id in list(self._voice_sessions):
             if user_id not in active_ids:
@@ -184,7 +170,7 @@ class SeasonalLeaderboardsCog(commands.Cog):
             return
 
         users = payload.get("users", {})
-        if not isinstance(users, dict):
+        if not isinstance(users, Mapping):
             users = {}
         rows = rank_rows(users, metric.field)
 
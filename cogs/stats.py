@@ -1,9 +1,11 @@
 """Mise à jour des salons de statistiques du serveur.
 
-La cog renomme périodiquement les canaux affichant le nombre de membres,
-les utilisateurs en ligne et l'activité vocale. Les valeurs sont
-maintenant persistées dans ``stats_cache.json`` pour survivre aux
-redémarrages.
+La cog renomme les canaux affichant le nombre de membres, les utilisateurs
+en ligne et l'activité vocale. Les compteurs sont tenus à jour par les
+événements (arrivées, départs, présences, vocal) plutôt que par un parcours
+de tous les membres ; un salon n'est renommé que si la valeur affichée
+change. Les valeurs sont persistées dans ``stats_cache.json`` pour survivre
+aux redémarrages, uniquement lorsqu'elles changent.
 """
 
 from __future__ import annotations
@@ -12,22 +14,31 @@ import asyncio
 import logging
 from datetime import datetime, time, timezone
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Tuple
 
 import discord
 from discord.ext import commands, tasks
 
 import config
 from config import DATA_DIR
+from utils.background_tasks import background_tasks
 from utils.metrics import measure
 from utils.persistence import atomic_write_json_async, ensure_dir, read_json_safe
 from utils.rename_manager import rename_manager
+from utils.voice_presence import voice_presence
 
 logger = logging.getLogger(__name__)
 
 STATS_CACHE_FILE = Path(DATA_DIR) / "stats_cache.json"
 ensure_dir(STATS_CACHE_FILE.parent)
 
+# Regroupe les rafales d'événements en un seul renommage par serveur.
+PUBLISH_DELAY_SECONDS = 30.0
+
+
+def _is_online(member: discord.Member) -> bool:
+    return getattr(member, "status", discord.Status.offline) != discord.Status.offline
+
 
 async def _ensure_rename_manager_started() -> None:
     """Start ``rename_manager`` if its worker is inactive."""
@@ -44,6 +55,13 @@ class StatsCog(commands.Cog):
         self.bot = bot
         # Cache {guild_id: {"members": int, "online": int, "voice": int}}
         self.cache: Dict[str, Dict[str, int]] = read_json_safe(STATS_CACHE_FILE) or {}
+        # Compteurs incrémentaux {guild_id: int}, amorcés par un seul parcours.
+        self._bots: Dict[int, int] = {}
+        self._online: Dict[int, int] = {}
+        # Dernière valeur demandée par salon : (guild_id, clé) -> valeur
+        self._displayed: Dict[Tuple[str, str], int] = {}
+        self._publish_tasks: Dict[int, asyncio.Task] = {}
+        self._started = False
         # Lancement différé pour appliquer le cache avant les boucles
         self._startup_task = asyncio.create_task(self._startup())
 
@@ -58,6 +76,7 @@ class StatsCog(commands.Cog):
             self.refresh_members.start()
             self.refresh_online.start()
             self.refresh_voice.start()
+            self._started = True
         except asyncio.CancelledError:  # pragma: no cover - task cancellation
             raise
         except Exception:  # pragma: no cover - unexpected errors
@@ -76,75 +95,198 @@ class StatsCog(commands.Cog):
                     await rename_manager.request(
                         channel, f"👥 Membres : {data['members']}"
                     )
+                    self._displayed[(gid, "members")] = data["members"]
             if "online" in data:
                 channel = guild.get_channel(config.STATS_ONLINE_CHANNEL_ID)
                 if channel is not None:
                     await rename_manager.request(
                         channel, f"🟢 En ligne : {data['online']}"
                     )
+                    self._displayed[(gid, "online")] = data["online"]
             if "voice" in data:
                 channel = guild.get_channel(config.STATS_VOICE_CHANNEL_ID)
                 if channel is not None:
                     await rename_manager.request(
                         channel, f"🔊 Voc : {data['voice']}"
                     )
+                    self._displayed[(gid, "voice")] = data["voice"]
 
     def cog_unload(self) -> None:
         self.refresh_members.cancel()
         self.refresh_online.cancel()
         self.refresh_voice.cancel()
         self._startup_task.cancel()
+        for task in self._publish_tasks.values():
+            task.cancel()
+        self._publish_tasks.clear()
+
+    # ---------- compteurs incrémentaux ----------
+
+    def _index_guild(self, guild: discord.Guild) -> None:
+        """Amorce les compteurs de ``guild`` par un unique parcours des membres."""
+        bots = online = 0
+        for member in guild.members:
+            if getattr(member, "bot", False):
+                bots += 1
+            elif _is_online(member):
+                online += 1
+        gid = getattr(guild, "id", 0)
+        self._bots[gid] = bots
+        self._online[gid] = online
+
+    def _ensure_indexed(self, guild: discord.Guild) -> int:
+        gid = getattr(guild, "id", 0)
+        if gid not in self._bots:
+            self._index_guild(guild)
+        return gid
+
+    def _schedule_publish(self, guild: discord.Guild) -> None:
+        """Planifie un renommage groupé après une rafale d'événements."""
+        if not self._started:
+            return
+        task = self._publish_tasks.get(guild.id)
+        if task is None or task.done():
+            self._publish_tasks[guild.id] = background_tasks.create_task(
+                self._publish_later(guild), name=f"stats:publish:{guild.id}"
+            )
+
+    async def _publish_later(self, guild: discord.Guild) -> None:
+        await asyncio.sleep(PUBLISH_DELAY_SECONDS)
+        for update in (self.update_members, self.update_online, self.update_voice):
+            try:
+                await update(guild)
+            except Exception:
+                logger.exception("Erreur publication stats")
+
+    async def _publish(
+        self,
+        guild: discord.Guild,
+        key: str,
+        channel_id: int,
+        name: str,
+        value: int,
+        *,
+        force: bool = False,
+    ) -> None:
+        """Renomme le salon et persiste la valeur, seulement si elle a changé.
+
+        ``_displayed`` ne retient que la dernière valeur *demandée* : le
+        renommage peut encore échouer dans ``rename_manager``. Les boucles de
+        sécurité passent donc ``force=True`` pour republier quoi qu'il arrive ;
+        un nom déjà à jour est ignoré par ``rename_manager`` sans appel réseau.
+        """
+        gid = str(getattr(guild, "id", 0))
+        if force or self._displayed.get((gid, key)) != value:
+            channel = guild.get_channel(channel_id)
+            if channel is not None:
+                await rename_manager.request(channel, name)
+                self._displayed[(gid, key)] = value
+        cached = self.cache.setdefault(gid, {})
+        if cached.get(key) != value:
+            cached[key] = value
+            await atomic_write_json_async(STATS_CACHE_FILE, self.cache)
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        # Après une reconnexion, des événements ont pu être manqués.
+        self._bots.clear()
+        self._online.clear()
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member) -> None:
+        gid = member.guild.id
+        if gid in self._bots:
+            if member.bot:
+                self._bots[gid] += 1
+            elif _is_online(member):
+                self._online[gid] += 1
+        self._schedule_publish(member.guild)
 
-    async def update_members(self, guild: discord.Guild) -> None:
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member) -> None:
+        gid = member.guild.id
+        if gid in self._bots:
+            if member.bot:
+                self._bots[gid] = max(0, self._bots[gid] - 1)
+            elif _is_online(member):
+                self._online[gid] = max(0, self._online[gid] - 1)
+        self._schedule_publish(member.guild)
+
+    @commands.Cog.listener()
+    async def on_presence_update(
+        self, before: discord.Member, after: discord.Member
+    ) -> None:
+        if after.bot:
+            return
+        delta = int(_is_online(after)) - int(_is_online(before))
+        gid = after.guild.id
+        if not delta or gid not in self._online:
+            return
+        self._online[gid] = max(0, self._online[gid] + delta)
+        self._schedule_publish(after.guild)
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(
+        self,
+        member: discord.Member,
+        before: discord.VoiceState,
+        after: discord.VoiceState,
+    ) -> None:
+        # Le nombre lui-même vient de voice_presence, lu à la publication.
+        if member.bot or before.channel == after.channel:
+            return
+        self._schedule_publish(member.guild)
+
+    # ---------- publication ----------
+
+    async def update_members(
+        self, guild: discord.Guild, *, force: bool = False
+    ) -> None:
         """Met à jour le nombre de membres pour ``guild``."""
         await _ensure_rename_manager_started()
         with measure("stats.update_members"):
-            members = guild.member_count - sum(
-                1 for m in guild.members if getattr(m, "bot", False)
+            gid = self._ensure_indexed(guild)
+            members = guild.member_count - self._bots[gid]
+            await self._publish(
+                guild,
+                "members",
+                config.STATS_MEMBERS_CHANNEL_ID,
+                f"👥 Membres : {members}",
+                members,
+                force=force,
             )
-            channel = guild.get_channel(config.STATS_MEMBERS_CHANNEL_ID)
-            if channel is not None:
-                await rename_manager.request(
-                    channel, f"👥 Membres : {members}"
-                )
-            gid = str(getattr(guild, "id", 0))
-            self.cache.setdefault(gid, {})["members"] = members
-            await atomic_write_json_async(STATS_CACHE_FILE, self.cache)
 
-    async def update_online(self, guild: discord.Guild) -> None:
+    async def update_online(
+        self, guild: discord.Guild, *, force: bool = False
+    ) -> None:
         """Met à jour le nombre d'utilisateurs en ligne pour ``guild``."""
         await _ensure_rename_manager_started()
         with measure("stats.update_online"):
-            online = sum(
-                1
-                for m in guild.members
-                if not getattr(m, "bot", False) and m.status != discord.Status.offline
+            online = self._online[self._ensure_indexed(guild)]
+            await self._publish(
+                guild,
+                "online",
+                config.STATS_ONLINE_CHANNEL_ID,
+                f"🟢 En ligne : {online}",
+                online,
+                force=force,
             )
-            channel = guild.get_channel(config.STATS_ONLINE_CHANNEL_ID)
-            if channel is not None:
-                await rename_manager.request(
-                    channel, f"🟢 En ligne : {online}"
-                )
-            gid = str(getattr(guild, "id", 0))
-            self.cache.setdefault(gid, {})["online"] = online
-            await atomic_write_json_async(STATS_CACHE_FILE, self.cache)
 
-    async def update_voice(self, guild: discord.Guild) -> None:
+    async def update_voice(
+        self, guild: discord.Guild, *, force: bool = False
+    ) -> None:
         """Met à jour le nombre d'utilisateurs en vocal pour ``guild``."""
         await _ensure_rename_manager_started()
         with measure("stats.update_voice"):
-            voice = sum(
-                len([m for m in vc.members if not getattr(m, "bot", False)])
-                for vc in getattr(guild, "voice_channels", [])
+            voice = voice_presence.human_count(guild)
+            await self._publish(
+                guild,
+                "voice",
+                config.STATS_VOICE_CHANNEL_ID,
+                f"🔊 Voc : {voice}",
+                voice,
+                force=force,
             )
-            channel = guild.get_channel(config.STATS_VOICE_CHANNEL_ID)
-            if channel is not None:
-                await rename_manager.request(
-                    channel, f"🔊 Voc : {voice}"
-                )
-            gid = str(getattr(guild, "id", 0))
-            self.cache.setdefault(gid, {})["voice"] = voice
-            await atomic_write_json_async(STATS_CACHE_FILE, self.cache)
 
     @tasks.loop(time=time(hour=0))
     async def refresh_members(self) -> None:
@@ -160,27 +302,30 @@ class StatsCog(commands.Cog):
             self.cache.clear()
         for guild in self.bot.guilds:
             try:
-                await self.update_members(guild)
+                # Réamorçage quotidien : corrige une éventuelle dérive des
+                # compteurs (événements manqués) pour un seul parcours par jour.
+                self._index_guild(guild)
+                await self.update_members(guild, force=True)
             except Exception:
                 logger.exception("Erreur refresh_members")
 
     @tasks.loop(minutes=15)
     async def refresh_online(self) -> None:
-        """Met à jour le nombre d'utilisateurs en ligne toutes les 15 minutes."""
+        """Filet de sécurité : republie le compteur en ligne toutes les 15 minutes."""
         await self.bot.wait_until_ready()
         for guild in self.bot.guilds:
             try:
-                await self.update_online(guild)
+                await self.update_online(guild, force=True)
             except Exception:
                 logger.exception("Erreur refresh_online")
 
     @tasks.loop(minutes=3)
     async def refresh_voice(self) -> None:
-        """Met à jour le nombre d'utilisateurs en vocal toutes les 3 minutes."""
+        """Filet de sécurité : republie le compteur vocal toutes les 3 minutes."""
         await self.bot.wait_until_ready()
         for guild in self.bot.guilds:
             try:
-                await self.update_voice(guild)
+                await self.update_voice(guild, force=True)
             except Exception:
                 logger.exception("Erreur refresh_voice")
 
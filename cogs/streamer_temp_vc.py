@@ -18,6 +18,7 @@ from storage.temp_vc_store import (
     load_streamer_temp_vcs,
     save_streamer_temp_vcs_async,
 )
+from utils.persistence import SnapshotWriter
 from view import StreamerTempVoiceView
 
 logger = logging.getLogger(__name__)
@@ -37,6 +38,13 @@ class StreamerTempVCCog(commands.Cog):
         }
         self._delete_tasks: Dict[int, asyncio.Task] = {}
         self._owner_locks: Dict[int, asyncio.Lock] = {}
+        # Écriture immédiate mais ignorée si le mapping n'a pas changé.
+        self._writer = SnapshotWriter(
+            self._channel_to_owner.copy,
+            lambda payload: save_streamer_temp_vcs_async(payload),
+            name="streamer_temp_vcs",
+        )
+        self._writer.mark_clean()
 
     def cog_unload(self) -> None:
         for task in self._delete_tasks.values():
@@ -44,7 +52,7 @@ class StreamerTempVCCog(commands.Cog):
         self._delete_tasks.clear()
 
     async def _persist_channels(self) -> None:
-        await save_streamer_temp_vcs_async(self._channel_to_owner.copy())
+        await self._writer.flush()
 
     def _track_channel(self, owner_id: int, channel_id: int) -> None:
         previous_channel = self._owner_to_channel.get(owner_id)
@@ -1,6 +1,7 @@
-import asyncio
 import logging
-from typing import Dict, Set
+import time
+from collections import Counter
+from typing import Dict, Hashable, Set, Tuple
 
 import discord
 from discord.ext import commands, tasks
@@ -26,6 +27,7 @@ from storage.temp_vc_store import (
     save_last_names_cache,
     save_temp_vc_registry_async,
 )
+from utils.persistence import SnapshotWriter
 from utils.temp_vc_cleanup import delete_empty_managed_temp_vcs
 from utils.rename_manager import rename_manager
 
@@ -39,6 +41,11 @@ TEMP_VC_IDS: Set[int] = {
     if record["type"] == GENERIC_TEMP_VC_TYPE
 }
 
+# Fréquence (s) à laquelle les salons marqués « à renommer » sont traités.
+RENAME_TICK_SECONDS = 1.0
+# Délai de regroupement des écritures du registre et du cache des noms.
+SNAPSHOT_DEBOUNCE_SECONDS = 5.0
+
 # Mapping « rôle principal → nom de base du salon »
 ROLE_NAMES: Dict[int, str] = {
     ROLE_PC: "PC",
@@ -52,10 +59,36 @@ class TempVCCog(commands.Cog):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self._rename_tasks: Dict[int, asyncio.Task] = {}
         self._last_names: Dict[int, str] = {}
+        # Salons à renommer : id -> (échéance monotonic, salon). Chaque
+        # événement ne fait que marquer le salon ; rename_tick draine la file.
+        self._dirty: Dict[int, Tuple[float, discord.VoiceChannel]] = {}
+        # Dernier nom calculé par salon, indexé par l'empreinte des membres.
+        self._name_cache: Dict[int, Tuple[Hashable, str | None]] = {}
+        # « events » : événements reçus ; « renames » : renommages demandés.
+        self.rename_counters: Counter[str] = Counter()
+        # Dernier balayage : (durée en secondes, salons supprimés).
+        self.last_sweep: Tuple[float, int] = (0.0, 0)
+        # « sweeps » : balayages effectués ; « deleted » : salons supprimés.
+        self.sweep_counters: Counter[str] = Counter()
+        # Écritures disque : ignorées si le contenu n'a pas changé, regroupées
+        # sinon. Les fonctions de sauvegarde sont résolues à chaque appel.
+        self._registry_writer = SnapshotWriter(
+            TEMP_VC_REGISTRY.copy,
+            lambda payload: save_temp_vc_registry_async(payload),
+            delay=SNAPSHOT_DEBOUNCE_SECONDS,
+            name="temp_vc_registry",
+        )
+        self._registry_writer.mark_clean()
+        self._names_writer = SnapshotWriter(
+            self._last_names.copy,
+            lambda payload: save_last_names_cache(payload),
+            delay=SNAPSHOT_DEBOUNCE_SECONDS,
+            name="temp_vc_last_names",
+        )
 
         # Aucun salon n'est découvert/adopté depuis son nom ou sa catégorie.
+        self.rename_tick.start()
         self.cleanup.start()
         self.monitor_rename_worker.start()
         self.health_check.start()
@@ -67,13 +100,17 @@ class TempVCCog(commands.Cog):
         await self._migrate_legacy_temp_vcs()
         await self._load_last_names_cache()
 
-    def cog_unload(self) -> None:
+    async def cog_unload(self) -> None:
+        self.rename_tick.cancel()
         self.cleanup.cancel()
         self.monitor_rename_worker.cancel()
         self.health_check.cancel()
-        for task in self._rename_tasks.values():
-            task.cancel()
-        self._rename_tasks.clear()
+        self._dirty.clear()
+        for writer in (self._registry_writer, self._names_writer):
+            try:
+                await writer.aclose()
+            except Exception:
+                logger.exception("[temp_vc] échec de l'écriture finale de %s", writer.name)
 
     async def _ensure_rename_worker(self) -> bool:
         """Start the rename manager worker if it's not running.
@@ -90,12 +127,10 @@ class TempVCCog(commands.Cog):
                 logger.info("[temp_vc] rename_manager worker démarré")
         return True
 
-    async def _save_last_names_cache(self) -> None:
-        """Persiste le cache des derniers noms."""
-        try:
-            await save_last_names_cache(self._last_names.copy())
-        except Exception:
-            logger.exception("[temp_vc] échec de sauvegarde du cache des noms")
+    def _mark_state_dirty(self) -> None:
+        """Programme l'écriture différée du registre et du cache des noms."""
+        self._registry_writer.mark_dirty()
+        self._names_writer.mark_dirty()
 
     async def _load_last_names_cache(self) -> None:
         """Charge le cache des derniers noms au démarrage."""
@@ -106,6 +141,7 @@ class TempVCCog(commands.Cog):
         else:
             if data:
                 self._last_names.update(data)
+            self._names_writer.mark_clean()
 
     async def _migrate_legacy_temp_vcs(self) -> None:
         """Migrate legacy IDs only when independent provenance can be reconstructed.
@@ -153,7 +189,7 @@ class TempVCCog(commands.Cog):
             changed = True
 
         if changed:
-            await save_temp_vc_registry_async(TEMP_VC_REGISTRY.copy())
+            await self._registry_writer.flush()
             logger.info(
                 "[temp_vc] migration legacy sûre terminée: %d salon(s) géré(s)",
                 len(TEMP_VC_IDS),
@@ -243,59 +279,85 @@ class TempVCCog(commands.Cog):
         name = f"{base} • {status}"
         return name[:100]
 
-    async def _rename_channel(self, channel: discord.VoiceChannel) -> None:
-        """Tâche différée effectuant le renommage du salon."""
-        try:
-            await asyncio.sleep(RENAME_DELAY)
-
-            task = asyncio.current_task()
-            if self._rename_tasks.get(channel.id) is not task:
-                return
-
-            # Le salon peut avoir été supprimé pendant l'attente
-            if getattr(channel, "guild", None) and channel.guild.get_channel(channel.id) is None:
-                return
-
-            new = self._compute_channel_name(channel)
-            if new and channel.name != new:
-                if await self._ensure_rename_worker():
-                    await rename_manager.request(channel, new)
-                    self._last_names[channel.id] = new
-                    await self._save_last_names_cache()
+    @staticmethod
+    def _member_fingerprint(member: discord.Member) -> Hashable:
+        """Résume ce qui influence le nom : rôles, activités et micro coupé."""
+        activities = tuple(
+            (
+                type(act).__name__,
+                getattr(act, "type", None),
+                getattr(act, "name", None),
+                getattr(act, "title", None),
+                getattr(act, "state", None),
+            )
+            for act in member.activities
+        )
+        voice = getattr(member, "voice", None)
+        return (
+            getattr(member, "id", None),
+            tuple(r.id for r in getattr(member, "roles", ())),
+            activities,
+            bool(voice and voice.self_mute),
+        )
 
-        except asyncio.CancelledError:
-            pass
-        finally:
-            if self._rename_tasks.get(channel.id) is asyncio.current_task():
-                self._rename_tasks.pop(channel.id, None)
+    def _cached_channel_name(self, channel: discord.VoiceChannel) -> str | None:
+        """``_compute_channel_name`` mémoïsé par empreinte des membres."""
+        fingerprint = tuple(self._member_fingerprint(m) for m in channel.members)
+        cached = self._name_cache.get(channel.id)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        name = self._compute_channel_name(channel)
+        self._name_cache[channel.id] = (fingerprint, name)
+        return name
+
+    def _forget_channel(self, channel_id: int) -> None:
+        self._dirty.pop(channel_id, None)
+        self._name_cache.pop(channel_id, None)
+        self._last_names.pop(channel_id, None)
 
-    async def _update_channel_name(self, channel: discord.VoiceChannel) -> None:
-        """Programme ou reprogramme le renommage du salon après un délai."""
-        if not channel.guild or channel.guild.get_channel(channel.id) is None:
+    async def _rename_channel(self, channel: discord.VoiceChannel) -> None:
+        """Renomme le salon si le nom attendu a changé."""
+        # Le salon peut avoir été supprimé pendant l'attente
+        if getattr(channel, "guild", None) and channel.guild.get_channel(channel.id) is None:
             return
         if channel.id not in TEMP_VC_IDS:
             return
 
-        new = self._compute_channel_name(channel)
-        cached = self._last_names.get(channel.id)
-        if new is None:
+        new = self._cached_channel_name(channel)
+        if new and channel.name != new:
+            if await self._ensure_rename_worker():
+                await rename_manager.request(channel, new)
+                self.rename_counters["renames"] += 1
+                self._last_names[channel.id] = new
+                self._names_writer.mark_dirty()
+
+    async def _drain_renames(self, now: float | None = None) -> None:
+        """Traite en une passe tous les salons dont le délai est écoulé."""
+        if not self._dirty:
             return
-        if cached == new and channel.name == new:
-            return
-
-        self._last_names[channel.id] = new
+        now = time.monotonic() if now is None else now
+        due = [cid for cid, (deadline, _channel) in self._dirty.items() if deadline <= now]
+        for cid in due:
+            _deadline, channel = self._dirty.pop(cid)
+            try:
+                await self._rename_channel(channel)
+            except Exception:
+                logger.exception("[temp_vc] renommage du salon %s échoué", cid)
 
-        task = self._rename_tasks.get(channel.id)
-        if task:
-            task.cancel()
+    async def _update_channel_name(self, channel: discord.VoiceChannel) -> None:
+        """Marque le salon à renommer ; la rafale est traitée par rename_tick.
 
-        if not await self._ensure_rename_worker():
+        Le premier événement fixe l'échéance à ``RENAME_DELAY`` secondes : les
+        suivants, pendant ce délai, ne coûtent qu'un test d'appartenance.
+        """
+        if not channel.guild or channel.guild.get_channel(channel.id) is None:
             return
-        if channel.guild.get_channel(channel.id) is None:
+        if channel.id not in TEMP_VC_IDS:
             return
 
-        new_task = asyncio.create_task(self._rename_channel(channel))
-        self._rename_tasks[channel.id] = new_task
+        self.rename_counters["events"] += 1
+        if channel.id not in self._dirty:
+            self._dirty[channel.id] = (time.monotonic() + RENAME_DELAY, channel)
 
     def _resolve_user_limit(self, base: str) -> int | None:
         """Détermine la limite user_limit pour un salon (fallback propre)."""
@@ -327,11 +389,12 @@ class TempVCCog(commands.Cog):
         TEMP_VC_IDS.add(channel.id)
         self._last_names[channel.id] = channel.name
         try:
-            await save_temp_vc_registry_async(TEMP_VC_REGISTRY.copy())
+            # Écriture immédiate : pas de salon sans preuve de provenance durable.
+            await self._registry_writer.flush()
         except Exception:
             TEMP_VC_REGISTRY.pop(channel.id, None)
             TEMP_VC_IDS.discard(channel.id)
-            self._last_names.pop(channel.id, None)
+            self._forget_channel(channel.id)
             try:
                 await channel.delete(reason="Échec enregistrement provenance Temp VC")
             except discord.HTTPException:
@@ -341,7 +404,7 @@ class TempVCCog(commands.Cog):
                 )
             raise
 
-        await self._save_last_names_cache()
+        self._names_writer.mark_dirty()
         return channel
 
     # ----------- événements Discord -----------
@@ -376,9 +439,8 @@ class TempVCCog(commands.Cog):
                 await new_vc.delete(reason="Échec du déplacement du membre")
                 TEMP_VC_REGISTRY.pop(new_vc.id, None)
                 TEMP_VC_IDS.discard(new_vc.id)
-                self._last_names.pop(new_vc.id, None)
-                await save_temp_vc_registry_async(TEMP_VC_REGISTRY.copy())
-                await self._save_last_names_cache()
+                self._forget_channel(new_vc.id)
+                self._mark_state_dirty()
                 return
 
             await self._update_channel_name(new_vc)
@@ -392,15 +454,10 @@ class TempVCCog(commands.Cog):
                 except discord.HTTPException:
                     logger.exception("Suppression du salon %s échouée", before.channel.id)
                 else:
-                    task = self._rename_tasks.pop(before.channel.id, None)
-                    if task:
-                        task.cancel()
-
                     TEMP_VC_REGISTRY.pop(before.channel.id, None)
                     TEMP_VC_IDS.discard(before.channel.id)
-                    self._last_names.pop(before.channel.id, None)
-                    await save_temp_vc_registry_async(TEMP_VC_REGISTRY.copy())
-                    await self._save_last_names_cache()
+                    self._forget_channel(before.channel.id)
+                    self._mark_state_dirty()
 
         # 3) Renommage sur changement d'état vocal
         if after.channel and after.channel.id in TEMP_VC_IDS:
@@ -421,6 +478,14 @@ class TempVCCog(commands.Cog):
 
     # ---------- surveillance ----------
 
+    @tasks.loop(seconds=RENAME_TICK_SECONDS)
+    async def rename_tick(self) -> None:
+        await self._drain_renames()
+
+    @rename_tick.before_loop
+    async def before_rename_tick(self) -> None:
+        await self.bot.wait_until_ready()
+
     @tasks.loop(minutes=5)
     async def monitor_rename_worker(self) -> None:
         if rename_manager._worker is None or rename_manager._worker.done():
@@ -443,11 +508,10 @@ class TempVCCog(commands.Cog):
                 if self.bot.get_channel(cid) is None:
                     TEMP_VC_REGISTRY.pop(cid, None)
                     TEMP_VC_IDS.discard(cid)
-                    self._last_names.pop(cid, None)
+                    self._forget_channel(cid)
                     removed = True
             if removed:
-                await save_temp_vc_registry_async(TEMP_VC_REGISTRY.copy())
-                await self._save_last_names_cache()
+                self._mark_state_dirty()
 
             stale = False
             for cid in list(self._last_names):
@@ -455,11 +519,11 @@ class TempVCCog(commands.Cog):
                     self._last_names.pop(cid, None)
                     stale = True
             if stale:
-                await self._save_last_names_cache()
+                self._names_writer.mark_dirty()
 
-            for cid, task in list(self._rename_tasks.items()):
-                if task.done():
-                    self._rename_tasks.pop(cid, None)
+            for cid in list(self._name_cache):
+                if cid not in TEMP_VC_IDS:
+                    self._name_cache.pop(cid, None)
         except Exception:
             logger.exception("[temp_vc] échec de health_check")
 
@@ -477,24 +541,33 @@ class TempVCCog(commands.Cog):
                 if isinstance(channel, discord.VoiceChannel):
                     await self._update_channel_name(channel)
 
+            started = time.monotonic()
             deleted_ids = await delete_empty_managed_temp_vcs(
                 self.bot,
                 TEMP_VC_REGISTRY.copy(),
             )
+            self._record_sweep(time.monotonic() - started, len(deleted_ids))
             if deleted_ids:
                 for channel_id in deleted_ids:
-                    task = self._rename_tasks.pop(channel_id, None)
-                    if task:
-                        task.cancel()
                     TEMP_VC_REGISTRY.pop(channel_id, None)
                     TEMP_VC_IDS.discard(channel_id)
-                    self._last_names.pop(channel_id, None)
-                await save_temp_vc_registry_async(TEMP_VC_REGISTRY.copy())
-
-            await self._save_last_names_cache()
+                    self._forget_channel(channel_id)
+                self._mark_state_dirty()
         except Exception:
             logger.exception("Erreur dans cleanup")
 
+    def _record_sweep(self, duration: float, deleted: int) -> None:
+        """Mémorise et journalise la durée et le bilan d'un balayage."""
+        self.last_sweep = (duration, deleted)
+        self.sweep_counters["sweeps"] += 1
+        self.sweep_counters["deleted"] += deleted
+        if deleted:
+            logger.info(
+                "[temp_vc] balayage: %d salon(s) supprimé(s) en %.2fs", deleted, duration
+            )
+        else:
+            logger.debug("[temp_vc] balayage sans suppression en %.3fs", duration)
+
     @cleanup.before_loop
     async def before_cleanup(self) -> None:
         await self.bot.wait_until_ready()
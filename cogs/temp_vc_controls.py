@@ -12,6 +12,7 @@ from storage.temp_vc_control_store import (
     load_temp_vc_owners,
     save_temp_vc_owners_async,
 )
+from utils.persistence import SnapshotWriter
 
 logger = logging.getLogger(__name__)
 
@@ -305,9 +306,15 @@ class TempVCControlsCog(commands.Cog):
         self.bot = bot
         self._owners: Dict[int, int] = load_temp_vc_owners()
         self._panel_posted: set[int] = set()
+        self._writer = SnapshotWriter(
+            self._owners.copy,
+            lambda payload: save_temp_vc_owners_async(payload),
+            name="temp_vc_owners",
+        )
+        self._writer.mark_clean()
 
     async def _persist(self) -> None:
-        await save_temp_vc_owners_async(self._owners.copy())
+        await self._writer.flush()
 
     async def _set_owner(self, channel_id: int, owner_id: int) -> None:
         self._owners[channel_id] = owner_id
@@ -0,0 +1,55 @@
+import logging
+
+import discord
+from discord.ext import commands
+
+from utils.voice_presence import voice_presence
+
+logger = logging.getLogger(__name__)
+
+
+class VoicePresenceCog(commands.Cog):
+    """Tient à jour l'index partagé des présences vocales par serveur."""
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+
+    async def cog_load(self) -> None:
+        # Rechargement à chaud : les serveurs sont déjà en cache.
+        for guild in getattr(self.bot, "guilds", ()) or ():
+            voice_presence.rebuild(guild)
+
+    async def cog_unload(self) -> None:
+        for guild in getattr(self.bot, "guilds", ()) or ():
+            voice_presence.forget_guild(guild.id)
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        """Reconstruit l'index après chaque (re)connexion complète."""
+        for guild in self.bot.guilds:
+            voice_presence.rebuild(guild)
+        logger.info(
+            "[voice_presence] index prêt: %d membre(s) en vocal",
+            sum(voice_presence.human_count(guild) for guild in self.bot.guilds),
+        )
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild) -> None:
+        voice_presence.rebuild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        voice_presence.forget_guild(guild.id)
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(
+        self,
+        member: discord.Member,
+        before: discord.VoiceState,
+        after: discord.VoiceState,
+    ) -> None:
+        voice_presence.update(member, before, after)
+
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(VoicePresenceCog(bot))
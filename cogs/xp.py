@@ -11,7 +11,10 @@ import io
 import logging
 import os
 import sqlite3
-from datetime import datetime, timezone, timedelta
+import time
+from collections import Counter
+from collections.abc import Sequence
+from datetime import datetime, time as dtime, timezone, timedelta
 
 import discord
 from discord import app_commands
@@ -26,16 +29,19 @@ from utils.timezones import PARIS_TZ
 from utils.interactions import safe_respond
 from utils.persistence import (
     ensure_dir,
+    request_checkpoint,
     schedule_checkpoint,
 )
 from utils.metrics import measure
 from storage.db import database
-from storage.xp_store import xp_store
+from storage.xp_store import XPAward, XPDataView, XPResult, xp_store
 from storage.season_store import season_store
 from utils.game_events import get_multiplier, record_participant
 from utils.voice_bonus import get_voice_bonus_windows
 from utils.seasons import should_count_xp_source
 from utils.refuge_casino_observer import observe_casino_xp_transaction
+from utils.voice_presence import voice_presence
+from utils.background_tasks import background_tasks
 logger = logging.getLogger(__name__)
 
 # Fichiers conservés uniquement comme sources de migration legacy ; toutes les
@@ -49,10 +55,19 @@ ensure_dir(DATA_DIR)
 
 # Caches en mémoire
 voice_times: dict[str, datetime] = {}
-XP_CACHE: dict[str, dict] = xp_store.data
+XP_CACHE: XPDataView = xp_store.data
 DAILY_STATS: dict[str, dict[str, dict[str, int]]] = {}
 XP_LOCK = xp_store.lock
 DAILY_LOCK = asyncio.Lock()
+# Messages du jour non encore reportés dans ``DAILY_STATS`` (id membre -> nombre).
+# ``on_message`` ne fait qu'incrémenter ce compteur : ni verrou, ni await.
+MESSAGE_COUNTS: Counter[int] = Counter()
+MESSAGE_DAY: str = datetime.now(PARIS_TZ).date().isoformat()
+# Délai (s) entre deux gains d'XP de message pour un même membre.
+MESSAGE_XP_COOLDOWN = 60.0
+# Fenêtre (s) de regroupement des gains vocaux : une vague de déconnexions
+# après un événement est appliquée en un seul ``add_xp_many``.
+VOICE_AWARD_BATCH_SECONDS = 0.05
 # ``XP_BOOSTS`` reste un mapping vers la date d'expiration pour conserver le
 # contrat utilisé par la boutique. Les débuts et anciens créneaux sont stockés
 # séparément afin de calculer précisément les sessions vocales différées.
@@ -75,6 +90,27 @@ def _prune_stale_daily_stats(current_day: str) -> None:
         DAILY_STATS.pop(day, None)
 
 
+def _fold_message_counts() -> None:
+    """Merge pending message counters into ``DAILY_STATS`` for ``MESSAGE_DAY``."""
+
+    if not MESSAGE_COUNTS:
+        return
+    day = DAILY_STATS.setdefault(MESSAGE_DAY, {})
+    for user_id, count in MESSAGE_COUNTS.items():
+        user = day.setdefault(str(user_id), {"messages": 0, "voice": 0})
+        user["messages"] = int(user.get("messages", 0)) + count
+    MESSAGE_COUNTS.clear()
+
+
+def _roll_daily_stats(current_day: str) -> None:
+    """Fold pending counters, then keep only ``current_day`` in the cache."""
+
+    global MESSAGE_DAY
+    _fold_message_counts()
+    MESSAGE_DAY = current_day
+    _prune_stale_daily_stats(current_day)
+
+
 async def load_voice_times() -> dict[str, datetime]:
     """Load active voice checkpoints from SQLite after one-time JSON import."""
     await database.migrate_legacy_voice_times(VOICE_TIMES_FILE)
@@ -111,6 +147,7 @@ async def load_daily_stats() -> dict:
 async def save_daily_stats_to_disk() -> None:
     """Persist one immutable snapshot of the in-memory daily statistics."""
     async with DAILY_LOCK:
+        _fold_message_counts()
         data = {
             day: {
                 uid: dict(payload)
@@ -202,7 +239,7 @@ async def xp_bootstrap_cache() -> None:
     voice_times = await load_voice_times()
     DAILY_STATS = await load_daily_stats()
     today = datetime.now(PARIS_TZ).date().isoformat()
-    _prune_stale_daily_stats(today)
+    _roll_daily_stats(today)
     XP_BOOSTS, XP_BOOST_STARTS, XP_BOOST_HISTORY = await load_xp_boosts()
     logger.info("🎒 XP cache chargé (%d utilisateurs).", len(XP_CACHE))
 
@@ -226,35 +263,123 @@ async def award_xp(
     l'attribution. Les gains vocaux calculent eux-mêmes les intersections
     temporelles et passent ``apply_personal_boost=False`` pour éviter de doubler
     rétroactivement toute la session au moment de la déconnexion.
+
+    Délègue à :func:`award_xp_many` avec un lot d'un seul gain, pour que boost
+    personnel, observation casino et points saisonniers restent au même endroit.
+    """
+    return (
+        await award_xp_many(
+            [(user_id, amount, source)],
+            guild_id,
+            apply_personal_boost=apply_personal_boost,
+        )
+    )[0]
+
+
+async def award_xp_many(
+    awards: Sequence[XPAward],
+    guild_id: int | None = None,
+    *,
+    apply_personal_boost: bool = True,
+) -> list[XPResult]:
+    """Variante par lot de :func:`award_xp` pour ``(user_id, amount, source)``.
+
+    Le lot passe par :meth:`XPStore.add_xp_many` (une seule prise du verrou XP)
+    et les points saisonniers par un seul ``season_store.record_many``.
     """
     now = datetime.now(timezone.utc)
-    requested_amount = int(amount)
-    if amount > 0 and apply_personal_boost:
-        boost_exp = XP_BOOSTS.get(str(user_id))
-        if boost_exp and _as_utc(boost_exp) > now:
-            amount *= 2
-    result = await xp_store.add_xp(
-        user_id, amount, guild_id=guild_id, source=source
-    )
-    old_level, new_level, old_xp, new_xp = result
-    delta = new_xp - old_xp
-    observe_casino_xp_transaction(
-        user_id=user_id,
-        source=source,
-        requested_amount=requested_amount,
-        applied_delta=delta,
-        at=now,
-    )
-    if should_count_xp_source(source, delta):
+    applied: list[XPAward] = []
+    for user_id, amount, source in awards:
+        if amount > 0 and apply_personal_boost:
+            boost_exp = XP_BOOSTS.get(str(user_id))
+            if boost_exp and _as_utc(boost_exp) > now:
+                amount *= 2
+        applied.append((user_id, amount, source))
+    results = await xp_store.add_xp_many(applied, guild_id=guild_id)
+
+    season_entries: list[tuple[int, dict[str, int]]] = []
+    for (user_id, requested_amount, source), result in zip(awards, results, strict=True):
+        delta = result[3] - result[2]
+        observe_casino_xp_transaction(
+            user_id=user_id,
+            source=source,
+            requested_amount=int(requested_amount),
+            applied_delta=delta,
+            at=now,
+        )
+        if should_count_xp_source(source, delta):
+            season_entries.append((user_id, {"xp_earned": delta}))
+    if season_entries:
         try:
-            await season_store.record(user_id, at=now, xp_earned=delta)
+            await season_store.record_many(season_entries, at=now)
         except Exception:
             logger.exception(
-                "[season] Impossible d'enregistrer %s XP saisonnière pour %s",
-                delta,
-                user_id,
+                "[season] Impossible d'enregistrer l'XP saisonnière de %d membre(s)",
+                len(season_entries),
             )
-    return result
+    return results
+
+
+class _AwardBatcher:
+    """Regroupe les gains soumis pendant ``delay`` secondes par serveur.
+
+    Chaque appelant attend le résultat de son propre gain ; le lot est
+    appliqué par :func:`award_xp_many`.
+    """
+
+    def __init__(self, delay: float, *, apply_personal_boost: bool) -> None:
+        self.delay = delay
+        self.apply_personal_boost = apply_personal_boost
+        self._pending: dict[int | None, list[tuple[XPAward, asyncio.Future[XPResult]]]] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    async def award(
+        self, user_id: int, amount: int, guild_id: int | None, source: str
+    ) -> XPResult:
+        future: asyncio.Future[XPResult] = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(guild_id, []).append(((user_id, amount, source), future))
+        if self._task is None or self._task.done():
+            self._task = background_tasks.create_task(
+                self._run(), name="xp-award-batch"
+            )
+        return await future
+
+    async def _run(self) -> None:
+        batch: dict[int | None, list[tuple[XPAward, asyncio.Future[XPResult]]]] = {}
+        try:
+            # Les gains arrivés pendant un lot sont traités au tour suivant.
+            while self._pending:
+                await asyncio.sleep(self.delay)
+                batch, self._pending = self._pending, {}
+                for guild_id, entries in batch.items():
+                    await self._apply(guild_id, entries)
+        finally:
+            # Annulation (arrêt du bot) : ne laisser aucun appelant en attente.
+            for pending in (batch, self._pending):
+                for entries in pending.values():
+                    for _award, future in entries:
+                        future.cancel()
+            self._pending = {}
+
+    async def _apply(
+        self,
+        guild_id: int | None,
+        entries: list[tuple[XPAward, asyncio.Future[XPResult]]],
+    ) -> None:
+        try:
+            results = await award_xp_many(
+                [award for award, _future in entries],
+                guild_id,
+                apply_personal_boost=self.apply_personal_boost,
+            )
+        except Exception as exc:
+            for _award, future in entries:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_award, future), result in zip(entries, results, strict=True):
+            if not future.done():
+                future.set_result(result)
 
 
 def _remember_finished_personal_boost(
@@ -391,8 +516,12 @@ class XPCog(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
         self.auto_backup_xp.start()
-        self._message_cooldown = commands.CooldownMapping.from_cooldown(
-            1, 60.0, commands.BucketType.user
+        # id membre -> instant monotonic du prochain gain possible. Remplace
+        # CooldownMapping, qui reparcourt tous ses buckets à chaque message.
+        self._message_ready_at: dict[int, float] = {}
+        # Les gains vocaux calculent eux-mêmes les créneaux Double XP.
+        self._voice_awards = _AwardBatcher(
+            VOICE_AWARD_BATCH_SECONDS, apply_personal_boost=False
         )
 
     @commands.Cog.listener()
@@ -400,25 +529,40 @@ class XPCog(commands.Cog):
         now = datetime.now(timezone.utc)
         active: set[str] = set()
         for guild in self.bot.guilds:
-            for channel in guild.voice_channels:
-                for member in channel.members:
-                    if member.bot:
-                        continue
-                    uid = str(member.id)
-                    active.add(uid)
-                    # A redémarrage, l'ancien timestamp n'est plus une borne fiable :
-                    # le bot ne peut pas observer le temps passé hors ligne.
-                    voice_times[uid] = now
+            for member in voice_presence.humans(guild):
+                uid = str(member.id)
+                active.add(uid)
+                # A redémarrage, l'ancien timestamp n'est plus une borne fiable :
+                # le bot ne peut pas observer le temps passé hors ligne.
+                voice_times[uid] = now
         for uid in list(voice_times.keys()):
             if uid not in active:
                 voice_times.pop(uid, None)
         await schedule_checkpoint(save_voice_times_to_disk)
 
+    def _prune_message_cooldowns(self) -> None:
+        now = time.monotonic()
+        expired = [uid for uid, ready_at in self._message_ready_at.items() if ready_at <= now]
+        for uid in expired:
+            del self._message_ready_at[uid]
+
+    async def cog_load(self) -> None:
+        self.daily_rollover.start()
+
     def cog_unload(self) -> None:
         self.auto_backup_xp.cancel()
+        self.daily_rollover.cancel()
+
+    @tasks.loop(time=dtime(hour=0, tzinfo=PARIS_TZ))
+    async def daily_rollover(self) -> None:
+        """Bascule les compteurs de messages sur le nouveau jour à minuit."""
+        async with DAILY_LOCK:
+            _roll_daily_stats(datetime.now(PARIS_TZ).date().isoformat())
+        request_checkpoint(save_daily_stats_to_disk)
 
     @tasks.loop(minutes=10)
     async def auto_backup_xp(self) -> None:
+        self._prune_message_cooldowns()
         await xp_flush_cache_to_disk()
         try:
             await save_voice_times_to_disk()
@@ -432,18 +576,15 @@ class XPCog(commands.Cog):
     async def on_message(self, message: discord.Message) -> None:
         if message.author.bot or message.guild is None:
             return
-        # Statistiques quotidiennes
-        today = datetime.now(PARIS_TZ).date().isoformat()
-        async with DAILY_LOCK:
-            _prune_stale_daily_stats(today)
-            day = DAILY_STATS.setdefault(today, {})
-            user = day.setdefault(str(message.author.id), {"messages": 0, "voice": 0})
-            user["messages"] = int(user.get("messages", 0)) + 1
-        await schedule_checkpoint(save_daily_stats_to_disk)
-
-        bucket = self._message_cooldown.get_bucket(message)
-        if bucket.update_rate_limit():
+        # Statistiques quotidiennes : simple incrément, la bascule de jour est
+        # faite par daily_rollover et le report par save_daily_stats_to_disk.
+        MESSAGE_COUNTS[message.author.id] += 1
+        request_checkpoint(save_daily_stats_to_disk)
+
+        now = time.monotonic()
+        if self._message_ready_at.get(message.author.id, 0.0) > now:
             return
+        self._message_ready_at[message.author.id] = now + MESSAGE_XP_COOLDOWN
         amount = 8
         old_lvl, new_lvl, old_xp, new_xp = await award_xp(
             message.author.id,
@@ -486,17 +627,17 @@ class XPCog(commands.Cog):
                     now,
                     event_multiplier=event_mult,
                 )
-                old_lvl, new_lvl, old_xp, new_xp = await award_xp(
+                old_lvl, new_lvl, old_xp, new_xp = await self._voice_awards.award(
                     member.id,
                     xp_amount,
-                    guild_id=member.guild.id,
-                    source="voice_leave",
-                    apply_personal_boost=False,
+                    member.guild.id,
+                    "voice_leave",
                 )
                 # Statistiques quotidiennes (en secondes)
                 day = now.date().isoformat()
                 async with DAILY_LOCK:
-                    _prune_stale_daily_stats(day)
+                    if day != MESSAGE_DAY:
+                        _roll_daily_stats(day)
                     d = DAILY_STATS.setdefault(day, {})
                     u = d.setdefault(uid, {"messages": 0, "voice": 0})
                     u["voice"] = int(u.get("voice", 0)) + int(duration.total_seconds())
@@ -1,9 +1,20 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from dataclasses import dataclass, field
-from typing import Any, Mapping
+from types import MappingProxyType
+from typing import AbstractSet, Any, Callable, Mapping
 
-REFUGE_WORLD_SCHEMA_VERSION = 1
+from utils.frozen import freeze as freeze_value, thaw as thaw_value
+
+REFUGE_WORLD_SCHEMA_VERSION = 2
+
+_EMPTY_MAPPING: Mapping[str, Any] = MappingProxyType({})
+
+
+def _empty_mapping() -> Mapping[str, Any]:
+    return _EMPTY_MAPPING
 
 
 def _string_or_none(value: Any) -> str | None:
@@ -19,19 +30,58 @@ def _dict_copy(value: Any) -> dict[str, Any]:
     return {str(key): item for key, item in value.items()}
 
 
+def _freeze_mapping(value: Any) -> Mapping[str, Any]:
+    if isinstance(value, MappingProxyType):
+        return value
+    if not isinstance(value, Mapping) or not value:
+        return _EMPTY_MAPPING
+    return freeze_value(value)
+
+
+def _freeze_fields(instance: Any, *names: str) -> None:
+    # The dataclasses are frozen: swap caller-provided dicts for read-only
+    # views through object.__setattr__.
+    for name in names:
+        current = getattr(instance, name)
+        frozen = _freeze_mapping(current)
+        if frozen is not current:
+            object.__setattr__(instance, name, frozen)
+
+
+def _freeze_tuple(instance: Any, name: str) -> None:
+    current = getattr(instance, name)
+    if not isinstance(current, tuple):
+        object.__setattr__(instance, name, tuple(current))
+
+
+def content_hash(payload: Any) -> str:
+    """Return the SHA-256 of the canonical JSON encoding of ``payload``."""
+
+    canonical = json.dumps(
+        payload,
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return hashlib.sha256(canonical).hexdigest()
+
+
 @dataclass(frozen=True, slots=True)
 class RefugeBuildingState:
     building_id: str
     level: int = 0
     unlocked_at: str | None = None
-    state: dict[str, Any] = field(default_factory=dict)
+    state: Mapping[str, Any] = field(default_factory=_empty_mapping)
+
+    def __post_init__(self) -> None:
+        _freeze_fields(self, "state")
 
     def to_dict(self) -> dict[str, Any]:
         return {
             "building_id": self.building_id,
             "level": max(0, int(self.level)),
             "unlocked_at": self.unlocked_at,
-            "state": dict(self.state),
+            "state": thaw_value(self.state),
         }
 
     @classmethod
@@ -61,14 +111,17 @@ class RefugeHistoricalEvent:
     event_id: str
     event_type: str
     occurred_at: str
-    data: dict[str, Any] = field(default_factory=dict)
+    data: Mapping[str, Any] = field(default_factory=_empty_mapping)
+
+    def __post_init__(self) -> None:
+        _freeze_fields(self, "data")
 
     def to_dict(self) -> dict[str, Any]:
         return {
             "event_id": self.event_id,
             "event_type": self.event_type,
             "occurred_at": self.occurred_at,
-            "data": dict(self.data),
+            "data": thaw_value(self.data),
         }
 
     @classmethod
@@ -121,7 +174,10 @@ class RefugeConstructionState:
     closes_at: str | None = None
     started_at: str | None = None
     completes_at: str | None = None
-    data: dict[str, Any] = field(default_factory=dict)
+    data: Mapping[str, Any] = field(default_factory=_empty_mapping)
+
+    def __post_init__(self) -> None:
+        _freeze_fields(self, "data")
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -132,7 +188,7 @@ class RefugeConstructionState:
             "closes_at": self.closes_at,
             "started_at": self.started_at,
             "completes_at": self.completes_at,
-            "data": dict(self.data),
+            "data": thaw_value(self.data),
         }
 
     @classmethod
@@ -160,7 +216,12 @@ class RefugeWorldSnapshot:
     buildings: tuple[RefugeBuildingState, ...] = ()
     event_ids: tuple[str, ...] = ()
     active_construction: RefugeConstructionState | None = None
-    state: dict[str, Any] = field(default_factory=dict)
+    state: Mapping[str, Any] = field(default_factory=_empty_mapping)
+
+    def __post_init__(self) -> None:
+        _freeze_tuple(self, "buildings")
+        _freeze_tuple(self, "event_ids")
+        _freeze_fields(self, "state")
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -176,7 +237,7 @@ class RefugeWorldSnapshot:
                 if self.active_construction is not None
                 else None
             ),
-            "state": dict(self.state),
+            "state": thaw_value(self.state),
         }
 
     @classmethod
@@ -245,7 +306,65 @@ class RefugeWorldState:
     snapshots: tuple[RefugeWorldSnapshot, ...] = ()
     panel: RefugePanelState = field(default_factory=RefugePanelState)
     active_construction: RefugeConstructionState | None = None
-    state: dict[str, Any] = field(default_factory=dict)
+    state: Mapping[str, Any] = field(default_factory=_empty_mapping)
+    # IDs of every event already in the store's event log, including those
+    # older than the in-memory ``events`` window. Owned by the store, never
+    # serialized and ignored by equality.
+    logged_event_ids: AbstractSet[str] = field(
+        default=frozenset(),
+        repr=False,
+        compare=False,
+    )
+    # Private cache of derived fingerprints (document hash, render
+    # signature...). Ignored by equality and reset by dataclasses.replace.
+    _memo: dict[str, Any] = field(
+        default_factory=dict,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    def __post_init__(self) -> None:
+        _freeze_tuple(self, "buildings")
+        _freeze_tuple(self, "events")
+        _freeze_tuple(self, "snapshots")
+        _freeze_fields(self, "state")
+
+    def memoize(self, key: str, compute: Callable[["RefugeWorldState"], Any]) -> Any:
+        """Return ``compute(self)`` computed at most once for this instance.
+
+        Only valid for pure functions of the (immutable) state.
+        """
+
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = compute(self)
+            self._memo[key] = value
+            return value
+
+    def find_event(self, event_id: str) -> RefugeHistoricalEvent | None:
+        """Look an event up through an ID index built once per instance."""
+
+        index = self.memoize(
+            "events_by_id",
+            lambda state: {event.event_id: event for event in state.events},
+        )
+        return index.get(event_id)
+
+    def has_event(self, event_id: str) -> bool:
+        """Whether ``event_id`` is in ``events`` or already in the event log."""
+
+        return event_id in self.logged_event_ids or self.find_event(event_id) is not None
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the persisted document, computed once per instance."""
+
+        return self.memoize(
+            "content_hash",
+            lambda state: content_hash(state.to_dict()),
+        )
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -266,7 +385,7 @@ class RefugeWorldState:
                 if self.active_construction is not None
                 else None
             ),
-            "state": dict(self.state),
+            "state": thaw_value(self.state),
         }
 
     @classmethod
@@ -0,0 +1,80 @@
+"""Benchmark the JSON serialization profiles on a synthetic season file.
+
+Writes and reads a ``season_stats.json``-shaped document (one season, N users
+with every seasonal counter) through ``atomic_write_json`` / ``read_json_safe``
+with each profile and reports file size, write and read time.
+
+    python scripts/bench_json_profiles.py [--users 50000] [--rounds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils import persistence  # noqa: E402
+from utils.seasons import SEASON_FIELDS  # noqa: E402
+
+
+def _document(users: int) -> dict:
+    rng = random.Random(42)
+    return {
+        "schema_version": 1,
+        "tracking_started_at": "2026-08-01T00:00:00+00:00",
+        "casino_baseline_initialized": True,
+        "casino_baseline": {},
+        "seasons": {
+            "2026-08": {
+                "label": "Août 2026",
+                "started_at": "2026-08-01T00:00:00+00:00",
+                "users": {
+                    str(100_000_000_000_000_000 + index): {
+                        field: rng.randint(0, 50_000) for field in SEASON_FIELDS
+                    }
+                    for index in range(users)
+                },
+            }
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    document = _document(args.users)
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in (persistence.PRETTY, persistence.COMPACT, persistence.ARCHIVE):
+            path = Path(tmp) / f"season_stats_{profile.name}.json"
+            writes: list[float] = []
+            reads: list[float] = []
+            for _ in range(args.rounds):
+                started = time.perf_counter()
+                persistence.atomic_write_json(path, document, profile=profile)
+                writes.append(time.perf_counter() - started)
+                started = time.perf_counter()
+                loaded = persistence.read_json_safe(path, {})
+                reads.append(time.perf_counter() - started)
+            assert loaded == document
+            size = path.stat().st_size
+            print(
+                f"{profile.name:8s} {size / 1024:9.0f} KiB  "
+                f"write {statistics.median(writes) * 1e3:7.1f} ms  "
+                f"read {statistics.median(reads) * 1e3:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
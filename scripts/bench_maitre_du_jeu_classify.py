@@ -0,0 +1,166 @@
+"""Microbenchmark: MaitreDuJeu ``classify_question`` per mention.
+
+Compares the historical classifier (NFKD normalization of every question,
+then one ``any(marker in text ...)`` scan per intent in priority order) with
+the ASCII fast path and compiled single-pass matcher, on a mix of known FAQ
+phrasings and unknown questions, and checks both agree. The best of
+``--repeat`` runs is reported.
+
+    python scripts/bench_maitre_du_jeu_classify.py [--rounds 2000] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DISCORD_TOKEN", "dummy")
+
+from cogs.maitre_du_jeu import AssistantIntent, classify_question  # noqa: E402
+
+
+QUESTIONS = (
+    "comment gagner de l'XP ?",
+    "mon Double XP est actif ?",
+    "où acheter un Ticket Royal ?",
+    "combien coûte le Double XP ?",
+    "la radio fonctionne ?",
+    "quelles commandes puis-je utiliser ?",
+    "pourquoi je n'ai pas gagné d'XP ?",
+    "Quand ouvre le casino ?",
+    "On est combien sur le serveur ?",
+    "Comment fonctionne le Refuge ?",
+    "salut",
+    "quelle est la capitale de la France ?",
+    "tu peux me raconter une histoire sur les dragons et les chevaliers ?",
+    "est-ce que quelqu'un joue ce soir, j'ai envie de lancer une partie",
+)
+
+
+def legacy_normalize(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    without_accents = "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    )
+    normalized = re.sub(r"[^a-z0-9]+", " ", without_accents)
+    return " ".join(normalized.split())
+
+
+def legacy_classify(question: str) -> AssistantIntent:
+    text = legacy_normalize(question)
+    if not text:
+        return AssistantIntent.HELP
+    if any(
+        marker in text
+        for marker in (
+            "pourquoi je n ai pas gagne",
+            "pourquoi j ai pas gagne",
+            "pourquoi je n ai pas recu",
+            "pourquoi j ai pas recu",
+            "pas gagne d xp",
+            "pas recu d xp",
+            "aucun xp",
+        )
+    ):
+        return AssistantIntent.DIAGNOSTIC
+    if any(
+        marker in text
+        for marker in (
+            "quand est ce qu on t a cree",
+            "quand est ce qu on ta cree",
+            "tu as ete cree quand",
+            "quand as tu ete cree",
+            "date de creation",
+            "tu existes depuis quand",
+            "depuis quand tu existes",
+        )
+    ):
+        return AssistantIntent.BOT_CREATED
+    if any(
+        marker in text
+        for marker in (
+            "combien de membres",
+            "combien sommes nous",
+            "on est combien",
+            "nous sommes combien",
+            "nombre de membres",
+        )
+    ):
+        return AssistantIntent.MEMBER_COUNT
+    if any(
+        marker in text
+        for marker in (
+            "refuge vivant",
+            "comment jouer au refuge",
+            "comment on joue au refuge",
+            "comment fonctionne le refuge",
+            "a quoi sert le refuge",
+        )
+    ):
+        return AssistantIntent.REFUGE_GUIDE
+    if "casino" in text and any(
+        marker in text
+        for marker in ("heure", "horaire", "ouvre", "ouverture", "ferme", "fermeture", "ouvert")
+    ):
+        return AssistantIntent.CASINO_HOURS
+    if any(token in text for token in ("boutique", "acheter", "achat", "ticket royal", "ticket")) or (
+        any(token in text for token in ("double xp", "boost", "ticket"))
+        and any(token in text for token in ("prix", "coute", "combien vaut", "combien coute"))
+    ):
+        return AssistantIntent.SHOP
+    if any(token in text for token in ("commande", "commandes", "slash", "que peux tu faire")):
+        return AssistantIntent.COMMANDS
+    if any(token in text for token in ("radio", "musique", "youtube", "chanson", "morceau")):
+        return AssistantIntent.RADIO
+    if any(token in text for token in ("double xp", "boost xp", "boost")):
+        return AssistantIntent.BOOST
+    if any(token in text for token in ("xp", "niveau", "rang", "level", "progression")):
+        return AssistantIntent.XP
+    if any(token in text for token in ("aide", "help", "bonjour", "salut")):
+        return AssistantIntent.HELP
+    return AssistantIntent.UNKNOWN
+
+
+def _rate(classify, rounds: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for question in QUESTIONS:
+                classify(question)
+        best = min(best, time.perf_counter() - started)
+    return rounds * len(QUESTIONS) / best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    mismatches = [
+        question
+        for question in QUESTIONS
+        if legacy_classify(question) is not classify_question(question)
+    ]
+    if mismatches:
+        print(f"mismatch: {mismatches}")
+        return 1
+
+    for name, classify in (("legacy", legacy_classify), ("compiled", classify_question)):
+        rate = _rate(classify, args.rounds, args.repeat)
+        print(f"{name:>8}: {rate:,.0f} questions/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,134 @@
+"""Benchmark ``/profil`` snapshots against a large season.
+
+Compares the historical path (deep copy of the whole season, one full
+``rank_rows`` sort per ranked metric, casino state file parsed on every call)
+with ``SeasonStore.user_ranks`` and the published casino read model. Counters
+keep changing between lookups, like on a live server, so the rank indexes are
+exercised on the update path too.
+
+    python scripts/bench_member_profile.py [--users 50000] [--lookups 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.member_profile as member_profile  # noqa: E402
+from services.casino_totals import CasinoTotalsReadModel  # noqa: E402
+from storage.season_store import SeasonStore  # noqa: E402
+
+SEASON_ID = "2026-08"
+
+
+class _LegacySeasonReader:
+    """Expose only ``get_season`` so the service takes the full-sort path."""
+
+    def __init__(self, store: SeasonStore) -> None:
+        self._store = store
+
+    async def get_season(self, season_id: str):
+        return await self._store.get_season(season_id)
+
+
+class _XPReader:
+    async def get_user_data(self, user_id: int):
+        return {"xp": 1_000, "level": 5}
+
+
+class _AchievementReader:
+    async def get_user_achievements(self, user_id: int):
+        return {}
+
+
+async def _populate(store: SeasonStore, users: int, rng: random.Random) -> dict:
+    at = datetime(2026, 8, 10, tzinfo=timezone.utc)
+    players: dict[str, dict[str, int]] = {}
+    for user_id in range(users):
+        bets = rng.choice((0, 0, 0, rng.randint(1, 50)))
+        await store.record(
+            user_id,
+            at=at,
+            xp_earned=rng.randint(0, 20_000),
+            messages=rng.randint(0, 3_000),
+            voice_seconds=rng.randint(0, 200_000),
+            casino_bets=bets,
+            casino_net=rng.randint(-500, 500) if bets else 0,
+        )
+        if bets:
+            players[str(user_id)] = {"bets": bets, "wagered": bets * 10, "winnings": bets * 9}
+    return {"players": players}
+
+
+async def _measure(service, users: int, lookups: int, store, rng) -> list[float]:
+    at = datetime(2026, 8, 10, tzinfo=timezone.utc)
+    durations: list[float] = []
+    for _ in range(lookups):
+        await store.record(rng.randrange(users), at=at, xp_earned=rng.randint(1, 50))
+        started = time.perf_counter()
+        await service.get_snapshot(rng.randrange(users), season_id=SEASON_ID)
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+async def _run(args: argparse.Namespace) -> None:
+    rng = random.Random(1234)
+    with tempfile.TemporaryDirectory() as tmp:
+        casino_path = Path(tmp) / "pari_xp_state.json"
+        store = SeasonStore(Path(tmp) / "season_stats.json")
+        state = await _populate(store, args.users, rng)
+        casino_path.write_text(json.dumps(state), encoding="utf-8")
+
+        legacy = member_profile.MemberProfileService(
+            xp_reader=_XPReader(),
+            achievement_reader=_AchievementReader(),
+            season_reader=_LegacySeasonReader(store),
+            casino_state_file=casino_path,
+        )
+        indexed = member_profile.MemberProfileService(
+            xp_reader=_XPReader(),
+            achievement_reader=_AchievementReader(),
+            season_reader=store,
+            casino_state_file=casino_path,
+        )
+
+        read_model = CasinoTotalsReadModel()
+        for label, service, model in (
+            ("legacy (deepcopy + sort + file)", legacy, CasinoTotalsReadModel()),
+            ("rank index + read model", indexed, read_model),
+        ):
+            if model is read_model:
+                model.publish(state, source_path=casino_path)
+            member_profile.casino_totals = model
+            # Première requête à part : elle construit les index.
+            first = (await _measure(service, args.users, 1, store, rng))[0]
+            durations = sorted(await _measure(service, args.users, args.lookups, store, rng))
+            print(
+                f"{label:32s} first {first * 1e3:8.2f} ms  "
+                f"p50 {statistics.median(durations) * 1e3:8.3f} ms  "
+                f"p99 {durations[int(len(durations) * 0.99) - 1] * 1e3:8.3f} ms"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
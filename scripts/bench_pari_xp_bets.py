@@ -0,0 +1,134 @@
+"""Load test: roulette bets/second with 50 concurrent bettors.
+
+Compares the historical write path (one global lock held across the debit,
+payout and a deep-copied, fsynced rewrite of ``pari_xp_state.json``) with the
+per-player lock and append-only bet journal. Discord and XP side effects are
+replaced by no-op awaitables so only the casino accounting path is measured.
+
+    python scripts/bench_pari_xp_bets.py [--bettors 50] [--bets 20] [--players 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import tempfile
+import time
+import weakref
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import cogs.pari_xp as pari_xp  # noqa: E402
+from storage.roulette_bet_journal import RouletteBetJournal  # noqa: E402
+from utils.persistence import atomic_write_json_async  # noqa: E402
+
+
+def _state(players: int) -> dict[str, object]:
+    return {
+        "is_open": True,
+        "total_bets": players * 100,
+        "total_winnings": players * 80,
+        "players": {
+            str(1000 + index): {"bets": 5, "wagered": 100, "winnings": 80}
+            for index in range(players)
+        },
+    }
+
+
+def _cog(directory: Path, players: int) -> pari_xp.PariXPCog:
+    cog = object.__new__(pari_xp.PariXPCog)
+    cog.bot = object()
+    cog.tz = pari_xp.PARIS_TZ
+    cog.state = _state(players)
+    cog.is_open = True
+    cog._bet_locks = weakref.WeakValueDictionary()
+    cog._journal = RouletteBetJournal(directory / "pari_xp_journal.jsonl")
+    cog._journal_seq = 0
+    cog._persisted_seq = 0
+    cog._record_living_event = AsyncMock()
+    return cog
+
+
+def _interaction(user_id: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        user=SimpleNamespace(id=user_id),
+        guild_id=1,
+        guild=None,
+        response=SimpleNamespace(send_message=AsyncMock()),
+        original_response=AsyncMock(
+            return_value=SimpleNamespace(edit=AsyncMock())
+        ),
+    )
+
+
+async def _run(mode: str, *, bettors: int, bets: int, players: int) -> float:
+    with tempfile.TemporaryDirectory() as raw_dir:
+        directory = Path(raw_dir)
+        cog = _cog(directory, players)
+        state_file = directory / "pari_xp_state.json"
+        handle_bet = pari_xp.PariXPCog._handle_bet
+
+        if mode == "legacy":
+            global_lock = asyncio.Lock()
+
+            async def legacy_save(_entry: dict[str, object]) -> None:
+                await atomic_write_json_async(state_file, copy.deepcopy(cog.state))
+
+            cog._journal_bet = legacy_save
+
+            async def place(user_id: int) -> None:
+                # The legacy cog held one lock from the balance check to the
+                # end of the state rewrite.
+                async with global_lock:
+                    await handle_bet(cog, _interaction(user_id), "red", 10)
+        else:
+
+            async def place(user_id: int) -> None:
+                await handle_bet(cog, _interaction(user_id), "red", 10)
+
+        async def bettor(user_id: int) -> None:
+            for _ in range(bets):
+                await place(user_id)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(bettor(1000 + index) for index in range(bettors)))
+        elapsed = time.perf_counter() - started
+        return bettors * bets / elapsed
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bettors", type=int, default=50)
+    parser.add_argument("--bets", type=int, default=20)
+    parser.add_argument("--players", type=int, default=5000)
+    args = parser.parse_args()
+
+    async def no_sleep(_delay: float) -> None:
+        return None
+
+    pari_xp.xp_store.get_user_data = AsyncMock(return_value={"xp": 10**9, "level": 1})
+    pari_xp.xp_adapter.add_xp = AsyncMock()
+    pari_xp.award_xp = AsyncMock()
+    pari_xp.asyncio.sleep = no_sleep  # type: ignore[assignment]
+
+    for mode in ("legacy", "journal"):
+        rate = await _run(
+            mode,
+            bettors=args.bettors,
+            bets=args.bets,
+            players=args.players,
+        )
+        print(f"{mode:>8}: {rate:,.0f} bets/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,101 @@
+"""Benchmark: burst of atomic JSON writes across several store files.
+
+Compares the historical path (one process-wide lock around every
+``atomic_write_json`` call, each snapshot written in turn) with the
+:class:`utils.persistence.WriteService` group-commit scheduler, which
+coalesces pending snapshots per path and writes distinct paths in parallel.
+Each round submits ``--snapshots`` successive versions of ``--files``
+documents at once, like the casino, temp VC and refuge stores saving within
+the same second.
+
+    python scripts/bench_write_service.py [--files 6] [--snapshots 20] [--rounds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils import persistence  # noqa: E402
+
+
+async def _legacy_write(lock: asyncio.Lock, path: Path, data: dict) -> None:
+    async with lock:
+        await asyncio.to_thread(persistence.atomic_write_json, path, data)
+
+
+def _document(file_index: int, version: int) -> dict:
+    return {
+        "version": version,
+        "users": {str(user): {"xp": user * version} for user in range(500 + file_index)},
+    }
+
+
+async def _round(directory: Path, files: int, snapshots: int, legacy: bool) -> tuple[float, float]:
+    lock = asyncio.Lock()
+    latencies: list[float] = []
+
+    async def submit(path: Path, data: dict) -> None:
+        started = time.perf_counter()
+        if legacy:
+            await _legacy_write(lock, path, data)
+        else:
+            await persistence.atomic_write_json_async(path, data)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            submit(directory / f"store_{index}.json", _document(index, version))
+            for version in range(snapshots)
+            for index in range(files)
+        )
+    )
+    return time.perf_counter() - started, statistics.median(latencies)
+
+
+async def _run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for label, legacy in (("global lock", True), ("write service", False)):
+            elapsed: list[float] = []
+            medians: list[float] = []
+            for _ in range(args.rounds):
+                total, median = await _round(directory, args.files, args.snapshots, legacy)
+                elapsed.append(total)
+                medians.append(median)
+            line = (
+                f"{label:14s} burst {statistics.median(elapsed) * 1e3:8.1f} ms  "
+                f"p50 caller {statistics.median(medians) * 1e3:8.1f} ms"
+            )
+            if not legacy:
+                service = persistence.write_service()
+                writes = sum(stats.writes for stats in service.path_stats.values())
+                coalesced = sum(stats.coalesced for stats in service.path_stats.values())
+                line += (
+                    f"  writes {writes}  coalesced {coalesced}  "
+                    f"dir fsync batches {service.dir_sync_batches}"
+                )
+            print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=6)
+    parser.add_argument("--snapshots", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Contention benchmark: many coroutines awarding XP at the same instant.
+
+``--awarders`` tasks (a voice-leave wave after an event, casino payouts) each
+award XP once. The historical path calls ``award_xp`` per task: one XP store
+lock acquisition, one season store lock acquisition and one task wake-up
+chain each. The batched path submits through the voice ``_AwardBatcher``,
+which applies the whole wave with one ``XPStore.add_xp_many`` and one
+``season_store.record_many``. Stores live in a temporary directory.
+
+    python scripts/bench_xp_award_contention.py [--awarders 1000] [--rounds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import cogs.xp as xp  # noqa: E402
+from storage.season_store import SeasonStore  # noqa: E402
+from storage.xp_store import XPStore  # noqa: E402
+
+
+class CountingLock(asyncio.Lock):
+    acquisitions = 0
+
+    async def acquire(self) -> bool:
+        CountingLock.acquisitions += 1
+        return await super().acquire()
+
+
+async def _wave(awarders: int, batched: bool) -> tuple[float, float, int]:
+    batcher = xp._AwardBatcher(0.0, apply_personal_boost=False)
+    latencies: list[float] = []
+    gate = asyncio.Event()
+    started = 0.0
+
+    async def awarder(index: int) -> None:
+        await gate.wait()
+        if batched:
+            await batcher.award(10_000 + index, 30, 1, "voice_leave")
+        else:
+            await xp.award_xp(
+                10_000 + index, 30, 1, "voice_leave", apply_personal_boost=False
+            )
+        # Délai depuis le début de la vague : inclut l'attente des autres.
+        latencies.append(time.perf_counter() - started)
+
+    CountingLock.acquisitions = 0
+    tasks = [asyncio.create_task(awarder(index)) for index in range(awarders)]
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    gate.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return elapsed, latencies[int(len(latencies) * 0.99) - 1], CountingLock.acquisitions
+
+
+async def _run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = XPStore(path=str(Path(tmp) / "xp.json"))
+        store.lock = CountingLock()
+        store._schedule_flush = lambda: None
+        seasons = SeasonStore(Path(tmp) / "seasons.json")
+        seasons.flush_delay = None
+        season_lock = CountingLock()
+        seasons._get_lock = lambda: season_lock
+        xp.xp_store = store
+        xp.season_store = seasons
+
+        for label, batched in (("award_xp per task", False), ("add_xp_many batch", True)):
+            walls: list[float] = []
+            tails: list[float] = []
+            for _ in range(args.rounds):
+                wall, p99, acquisitions = await _wave(args.awarders, batched)
+                walls.append(wall)
+                tails.append(p99)
+            print(
+                f"{label:18s} wave {statistics.median(walls) * 1e3:7.2f} ms  "
+                f"p99 {statistics.median(tails) * 1e3:7.2f} ms  "
+                f"lock acquisitions/wave {acquisitions}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--awarders", type=int, default=1_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Load test: replay synthetic guild messages through ``XPCog.on_message``.
+
+Compares the historical path (``DAILY_LOCK`` + stale-day prune + nested dict
+update + ``schedule_checkpoint`` and its global lock, then discord.py's
+``CooldownMapping``, which rescans every bucket on each lookup) with the
+lock-free ``MESSAGE_COUNTS`` increment and per-member deadline dict. Messages
+are dispatched as one task each, like discord.py does, at a fixed rate; XP
+awards and SQLite writes are replaced by no-op awaitables.
+
+    python scripts/bench_xp_on_message.py [--rate 10000] [--seconds 3] [--users 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from types import MethodType, SimpleNamespace
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import cogs.xp as xp  # noqa: E402
+from utils import persistence  # noqa: E402
+
+
+async def _legacy_on_message(self, message) -> None:
+    if message.author.bot or message.guild is None:
+        return
+    today = datetime.now(xp.PARIS_TZ).date().isoformat()
+    async with xp.DAILY_LOCK:
+        xp._prune_stale_daily_stats(today)
+        day = xp.DAILY_STATS.setdefault(today, {})
+        user = day.setdefault(str(message.author.id), {"messages": 0, "voice": 0})
+        user["messages"] = int(user.get("messages", 0)) + 1
+    await persistence.schedule_checkpoint(xp.save_daily_stats_to_disk)
+
+    bucket = self._legacy_cooldown.get_bucket(message)
+    if bucket.update_rate_limit():
+        return
+    await xp.award_xp(message.author.id, 8, guild_id=message.guild.id, source="message")
+
+
+def _cog(legacy: bool) -> xp.XPCog:
+    cog = object.__new__(xp.XPCog)
+    cog.bot = SimpleNamespace()
+    cog._message_ready_at = {}
+    if legacy:
+        cog._legacy_cooldown = xp.commands.CooldownMapping.from_cooldown(
+            1, 60.0, xp.commands.BucketType.user
+        )
+        cog.on_message = MethodType(_legacy_on_message, cog)
+    return cog
+
+
+def _messages(users: int) -> list[SimpleNamespace]:
+    guild = SimpleNamespace(id=1)
+    channel = SimpleNamespace(id=2)
+    return [
+        SimpleNamespace(
+            author=SimpleNamespace(bot=False, id=10_000 + index),
+            guild=guild,
+            channel=channel,
+        )
+        for index in range(users)
+    ]
+
+
+async def _replay(cog: xp.XPCog, messages: list, rate: int, seconds: float) -> dict[str, float]:
+    latencies: list[float] = []
+    tick = 0.01
+    per_tick = max(1, int(rate * tick))
+    total = int(rate * seconds)
+
+    async def dispatch(message) -> None:
+        queued = time.perf_counter()
+        await cog.on_message(message)
+        latencies.append(time.perf_counter() - queued)
+
+    tasks: list[asyncio.Task] = []
+    started = time.perf_counter()
+    sent = 0
+    ticks = 0
+    while sent < total:
+        for _ in range(min(per_tick, total - sent)):
+            tasks.append(asyncio.create_task(dispatch(messages[sent % len(messages)])))
+            sent += 1
+        ticks += 1
+        # Cadence absolue : un tick en retard n'est pas rattrapé par du sommeil.
+        await asyncio.sleep(max(0.0, started + ticks * tick - time.perf_counter()))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    # Coût CPU pur du listener, sans ordonnancement de tâches.
+    cpu_started = time.perf_counter()
+    for message in messages * max(1, total // len(messages) // 4):
+        await cog.on_message(message)
+    cpu_us = (time.perf_counter() - cpu_started) / (len(messages) * max(1, total // len(messages) // 4)) * 1e6
+
+    latencies.sort()
+    return {
+        "throughput": total / elapsed,
+        "p50_us": statistics.median(latencies) * 1e6,
+        "p99_us": latencies[int(len(latencies) * 0.99) - 1] * 1e6,
+        "cpu_us": cpu_us,
+    }
+
+
+async def _run(args: argparse.Namespace) -> None:
+    async def award_xp(*_args, **_kwargs):
+        return 0, 0, 0, 0
+
+    async def save_daily_stats() -> None:
+        return None
+
+    xp.award_xp = award_xp
+    xp.save_daily_stats_to_disk = save_daily_stats
+    messages = _messages(args.users)
+
+    for label, legacy in (("legacy (locks + CooldownMapping)", True), ("lock-free counter", False)):
+        xp.DAILY_STATS.clear()
+        xp.MESSAGE_COUNTS.clear()
+        persistence._checkpoint_tasks.clear()
+        result = await _replay(_cog(legacy), messages, args.rate, args.seconds)
+        print(
+            f"{label:32s} {result['throughput']:9.0f} msg/s  "
+            f"p50 {result['p50_us']:8.1f} µs  p99 {result['p99_us']:9.1f} µs  "
+            f"listener {result['cpu_us']:6.2f} µs/msg"
+        )
+        for task in list(persistence._checkpoint_tasks.values()):
+            task.cancel()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rate", type=int, default=10_000, help="messages par seconde")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--users", type=int, default=2_000)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark: XP store state as slotted records vs. per-user dicts.
+
+Builds ``--users`` members both ways and reports the retained memory
+(``tracemalloc``) and the throughput of the in-memory part of an award
+(lookup, double XP check, level computation, last-access stamp) and of
+building the SQLite rows of a flush. The historical layout is a ``dict[str, dict]``
+stamped with ``datetime.now().isoformat()`` on every touch and copied
+entirely on flush; the new one is ``XPStore._records`` (``int`` keys,
+``XPRecord`` with ``__slots__``) with a dirty set.
+
+    python scripts/bench_xp_store_records.py [--users 100000] [--ops 500000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from storage.xp_store import XPRecord, XPStore, _access_tick  # noqa: E402
+
+
+def _legacy_state(users: int) -> dict[str, dict]:
+    stamp = datetime.now(timezone.utc).isoformat()
+    return {
+        str(10_000 + uid): {"xp": uid * 7, "level": XPStore._calc_level(uid * 7), "last_accessed": stamp}
+        for uid in range(users)
+    }
+
+
+def _record_state(users: int) -> dict[int, XPRecord]:
+    tick = _access_tick()
+    return {
+        10_000 + uid: XPRecord(uid * 7, XPStore._calc_level(uid * 7), None, tick)
+        for uid in range(users)
+    }
+
+
+def _measure_memory(builder, users: int) -> tuple[object, int]:
+    gc.collect()
+    tracemalloc.start()
+    state = builder(users)
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return state, size
+
+
+def _legacy_award(data: dict[str, dict], uid: str, amount: int) -> None:
+    user = data.setdefault(uid, {"xp": 0, "level": 0})
+    double_until = user.get("double_xp_until")
+    if double_until and datetime.fromisoformat(double_until) > datetime.now(timezone.utc):
+        amount *= 2
+    new_xp = max(0, int(user.get("xp", 0)) + amount)
+    user["xp"] = new_xp
+    user["level"] = XPStore._calc_level(new_xp)
+    user["last_accessed"] = datetime.now(timezone.utc).isoformat()
+
+
+def _record_award(records: dict[int, XPRecord], dirty: set[int], uid: int, amount: int) -> None:
+    record = records.get(uid)
+    if record is None:
+        record = records[uid] = XPRecord()
+    if record.boost_until is not None and record.boost_until > time.time():
+        amount *= 2
+    record.xp = max(0, record.xp + amount)
+    record.level = XPStore._calc_level(record.xp)
+    record.last_access = _access_tick()
+    dirty.add(uid)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--ops", type=int, default=500_000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    targets = [10_000 + rng.randrange(args.users) for _ in range(args.ops)]
+    str_targets = [str(uid) for uid in targets]
+
+    legacy, legacy_bytes = _measure_memory(_legacy_state, args.users)
+    records, record_bytes = _measure_memory(_record_state, args.users)
+    print(f"memory  legacy dicts {legacy_bytes / 2**20:7.1f} MiB   records {record_bytes / 2**20:7.1f} MiB")
+
+    started = time.perf_counter()
+    for uid in str_targets:
+        _legacy_award(legacy, uid, 8)
+    legacy_ops = args.ops / (time.perf_counter() - started)
+
+    dirty: set[int] = set()
+    started = time.perf_counter()
+    for uid in targets:
+        _record_award(records, dirty, uid, 8)
+    record_ops = args.ops / (time.perf_counter() - started)
+    print(f"awards  legacy dicts {legacy_ops:9.0f} ops/s  records {record_ops:9.0f} ops/s")
+
+    started = time.perf_counter()
+    snapshot = {uid: dict(payload) for uid, payload in legacy.items()}
+    [
+        (
+            int(uid),
+            max(0, int(payload.get("xp", 0))),
+            max(0, int(payload.get("level", 0))),
+            payload.get("double_xp_until"),
+            payload.get("last_accessed"),
+        )
+        for uid, payload in snapshot.items()
+    ]
+    legacy_flush = time.perf_counter() - started
+    started = time.perf_counter()
+    [records[uid].row(uid) for uid in dirty]
+    record_flush = time.perf_counter() - started
+    print(
+        f"flush   legacy copy + rows {legacy_flush * 1e3:7.1f} ms   "
+        f"records {len(dirty)} dirty rows {record_flush * 1e3:7.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -266,7 +266,7 @@ class CasinoLegendService:
             events = tuple(
                 event for event in state.events if event.event_id not in removed_event_ids
             )
-            if not any(event.event_id == CASINO_LEGEND_V22_EVENT_ID for event in events):
+            if not state.has_event(CASINO_LEGEND_V22_EVENT_ID):
                 events = events + (
                     RefugeHistoricalEvent(
                         event_id=CASINO_LEGEND_V22_EVENT_ID,
@@ -292,7 +292,11 @@ class CasinoLegendService:
         # service lock prevents a stale evaluate/save cycle from overwriting the
         # one-time V2.2 migration while RefugeWorldStore performs the atomic write.
         async with self.casino_service._lock:
-            await self.casino_service.world_store.update_state(updater)
+            # Markers older than the in-memory window are dropped from the log.
+            await self.casino_service.world_store.update_state(
+                updater,
+                removed_event_ids=removed_event_ids,
+            )
         return tuple(reset_markers_holder)
 
     async def _capture_v22_boundary(self) -> int:
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+
+from config import DATA_DIR
+from utils.persistence import read_json_safe
+
+
+CASINO_STATE_FILE = Path(DATA_DIR) / "pari_xp_state.json"
+logger = logging.getLogger(__name__)
+
+PlayerListener = Callable[[str, Mapping[str, int]], None]
+
+
+@dataclass(frozen=True, slots=True)
+class CasinoTotals:
+    """Immutable cumulative roulette totals shared by every casino reader.
+
+    ``version`` is ``None`` when the totals come from the cold-start file
+    fallback; published snapshots carry a strictly increasing version.
+    """
+
+    version: int | None = None
+    bet_count: int = 0
+    unique_players: int = 0
+    wagered_xp: int = 0
+    winnings_xp: int = 0
+
+    @property
+    def house_net_xp(self) -> int:
+        return self.wagered_xp - self.winnings_xp
+
+
+def _nonnegative_int(value: Any) -> int:
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _player_totals(payload: Any) -> dict[str, int] | None:
+    if not isinstance(payload, Mapping):
+        return None
+    return {
+        "bets": _nonnegative_int(payload.get("bets", 0)),
+        "wagered": _nonnegative_int(payload.get("wagered", 0)),
+        "winnings": _nonnegative_int(payload.get("winnings", 0)),
+    }
+
+
+def _players_from_raw(raw: Any) -> dict[str, dict[str, int]]:
+    if not isinstance(raw, Mapping):
+        return {}
+    players = raw.get("players", {})
+    if not isinstance(players, Mapping):
+        return {}
+    parsed: dict[str, dict[str, int]] = {}
+    for user_id, payload in players.items():
+        totals = _player_totals(payload)
+        if totals is not None:
+            parsed[str(user_id)] = totals
+    return parsed
+
+
+def _totals_from_players(
+    raw: Any,
+    players: Mapping[str, Mapping[str, int]],
+    *,
+    version: int | None,
+) -> CasinoTotals:
+    bet_count = sum(payload["bets"] for payload in players.values())
+    unique_players = sum(1 for payload in players.values() if payload["bets"] > 0)
+    if isinstance(raw, Mapping):
+        wagered = _nonnegative_int(raw.get("total_bets", 0))
+        winnings = _nonnegative_int(raw.get("total_winnings", 0))
+    else:
+        wagered = winnings = 0
+    return CasinoTotals(
+        version=version,
+        bet_count=bet_count,
+        unique_players=unique_players,
+        wagered_xp=wagered,
+        winnings_xp=winnings,
+    )
+
+
+def casino_totals_from_raw(raw: Any, *, version: int | None = None) -> CasinoTotals:
+    """Build a totals snapshot from the ``pari_xp_state.json`` document shape."""
+
+    return _totals_from_players(raw, _players_from_raw(raw), version=version)
+
+
+class CasinoTotalsReadModel:
+    """Versioned in-process view of the roulette totals owned by PariXPCog.
+
+    The cog publishes its authoritative state once when it loads and then
+    reports each player's updated counters after every bet. Readers get an
+    immutable snapshot without parsing the state file; the file is only read
+    while nothing has been published for the requested path (cog not loaded
+    yet, or a different state file in tests and tooling).
+    """
+
+    def __init__(self) -> None:
+        self._source_path: Path | None = None
+        self._players: dict[str, Mapping[str, int]] = {}
+        self._bet_count = 0
+        self._unique_players = 0
+        self._wagered_xp = 0
+        self._winnings_xp = 0
+        self._version = 0
+        self._snapshot: CasinoTotals | None = None
+        self._players_view: Mapping[str, Mapping[str, int]] | None = None
+        self._listeners: list[PlayerListener] = []
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def is_published(self, source_path: str | Path) -> bool:
+        return self._source_path is not None and self._source_path == Path(source_path)
+
+    def publish(self, state: Mapping[str, Any], *, source_path: str | Path) -> CasinoTotals:
+        """Replace the model with a full copy of the cog state."""
+
+        players = _players_from_raw(state)
+        totals = _totals_from_players(state, players, version=None)
+        self._source_path = Path(source_path)
+        self._players = {
+            user_id: MappingProxyType(payload) for user_id, payload in players.items()
+        }
+        self._bet_count = totals.bet_count
+        self._unique_players = totals.unique_players
+        self._wagered_xp = totals.wagered_xp
+        self._winnings_xp = totals.winnings_xp
+        self._bump()
+        snapshot = self.snapshot()
+        assert snapshot is not None
+        return snapshot
+
+    def add_listener(self, callback: PlayerListener) -> None:
+        """Call ``callback(user_id, totals)`` after each recorded bet result.
+
+        Callbacks run synchronously on the betting path and must only record or
+        schedule work.
+        """
+
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: PlayerListener) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def record_player(
+        self,
+        user_id: int | str,
+        stats: Mapping[str, Any],
+        *,
+        total_bets: int,
+        total_winnings: int,
+        source_path: str | Path,
+    ) -> None:
+        """Apply one player's new cumulative counters in O(1).
+
+        Updates for a path that was never fully published are ignored so a
+        partial model can never shadow the file fallback.
+        """
+
+        if not self.is_published(source_path):
+            return
+        current = _player_totals(stats)
+        if current is None:
+            return
+        user_key = str(user_id)
+        previous = self._players.get(user_key)
+        previous_bets = previous["bets"] if previous is not None else 0
+        self._bet_count += current["bets"] - previous_bets
+        self._unique_players += int(current["bets"] > 0) - int(previous_bets > 0)
+        view = MappingProxyType(current)
+        self._players[user_key] = view
+        self._wagered_xp = _nonnegative_int(total_bets)
+        self._winnings_xp = _nonnegative_int(total_winnings)
+        self._bump()
+        for callback in tuple(self._listeners):
+            try:
+                callback(user_key, view)
+            except Exception:
+                logger.exception("casino player listener failed")
+
+    def _bump(self) -> None:
+        self._version += 1
+        self._snapshot = None
+        self._players_view = None
+
+    def snapshot(self) -> CasinoTotals | None:
+        """Return the shared immutable snapshot, or ``None`` before publication."""
+
+        if self._source_path is None:
+            return None
+        if self._snapshot is None:
+            self._snapshot = CasinoTotals(
+                version=self._version,
+                bet_count=self._bet_count,
+                unique_players=self._unique_players,
+                wagered_xp=self._wagered_xp,
+                winnings_xp=self._winnings_xp,
+            )
+        return self._snapshot
+
+    async def get_totals(self, source_path: str | Path = CASINO_STATE_FILE) -> CasinoTotals:
+        """Return published totals for ``source_path`` or read the file once."""
+
+        if self.is_published(source_path):
+            snapshot = self.snapshot()
+            assert snapshot is not None
+            return snapshot
+        raw = await asyncio.to_thread(read_json_safe, Path(source_path), {})
+        return casino_totals_from_raw(raw)
+
+    async def get_players(
+        self,
+        source_path: str | Path = CASINO_STATE_FILE,
+    ) -> tuple[int | None, Mapping[str, Mapping[str, int]]]:
+        """Return ``(version, players)`` with read-only cumulative counters.
+
+        The player map is copied at most once per version, and only when a
+        reader actually asks for it; aggregate readers never pay for it.
+        """
+
+        if self.is_published(source_path):
+            if self._players_view is None:
+                self._players_view = MappingProxyType(dict(self._players))
+            return self._version, self._players_view
+        raw = await asyncio.to_thread(read_json_safe, Path(source_path), {})
+        return None, MappingProxyType(_players_from_raw(raw))
+
+    async def get_player(
+        self,
+        user_id: int | str,
+        source_path: str | Path = CASINO_STATE_FILE,
+    ) -> Mapping[str, int] | None:
+        """Return one player's read-only cumulative counters, or ``None``.
+
+        Published paths are answered in O(1) without copying the player map.
+        """
+
+        if self.is_published(source_path):
+            return self._players.get(str(user_id))
+        raw = await asyncio.to_thread(read_json_safe, Path(source_path), {})
+        players = raw.get("players", {}) if isinstance(raw, Mapping) else {}
+        if not isinstance(players, Mapping):
+            return None
+        totals = _player_totals(players.get(str(user_id)))
+        return MappingProxyType(totals) if totals is not None else None
+
+
+casino_totals = CasinoTotalsReadModel()
+
+
+__all__ = [
+    "CASINO_STATE_FILE",
+    "CasinoTotals",
+    "CasinoTotalsReadModel",
+    "casino_totals",
+    "casino_totals_from_raw",
+]
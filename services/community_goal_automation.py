@@ -141,21 +141,6 @@ def _parse_timestamp(value: object) -> datetime | None:
     return parsed.astimezone(timezone.utc)
 
 
-def _sum_season_field(payload: Mapping[str, Any], field: str) -> int:
-    users = payload.get("users", {})
-    if not isinstance(users, Mapping):
-        return 0
-    total = 0
-    for user in users.values():
-        if not isinstance(user, Mapping):
-            continue
-        try:
-            total += int(user.get(field, 0))
-        except (TypeError, ValueError):
-            continue
-    return max(0, total)
-
-
 def _round_target(metric_key: str, raw_target: float) -> int:
     granularity = max(1, int(_TARGET_GRANULARITY.get(metric_key, 1)))
     rounded = int(round(max(1.0, raw_target) / granularity)) * granularity
@@ -201,8 +186,8 @@ class CommunityGoalAutomationService:
         config: CommunityGoalAutomationConfig,
     ) -> dict[str, MetricActivityRate]:
         current_season_id = season_id_for(at)
-        payload = await self.season_store.get_season(current_season_id)
-        if not isinstance(payload, Mapping):
+        payload = await self.season_store.season_metadata(current_season_id)
+        if payload is None:
             return {}
 
         started_at = _parse_timestamp(payload.get("started_at"))
@@ -219,7 +204,12 @@ class CommunityGoalAutomationService:
         observed_days = elapsed_hours / 24.0
         rates: dict[str, MetricActivityRate] = {}
         for metric in COMMUNITY_GOAL_METRICS:
-            total = _sum_season_field(payload, metric.season_field)
+            total = max(
+                0,
+                await self.season_store.metric_total(
+                    metric.season_field, season_id=current_season_id
+                ),
+            )
             if total <= 0:
                 continue
             daily_rate = total / observed_days
@@ -370,12 +360,7 @@ class CommunityGoalAutomationService:
         return CommunityGoalAutomationResult(created, None, True)
 
     async def _all_time_metric_total(self, metric: CommunityGoalMetric) -> int:
-        total = 0
-        for season_id in await self.season_store.list_seasons():
-            payload = await self.season_store.get_season(season_id)
-            if isinstance(payload, Mapping):
-                total += _sum_season_field(payload, metric.season_field)
-        return max(0, total)
+        return max(0, await self.season_store.metric_total(metric.season_field))
 
 
 community_goal_automation_service = CommunityGoalAutomationService()
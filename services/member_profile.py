@@ -3,19 +3,21 @@ from __future__ import annotations
 import asyncio
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Mapping, Protocol
+from typing import Any, Mapping, Protocol, runtime_checkable
 
 from config import DATA_DIR
+from services.casino_totals import casino_totals
 from storage.achievement_store import achievement_store
 from storage.season_store import season_store
 from storage.xp_store import xp_store
 from utils.achievements import ACHIEVEMENTS
-from utils.persistence import read_json_safe
+from utils.metrics import measure
 from utils.seasons import parse_season_id, rank_rows, season_id_for
 
 
 CASINO_STATE_FILE = Path(DATA_DIR) / "pari_xp_state.json"
 _KNOWN_ACHIEVEMENT_IDS = frozenset(item.id for item in ACHIEVEMENTS)
+RANKED_FIELDS = ("xp_earned", "messages", "voice_seconds", "casino_net")
 
 
 class XPReader(Protocol):
@@ -30,6 +32,19 @@ class SeasonReader(Protocol):
     async def get_season(self, season_id: str) -> Mapping[str, Any] | None: ...
 
 
+@runtime_checkable
+class RankedSeasonReader(SeasonReader, Protocol):
+    """Season reader that answers one user's counters and ranks directly."""
+
+    async def get_season_user(
+        self, season_id: str, user_id: int
+    ) -> Mapping[str, Any] | None: ...
+
+    async def user_ranks(
+        self, season_id: str, user_id: int, fields: tuple[str, ...]
+    ) -> Mapping[str, int | None]: ...
+
+
 @dataclass(frozen=True, slots=True)
 class MemberProfileSnapshot:
     """Read-only aggregate consumed by future Discord profile views."""
@@ -65,16 +80,6 @@ def _safe_int(value: Any, *, minimum: int | None = None) -> int:
     return parsed
 
 
-def _casino_player_payload(raw: Any, user_id: int) -> dict[str, Any]:
-    if not isinstance(raw, Mapping):
-        return {}
-    players = raw.get("players", {})
-    if not isinstance(players, Mapping):
-        return {}
-    payload = players.get(str(user_id), {})
-    return dict(payload) if isinstance(payload, Mapping) else {}
-
-
 def _season_users(payload: Mapping[str, Any] | None) -> dict[str, dict[str, Any]]:
     if not isinstance(payload, Mapping):
         return {}
@@ -108,8 +113,15 @@ def build_member_profile_snapshot(
     unlocked_achievements: Mapping[str, str] | None,
     season_payload: Mapping[str, Any] | None,
     casino_payload: Mapping[str, Any] | None,
+    season_user: Mapping[str, Any] | None = None,
+    season_ranks: Mapping[str, int | None] | None = None,
 ) -> MemberProfileSnapshot:
-    """Combine authoritative source snapshots without mutating any store."""
+    """Combine authoritative source snapshots without mutating any store.
+
+    When ``season_ranks`` is given (with the member's ``season_user``
+    counters) the full ``season_payload`` is not needed and ranks are not
+    recomputed.
+    """
 
     parse_season_id(season_id)
     xp_payload = xp_payload if isinstance(xp_payload, Mapping) else {}
@@ -126,8 +138,14 @@ def build_member_profile_snapshot(
         )
     )
 
-    users = _season_users(season_payload)
-    season_user = users.get(str(user_id), {})
+    if season_ranks is None:
+        users = _season_users(season_payload)
+        season_user = users.get(str(user_id), {})
+        season_ranks = {
+            field: _rank_for_user(users, field, user_id) for field in RANKED_FIELDS
+        }
+    elif not isinstance(season_user, Mapping):
+        season_user = {}
 
     casino_bets = _safe_int(casino_payload.get("bets", 0), minimum=0)
     casino_wagered = _safe_int(casino_payload.get("wagered", 0), minimum=0)
@@ -142,15 +160,15 @@ def build_member_profile_snapshot(
         achievement_ids=known_unlocked,
         season_id=season_id,
         season_xp=_safe_int(season_user.get("xp_earned", 0), minimum=0),
-        season_xp_rank=_rank_for_user(users, "xp_earned", user_id),
+        season_xp_rank=season_ranks.get("xp_earned"),
         season_messages=_safe_int(season_user.get("messages", 0), minimum=0),
-        season_messages_rank=_rank_for_user(users, "messages", user_id),
+        season_messages_rank=season_ranks.get("messages"),
         season_voice_seconds=_safe_int(
             season_user.get("voice_seconds", 0), minimum=0
         ),
-        season_voice_rank=_rank_for_user(users, "voice_seconds", user_id),
+        season_voice_rank=season_ranks.get("voice_seconds"),
         season_casino_net=_safe_int(season_user.get("casino_net", 0)),
-        season_casino_rank=_rank_for_user(users, "casino_net", user_id),
+        season_casino_rank=season_ranks.get("casino_net"),
         casino_bets=casino_bets,
         casino_wagered=casino_wagered,
         casino_winnings=casino_winnings,
@@ -174,6 +192,24 @@ class MemberProfileService:
         self._season_reader = season_reader
         self._casino_state_file = Path(casino_state_file)
 
+    async def _season_view(
+        self,
+        user_id: int,
+        season_id: str,
+    ) -> tuple[
+        Mapping[str, Any] | None,
+        Mapping[str, Any] | None,
+        Mapping[str, int | None] | None,
+    ]:
+        reader = self._season_reader
+        if isinstance(reader, RankedSeasonReader):
+            season_user, ranks = await asyncio.gather(
+                reader.get_season_user(season_id, user_id),
+                reader.user_ranks(season_id, user_id, RANKED_FIELDS),
+            )
+            return None, season_user, ranks
+        return await reader.get_season(season_id), None, None
+
     async def get_snapshot(
         self,
         user_id: int,
@@ -183,26 +219,25 @@ class MemberProfileService:
         resolved_season_id = season_id or season_id_for()
         parse_season_id(resolved_season_id)
 
-        xp_payload, unlocked, season_payload = await asyncio.gather(
-            self._xp_reader.get_user_data(user_id),
-            self._achievement_reader.get_user_achievements(user_id),
-            self._season_reader.get_season(resolved_season_id),
-        )
-        raw_casino = await asyncio.to_thread(
-            read_json_safe,
-            self._casino_state_file,
-            {},
-        )
-        casino_payload = _casino_player_payload(raw_casino, user_id)
-
-        return build_member_profile_snapshot(
-            user_id=user_id,
-            season_id=resolved_season_id,
-            xp_payload=xp_payload,
-            unlocked_achievements=unlocked,
-            season_payload=season_payload,
-            casino_payload=casino_payload,
-        )
+        with measure("member_profile.snapshot"):
+            xp_payload, unlocked, season_view, casino_payload = await asyncio.gather(
+                self._xp_reader.get_user_data(user_id),
+                self._achievement_reader.get_user_achievements(user_id),
+                self._season_view(user_id, resolved_season_id),
+                casino_totals.get_player(user_id, self._casino_state_file),
+            )
+            season_payload, season_user, season_ranks = season_view
+            snapshot = build_member_profile_snapshot(
+                user_id=user_id,
+                season_id=resolved_season_id,
+                xp_payload=xp_payload,
+                unlocked_achievements=unlocked,
+                season_payload=season_payload,
+                casino_payload=casino_payload,
+                season_user=season_user,
+                season_ranks=season_ranks,
+            )
+        return snapshot
 
 
 member_profile_service = MemberProfileService()
@@ -212,6 +247,8 @@ __all__ = [
     "CASINO_STATE_FILE",
     "MemberProfileService",
     "MemberProfileSnapshot",
+    "RANKED_FIELDS",
+    "RankedSeasonReader",
     "build_member_profile_snapshot",
     "member_profile_service",
 ]
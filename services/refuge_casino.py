@@ -7,11 +7,18 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Final, Mapping
 
-from config import CASINO_CLOSE_HOUR, CASINO_OPEN_HOUR, DATA_DIR
+from config import CASINO_CLOSE_HOUR, CASINO_OPEN_HOUR
 from models.refuge_world import (
     RefugeBuildingState,
     RefugeHistoricalEvent,
     RefugeWorldState,
+    freeze_value,
+)
+from services.casino_totals import (
+    CASINO_STATE_FILE,
+    CasinoTotals,
+    CasinoTotalsReadModel,
+    casino_totals,
 )
 from services.refuge_world import (
     BuildingProgressionRule,
@@ -23,7 +30,6 @@ from storage.refuge_casino_activity_store import (
     RefugeCasinoActivityStore,
     refuge_casino_activity_store,
 )
-from utils.persistence import read_json_safe
 from utils.timezones import PARIS_TZ
 
 
@@ -31,7 +37,6 @@ CASINO_BUILDING_ID: Final[str] = "casino"
 CASINO_METRIC_KEY: Final[str] = "casino_prestige_points"
 CASINO_MAX_LEVEL: Final[int] = 5
 CASINO_RECENT_WINDOW_SECONDS: Final[int] = 24 * 60 * 60
-CASINO_STATE_FILE = Path(DATA_DIR) / "pari_xp_state.json"
 # Boundaries implementing the approved visible states exactly:
 # <= -1500 ruined, -1499..-251 difficulty, -250..250 stable,
 # 251..1500 prosperous, > 1500 insolent.
@@ -243,37 +248,12 @@ def casino_fortune_for_net(
     return "prosperous" if net > 0 else "difficulty"
 
 
-def casino_source_snapshot(raw: Any) -> CasinoSourceSnapshot:
-    if not isinstance(raw, dict):
-        return CasinoSourceSnapshot()
-    players = raw.get("players", {})
-    if not isinstance(players, dict):
-        players = {}
-    bet_count = 0
-    unique_players = 0
-    for payload in players.values():
-        if not isinstance(payload, dict):
-            continue
-        try:
-            bets = max(0, int(payload.get("bets", 0)))
-        except (TypeError, ValueError):
-            bets = 0
-        bet_count += bets
-        if bets > 0:
-            unique_players += 1
-    try:
-        wagered = max(0, int(raw.get("total_bets", 0)))
-    except (TypeError, ValueError):
-        wagered = 0
-    try:
-        winnings = max(0, int(raw.get("total_winnings", 0)))
-    except (TypeError, ValueError):
-        winnings = 0
+def casino_source_from_totals(totals: CasinoTotals) -> CasinoSourceSnapshot:
     return CasinoSourceSnapshot(
-        roulette_bet_count=bet_count,
-        roulette_unique_players=unique_players,
-        roulette_wagered_xp=wagered,
-        roulette_winnings_xp=winnings,
+        roulette_bet_count=totals.bet_count,
+        roulette_unique_players=totals.unique_players,
+        roulette_wagered_xp=totals.wagered_xp,
+        roulette_winnings_xp=totals.winnings_xp,
     )
 
 
@@ -337,16 +317,19 @@ class RefugeCasinoService:
         activity_store: RefugeCasinoActivityStore = refuge_casino_activity_store,
         world_service: RefugeWorldService = refuge_world_service,
         state_file: str | Path = CASINO_STATE_FILE,
+        totals: CasinoTotalsReadModel = casino_totals,
     ) -> None:
         self.activity_store = activity_store
         self.world_service = world_service
         self.world_store = world_service.store
         self.state_file = Path(state_file)
+        self.totals = totals
         self._lock = asyncio.Lock()
 
     async def _source_snapshot(self) -> CasinoSourceSnapshot:
-        raw = await asyncio.to_thread(read_json_safe, self.state_file, {})
-        return casino_source_snapshot(raw)
+        # PariXPCog publishes its in-memory totals; the state file is only
+        # parsed on cold start, before the cog has loaded.
+        return casino_source_from_totals(await self.totals.get_totals(self.state_file))
 
     async def evaluate(
         self,
@@ -403,9 +386,8 @@ class RefugeCasinoService:
         open_now = casino_is_open(at)
 
         events = list(state.events)
-        event_ids = {event.event_id for event in events}
         raw_jackpots = activity.get("jackpots", [])
-        jackpots = [dict(item) for item in raw_jackpots if isinstance(item, dict)]
+        jackpots = [dict(item) for item in raw_jackpots if isinstance(item, Mapping)]
         jackpots.sort(
             key=lambda item: (
                 str(item.get("occurred_at", "")),
@@ -413,12 +395,13 @@ class RefugeCasinoService:
             )
         )
         imported_jackpot = False
+        imported_ids: set[str] = set()
         for item in jackpots:
             source_event_id = str(item.get("event_id", "")).strip()
             if not source_event_id:
                 continue
             event_id = f"casino:jackpot:{source_event_id}"
-            if event_id in event_ids:
+            if event_id in imported_ids or state.has_event(event_id):
                 continue
             try:
                 tier = int(item.get("tier", 0))
@@ -441,7 +424,7 @@ class RefugeCasinoService:
                     },
                 )
             )
-            event_ids.add(event_id)
+            imported_ids.add(event_id)
             imported_jackpot = True
 
         building_state = dict(building.state)
@@ -470,7 +453,7 @@ class RefugeCasinoService:
             desired["last_jackpot"] = dict(building_state["last_jackpot"])
 
         state_changed = progression.changed or imported_jackpot
-        if any(building_state.get(key) != value for key, value in desired.items()):
+        if any(building_state.get(key) != freeze_value(value) for key, value in desired.items()):
             building_state.update(desired)
             building = replace(building, state=building_state)
             state = _replace_building(state, building)
@@ -541,7 +524,7 @@ class RefugeCasinoService:
                 event for event in state.events if event.event_id not in removed_event_ids
             )
             migration_event_id = "casino:legend_rules:v2"
-            if not any(event.event_id == migration_event_id for event in events):
+            if not state.has_event(migration_event_id):
                 events = events + (
                     RefugeHistoricalEvent(
                         event_id=migration_event_id,
@@ -560,7 +543,11 @@ class RefugeCasinoService:
                 replace(state, events=events),
                 replace(building, state=building_state),
             )
-            return await self.world_store.save_state(updated)
+            # Markers older than the in-memory window are dropped from the log.
+            return await self.world_store.save_state(
+                updated,
+                removed_event_ids=removed_event_ids,
+            )
 
     async def _unlock_marker(
         self,
@@ -583,7 +570,7 @@ class RefugeCasinoService:
             if building is None:
                 raise RuntimeError("Refuge Casino building is missing")
             event_id = f"casino:{state_key}:{normalized}"
-            if any(event.event_id == event_id for event in state.events):
+            if state.has_event(event_id):
                 return state
 
             building_state = dict(building.state)
@@ -667,6 +654,6 @@ __all__ = [
     "casino_is_open",
     "casino_level_name",
     "casino_prestige_points",
-    "casino_source_snapshot",
+    "casino_source_from_totals",
     "refuge_casino_service",
 ]
@@ -237,7 +237,7 @@ def _append_event(
     state: RefugeWorldState,
     event: RefugeHistoricalEvent,
 ) -> RefugeWorldState:
-    if any(existing.event_id == event.event_id for existing in state.events):
+    if state.has_event(event.event_id):
         return state
     return replace(state, events=state.events + (event,))
 
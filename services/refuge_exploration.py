@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from typing import Final, Mapping, Sequence
 
@@ -39,6 +39,10 @@ EXPLORER_ZONE_ORDER: Final[tuple[str, ...]] = (
     "monuments",
     "mysteries",
 )
+# Events shown per building in the explorer, and the event type suffix of the
+# discovered mysteries.
+_BUILDING_HISTORY_LIMIT: Final[int] = 4
+_SECRET_EVENT_SUFFIX: Final[str] = "secret_discovered"
 
 
 @dataclass(frozen=True, slots=True)
@@ -143,7 +147,7 @@ def _history_for_building(
     state: RefugeWorldState,
     building_id: str,
     *,
-    limit: int = 4,
+    limit: int = _BUILDING_HISTORY_LIMIT,
 ) -> tuple[str, ...]:
     matching = [
         event
@@ -352,7 +356,7 @@ def _secret_events(state: RefugeWorldState) -> tuple[RefugeHistoricalEvent, ...]
     events = [
         event
         for event in state.events
-        if str(event.event_type).endswith("secret_discovered")
+        if str(event.event_type).endswith(_SECRET_EVENT_SUFFIX)
     ]
     events.sort(
         key=lambda event: (
@@ -521,6 +525,15 @@ def build_footprint_snapshot(
     )
 
 
+def _unique_events(
+    events: Sequence[RefugeHistoricalEvent],
+) -> tuple[RefugeHistoricalEvent, ...]:
+    unique: dict[str, RefugeHistoricalEvent] = {}
+    for event in events:
+        unique.setdefault(event.event_id, event)
+    return tuple(unique.values())
+
+
 class RefugeExplorationService:
     """Read-only orchestration for Explorer and Mon empreinte."""
 
@@ -542,6 +555,23 @@ class RefugeExplorationService:
     ) -> RefugeExplorerSnapshot:
         now = _aware_utc(at)
         panel = await self.panel_service.evaluate(at=now)
+        # The builders read the history from ``state.events``, which only
+        # holds the recent window: hand them the relevant log events instead.
+        history: list[RefugeHistoricalEvent] = []
+        for building_id in ("fire", "hall", "casino"):
+            history.extend(
+                await self.world_store.find_events(
+                    building_id=building_id,
+                    limit=_BUILDING_HISTORY_LIMIT,
+                )
+            )
+        history.extend(
+            await self.world_store.find_events(type_suffix=_SECRET_EVENT_SUFFIX)
+        )
+        panel = replace(
+            panel,
+            state=replace(panel.state, events=_unique_events(history)),
+        )
         return build_explorer_snapshot(
             panel=panel,
             fire_config=RefugeFireConfig.from_env(),
@@ -564,7 +594,11 @@ class RefugeExplorationService:
             ),
             self.world_store.get_state(),
         )
-        return build_footprint_snapshot(profile=profile, state=state)
+        events = await self.world_store.find_events(user_id=int(user_id))
+        return build_footprint_snapshot(
+            profile=profile,
+            state=replace(state, events=events),
+        )
 
 
 refuge_exploration_service = RefugeExplorationService()
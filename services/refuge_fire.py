@@ -299,7 +299,7 @@ class RefugeFireService:
                 raise RuntimeError("Refuge Fire building is missing")
 
             event_id = f"fire:secret:{normalized}"
-            if any(event.event_id == event_id for event in state.events):
+            if state.has_event(event_id):
                 return state
 
             existing_secrets = building.state.get("secret_events", ())
@@ -10,6 +10,7 @@ from models.refuge_world import (
     RefugeBuildingState,
     RefugeHistoricalEvent,
     RefugeWorldState,
+    freeze_value,
 )
 from services.refuge_world import (
     BuildingProgressionRule,
@@ -671,7 +672,7 @@ class RefugeHallService:
             ("season_plaques", desired_plaques),
             ("gallery_markers", desired_gallery),
         ):
-            if building_state.get(key) != desired:
+            if building_state.get(key) != freeze_value(desired):
                 if desired is None:
                     building_state.pop(key, None)
                 else:
@@ -755,7 +756,7 @@ class RefugeHallService:
                     "kind": marker_kind,
                 },
             )
-            if not any(item.event_id == event.event_id for item in updated.events):
+            if not updated.has_event(event.event_id):
                 updated = replace(updated, events=updated.events + (event,))
             return await self.world_store.save_state(updated)
 
@@ -781,7 +782,7 @@ class RefugeHallService:
                 raise RuntimeError("Refuge Hall building is missing")
 
             event_id = f"hall:secret:{normalized}"
-            if any(event.event_id == event_id for event in state.events):
+            if state.has_event(event_id):
                 return state
 
             raw_secrets = building.state.get("secret_events", ())
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any, Mapping
 
 from storage.achievement_store import achievement_store
@@ -278,13 +278,18 @@ class RefugeJournalService:
         end: datetime,
     ) -> tuple[int, tuple[str, ...]]:
         try:
-            world = await self.world_store.get_state()
+            # Fenêtre ]start, end] : la requête du journal d'événements est
+            # demi-ouverte à droite, on l'élargit d'une microseconde.
+            events = await self.world_store.events_between(
+                start,
+                end + timedelta(microseconds=1),
+            )
         except Exception:
             logger.exception("[Journal] lecture de la Chronologie impossible")
             return 0, ()
 
         rows: list[tuple[datetime, str]] = []
-        for event in world.events:
+        for event in events:
             moment = _parse_timestamp(event.occurred_at)
             if moment is None or not start < moment <= end:
                 continue
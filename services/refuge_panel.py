@@ -124,7 +124,7 @@ def _event_timestamp(event: RefugeHistoricalEvent) -> datetime:
     return parsed.astimezone(timezone.utc)
 
 
-def latest_event(state: RefugeWorldState) -> RefugeHistoricalEvent | None:
+def _compute_latest_event(state: RefugeWorldState) -> RefugeHistoricalEvent | None:
     if not state.events:
         return None
     return max(
@@ -133,6 +133,10 @@ def latest_event(state: RefugeWorldState) -> RefugeHistoricalEvent | None:
     )
 
 
+def latest_event(state: RefugeWorldState) -> RefugeHistoricalEvent | None:
+    return state.memoize("latest_event", _compute_latest_event)
+
+
 def event_label(event: RefugeHistoricalEvent | None) -> str | None:
     if event is None:
         return None
@@ -207,7 +207,7 @@ def _casino_evidence(
 
     jackpots: list[dict[str, Any]] = []
     raw_jackpots = snapshot.get("jackpots", [])
-    if isinstance(raw_jackpots, list):
+    if isinstance(raw_jackpots, (list, tuple)):
         for item in raw_jackpots:
             if not isinstance(item, Mapping):
                 continue
@@ -228,7 +228,7 @@ def _casino_evidence(
 
 
 def _discovery_exists(state: RefugeWorldState, event_id: str) -> bool:
-    return any(event.event_id == event_id for event in state.events)
+    return state.has_event(event_id)
 
 
 def _discover(
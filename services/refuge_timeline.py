@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, replace
 from datetime import datetime, timedelta, timezone
-from typing import Final, Mapping
+from typing import Final, Iterable, Mapping
 
 from models.refuge_world import (
     RefugeHistoricalEvent,
@@ -22,6 +22,8 @@ from utils.seasons import season_bounds, season_id_for, season_label
 
 TIMELINE_STATE_KEY: Final[str] = "refuge_timeline"
 _TIMELINE_VERSION: Final[int] = 1
+# Lower bound of the event log queries that need the history since the start.
+_HISTORY_START: Final[datetime] = datetime.min.replace(tzinfo=timezone.utc)
 
 
 @dataclass(frozen=True, slots=True)
@@ -111,7 +113,7 @@ def _state_with_meta(
 
 
 def _event_ids_at_season_end(
-    events: tuple[RefugeHistoricalEvent, ...],
+    events: Iterable[RefugeHistoricalEvent],
     season_id: str,
 ) -> tuple[str, ...]:
     _, season_end = season_bounds(season_id)
@@ -162,23 +164,6 @@ def _event_label(event: RefugeHistoricalEvent) -> str:
     return labels.get(event.event_type, "Un événement a marqué le Refuge")
 
 
-def _chapter_events(
-    state: RefugeWorldState,
-    season_id: str,
-) -> tuple[RefugeHistoricalEvent, ...]:
-    start, end = season_bounds(season_id)
-    start_utc = start.astimezone(timezone.utc)
-    end_utc = end.astimezone(timezone.utc)
-    selected: list[tuple[datetime, RefugeHistoricalEvent]] = []
-    for event in state.events:
-        occurred = _parse_timestamp(event.occurred_at)
-        if occurred is None or not start_utc <= occurred < end_utc:
-            continue
-        selected.append((occurred, event))
-    selected.sort(key=lambda item: (item[0], item[1].event_id), reverse=True)
-    return tuple(event for _occurred, event in selected)
-
-
 def _construction_label(state: RefugeWorldState) -> str | None:
     construction = state.active_construction
     if construction is None:
@@ -247,11 +232,18 @@ class RefugeTimelineService:
         archived_id: str | None = None
         snapshots = state.snapshots
         if existing is None:
+            # The world only keeps its recent events in memory: the season's
+            # history comes from the event log.
+            _start, season_end = season_bounds(active_season_id)
+            history = await self.world_store.events_between(
+                _HISTORY_START,
+                season_end.astimezone(timezone.utc),
+            )
             snapshot = RefugeWorldSnapshot(
                 season_id=active_season_id,
                 captured_at=now.isoformat(),
                 buildings=state.buildings,
-                event_ids=_event_ids_at_season_end(state.events, active_season_id),
+                event_ids=_event_ids_at_season_end(history, active_season_id),
                 active_construction=state.active_construction,
                 state=dict(state.state),
             )
@@ -276,10 +268,12 @@ class RefugeTimelineService:
         self,
         world: RefugeWorldState,
         snapshot: RefugeWorldSnapshot,
+        events_by_id: Mapping[str, RefugeHistoricalEvent],
     ) -> RefugeWorldState:
-        event_ids = set(snapshot.event_ids)
         historical_events = tuple(
-            event for event in world.events if event.event_id in event_ids
+            event
+            for event_id in snapshot.event_ids
+            if (event := events_by_id.get(event_id)) is not None
         )
         return RefugeWorldState(
             schema_version=world.schema_version,
@@ -292,13 +286,33 @@ class RefugeTimelineService:
             state=dict(snapshot.state),
         )
 
+    @staticmethod
+    def _chapter_events(
+        snapshot: RefugeWorldSnapshot,
+        history: tuple[RefugeHistoricalEvent, ...],
+    ) -> tuple[RefugeHistoricalEvent, ...]:
+        # ``history`` is newest first; keep this season's archived events.
+        start, end = season_bounds(snapshot.season_id)
+        start_utc = start.astimezone(timezone.utc)
+        end_utc = end.astimezone(timezone.utc)
+        archived_ids = frozenset(snapshot.event_ids)
+        return tuple(
+            event
+            for event in history
+            if event.event_id in archived_ids
+            and (occurred := _parse_timestamp(event.occurred_at)) is not None
+            and start_utc <= occurred < end_utc
+        )
+
     def _chapter_from_snapshot(
         self,
         world: RefugeWorldState,
         snapshot: RefugeWorldSnapshot,
+        history: tuple[RefugeHistoricalEvent, ...],
+        events_by_id: Mapping[str, RefugeHistoricalEvent],
     ) -> RefugeTimelineChapter:
-        restored = self._restore_snapshot_state(world, snapshot)
-        chapter_events = _chapter_events(restored, snapshot.season_id)
+        restored = self._restore_snapshot_state(world, snapshot, events_by_id)
+        chapter_events = self._chapter_events(snapshot, history)
         monuments = tuple(
             building
             for building in restored.buildings
@@ -330,13 +344,24 @@ class RefugeTimelineService:
     ) -> RefugeTimelineSnapshot:
         sync_result = await self.sync(at=at)
         world = sync_result.state
-        chapters = tuple(
-            self._chapter_from_snapshot(world, snapshot)
-            for snapshot in sorted(
-                world.snapshots,
-                key=lambda item: item.season_id,
-                reverse=True,
+        snapshots = sorted(
+            world.snapshots,
+            key=lambda item: item.season_id,
+            reverse=True,
+        )
+        # One event log read covers every chapter: each snapshot restores the
+        # history up to its season end, and the latest season ends last.
+        history: tuple[RefugeHistoricalEvent, ...] = ()
+        if snapshots:
+            _start, last_end = season_bounds(snapshots[0].season_id)
+            history = await self.world_store.events_between(
+                _HISTORY_START,
+                last_end.astimezone(timezone.utc),
             )
+        events_by_id = {event.event_id: event for event in history}
+        chapters = tuple(
+            self._chapter_from_snapshot(world, snapshot, history, events_by_id)
+            for snapshot in snapshots
         )
         selected = selected_season_id
         if selected is None and chapters:
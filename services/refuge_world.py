@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-import hashlib
-import json
 from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from typing import Final, Mapping, Sequence
 
-from models.refuge_world import RefugeBuildingState, RefugeHistoricalEvent, RefugeWorldState
+from models.refuge_world import (
+    RefugeBuildingState,
+    RefugeHistoricalEvent,
+    RefugeWorldState,
+    content_hash,
+    thaw_value,
+)
 from storage.refuge_world_store import RefugeWorldStore, refuge_world_store
 
 
@@ -83,21 +87,28 @@ def level_for_metric(
 
 def _render_relevant_world_state(state: RefugeWorldState) -> dict[str, object]:
     return {
-        str(key): value
+        str(key): thaw_value(value)
         for key, value in state.state.items()
         if str(key) not in _NON_VISUAL_WORLD_STATE_KEYS
     }
 
 
 def world_render_signature(state: RefugeWorldState) -> str:
-    """Hash only fields that can affect the rendered current world."""
+    """Hash only fields that can affect the rendered current world.
+
+    The state is immutable, so the signature is memoized on the instance.
+    """
+
+    return state.memoize("render_signature", _compute_world_render_signature)
+
 
+def _compute_world_render_signature(state: RefugeWorldState) -> str:
     payload = {
         "buildings": [
             {
                 "building_id": building.building_id,
                 "level": int(building.level),
-                "state": building.state,
+                "state": thaw_value(building.state),
             }
             for building in sorted(
                 state.buildings,
@@ -111,13 +122,7 @@ def world_render_signature(state: RefugeWorldState) -> str:
         ),
         "state": _render_relevant_world_state(state),
     }
-    canonical = json.dumps(
-        payload,
-        ensure_ascii=False,
-        sort_keys=True,
-        separators=(",", ":"),
-    ).encode("utf-8")
-    return hashlib.sha256(canonical).hexdigest()
+    return content_hash(payload)
 
 
 def _event_id(building_id: str, level: int) -> str:
@@ -143,8 +148,8 @@ class RefugeWorldService:
             building.building_id: building
             for building in current.buildings
         }
-        events = list(current.events)
-        existing_event_ids = {event.event_id for event in events}
+        new_events: list[RefugeHistoricalEvent] = []
+        new_event_ids: set[str] = set()
         changed_buildings: list[str] = []
         rule_building_ids = [rule.building_id for rule in rules]
         if len(set(rule_building_ids)) != len(rule_building_ids):
@@ -180,9 +185,9 @@ class RefugeWorldService:
                 if reached_level < rule.event_from_level:
                     continue
                 event_id = _event_id(rule.building_id, reached_level)
-                if event_id in existing_event_ids:
+                if event_id in new_event_ids or current.has_event(event_id):
                     continue
-                events.append(
+                new_events.append(
                     RefugeHistoricalEvent(
                         event_id=event_id,
                         event_type="building_level_reached",
@@ -194,7 +199,7 @@ class RefugeWorldService:
                         },
                     )
                 )
-                existing_event_ids.add(event_id)
+                new_event_ids.add(event_id)
 
         changed = bool(changed_buildings)
         if changed:
@@ -206,7 +211,7 @@ class RefugeWorldService:
                         key=lambda item: item.building_id,
                     )
                 ),
-                events=tuple(events),
+                events=current.events + tuple(new_events),
             )
             current = await self.store.save_state(current)
 
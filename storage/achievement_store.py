@@ -1,42 +1,27 @@
 from __future__ import annotations
 
-import asyncio
-import weakref
-from copy import deepcopy
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Iterable, Mapping
 
 from config import DATA_DIR
-from utils.persistence import atomic_write_json_async, read_json_safe
+from storage.snapshot_store import JsonSnapshotStore
 
 
 ACHIEVEMENTS_FILE = Path(DATA_DIR) / "achievements.json"
 
 
-class AchievementStore:
+class AchievementStore(JsonSnapshotStore):
     """Persist unlocked achievements without rewriting on read-only checks."""
 
     def __init__(self, path: str | Path = ACHIEVEMENTS_FILE) -> None:
-        self.path = Path(path)
-        self._loaded = False
+        super().__init__(path)
         self._data: dict[str, Any] = {"schema_version": 1, "users": {}}
-        self._locks: weakref.WeakKeyDictionary[
-            asyncio.AbstractEventLoop, asyncio.Lock
-        ] = weakref.WeakKeyDictionary()
-
-    def _get_lock(self) -> asyncio.Lock:
-        loop = asyncio.get_running_loop()
-        lock = self._locks.get(loop)
-        if lock is None:
-            lock = asyncio.Lock()
-            self._locks[loop] = lock
-        return lock
-
-    async def _ensure_loaded_locked(self) -> None:
+
+    async def _load_locked(self) -> None:
         if self._loaded:
             return
-        raw = await asyncio.to_thread(read_json_safe, self.path, {})
+        raw = await self._read_locked({})
         users: dict[str, Any] = {}
         if isinstance(raw, dict):
             raw_users = raw.get("users", {})
@@ -47,20 +32,21 @@ class AchievementStore:
                     if isinstance(payload, dict)
                 }
         self._data = {"schema_version": 1, "users": users}
+        self._mark_changed_locked()
         self._loaded = True
 
-    async def get_snapshot(self) -> dict[str, Any]:
-        """Return a defensive snapshot of all persisted unlock history."""
+    async def get_snapshot(self) -> Mapping[str, Any]:
+        """Return the shared read-only snapshot of all unlock history."""
 
         async with self._get_lock():
-            await self._ensure_loaded_locked()
-            return deepcopy(self._data)
+            await self._load_locked()
+            return self._frozen_locked()
 
     async def get_user_achievements(self, user_id: int) -> dict[str, str]:
         """Return a copy of one user's ``achievement_id -> unlocked_at`` map."""
 
         async with self._get_lock():
-            await self._ensure_loaded_locked()
+            await self._load_locked()
             users = self._data["users"]
             payload = users.get(str(user_id), {})
             return {
@@ -108,7 +94,7 @@ class AchievementStore:
         ).isoformat()
 
         async with self._get_lock():
-            await self._ensure_loaded_locked()
+            await self._load_locked()
             users = self._data["users"]
             result: dict[int, list[str]] = {}
             changed = False
@@ -126,7 +112,8 @@ class AchievementStore:
                     result[user_id] = newly_unlocked
 
             if changed:
-                await atomic_write_json_async(self.path, self._data)
+                self._mark_changed_locked()
+                await self._write_locked()
             return result
 
 
@@ -1,15 +1,13 @@
 from __future__ import annotations
 
-import asyncio
 import uuid
-import weakref
 from copy import deepcopy
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Mapping
 
 from config import DATA_DIR
-from utils.persistence import atomic_write_json_async, read_json_safe
+from storage.snapshot_store import JsonSnapshotStore
 
 
 COMMUNITY_GOALS_FILE = Path(DATA_DIR) / "community_goals.json"
@@ -23,33 +21,25 @@ def _automation_copy(value: Any) -> dict[str, Any]:
     return {str(key): deepcopy(item) for key, item in value.items()}
 
 
-class CommunityGoalStore:
-    """Persist community goals, lifecycle and lightweight automation state."""
+class CommunityGoalStore(JsonSnapshotStore):
+    """Persist community goals, lifecycle and lightweight automation state.
+
+    Goals are few and handed to callers that edit them, so reads still return
+    per-goal copies rather than the shared frozen snapshot.
+    """
 
     def __init__(self, path: str | Path = COMMUNITY_GOALS_FILE) -> None:
-        self.path = Path(path)
-        self._loaded = False
+        super().__init__(path)
         self._data: dict[str, Any] = {
             "schema_version": 1,
             "goals": {},
             "automation": {},
         }
-        self._locks: weakref.WeakKeyDictionary[
-            asyncio.AbstractEventLoop, asyncio.Lock
-        ] = weakref.WeakKeyDictionary()
-
-    def _get_lock(self) -> asyncio.Lock:
-        loop = asyncio.get_running_loop()
-        lock = self._locks.get(loop)
-        if lock is None:
-            lock = asyncio.Lock()
-            self._locks[loop] = lock
-        return lock
 
     async def _load_locked(self) -> None:
         if self._loaded:
             return
-        raw = await asyncio.to_thread(read_json_safe, self.path, {})
+        raw = await self._read_locked({})
         goals: dict[str, Any] = {}
         automation: dict[str, Any] = {}
         if isinstance(raw, dict):
@@ -132,7 +122,8 @@ class CommunityGoalStore:
                 "final_progress": None,
             }
             goals[goal_id] = payload
-            await atomic_write_json_async(self.path, self._data)
+            self._mark_changed_locked()
+            await self._write_locked()
             return deepcopy(payload)
 
     async def list_goals(self, *, status: str | None = None) -> list[dict[str, Any]]:
@@ -172,7 +163,8 @@ class CommunityGoalStore:
             payload["status"] = status
             payload["final_progress"] = max(0, int(final_progress))
             payload[f"{status}_at"] = timestamp
-            await atomic_write_json_async(self.path, self._data)
+            self._mark_changed_locked()
+            await self._write_locked()
             return deepcopy(payload)
 
     async def get_automation_state(self) -> dict[str, Any]:
@@ -188,7 +180,8 @@ class CommunityGoalStore:
         async with self._get_lock():
             await self._load_locked()
             self._data["automation"] = normalized
-            await atomic_write_json_async(self.path, self._data)
+            self._mark_changed_locked()
+            await self._write_locked()
             return _automation_copy(normalized)
 
 
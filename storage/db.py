@@ -186,6 +186,13 @@ class SQLiteDatabase:
             )
         await self._run_write(self._upsert_xp_sync, rows)
 
+    async def upsert_xp_rows(self, rows: list[tuple[object, ...]]) -> None:
+        """Persist pre-built ``(user_id, xp, level, double_xp_until,
+        last_accessed)`` rows in one transaction."""
+        if not rows:
+            return
+        await self._run_write(self._upsert_xp_sync, rows)
+
     async def load_voice_times(self) -> dict[str, str]:
         await self.start()
 
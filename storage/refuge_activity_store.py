@@ -1,14 +1,11 @@
 from __future__ import annotations
 
-import asyncio
-import weakref
-from copy import deepcopy
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Mapping
 
 from config import DATA_DIR
-from utils.persistence import atomic_write_json_async, read_json_safe
+from storage.snapshot_store import JsonSnapshotStore
 from utils.seasons import split_interval_by_season
 
 
@@ -83,17 +80,12 @@ def _prune_recent_buckets(
             buckets.pop(raw_key, None)
 
 
-class RefugeActivityStore:
+class RefugeActivityStore(JsonSnapshotStore):
     """Persist derived Refuge activity without changing XP or season metrics."""
 
     def __init__(self, path: str | Path = REFUGE_ACTIVITY_FILE) -> None:
-        self.path = Path(path)
-        self._loaded = False
-        self._dirty = False
+        super().__init__(path)
         self._data: dict[str, Any] = self._empty_data()
-        self._locks: weakref.WeakKeyDictionary[
-            asyncio.AbstractEventLoop, asyncio.Lock
-        ] = weakref.WeakKeyDictionary()
 
     @staticmethod
     def _empty_data() -> dict[str, Any]:
@@ -105,25 +97,19 @@ class RefugeActivityStore:
             "recent_voice_buckets": {},
         }
 
-    def _get_lock(self) -> asyncio.Lock:
-        loop = asyncio.get_running_loop()
-        lock = self._locks.get(loop)
-        if lock is None:
-            lock = asyncio.Lock()
-            self._locks[loop] = lock
-        return lock
-
     async def _load_locked(self) -> None:
         if self._loaded:
             return
 
-        raw = await asyncio.to_thread(read_json_safe, self.path, None)
+        raw = await self._read_locked(None)
         if raw is None:
             self._data = self._empty_data()
+            self._mark_changed_locked()
             self._loaded = True
             return
         if not isinstance(raw, Mapping):
             self._data = self._empty_data()
+            self._mark_changed_locked()
             self._loaded = True
             return
 
@@ -188,21 +174,23 @@ class RefugeActivityStore:
             "seasons": seasons,
             "recent_voice_buckets": recent_voice_buckets,
         }
+        self._mark_changed_locked()
         self._loaded = True
         if migrated:
-            await atomic_write_json_async(self.path, self._data)
+            await self._write_locked()
 
     async def initialize(
         self,
         *,
         at: datetime | None = None,
-    ) -> dict[str, Any]:
+    ) -> Mapping[str, Any]:
         async with self._get_lock():
             await self._load_locked()
             if not self._data.get("tracking_started_at"):
                 self._data["tracking_started_at"] = _utc_iso(at)
-                await atomic_write_json_async(self.path, self._data)
-            return deepcopy(self._data)
+                self._mark_changed_locked()
+                await self._write_locked()
+            return self._frozen_locked()
 
     async def record_interval(
         self,
@@ -244,13 +232,15 @@ class RefugeActivityStore:
                 recent,
                 at=_aware_utc(started_at) + timedelta(seconds=recorded_seconds),
             )
-            self._dirty = True
+            self._mark_dirty_locked()
         return recorded_seconds
 
-    async def get_snapshot(self) -> dict[str, Any]:
+    async def get_snapshot(self) -> Mapping[str, Any]:
+        """Return the shared read-only snapshot of the activity document."""
+
         async with self._get_lock():
             await self._load_locked()
-            return deepcopy(self._data)
+            return self._frozen_locked()
 
     async def get_total_seconds(self) -> int:
         snapshot = await self.get_snapshot()
@@ -297,14 +287,6 @@ class RefugeActivityStore:
                 continue
         return total
 
-    async def flush(self) -> None:
-        async with self._get_lock():
-            await self._load_locked()
-            if not self._dirty:
-                return
-            await atomic_write_json_async(self.path, self._data)
-            self._dirty = False
-
 
 refuge_activity_store = RefugeActivityStore()
 
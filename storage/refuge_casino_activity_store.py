@@ -1,14 +1,11 @@
 from __future__ import annotations
 
-import asyncio
-import copy
-import weakref
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Mapping
 
 from config import DATA_DIR
-from utils.persistence import atomic_write_json_async, read_json_safe
+from storage.snapshot_store import JsonSnapshotStore
 
 
 REFUGE_CASINO_ACTIVITY_SCHEMA_VERSION = 1
@@ -48,29 +45,23 @@ class RefugeCasinoActivitySchemaError(RuntimeError):
     pass
 
 
-class RefugeCasinoActivityStore:
-    """Prospective Refuge-only observation of concrete casino XP flows."""
+class RefugeCasinoActivityStore(JsonSnapshotStore):
+    """Prospective Refuge-only observation of concrete casino XP flows.
+
+    Every casino transaction is recorded, so writes are debounced by
+    ``flush_delay`` instead of rewriting the file per bet.
+    """
+
+    flush_delay = 5.0
 
     def __init__(self, path: str | Path = REFUGE_CASINO_ACTIVITY_FILE) -> None:
-        self.path = Path(path)
-        self._loaded = False
+        super().__init__(path)
         self._data: dict[str, Any] = _empty_data()
-        self._locks: weakref.WeakKeyDictionary[
-            asyncio.AbstractEventLoop, asyncio.Lock
-        ] = weakref.WeakKeyDictionary()
-
-    def _get_lock(self) -> asyncio.Lock:
-        loop = asyncio.get_running_loop()
-        lock = self._locks.get(loop)
-        if lock is None:
-            lock = asyncio.Lock()
-            self._locks[loop] = lock
-        return lock
 
     async def _load_locked(self) -> None:
         if self._loaded:
             return
-        raw = await asyncio.to_thread(read_json_safe, self.path, {})
+        raw = await self._read_locked({})
         data = _empty_data()
         if isinstance(raw, dict) and raw:
             try:
@@ -115,11 +106,13 @@ class RefugeCasinoActivityStore:
                     dict(item) for item in raw_jackpots if isinstance(item, dict)
                 ]
         self._data = data
+        self._mark_changed_locked()
         self._loaded = True
 
     def _prune_locked(self, now: datetime) -> None:
         cutoff = now - timedelta(seconds=RECENT_RETENTION_SECONDS)
         buckets = self._data["recent_buckets"]
+        pruned = False
         for key in list(buckets):
             try:
                 moment = datetime.fromisoformat(str(key))
@@ -127,11 +120,15 @@ class RefugeCasinoActivityStore:
                     moment = moment.replace(tzinfo=timezone.utc)
             except ValueError:
                 buckets.pop(key, None)
+                pruned = True
                 continue
             if moment.astimezone(timezone.utc) < cutoff:
                 buckets.pop(key, None)
+                pruned = True
+        if pruned:
+            self._mark_changed_locked()
 
-    async def initialize(self, *, at: datetime | None = None) -> dict[str, Any]:
+    async def initialize(self, *, at: datetime | None = None) -> Mapping[str, Any]:
         now = _aware_utc(at)
         async with self._get_lock():
             await self._load_locked()
@@ -141,8 +138,9 @@ class RefugeCasinoActivityStore:
                 changed = True
             self._prune_locked(now)
             if changed:
-                await atomic_write_json_async(self.path, self._data)
-            return copy.deepcopy(self._data)
+                self._mark_changed_locked()
+                await self._write_locked()
+            return self._frozen_locked()
 
     async def record_transaction(
         self,
@@ -210,14 +208,16 @@ class RefugeCasinoActivityStore:
                         }
                     )
 
-            await atomic_write_json_async(self.path, self._data)
+            self._mark_dirty_locked()
+
+    async def get_snapshot(self, *, at: datetime | None = None) -> Mapping[str, Any]:
+        """Return the shared read-only snapshot, pruned at ``at``."""
 
-    async def get_snapshot(self, *, at: datetime | None = None) -> dict[str, Any]:
         now = _aware_utc(at)
         async with self._get_lock():
             await self._load_locked()
             self._prune_locked(now)
-            return copy.deepcopy(self._data)
+            return self._frozen_locked()
 
     async def get_recent_totals(
         self,
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Collection, Sequence
+
+from config import DATA_DIR
+from models.refuge_world import RefugeHistoricalEvent
+from utils.frozen import thaw
+
+
+REFUGE_EVENT_LOG_FILE = Path(DATA_DIR) / "refuge_world_events.db"
+
+
+def _event_timestamp(value: str) -> float | None:
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _aware_timestamp(moment: datetime) -> float:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+class RefugeEventLog:
+    """Append-only SQLite log of the Refuge historical events.
+
+    ``refuge_world.json`` only keeps a bounded window of recent events plus the
+    log *revision* it was written against. Every persisted change to the event
+    list is applied here first, stamped with the next revision; rows added or
+    removed by a revision the document never reached are rolled back on load,
+    so a crash between the two writes cannot resurrect or lose events.
+
+    Events are indexed by ``event_id`` (live rows only) and by occurrence time
+    for range queries such as timeline chapters. All methods are blocking and
+    meant to run through ``asyncio.to_thread`` under the world store lock.
+    """
+
+    def __init__(self, path: str | Path = REFUGE_EVENT_LOG_FILE) -> None:
+        self.path = Path(path)
+        self._initialized = False
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=5.0)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA busy_timeout = 5000")
+        connection.execute("PRAGMA synchronous = FULL")
+        return connection
+
+    def _initialize(self) -> None:
+        if self._initialized:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS refuge_world_events (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_id TEXT NOT NULL,
+                    event_type TEXT NOT NULL,
+                    occurred_at TEXT NOT NULL,
+                    occurred_ts REAL,
+                    data TEXT NOT NULL,
+                    added_rev INTEGER NOT NULL,
+                    removed_rev INTEGER
+                );
+
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_refuge_world_events_live_id
+                    ON refuge_world_events (event_id)
+                    WHERE removed_rev IS NULL;
+
+                CREATE INDEX IF NOT EXISTS idx_refuge_world_events_time
+                    ON refuge_world_events (occurred_ts, seq);
+                """
+            )
+            connection.commit()
+        self._initialized = True
+
+    @staticmethod
+    def _event_from_row(row: sqlite3.Row) -> RefugeHistoricalEvent:
+        try:
+            data = json.loads(row["data"])
+        except ValueError:
+            data = {}
+        return RefugeHistoricalEvent(
+            event_id=str(row["event_id"]),
+            event_type=str(row["event_type"]),
+            occurred_at=str(row["occurred_at"]),
+            data=data if isinstance(data, dict) else {},
+        )
+
+    @staticmethod
+    def _rollback_after(connection: sqlite3.Connection, revision: int) -> None:
+        connection.execute(
+            "DELETE FROM refuge_world_events WHERE added_rev > ?",
+            (revision,),
+        )
+        connection.execute(
+            "UPDATE refuge_world_events SET removed_rev = NULL WHERE removed_rev > ?",
+            (revision,),
+        )
+
+    def recover(
+        self,
+        revision: int,
+        *,
+        limit: int,
+    ) -> tuple[list[RefugeHistoricalEvent], list[str]]:
+        """Drop uncommitted revisions; return the ``limit`` newest live events.
+
+        Events come back in log order, with the IDs of every live event so the
+        store can answer membership checks without loading older payloads.
+        """
+
+        self._initialize()
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            self._rollback_after(connection, revision)
+            connection.execute(
+                "DELETE FROM refuge_world_events WHERE removed_rev IS NOT NULL"
+            )
+            rows = connection.execute(
+                """
+                SELECT event_id, event_type, occurred_at, data
+                FROM refuge_world_events
+                ORDER BY seq DESC
+                LIMIT ?
+                """,
+                (max(0, int(limit)),),
+            ).fetchall()
+            event_ids = [
+                str(row["event_id"])
+                for row in connection.execute(
+                    "SELECT event_id FROM refuge_world_events ORDER BY seq"
+                )
+            ]
+            connection.commit()
+        return [self._event_from_row(row) for row in reversed(rows)], event_ids
+
+    def apply(
+        self,
+        revision: int,
+        *,
+        added: Sequence[RefugeHistoricalEvent],
+        removed_ids: Collection[str],
+    ) -> None:
+        """Record one revision of the event list in a single transaction.
+
+        Re-applying a revision after a failed document write first discards
+        the previous attempt, so retries are idempotent.
+        """
+
+        self._initialize()
+        rows = [
+            (
+                event.event_id,
+                event.event_type,
+                event.occurred_at,
+                _event_timestamp(event.occurred_at),
+                json.dumps(thaw(event.data), ensure_ascii=False, separators=(",", ":")),
+                revision,
+            )
+            for event in added
+        ]
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            self._rollback_after(connection, revision - 1)
+            connection.executemany(
+                """
+                UPDATE refuge_world_events
+                SET removed_rev = ?
+                WHERE event_id = ? AND removed_rev IS NULL
+                """,
+                [(revision, event_id) for event_id in removed_ids],
+            )
+            connection.executemany(
+                """
+                INSERT OR IGNORE INTO refuge_world_events (
+                    event_id,
+                    event_type,
+                    occurred_at,
+                    occurred_ts,
+                    data,
+                    added_rev
+                )
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            connection.commit()
+
+    def events_between(
+        self,
+        start: datetime,
+        end: datetime,
+        *,
+        revision: int,
+    ) -> list[RefugeHistoricalEvent]:
+        """Return events with ``start <= occurred_at < end`` as of ``revision``."""
+
+        self._initialize()
+        with self._connect() as connection:
+            rows = connection.execute(
+                """
+                SELECT event_id, event_type, occurred_at, data
+                FROM refuge_world_events
+                WHERE occurred_ts >= ? AND occurred_ts < ?
+                  AND added_rev <= ?
+                  AND (removed_rev IS NULL OR removed_rev > ?)
+                ORDER BY occurred_ts DESC, event_id DESC
+                """,
+                (_aware_timestamp(start), _aware_timestamp(end), revision, revision),
+            ).fetchall()
+        return [self._event_from_row(row) for row in rows]
+
+    def find(
+        self,
+        *,
+        revision: int,
+        building_id: str | None = None,
+        user_id: int | None = None,
+        type_suffix: str | None = None,
+        limit: int | None = None,
+    ) -> list[RefugeHistoricalEvent]:
+        """Return live events matching every given filter, newest first.
+
+        Filters apply to the ``building_id``/``user_id`` keys of the event data
+        and to the end of the event type. They narrow the scan in SQLite;
+        callers re-check the exact predicate on the returned events.
+        """
+
+        self._initialize()
+        clauses = ["added_rev <= ?", "(removed_rev IS NULL OR removed_rev > ?)"]
+        params: list[object] = [revision, revision]
+        if building_id is not None:
+            clauses.append("json_extract(data, '$.building_id') = ?")
+            params.append(building_id)
+        if user_id is not None:
+            clauses.append("CAST(json_extract(data, '$.user_id') AS INTEGER) = ?")
+            params.append(int(user_id))
+        if type_suffix is not None:
+            clauses.append("substr(event_type, -?) = ?")
+            params.extend((len(type_suffix), type_suffix))
+        query = (
+            "SELECT event_id, event_type, occurred_at, data "
+            "FROM refuge_world_events WHERE "
+            + " AND ".join(clauses)
+            + " ORDER BY occurred_ts DESC, event_id DESC"
+        )
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(max(0, int(limit)))
+        with self._connect() as connection:
+            rows = connection.execute(query, params).fetchall()
+        return [self._event_from_row(row) for row in rows]
+
+
+__all__ = ["REFUGE_EVENT_LOG_FILE", "RefugeEventLog"]
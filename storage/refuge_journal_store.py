@@ -1,47 +1,33 @@
 from __future__ import annotations
 
-import asyncio
-import weakref
 from copy import deepcopy
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Mapping
 
 from config import DATA_DIR
-from utils.persistence import atomic_write_json_async, read_json_safe
+from storage.snapshot_store import JsonSnapshotStore
 
 
 REFUGE_JOURNAL_FILE = Path(DATA_DIR) / "refuge_journal.json"
 
 
-class RefugeJournalStore:
+class RefugeJournalStore(JsonSnapshotStore):
     """Persist the Journal baseline and publication ledger atomically."""
 
     def __init__(self, path: str | Path = REFUGE_JOURNAL_FILE) -> None:
-        self.path = Path(path)
-        self._loaded = False
+        super().__init__(path)
         self._data: dict[str, Any] = {
             "schema_version": 1,
             "baseline": None,
             "last_issue_number": 0,
             "published": {},
         }
-        self._locks: weakref.WeakKeyDictionary[
-            asyncio.AbstractEventLoop, asyncio.Lock
-        ] = weakref.WeakKeyDictionary()
-
-    def _get_lock(self) -> asyncio.Lock:
-        loop = asyncio.get_running_loop()
-        lock = self._locks.get(loop)
-        if lock is None:
-            lock = asyncio.Lock()
-            self._locks[loop] = lock
-        return lock
 
     async def _load_locked(self) -> None:
         if self._loaded:
             return
-        raw = await asyncio.to_thread(read_json_safe, self.path, {})
+        raw = await self._read_locked({})
         if isinstance(raw, Mapping):
             baseline = raw.get("baseline")
             published = raw.get("published", {})
@@ -59,12 +45,15 @@ class RefugeJournalStore:
                     else {}
                 ),
             }
+        self._mark_changed_locked()
         self._loaded = True
 
-    async def get_state(self) -> dict[str, Any]:
+    async def get_state(self) -> Mapping[str, Any]:
+        """Return the shared read-only snapshot of the Journal state."""
+
         async with self._get_lock():
             await self._load_locked()
-            return deepcopy(self._data)
+            return self._frozen_locked()
 
     async def ensure_baseline(
         self,
@@ -89,7 +78,8 @@ class RefugeJournalStore:
                     if isinstance(payload, Mapping)
                 },
             }
-            await atomic_write_json_async(self.path, self._data)
+            self._mark_changed_locked()
+            await self._write_locked()
             return True
 
     async def was_published(self, publication_key: str) -> bool:
@@ -144,7 +134,8 @@ class RefugeJournalStore:
                     if isinstance(payload, Mapping)
                 },
             }
-            await atomic_write_json_async(self.path, self._data)
+            self._mark_changed_locked()
+            await self._write_locked()
 
 
 refuge_journal_store = RefugeJournalStore()
@@ -1,22 +1,26 @@
 from __future__ import annotations
 
 import asyncio
-import weakref
-from copy import deepcopy
 from dataclasses import replace
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable, Mapping
+from typing import AbstractSet, Any, Callable, Collection, Mapping
 
 from config import DATA_DIR
 from models.refuge_world import (
     REFUGE_WORLD_SCHEMA_VERSION,
+    RefugeHistoricalEvent,
     RefugeWorldState,
+    content_hash,
 )
-from utils.persistence import atomic_write_json_async, read_json_safe
+from storage.refuge_event_log import RefugeEventLog
+from storage.snapshot_store import JsonSnapshotStore
 
 
 REFUGE_WORLD_FILE = Path(DATA_DIR) / "refuge_world.json"
+# Number of most recent events kept in memory and inline in refuge_world.json;
+# the full history lives in the event log.
+REFUGE_WORLD_RECENT_EVENTS = 100
 
 
 class RefugeWorldSchemaError(ValueError):
@@ -60,6 +64,13 @@ def _migrate_payload(raw: Any) -> tuple[dict[str, Any], bool]:
             version = 1
             migrated = True
             continue
+        if version == 1:
+            # v2 moves the full history to the event log; the store imports
+            # the inline events on first load (no "event_log" cursor yet).
+            payload = {**payload, "schema_version": 2}
+            version = 2
+            migrated = True
+            continue
         raise RefugeWorldSchemaError(
             f"no refuge world migration path from schema {version}"
         )
@@ -74,24 +85,75 @@ def _utc_iso(at: datetime | None = None) -> str:
     return moment.astimezone(timezone.utc).isoformat()
 
 
-class RefugeWorldStore:
-    """Persist the Refuge world state without owning progression rules."""
-
-    def __init__(self, path: str | Path = REFUGE_WORLD_FILE) -> None:
-        self.path = Path(path)
-        self._loaded = False
+def _event_delta(
+    previous: tuple[RefugeHistoricalEvent, ...],
+    current: tuple[RefugeHistoricalEvent, ...],
+    logged_ids: AbstractSet[str],
+) -> tuple[tuple[RefugeHistoricalEvent, ...], frozenset[str]]:
+    """Diff a saved state against the previously persisted window.
+
+    ``previous`` is the bounded window the store handed out, so the cost does
+    not depend on the size of the history. Events outside that window are
+    only known by ID: one that is already logged is not appended again.
+    """
+
+    if current is previous:
+        return (), frozenset()
+    # Common case: events were only appended. Tuple comparison short-circuits
+    # on identity, so the shared prefix costs pointer checks only.
+    size = len(previous)
+    if len(current) >= size and current[:size] == previous:
+        return (
+            tuple(event for event in current[size:] if event.event_id not in logged_ids),
+            frozenset(),
+        )
+    before = {event.event_id: event for event in previous}
+    after = {event.event_id: event for event in current}
+    removed = frozenset(
+        event_id
+        for event_id, event in before.items()
+        if after.get(event_id) != event
+    )
+    added = tuple(
+        event
+        for event in current
+        if event.event_id in removed
+        or (event.event_id not in before and event.event_id not in logged_ids)
+    )
+    return added, removed
+
+
+class RefugeWorldStore(JsonSnapshotStore):
+    """Persist the Refuge world state without owning progression rules.
+
+    ``RefugeWorldState`` is deeply immutable, so every reader shares the
+    current instance and writers hand back a structurally copied state. The
+    historical events are appended to a :class:`RefugeEventLog`; the state and
+    the JSON document only keep the most recent ones plus the log revision, and
+    older events are known by ID only (``logged_event_ids``). A save therefore
+    costs the same however old the world is. Older history is read from the
+    log on demand (:meth:`events_between`, :meth:`find_events`). The hash of
+    the last persisted document lets identical saves skip the rewrite.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = REFUGE_WORLD_FILE,
+        *,
+        event_log: RefugeEventLog | None = None,
+    ) -> None:
+        super().__init__(path)
+        self.event_log = event_log or RefugeEventLog(
+            self.path.with_name(f"{self.path.stem}_events.db")
+        )
         self._state = RefugeWorldState()
-        self._locks: weakref.WeakKeyDictionary[
-            asyncio.AbstractEventLoop, asyncio.Lock
-        ] = weakref.WeakKeyDictionary()
-
-    def _get_lock(self) -> asyncio.Lock:
-        loop = asyncio.get_running_loop()
-        lock = self._locks.get(loop)
-        if lock is None:
-            lock = asyncio.Lock()
-            self._locks[loop] = lock
-        return lock
+        self._persisted_hash: str | None = None
+        self._event_revision = 0
+        # Window last persisted and handed out, and IDs of every live event
+        # in the log; together they let a save find its delta without the
+        # full history.
+        self._logged_events: tuple[RefugeHistoricalEvent, ...] = ()
+        self._event_ids: set[str] = set()
 
     async def _load_locked(self) -> None:
         if self._loaded:
@@ -104,14 +166,18 @@ class RefugeWorldStore:
         backup_path = self.path.with_suffix(self.path.suffix + ".bak")
         primary_exists = self.path.exists()
         backup_exists = backup_path.exists()
-        raw = await asyncio.to_thread(read_json_safe, self.path, None)
+        raw = await self._read_locked(None)
         if raw is None:
             if primary_exists or backup_exists:
                 raise RefugeWorldSchemaError(
                     "refuge world persistence is unreadable; refusing to reset "
                     "the permanent world"
                 )
-            self._state = RefugeWorldState()
+            self._event_ids = set()
+            self._state = RefugeWorldState(logged_event_ids=self._event_ids)
+            self._persisted_hash = None
+            self._event_revision = 0
+            self._logged_events = ()
             self._loaded = True
             return
 
@@ -121,10 +187,111 @@ class RefugeWorldStore:
         except ValueError as exc:
             raise RefugeWorldSchemaError(str(exc)) from exc
 
+        cursor = payload.get("event_log")
+        if isinstance(cursor, Mapping):
+            try:
+                revision = max(0, int(cursor.get("revision", 0)))
+            except (TypeError, ValueError) as exc:
+                raise RefugeWorldSchemaError("invalid refuge event log cursor") from exc
+            if revision > 0 and not self.event_log.exists():
+                raise RefugeWorldSchemaError(
+                    "refuge event log is missing; refusing to drop the world history"
+                )
+            events, event_ids = await asyncio.to_thread(
+                self.event_log.recover,
+                revision,
+                limit=REFUGE_WORLD_RECENT_EVENTS,
+            )
+            self._event_ids = set(event_ids)
+            state = replace(
+                state,
+                events=tuple(events),
+                logged_event_ids=self._event_ids,
+            )
+            self._event_revision = revision
+            self._logged_events = state.events
+        else:
+            # Legacy document: every event is still inline. Discard whatever a
+            # previous interrupted import left in the log and re-import.
+            await asyncio.to_thread(self.event_log.recover, 0, limit=0)
+            self._event_ids = set()
+            state = replace(state, logged_event_ids=self._event_ids)
+            self._event_revision = 0
+            self._logged_events = ()
+            migrated = True
+
         self._state = state
         self._loaded = True
         if migrated:
-            await atomic_write_json_async(self.path, state.to_dict())
+            await self._persist_locked()
+        else:
+            self._persisted_hash = content_hash(
+                self._document(state, self._event_revision, len(self._event_ids))
+            )
+
+    @staticmethod
+    def _document(
+        state: RefugeWorldState,
+        revision: int,
+        event_count: int,
+    ) -> dict[str, Any]:
+        recent = state.events[-REFUGE_WORLD_RECENT_EVENTS:]
+        payload = replace(state, events=recent).to_dict()
+        payload["event_log"] = {
+            "revision": revision,
+            "event_count": event_count,
+        }
+        return payload
+
+    async def _persist_locked(self, removed_event_ids: Collection[str] = ()) -> None:
+        state = self._state
+        added, removed = _event_delta(
+            self._logged_events,
+            state.events,
+            self._event_ids,
+        )
+        # Events older than the window cannot be filtered out of ``events``;
+        # callers name them explicitly.
+        removed |= frozenset(
+            event_id for event_id in removed_event_ids if event_id in self._event_ids
+        )
+        revision = self._event_revision
+        if added or removed:
+            revision += 1
+        event_count = len(self._event_ids) - len(removed) + len(added)
+        document = self._document(state, revision, event_count)
+        digest = content_hash(document)
+        if digest == self._persisted_hash:
+            self._adopt_locked(state)
+            return
+        if revision != self._event_revision:
+            await asyncio.to_thread(
+                self.event_log.apply,
+                revision,
+                added=added,
+                removed_ids=removed,
+            )
+        await self._write_locked(document)
+        self._event_revision = revision
+        self._event_ids.difference_update(removed)
+        self._event_ids.update(event.event_id for event in added)
+        self._adopt_locked(state)
+        self._persisted_hash = digest
+
+    def _adopt_locked(self, state: RefugeWorldState) -> None:
+        # Keep only the recent window in memory and share the logged IDs.
+        if len(state.events) > REFUGE_WORLD_RECENT_EVENTS:
+            state = replace(
+                state,
+                events=state.events[-REFUGE_WORLD_RECENT_EVENTS:],
+                logged_event_ids=self._event_ids,
+            )
+        elif state.logged_event_ids is not self._event_ids:
+            # The field is store-owned and ignored by equality: attaching it
+            # in place keeps the caller's instance (and its memo) shared.
+            object.__setattr__(state, "logged_event_ids", self._event_ids)
+        self._state = state
+        self._logged_events = state.events
 
     @staticmethod
     def _validate_state(state: RefugeWorldState) -> None:
@@ -137,7 +304,7 @@ class RefugeWorldStore:
     async def load(self) -> RefugeWorldState:
         async with self._get_lock():
             await self._load_locked()
-            return deepcopy(self._state)
+            return self._state
 
     async def initialize(
         self,
@@ -151,38 +318,107 @@ class RefugeWorldStore:
                     self._state,
                     created_at=_utc_iso(created_at),
                 )
-                await atomic_write_json_async(self.path, self._state.to_dict())
-            return deepcopy(self._state)
+                await self._persist_locked()
+            return self._state
 
     async def get_state(self) -> RefugeWorldState:
         async with self._get_lock():
             await self._load_locked()
-            return deepcopy(self._state)
+            return self._state
+
+    async def save_state(
+        self,
+        state: RefugeWorldState,
+        *,
+        removed_event_ids: Collection[str] = (),
+    ) -> RefugeWorldState:
+        """Persist ``state`` and return the stored (windowed) instance.
+
+        ``removed_event_ids`` drops events from the log even when they are
+        older than the in-memory window.
+        """
 
-    async def save_state(self, state: RefugeWorldState) -> RefugeWorldState:
         self._validate_state(state)
         async with self._get_lock():
-            self._state = deepcopy(state)
-            self._loaded = True
-            await atomic_write_json_async(self.path, self._state.to_dict())
-            return deepcopy(self._state)
+            await self._load_locked()
+            self._state = state
+            await self._persist_locked(removed_event_ids)
+            return self._state
+
+    async def events_between(
+        self,
+        start: datetime,
+        end: datetime,
+    ) -> tuple[RefugeHistoricalEvent, ...]:
+        """Return persisted events in ``[start, end)``, newest first.
+
+        Served by the event log time index instead of scanning the world.
+        """
+
+        async with self._get_lock():
+            await self._load_locked()
+            revision = self._event_revision
+            if revision == 0:
+                return ()
+            events = await asyncio.to_thread(
+                self.event_log.events_between,
+                start,
+                end,
+                revision=revision,
+            )
+        return tuple(events)
+
+    async def find_events(
+        self,
+        *,
+        building_id: str | None = None,
+        user_id: int | None = None,
+        type_suffix: str | None = None,
+        limit: int | None = None,
+    ) -> tuple[RefugeHistoricalEvent, ...]:
+        """Return persisted events matching the filters, newest first.
+
+        Reads the whole history from the event log, for the views that show
+        more than the in-memory window. See :meth:`RefugeEventLog.find`.
+        """
+
+        async with self._get_lock():
+            await self._load_locked()
+            revision = self._event_revision
+            if revision == 0:
+                return ()
+            events = await asyncio.to_thread(
+                self.event_log.find,
+                revision=revision,
+                building_id=building_id,
+                user_id=user_id,
+                type_suffix=type_suffix,
+                limit=limit,
+            )
+        return tuple(events)
 
     async def update_state(
         self,
         updater: Callable[[RefugeWorldState], RefugeWorldState],
+        *,
+        removed_event_ids: Collection[str] = (),
     ) -> RefugeWorldState:
-        """Atomically transform and persist the latest Refuge world state."""
+        """Atomically transform and persist the latest Refuge world state.
+
+        ``removed_event_ids`` is applied only when the updater changes the
+        state, see :meth:`save_state`.
+        """
 
         async with self._get_lock():
             await self._load_locked()
-            updated = updater(deepcopy(self._state))
+            updated = updater(self._state)
             if not isinstance(updated, RefugeWorldState):
                 raise TypeError("Refuge world updater must return RefugeWorldState")
             self._validate_state(updated)
-            if updated != self._state:
-                self._state = deepcopy(updated)
-                await atomic_write_json_async(self.path, self._state.to_dict())
-            return deepcopy(self._state)
+            if updated is not self._state and updated != self._state:
+                self._state = updated
+                await self._persist_locked(removed_event_ids)
+            return self._state
 
 
 refuge_world_store = RefugeWorldStore()
@@ -190,6 +426,7 @@ refuge_world_store = RefugeWorldStore()
 
 __all__ = [
     "REFUGE_WORLD_FILE",
+    "REFUGE_WORLD_RECENT_EVENTS",
     "RefugeWorldSchemaError",
     "RefugeWorldStore",
     "refuge_world_store",
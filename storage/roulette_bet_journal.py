@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+from config import DATA_DIR
+
+
+logger = logging.getLogger(__name__)
+ROULETTE_BET_JOURNAL_FILE = Path(DATA_DIR) / "pari_xp_journal.jsonl"
+
+
+class RouletteBetJournal:
+    """Append-only journal of settled roulette bets.
+
+    ``PariXPCog`` appends one small line per bet instead of rewriting the full
+    ``pari_xp_state.json``. Every entry carries a monotonically increasing
+    ``seq``; the cog periodically compacts its in-memory state into the JSON
+    document together with the last applied ``seq`` and then drops the
+    compacted prefix. Replay skips entries already covered by the document, so
+    a crash between the two steps never double-counts a bet.
+
+    Appends are flushed to the OS without ``fsync``: they survive a process
+    crash, and the periodic compaction provides the durable checkpoint.
+    """
+
+    def __init__(self, path: str | Path = ROULETTE_BET_JOURNAL_FILE) -> None:
+        self.path = Path(path)
+        # Appends run in worker threads; compaction must not replace the file
+        # while a line is being written to the previous inode.
+        self._file_lock = threading.Lock()
+
+    def _append_sync(self, line: str) -> None:
+        with self._file_lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+                handle.flush()
+
+    async def append(self, entry: dict[str, Any]) -> None:
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        await asyncio.to_thread(self._append_sync, line)
+
+    def read_after(self, seq: int) -> list[dict[str, Any]]:
+        """Return valid entries with ``seq`` greater than ``seq``, in order.
+
+        This is a blocking startup helper; a truncated last line left by a
+        crash mid-write is ignored.
+        """
+
+        try:
+            raw_lines = self.path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return []
+        except OSError:
+            logger.exception("[PariXP] bet journal unreadable: %s", self.path)
+            return []
+        entries: list[dict[str, Any]] = []
+        for line in raw_lines:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                entry_seq = int(entry["seq"])
+            except (ValueError, TypeError, KeyError):
+                logger.warning("[PariXP] ignoring malformed bet journal line")
+                continue
+            if entry_seq > seq:
+                entries.append(entry)
+        entries.sort(key=lambda item: int(item["seq"]))
+        return entries
+
+    def _compact_sync(self, through_seq: int) -> int:
+        with self._file_lock:
+            remaining = self.read_after(through_seq)
+            if not remaining:
+                try:
+                    os.remove(self.path)
+                except FileNotFoundError:
+                    pass
+                return 0
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent))
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    for entry in remaining:
+                        handle.write(
+                            json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+                            + "\n"
+                        )
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                os.replace(tmp_path, self.path)
+            finally:
+                try:
+                    os.remove(tmp_path)
+                except FileNotFoundError:
+                    pass
+            return len(remaining)
+
+    async def compact(self, through_seq: int) -> int:
+        """Drop entries already checkpointed; return how many remain."""
+
+        return await asyncio.to_thread(self._compact_sync, int(through_seq))
+
+
+__all__ = ["ROULETTE_BET_JOURNAL_FILE", "RouletteBetJournal"]
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 import sqlite3
+from collections import deque
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
@@ -11,6 +13,9 @@ from storage.db import DB_PATH
 
 ROULETTE_HISTORY_RETENTION_DAYS = 30
 ROULETTE_SPOTLIGHT_WINDOW_HOURS = 24
+ROULETTE_RECENT_MAX_LIMIT = 12
+ROULETTE_STREAK_SCAN_LIMIT = 32
+ROULETTE_PRUNE_BATCH_SIZE = 500
 VALID_BET_TYPES = frozenset({"red", "black", "even", "odd", "number"})
 
 
@@ -21,13 +26,170 @@ def _aware_utc(at: datetime | None = None) -> datetime:
     return moment.astimezone(timezone.utc)
 
 
+class _LivingRouletteModel:
+    """Incrementally maintained living-panel snapshot for one time window.
+
+    Reproduces the SQL snapshot exactly: a ring of the latest events, per-user
+    rolling totals over the window (events are kept in a FIFO and subtracted
+    when they leave it), lazily invalidated heaps for the spotlight player and
+    the biggest win, and the current win/loss streak.
+    """
+
+    def __init__(self, window: timedelta) -> None:
+        self.window = window
+        self.recent: deque[dict[str, Any]] = deque(maxlen=ROULETTE_RECENT_MAX_LIMIT)
+        self.streak_won: bool | None = None
+        self.streak_count = 0
+        self._window_events: deque[tuple[datetime, dict[str, Any]]] = deque()
+        # user_id -> [bets, wins, wagered_xp, payout_xp]
+        self._user_totals: dict[int, list[int]] = {}
+        self._user_versions: dict[int, int] = {}
+        self._spotlight_heap: list[tuple[int, int, int, int, int, int]] = []
+        self._biggest_heap: list[tuple[int, float, int, dict[str, Any]]] = []
+        self._snapshots: dict[int, dict[str, Any]] = {}
+
+    def _touch_user(self, user_id: int) -> None:
+        version = self._user_versions.get(user_id, 0) + 1
+        self._user_versions[user_id] = version
+        totals = self._user_totals.get(user_id)
+        if totals is None:
+            return
+        bets, wins, wagered, payout = totals
+        heapq.heappush(
+            self._spotlight_heap,
+            (-(payout - wagered), -payout, -wins, bets, user_id, version),
+        )
+        if len(self._spotlight_heap) > 4 * len(self._user_totals) + 64:
+            self._rebuild_spotlight_heap()
+
+    def _rebuild_spotlight_heap(self) -> None:
+        self._spotlight_heap = [
+            (
+                -(payout - wagered),
+                -payout,
+                -wins,
+                bets,
+                user_id,
+                self._user_versions.get(user_id, 0),
+            )
+            for user_id, (bets, wins, wagered, payout) in self._user_totals.items()
+        ]
+        heapq.heapify(self._spotlight_heap)
+
+    def add(self, event: dict[str, Any], occurred: datetime, *, in_window: bool) -> None:
+        self.recent.append(event)
+        won = bool(event["won"])
+        if self.streak_won is won:
+            self.streak_count += 1
+        else:
+            self.streak_won = won
+            self.streak_count = 1
+        if in_window:
+            self._add_to_window(event, occurred)
+        self._snapshots.clear()
+
+    def _add_to_window(self, event: dict[str, Any], occurred: datetime) -> None:
+        self._window_events.append((occurred, event))
+        user_id = int(event["user_id"])
+        totals = self._user_totals.setdefault(user_id, [0, 0, 0, 0])
+        totals[0] += 1
+        totals[1] += 1 if event["won"] else 0
+        totals[2] += int(event["wager_xp"])
+        totals[3] += int(event["payout_xp"])
+        self._touch_user(user_id)
+        if event["won"] and int(event["payout_xp"]) > 0:
+            heapq.heappush(
+                self._biggest_heap,
+                (
+                    -int(event["payout_xp"]),
+                    -occurred.timestamp(),
+                    -int(event["id"]),
+                    event,
+                ),
+            )
+
+    def expire(self, now: datetime) -> None:
+        cutoff = now - self.window
+        changed = False
+        while self._window_events and self._window_events[0][0] < cutoff:
+            _occurred, event = self._window_events.popleft()
+            user_id = int(event["user_id"])
+            totals = self._user_totals[user_id]
+            totals[0] -= 1
+            totals[1] -= 1 if event["won"] else 0
+            totals[2] -= int(event["wager_xp"])
+            totals[3] -= int(event["payout_xp"])
+            if totals[0] <= 0:
+                del self._user_totals[user_id]
+                self._user_versions.pop(user_id, None)
+            else:
+                self._touch_user(user_id)
+            changed = True
+        cutoff_ts = cutoff.timestamp()
+        while self._biggest_heap and -self._biggest_heap[0][1] < cutoff_ts:
+            heapq.heappop(self._biggest_heap)
+            changed = True
+        if changed:
+            self._snapshots.clear()
+
+    def _spotlight(self) -> dict[str, Any] | None:
+        heap = self._spotlight_heap
+        while heap:
+            _net, _payout, _wins, _bets, user_id, version = heap[0]
+            if self._user_versions.get(user_id) == version and user_id in self._user_totals:
+                break
+            heapq.heappop(heap)
+        if not heap:
+            return None
+        user_id = heap[0][4]
+        bets, wins, wagered, payout = self._user_totals[user_id]
+        if payout - wagered <= 0:
+            return None
+        return {
+            "user_id": user_id,
+            "bets": bets,
+            "wins": wins,
+            "wagered_xp": wagered,
+            "payout_xp": payout,
+            "net_xp": payout - wagered,
+        }
+
+    def snapshot(self, recent_limit: int) -> dict[str, Any]:
+        cached = self._snapshots.get(recent_limit)
+        if cached is not None:
+            return cached
+        streak: dict[str, Any] | None = None
+        count = min(self.streak_count, ROULETTE_STREAK_SCAN_LIMIT)
+        if self.streak_won is not None and count >= 3:
+            streak = {
+                "side": "players" if self.streak_won else "house",
+                "count": count,
+            }
+        recent = list(self.recent)[-recent_limit:]
+        recent.reverse()
+        snapshot = {
+            "recent": recent,
+            "spotlight": self._spotlight(),
+            "biggest_win": self._biggest_heap[0][3] if self._biggest_heap else None,
+            "streak": streak,
+        }
+        self._snapshots[recent_limit] = snapshot
+        return snapshot
+
+
 class RouletteHistoryStore:
-    """SQLite-backed recent roulette history used by the living casino panel."""
+    """SQLite-backed recent roulette history used by the living casino panel.
+
+    The living snapshot for the default spotlight window is served from memory
+    once hydrated from SQLite and is updated by every ``record_event``; retention
+    pruning runs separately through :meth:`prune_expired`.
+    """
 
     def __init__(self, path: str | Path = DB_PATH) -> None:
         self.path = Path(path)
         self._lock = asyncio.Lock()
         self._initialized = False
+        self._living: _LivingRouletteModel | None = None
 
     def _connect(self) -> sqlite3.Connection:
         connection = sqlite3.connect(self.path, timeout=5.0)
@@ -93,7 +255,6 @@ class RouletteHistoryStore:
         selected_number: int | None,
         drawn_number: int | None,
         occurred_at: str,
-        retention_cutoff: str,
     ) -> int:
         with self._connect() as connection:
             connection.execute("BEGIN IMMEDIATE")
@@ -123,10 +284,6 @@ class RouletteHistoryStore:
                     occurred_at,
                 ),
             )
-            connection.execute(
-                "DELETE FROM roulette_events WHERE occurred_at < ?",
-                (retention_cutoff,),
-            )
             connection.commit()
             return int(cursor.lastrowid)
 
@@ -158,10 +315,10 @@ class RouletteHistoryStore:
             raise ValueError("zero_hit cannot have a non-zero drawn_number")
 
         now = _aware_utc(at)
-        cutoff = now - timedelta(days=ROULETTE_HISTORY_RETENTION_DAYS)
         await self.start()
         async with self._lock:
-            return await asyncio.to_thread(
+            living = await self._living_model_locked(now)
+            event_id = await asyncio.to_thread(
                 self._record_sync,
                 int(user_id),
                 normalized_type,
@@ -172,8 +329,118 @@ class RouletteHistoryStore:
                 selected,
                 drawn,
                 now.isoformat(),
-                cutoff.isoformat(),
             )
+            living.add(
+                {
+                    "id": event_id,
+                    "user_id": int(user_id),
+                    "bet_type": normalized_type,
+                    "wager_xp": wager,
+                    "payout_xp": payout,
+                    "won": bool(won),
+                    "zero_hit": bool(zero_hit),
+                    "selected_number": selected,
+                    "drawn_number": drawn,
+                    "occurred_at": now.isoformat(),
+                },
+                now,
+                in_window=True,
+            )
+            return event_id
+
+    def _living_rows_sync(
+        self,
+        cutoff: str,
+    ) -> tuple[list[sqlite3.Row], list[sqlite3.Row]]:
+        with self._connect() as connection:
+            latest_rows = connection.execute(
+                """
+                SELECT *
+                FROM roulette_events
+                ORDER BY occurred_at DESC, id DESC
+                LIMIT ?
+                """,
+                (ROULETTE_STREAK_SCAN_LIMIT,),
+            ).fetchall()
+            window_rows = connection.execute(
+                """
+                SELECT *
+                FROM roulette_events
+                WHERE occurred_at >= ?
+                ORDER BY occurred_at ASC, id ASC
+                """,
+                (cutoff,),
+            ).fetchall()
+        return latest_rows, window_rows
+
+    async def _living_model_locked(self, now: datetime) -> _LivingRouletteModel:
+        if self._living is not None:
+            return self._living
+        window = timedelta(hours=ROULETTE_SPOTLIGHT_WINDOW_HOURS)
+        latest_rows, window_rows = await asyncio.to_thread(
+            self._living_rows_sync,
+            (now - window).isoformat(),
+        )
+        living = _LivingRouletteModel(window)
+        # Replay the latest events oldest-first for the ring and streak, then
+        # the whole window for the rolling aggregates.
+        for row in reversed(latest_rows):
+            living.add(
+                self._event_payload(row),
+                _aware_utc(datetime.fromisoformat(str(row["occurred_at"]))),
+                in_window=False,
+            )
+        for row in window_rows:
+            living._add_to_window(
+                self._event_payload(row),
+                _aware_utc(datetime.fromisoformat(str(row["occurred_at"]))),
+            )
+        self._living = living
+        return living
+
+    def _prune_batch_sync(self, cutoff: str, batch_size: int) -> int:
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            cursor = connection.execute(
+                """
+                DELETE FROM roulette_events
+                WHERE id IN (
+                    SELECT id
+                    FROM roulette_events
+                    WHERE occurred_at < ?
+                    ORDER BY occurred_at ASC
+                    LIMIT ?
+                )
+                """,
+                (cutoff, batch_size),
+            )
+            connection.commit()
+            return int(cursor.rowcount)
+
+    async def prune_expired(
+        self,
+        *,
+        at: datetime | None = None,
+        batch_size: int = ROULETTE_PRUNE_BATCH_SIZE,
+    ) -> int:
+        """Delete events older than the retention period in short batches.
+
+        Each batch is its own transaction so bets recorded meanwhile only wait
+        for one small ``DELETE`` instead of the whole backlog.
+        """
+
+        cutoff = (
+            _aware_utc(at) - timedelta(days=ROULETTE_HISTORY_RETENTION_DAYS)
+        ).isoformat()
+        size = max(1, int(batch_size))
+        await self.start()
+        deleted = 0
+        while True:
+            async with self._lock:
+                removed = await asyncio.to_thread(self._prune_batch_sync, cutoff, size)
+            deleted += removed
+            if removed < size:
+                return deleted
 
     @staticmethod
     def _event_payload(row: sqlite3.Row) -> dict[str, Any]:
@@ -293,15 +560,30 @@ class RouletteHistoryStore:
         window_hours: int = ROULETTE_SPOTLIGHT_WINDOW_HOURS,
         at: datetime | None = None,
     ) -> dict[str, Any]:
+        """Return the living-panel snapshot.
+
+        The default window is answered from the in-memory model; the returned
+        mapping is shared between callers and must be treated as read-only.
+        Any other window still runs the SQL aggregation.
+        """
+
         now = _aware_utc(at)
-        cutoff = now - timedelta(hours=max(1, int(window_hours)))
-        limit = max(1, min(12, int(recent_limit)))
+        hours = max(1, int(window_hours))
+        limit = max(1, min(ROULETTE_RECENT_MAX_LIMIT, int(recent_limit)))
         await self.start()
-        return await asyncio.to_thread(
-            self._snapshot_sync,
-            limit,
-            cutoff.isoformat(),
-        )
+        if hours != ROULETTE_SPOTLIGHT_WINDOW_HOURS:
+            cutoff = now - timedelta(hours=hours)
+            return await asyncio.to_thread(
+                self._snapshot_sync,
+                limit,
+                cutoff.isoformat(),
+            )
+        living = self._living
+        if living is None:
+            async with self._lock:
+                living = await self._living_model_locked(now)
+        living.expire(now)
+        return living.snapshot(limit)
 
 
 roulette_history_store = RouletteHistoryStore()
@@ -1,27 +1,111 @@
 from __future__ import annotations
 
-import asyncio
-import weakref
-from copy import deepcopy
+import bisect
+from collections import Counter
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Mapping
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping
 
 from config import DATA_DIR
-from utils.persistence import atomic_write_json_async, read_json_safe
-from utils.seasons import SEASON_FIELDS, season_id_for, season_label
+from storage.snapshot_store import JsonSnapshotStore
+from utils.frozen import freeze
+from utils.seasons import SEASON_FIELDS, rank_rows, season_id_for, season_label
 
 
 SEASON_STATS_FILE = Path(DATA_DIR) / "season_stats.json"
 
 
-class SeasonStore:
+def compute_season_totals(
+    seasons: Mapping[str, Any],
+) -> tuple[dict[str, Counter[str]], Counter[str]]:
+    """Sum every user field per season and across all seasons from scratch.
+
+    Non-numeric values are skipped, matching the historical aggregation
+    helpers. ``SeasonStore`` keeps the same totals incrementally; this function
+    is the reference used to rebuild them on load and to verify them in tests.
+    """
+
+    per_season: dict[str, Counter[str]] = {}
+    all_time: Counter[str] = Counter()
+    for season_id, season in seasons.items():
+        totals: Counter[str] = Counter()
+        users = season.get("users", {}) if isinstance(season, Mapping) else {}
+        if isinstance(users, Mapping):
+            for payload in users.values():
+                if not isinstance(payload, Mapping):
+                    continue
+                for field, value in payload.items():
+                    try:
+                        totals[field] += int(value)
+                    except (TypeError, ValueError):
+                        continue
+        per_season[str(season_id)] = totals
+        all_time.update(totals)
+    return per_season, all_time
+
+
+class SeasonRankIndex:
+    """Sorted ``(value, user_id)`` rows of one season metric.
+
+    Rows follow :func:`utils.seasons.rank_rows` exactly (same eligibility and
+    ``(value, user_id)`` descending order) but are kept ascending so a rank is
+    one binary search instead of a full sort. Updates are a bisect plus a list
+    insert/delete, which is a ``memmove`` even for tens of thousands of rows.
+    """
+
+    __slots__ = ("field", "_rows")
+
+    def __init__(self, field: str, users: Mapping[str, Any]) -> None:
+        self.field = field
+        self._rows: list[tuple[int, str]] = sorted(
+            (value, user_id) for user_id, value in rank_rows(users, field)
+        )
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _row(self, user_id: str, payload: Any) -> tuple[int, str] | None:
+        rows = rank_rows({user_id: payload}, self.field)
+        if not rows:
+            return None
+        return rows[0][1], rows[0][0]
+
+    def discard(self, user_id: str, payload: Any) -> None:
+        row = self._row(user_id, payload)
+        if row is None:
+            return
+        index = bisect.bisect_left(self._rows, row)
+        if index < len(self._rows) and self._rows[index] == row:
+            del self._rows[index]
+
+    def add(self, user_id: str, payload: Any) -> None:
+        row = self._row(user_id, payload)
+        if row is not None:
+            bisect.insort(self._rows, row)
+
+    def rank(self, user_id: str, payload: Any) -> int | None:
+        """Return the 1-based rank of ``user_id``, or ``None`` when unranked."""
+
+        row = self._row(user_id, payload)
+        if row is None:
+            return None
+        index = bisect.bisect_left(self._rows, row)
+        if index >= len(self._rows) or self._rows[index] != row:
+            return None
+        return len(self._rows) - index
+
+
+def _index_affected(field: str, increments: Mapping[str, int]) -> bool:
+    # casino_net eligibility depends on casino_bets, see rank_rows.
+    return field in increments or (field == "casino_net" and "casino_bets" in increments)
+
+
+class SeasonStore(JsonSnapshotStore):
     """In-memory seasonal counters with periodic atomic persistence."""
 
     def __init__(self, path: str | Path = SEASON_STATS_FILE) -> None:
-        self.path = Path(path)
-        self._loaded = False
-        self._dirty = False
+        super().__init__(path)
         self._data: dict[str, Any] = {
             "schema_version": 1,
             "tracking_started_at": None,
@@ -29,22 +113,23 @@ class SeasonStore:
             "casino_baseline": {},
             "seasons": {},
         }
-        self._locks: weakref.WeakKeyDictionary[
-            asyncio.AbstractEventLoop, asyncio.Lock
-        ] = weakref.WeakKeyDictionary()
-
-    def _get_lock(self) -> asyncio.Lock:
-        loop = asyncio.get_running_loop()
-        lock = self._locks.get(loop)
-        if lock is None:
-            lock = asyncio.Lock()
-            self._locks[loop] = lock
-        return lock
+        # Running field totals, maintained by _apply_increments_locked so that
+        # goal evaluation never rescans every season and user.
+        self._season_totals: dict[str, Counter[str]] = {}
+        self._all_time_totals: Counter[str] = Counter()
+        # Rank indexes per (season_id, field), built on first lookup and then
+        # maintained by _apply_increments_locked.
+        self._rank_indexes: dict[tuple[str, str], SeasonRankIndex] = {}
+        # Frozen season views shared by readers. Each view wraps the frozen
+        # per-user payloads of ``_season_users``; an increment replaces only
+        # the changed user's entry there instead of re-freezing the season.
+        self._season_views: dict[str, Any] = {}
+        self._season_users: dict[str, dict[str, Any]] = {}
 
     async def _load_locked(self) -> None:
         if self._loaded:
             return
-        raw = await asyncio.to_thread(read_json_safe, self.path, {})
+        raw = await self._read_locked({})
         seasons: dict[str, Any] = {}
         casino_baseline: dict[str, Any] = {}
         casino_baseline_initialized = False
@@ -77,6 +162,11 @@ class SeasonStore:
             "casino_baseline": casino_baseline,
             "seasons": seasons,
         }
+        self._season_totals, self._all_time_totals = compute_season_totals(seasons)
+        self._rank_indexes = {}
+        self._season_views = {}
+        self._season_users = {}
+        self._mark_changed_locked()
         self._loaded = True
 
     async def load(self) -> None:
@@ -93,9 +183,8 @@ class SeasonStore:
                 return str(current)
             current = datetime.now(timezone.utc).isoformat()
             self._data["tracking_started_at"] = current
-            self._dirty = True
-            await atomic_write_json_async(self.path, self._data)
-            self._dirty = False
+            self._mark_dirty_locked()
+            await self._write_locked()
             return current
 
     def _apply_increments_locked(
@@ -118,10 +207,26 @@ class SeasonStore:
             },
         )
         users = season.setdefault("users", {})
-        payload = users.setdefault(str(user_id), {})
+        user_key = str(user_id)
+        payload = users.setdefault(user_key, {})
+        indexes = [
+            index
+            for (indexed_season, field), index in self._rank_indexes.items()
+            if indexed_season == season_id and _index_affected(field, increments)
+        ]
+        for index in indexes:
+            index.discard(user_key, payload)
+        season_totals = self._season_totals.setdefault(season_id, Counter())
         for field, value in increments.items():
             payload[field] = int(payload.get(field, 0)) + int(value)
-        self._dirty = True
+            season_totals[field] += int(value)
+            self._all_time_totals[field] += int(value)
+        for index in indexes:
+            index.add(user_key, payload)
+        frozen_users = self._season_users.get(season_id)
+        if frozen_users is not None:
+            frozen_users[user_key] = freeze(payload)
+        self._mark_dirty_locked()
 
     async def record(
         self,
@@ -133,14 +238,29 @@ class SeasonStore:
     ) -> None:
         """Add one or more metric deltas to a season without immediate disk I/O."""
 
-        normalized: dict[str, int] = {}
-        for field, raw_value in increments.items():
-            if field not in SEASON_FIELDS:
-                raise ValueError(f"unsupported season metric: {field}")
-            value = int(raw_value)
-            if value:
-                normalized[field] = value
-        if not normalized:
+        await self.record_many([(user_id, increments)], season_id=season_id, at=at)
+
+    async def record_many(
+        self,
+        entries: Iterable[tuple[int, Mapping[str, int]]],
+        *,
+        season_id: str | None = None,
+        at: datetime | None = None,
+    ) -> None:
+        """Apply ``(user_id, increments)`` pairs under one lock acquisition."""
+
+        batch: list[tuple[int, dict[str, int]]] = []
+        for user_id, increments in entries:
+            normalized: dict[str, int] = {}
+            for field, raw_value in increments.items():
+                if field not in SEASON_FIELDS:
+                    raise ValueError(f"unsupported season metric: {field}")
+                value = int(raw_value)
+                if value:
+                    normalized[field] = value
+            if normalized:
+                batch.append((user_id, normalized))
+        if not batch:
             return
 
         resolved_season_id = season_id or season_id_for(at)
@@ -151,12 +271,13 @@ class SeasonStore:
 
         async with self._get_lock():
             await self._load_locked()
-            self._apply_increments_locked(
-                user_id,
-                resolved_season_id,
-                timestamp,
-                normalized,
-            )
+            for user_id, normalized in batch:
+                self._apply_increments_locked(
+                    user_id,
+                    resolved_season_id,
+                    timestamp,
+                    normalized,
+                )
 
     async def sync_casino_totals(
         self,
@@ -200,7 +321,7 @@ class SeasonStore:
                 previous = baseline.get(str(user_id))
                 baseline[str(user_id)] = current
                 if initializing:
-                    self._dirty = True
+                    self._mark_dirty_locked()
                     continue
                 if not isinstance(previous, dict):
                     previous = {"bets": 0, "wagered": 0, "winnings": 0}
@@ -214,13 +335,13 @@ class SeasonStore:
                         previous.get("winnings", 0)
                     )
                 except (TypeError, ValueError):
-                    self._dirty = True
+                    self._mark_dirty_locked()
                     continue
 
                 # A reset/corruption of the source should reset the baseline,
                 # never fabricate negative seasonal activity.
                 if delta_bets < 0 or delta_wagered < 0 or delta_winnings < 0:
-                    self._dirty = True
+                    self._mark_dirty_locked()
                     continue
                 if delta_bets == 0 and delta_wagered == 0 and delta_winnings == 0:
                     continue
@@ -237,37 +358,138 @@ class SeasonStore:
 
             if initializing:
                 self._data["casino_baseline_initialized"] = True
-                self._dirty = True
+                self._mark_dirty_locked()
+
+    async def get_season(self, season_id: str) -> Mapping[str, Any] | None:
+        """Return a shared read-only view of one season.
+
+        The season is frozen once; later increments swap in the changed user's
+        frozen payload, so the view follows the live counters and a read never
+        copies every user again. Iterate it without awaiting in between.
+        """
 
-    async def get_season(self, season_id: str) -> dict[str, Any] | None:
         async with self._get_lock():
             await self._load_locked()
             payload = self._data["seasons"].get(season_id)
-            return deepcopy(payload) if isinstance(payload, dict) else None
+            if not isinstance(payload, dict):
+                return None
+            view = self._season_views.get(season_id)
+            if view is None:
+                users = payload.get("users")
+                frozen_users = {
+                    str(user_id): freeze(values)
+                    for user_id, values in (
+                        users.items() if isinstance(users, dict) else ()
+                    )
+                }
+                fields = {
+                    str(key): freeze(value)
+                    for key, value in payload.items()
+                    if key != "users"
+                }
+                fields["users"] = MappingProxyType(frozen_users)
+                view = MappingProxyType(fields)
+                self._season_users[season_id] = frozen_users
+                self._season_views[season_id] = view
+            return view
+
+    async def get_season_user(
+        self,
+        season_id: str,
+        user_id: int | str,
+    ) -> dict[str, Any] | None:
+        """Return a copy of one user's counters without copying the season."""
+
+        async with self._get_lock():
+            await self._load_locked()
+            season = self._data["seasons"].get(season_id)
+            users = season.get("users") if isinstance(season, dict) else None
+            payload = users.get(str(user_id)) if isinstance(users, dict) else None
+            return dict(payload) if isinstance(payload, dict) else None
+
+    async def user_ranks(
+        self,
+        season_id: str,
+        user_id: int | str,
+        fields: tuple[str, ...],
+    ) -> dict[str, int | None]:
+        """Return ``user_id``'s rank per field, as ``rank_rows`` would order it.
+
+        The first lookup of a (season, field) pair builds its index in one
+        sort; later lookups and increments are logarithmic searches.
+        """
+
+        async with self._get_lock():
+            await self._load_locked()
+            season = self._data["seasons"].get(season_id)
+            users = season.get("users") if isinstance(season, dict) else None
+            if not isinstance(users, dict):
+                return {field: None for field in fields}
+            user_key = str(user_id)
+            payload = users.get(user_key)
+            ranks: dict[str, int | None] = {}
+            for field in fields:
+                index = self._rank_indexes.get((season_id, field))
+                if index is None:
+                    index = SeasonRankIndex(field, users)
+                    self._rank_indexes[(season_id, field)] = index
+                ranks[field] = index.rank(user_key, payload)
+            return ranks
+
+    async def season_metadata(self, season_id: str) -> dict[str, Any] | None:
+        """Return a season's label/start fields without copying its users map."""
+
+        async with self._get_lock():
+            await self._load_locked()
+            payload = self._data["seasons"].get(season_id)
+            if not isinstance(payload, dict):
+                return None
+            return {key: value for key, value in payload.items() if key != "users"}
 
     async def list_seasons(self) -> list[str]:
         async with self._get_lock():
             await self._load_locked()
             return sorted(self._data["seasons"].keys(), reverse=True)
 
-    async def tracking_started_at(self) -> str | None:
+    async def metric_total(self, field: str, *, season_id: str | None = None) -> int:
+        """Return the sum of ``field`` for one season, or all seasons, in O(1)."""
+
         async with self._get_lock():
             await self._load_locked()
-            value = self._data.get("tracking_started_at")
-            return str(value) if value else None
+            if season_id is None:
+                return int(self._all_time_totals.get(field, 0))
+            totals = self._season_totals.get(season_id)
+            return int(totals.get(field, 0)) if totals is not None else 0
+
+    async def verify_totals(self) -> bool:
+        """Check the running totals against a full rebuild of the data."""
 
-    async def flush(self) -> None:
-        """Atomically persist the latest snapshot only when counters changed."""
+        async with self._get_lock():
+            await self._load_locked()
+            per_season, all_time = compute_season_totals(self._data["seasons"])
+            if all_time != self._all_time_totals:
+                return False
+            # Counter equality ignores zero entries, so empty seasons match.
+            return all(
+                per_season.get(season_id, Counter())
+                == self._season_totals.get(season_id, Counter())
+                for season_id in per_season.keys() | self._season_totals.keys()
+            )
 
+    async def tracking_started_at(self) -> str | None:
         async with self._get_lock():
             await self._load_locked()
-            if not self._dirty:
-                return
-            await atomic_write_json_async(self.path, self._data)
-            self._dirty = False
+            value = self._data.get("tracking_started_at")
+            return str(value) if value else None
 
 
 season_store = SeasonStore()
 
 
-__all__ = ["SEASON_STATS_FILE", "SeasonStore", "season_store"]
+__all__ = [
+    "SEASON_STATS_FILE",
+    "SeasonRankIndex",
+    "SeasonStore",
+    "compute_season_totals",
+    "season_store",
+]
@@ -0,0 +1,190 @@
+"""Shared core for the in-memory JSON document stores.
+
+Each store keeps one JSON document in memory, loads it lazily under a
+loop-aware lock and persists it atomically with a ``.bak`` copy. This module
+factors that pattern out and adds what the hand-rolled versions lacked:
+
+* whole-document reads share one frozen snapshot per version instead of a
+  ``deepcopy`` per call (see :func:`utils.frozen.freeze`);
+* documents are written with the store's ``json_profile`` (compact JSON by
+  default), and an encoded payload identical to the last persisted one is
+  not rewritten;
+* stores whose writes may lag can mark themselves dirty and let a debounced
+  task flush them;
+* load and write durations and byte counts are tracked per store in
+  :class:`StoreStats`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+import weakref
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from utils.background_tasks import background_tasks
+from utils.frozen import freeze
+from utils.persistence import (
+    COMPACT,
+    JsonProfile,
+    atomic_write_bytes_async,
+    decode_json,
+    encode_json,
+    read_json_safe,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _read_document(path: Path, default: Any) -> tuple[Any, int]:
+    try:
+        payload = path.read_bytes()
+        return decode_json(payload), len(payload)
+    except (OSError, ValueError):
+        # Missing or corrupted primary: let read_json_safe log it and try the
+        # backup with the historical semantics.
+        return read_json_safe(path, default), 0
+
+
+@dataclass(slots=True)
+class StoreStats:
+    """Cumulative I/O counters of one store."""
+
+    loads: int = 0
+    load_seconds: float = 0.0
+    bytes_read: int = 0
+    writes: int = 0
+    write_seconds: float = 0.0
+    bytes_written: int = 0
+    skipped_writes: int = 0
+
+
+class JsonSnapshotStore(ABC):
+    """Base class for a lazily loaded, atomically persisted JSON document.
+
+    Subclasses implement ``_load_locked`` with :meth:`_read_locked`, keep the
+    document in ``self._data`` and call :meth:`_mark_changed_locked` after
+    every in-memory mutation. They then either persist at once with
+    :meth:`_write_locked` or call :meth:`_mark_dirty_locked` and rely on
+    :meth:`flush` (explicit, or debounced when ``flush_delay`` is set).
+    """
+
+    flush_delay: float | None = None
+    json_profile: JsonProfile = COMPACT
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._loaded = False
+        self._dirty = False
+        self._data: Any = {}
+        self._version = 0
+        self._snapshot: Any = None
+        self._snapshot_version = -1
+        self._persisted_digest: bytes | None = None
+        self._flush_task: asyncio.Task[None] | None = None
+        self.stats = StoreStats()
+        self._locks: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Lock
+        ] = weakref.WeakKeyDictionary()
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[loop] = lock
+        return lock
+
+    @abstractmethod
+    async def _load_locked(self) -> None:
+        """Load the document into ``self._data`` once; the lock is held."""
+
+    async def _read_locked(self, default: Any = None) -> Any:
+        """Read and decode the persisted document, ``default`` when absent."""
+
+        started = time.perf_counter()
+        raw, size = await asyncio.to_thread(_read_document, self.path, default)
+        self.stats.loads += 1
+        self.stats.load_seconds += time.perf_counter() - started
+        self.stats.bytes_read += size
+        return raw
+
+    def _persisted_document(self) -> Any:
+        """Return the JSON document to persist; ``self._data`` by default."""
+
+        return self._data
+
+    async def _write_locked(self, document: Any = None) -> bool:
+        """Persist ``document``, or the current one, unless it is unchanged."""
+
+        if document is None:
+            document = self._persisted_document()
+        started = time.perf_counter()
+        payload = await asyncio.to_thread(encode_json, document, self.json_profile)
+        digest = hashlib.sha256(payload).digest()
+        if digest == self._persisted_digest:
+            self.stats.skipped_writes += 1
+            self._dirty = False
+            return False
+        await atomic_write_bytes_async(self.path, payload)
+        self._persisted_digest = digest
+        self._dirty = False
+        self.stats.writes += 1
+        self.stats.write_seconds += time.perf_counter() - started
+        self.stats.bytes_written += len(payload)
+        return True
+
+    def _mark_changed_locked(self) -> None:
+        self._version += 1
+
+    def _mark_dirty_locked(self) -> None:
+        self._mark_changed_locked()
+        self._dirty = True
+        if self.flush_delay is None:
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = background_tasks.create_task(
+                self._flush_later(), name=f"store-flush:{self.path.name}"
+            )
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_delay or 0)
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("deferred flush of %s failed", self.path)
+
+    def _frozen_locked(self) -> Any:
+        """Return the shared frozen snapshot of the current document."""
+
+        if self._snapshot_version != self._version:
+            self._snapshot = freeze(self._data)
+            self._snapshot_version = self._version
+        return self._snapshot
+
+    async def flush(self) -> None:
+        """Persist pending changes, if any."""
+
+        async with self._get_lock():
+            if not self._loaded or not self._dirty:
+                return
+            await self._write_locked()
+
+    async def aclose(self) -> None:
+        """Cancel a scheduled flush and persist pending changes now."""
+
+        task, self._flush_task = self._flush_task, None
+        if task is not None and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+        await self.flush()
+
+
+__all__ = [
+    "JsonSnapshotStore",
+    "StoreStats",
+]
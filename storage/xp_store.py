@@ -2,12 +2,16 @@
 
 import asyncio
 import logging
+import heapq
 import math
 import os
+import time
 from collections import defaultdict
+from collections.abc import Iterator, Mapping, MutableMapping
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, TypedDict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, TypedDict
 
 from config import DATA_DIR
 from storage.db import SQLiteDatabase, database
@@ -30,6 +34,35 @@ def _parse_utc_datetime(value: str) -> datetime:
     return parsed.astimezone(timezone.utc)
 
 
+# ``time.monotonic()`` + anchor = wall-clock epoch seconds, for the lifetime of
+# the process. Access ticks are stored as monotonic ints and only rendered as
+# ISO strings when a payload is built or persisted.
+_WALL_ANCHOR = time.time() - time.monotonic()
+
+
+def _access_tick() -> int:
+    return int(time.monotonic())
+
+
+def _epoch_from_iso(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return _parse_utc_datetime(str(value)).timestamp()
+    except ValueError:
+        return None
+
+
+def _iso_from_epoch(value: float) -> str:
+    return datetime.fromtimestamp(value, timezone.utc).isoformat()
+
+
+@lru_cache(maxsize=4096)
+def _iso_from_tick(tick: int) -> str:
+    # Ticks have a one-second resolution: a flush renders each second once.
+    return _iso_from_epoch(tick + _WALL_ANCHOR)
+
+
 class XPUserData(TypedDict, total=False):
     xp: int
     level: int
@@ -37,29 +70,224 @@ class XPUserData(TypedDict, total=False):
     last_accessed: str  # Pour le cache LRU manuel
 
 
+class XPRecord:
+    """Runtime XP state of one member.
+
+    ``boost_until`` is the legacy per-user double XP expiry in epoch seconds
+    and ``last_access`` a :func:`time.monotonic` tick; both are ``None`` when
+    unset. :meth:`payload` renders the historical :class:`XPUserData` shape.
+    """
+
+    __slots__ = ("xp", "level", "boost_until", "last_access")
+
+    def __init__(
+        self,
+        xp: int = 0,
+        level: int = 0,
+        boost_until: Optional[float] = None,
+        last_access: Optional[int] = None,
+    ) -> None:
+        self.xp = xp
+        self.level = level
+        self.boost_until = boost_until
+        self.last_access = last_access
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, Any]) -> "XPRecord":
+        accessed = _epoch_from_iso(payload.get("last_accessed"))
+        return cls(
+            int(payload.get("xp", 0)),
+            int(payload.get("level", 0)),
+            _epoch_from_iso(payload.get("double_xp_until")),
+            None if accessed is None else int(accessed - _WALL_ANCHOR),
+        )
+
+    @property
+    def double_xp_until(self) -> Optional[str]:
+        if self.boost_until is None:
+            return None
+        return _iso_from_epoch(self.boost_until)
+
+    @property
+    def last_accessed(self) -> Optional[str]:
+        if self.last_access is None:
+            return None
+        return _iso_from_tick(self.last_access)
+
+    def payload(self) -> XPUserData:
+        data: XPUserData = {"xp": self.xp, "level": self.level}
+        if self.boost_until is not None:
+            data["double_xp_until"] = _iso_from_epoch(self.boost_until)
+        if self.last_access is not None:
+            data["last_accessed"] = _iso_from_tick(self.last_access)
+        return data
+
+    def row(self, user_id: int) -> Tuple[object, ...]:
+        """Return the ``xp`` table row of this record."""
+        return (
+            user_id,
+            max(0, self.xp),
+            max(0, self.level),
+            self.double_xp_until,
+            self.last_accessed,
+        )
+
+
+def _user_key(key: Any) -> int:
+    try:
+        return int(key)
+    except (TypeError, ValueError):
+        raise KeyError(key) from None
+
+
+class XPRecordView(MutableMapping[str, Any]):
+    """Dict-like view of one :class:`XPRecord` for historical callers.
+
+    Writes go to the record and mark the member dirty for the next flush.
+    """
+
+    __slots__ = ("_user_id", "_record", "_dirty")
+
+    def __init__(self, user_id: int, record: XPRecord, dirty: Set[int]) -> None:
+        self._user_id = user_id
+        self._record = record
+        self._dirty = dirty
+
+    def __getitem__(self, key: str) -> Any:
+        record = self._record
+        if key == "xp":
+            return record.xp
+        if key == "level":
+            return record.level
+        if key == "double_xp_until" and record.boost_until is not None:
+            return record.double_xp_until
+        if key == "last_accessed" and record.last_access is not None:
+            return record.last_accessed
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        record = self._record
+        if key == "xp":
+            record.xp = int(value)
+        elif key == "level":
+            record.level = int(value)
+        elif key == "double_xp_until":
+            record.boost_until = _epoch_from_iso(value)
+        elif key == "last_accessed":
+            accessed = _epoch_from_iso(value)
+            record.last_access = (
+                None if accessed is None else int(accessed - _WALL_ANCHOR)
+            )
+        else:
+            raise KeyError(key)
+        self._dirty.add(self._user_id)
+
+    def __delitem__(self, key: str) -> None:
+        record = self._record
+        if key == "double_xp_until" and record.boost_until is not None:
+            record.boost_until = None
+        elif key == "last_accessed" and record.last_access is not None:
+            record.last_access = None
+        else:
+            raise KeyError(key)
+        self._dirty.add(self._user_id)
+
+    def __iter__(self) -> Iterator[str]:
+        yield "xp"
+        yield "level"
+        if self._record.boost_until is not None:
+            yield "double_xp_until"
+        if self._record.last_access is not None:
+            yield "last_accessed"
+
+    def __len__(self) -> int:
+        record = self._record
+        return 2 + (record.boost_until is not None) + (record.last_access is not None)
+
+    def __repr__(self) -> str:
+        return repr(self._record.payload())
+
+
+class XPDataView(MutableMapping[str, XPRecordView]):
+    """``Dict[str, XPUserData]``-compatible view over the int-keyed records."""
+
+    __slots__ = ("_records", "_dirty")
+
+    def __init__(self, records: Dict[int, XPRecord], dirty: Set[int]) -> None:
+        self._records = records
+        self._dirty = dirty
+
+    def __getitem__(self, key: Any) -> XPRecordView:
+        user_id = _user_key(key)
+        return XPRecordView(user_id, self._records[user_id], self._dirty)
+
+    def __setitem__(self, key: Any, value: Mapping[str, Any]) -> None:
+        user_id = _user_key(key)
+        self._records[user_id] = XPRecord.from_payload(value)
+        self._dirty.add(user_id)
+
+    def __delitem__(self, key: Any) -> None:
+        user_id = _user_key(key)
+        del self._records[user_id]
+        self._dirty.discard(user_id)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            return _user_key(key) in self._records
+        except KeyError:
+            return False
+
+    def __iter__(self) -> Iterator[str]:
+        return (str(user_id) for user_id in self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def setdefault(self, key: Any, default: Mapping[str, Any]) -> XPRecordView:  # type: ignore[override]
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def clear(self) -> None:
+        self._records.clear()
+        self._dirty.clear()
+
+    def __repr__(self) -> str:
+        return repr({str(uid): record.payload() for uid, record in self._records.items()})
+
+
+# (user_id, amount, source) : une attribution de :meth:`XPStore.add_xp_many`.
+XPAward = Tuple[int, int, str]
+XPResult = Tuple[int, int, int, int]
+
+MAX_SINGLE_TRANSACTION = 10000
+
+
 class BatchUpdate:
-    """Accumule les mises à jour XP pour traitement par lot."""
+    """Accumule les mises à jour XP pour traitement par lot.
+
+    Aucune méthode n'attend quoi que ce soit : chaque opération est atomique
+    vis-à-vis des autres coroutines et ne nécessite donc pas de verrou.
+    """
 
     def __init__(self) -> None:
         self.pending: Dict[str, int] = defaultdict(int)
-        self.lock = asyncio.Lock()
 
     async def add(self, user_id: str, amount: int) -> None:
-        async with self.lock:
-            self.pending[user_id] += amount
+        self.pending[user_id] += amount
 
     async def flush(self) -> Dict[str, int]:
-        async with self.lock:
-            updates = dict(self.pending)
-            self.pending.clear()
-            return updates
+        updates = dict(self.pending)
+        self.pending.clear()
+        return updates
 
 
 class XPStore:
     """Stockage XP en mémoire avec persistance SQLite transactionnelle.
 
-    ``self.data`` reste la source de vérité runtime afin de préserver tous les
-    contrats historiques des cogs. Au démarrage, l'ancien fichier JSON est
+    L'état runtime est un dictionnaire ``int -> XPRecord`` (enregistrements à
+    ``__slots__``). ``self.data`` en expose une vue ``Dict[str, XPUserData]``
+    afin de préserver tous les contrats historiques des cogs. Au démarrage, l'ancien fichier JSON est
     importé une seule fois dans SQLite, puis SQLite devient la source persistée.
 
     Les instances de test utilisant un chemin personnalisé reçoivent leur propre
@@ -76,7 +304,10 @@ class XPStore:
         database_service: SQLiteDatabase | None = None,
     ) -> None:
         self.path = path
-        self.data: Dict[str, XPUserData] = {}
+        self._records: Dict[int, XPRecord] = {}
+        # Membres modifiés depuis le dernier flush SQLite (upsert ciblé).
+        self._dirty: Set[int] = set()
+        self._data_view = XPDataView(self._records, self._dirty)
         self.lock = asyncio.Lock()
         self.cache_size = cache_size
         self._flush_task: Optional[asyncio.Task] = None
@@ -105,6 +336,49 @@ class XPStore:
             "total_updates": 0,
         }
 
+    @property
+    def data(self) -> XPDataView:
+        """Vue ``Dict[str, XPUserData]`` historique sur les enregistrements."""
+        return self._data_view
+
+    @data.setter
+    def data(self, value: Mapping[str, Mapping[str, Any]]) -> None:
+        if isinstance(value, XPDataView):
+            records = value._records
+        else:
+            records = {
+                _user_key(uid): XPRecord.from_payload(payload)
+                for uid, payload in value.items()
+            }
+        self._records = records
+        self._data_view = XPDataView(records, self._dirty)
+        self._dirty.clear()
+        self._dirty.update(records)
+
+    def get_record(self, user_id: int | str) -> Optional[XPRecord]:
+        """Retourne l'enregistrement vivant d'un membre, sans le créer."""
+        try:
+            return self._records.get(int(user_id))
+        except (TypeError, ValueError):
+            return None
+
+    def iter_levels(self) -> Iterator[Tuple[int, int]]:
+        """Itère ``(user_id, level)`` sans construire de payload."""
+        return ((uid, record.level) for uid, record in self._records.items())
+
+    def _record_locked(self, user_id: int) -> XPRecord:
+        record = self._records.get(user_id)
+        if record is None:
+            self.stats["cache_misses"] += 1
+            record = self._records[user_id] = XPRecord()
+        else:
+            self.stats["cache_hits"] += 1
+        return record
+
+    def _touch_locked(self, user_id: int, record: XPRecord) -> None:
+        record.last_access = _access_tick()
+        self._dirty.add(user_id)
+
     async def start(self) -> None:
         """Charge SQLite et démarre les tâches de fond du store."""
         if self._periodic_task and not self._periodic_task.done():
@@ -115,10 +389,9 @@ class XPStore:
         await self._database.start()
         await self._database.migrate_legacy_xp(self.path)
         loaded_data = await self._database.load_xp()
-        self.data = {
-            str(uid): dict(payload)  # type: ignore[assignment]
-            for uid, payload in loaded_data.items()
-        }
+        self.data = loaded_data
+        # Tout vient d'être lu depuis SQLite : rien à réécrire.
+        self._dirty.clear()
         self._started = True
 
         # ``self.data`` est la source de vérité runtime, pas un cache jetable.
@@ -132,7 +405,7 @@ class XPStore:
         )
         logger.info(
             "XP Store démarré depuis SQLite avec %d utilisateurs",
-            len(self.data),
+            len(self._records),
         )
 
     async def aclose(self) -> None:
@@ -174,11 +447,11 @@ class XPStore:
         no-op afin de garantir l'intégrité des données.
         """
         async with self.lock:
-            if len(self.data) > self.cache_size:
+            if len(self._records) > self.cache_size:
                 logger.debug(
                     "XP cache limit exceeded (%d > %d); preserving all users "
                     "because self.data is persistent state",
-                    len(self.data),
+                    len(self._records),
                     self.cache_size,
                 )
 
@@ -217,12 +490,13 @@ class XPStore:
 
         async with self.lock:
             for uid, amount in updates.items():
-                user = self.data.setdefault(uid, {"xp": 0, "level": 0})
-                old_xp = int(user.get("xp", 0))
-                new_xp = max(0, old_xp + amount)
-                user["xp"] = new_xp
-                user["level"] = self._calc_level(new_xp)
-                user["last_accessed"] = _utc_now().isoformat()
+                user_id = int(uid)
+                record = self._records.get(user_id)
+                if record is None:
+                    record = self._records[user_id] = XPRecord()
+                record.xp = max(0, record.xp + amount)
+                record.level = self._calc_level(record.xp)
+                self._touch_locked(user_id, record)
 
             self.stats["batch_flushes"] += 1
             self.stats["total_updates"] += len(updates)
@@ -252,33 +526,106 @@ class XPStore:
             pass
 
     async def flush(self) -> None:
-        """Persiste un snapshot cohérent de l'état XP courant."""
+        """Persiste un snapshot cohérent de l'état XP courant.
+
+        Une fois le store démarré, seuls les membres modifiés depuis le dernier
+        flush sont upsertés ; les lignes sont construites sous le verrou, donc
+        une mutation postérieure ne peut pas altérer le snapshot en cours.
+        """
         async with self.lock:
-            # Copier également les payloads imbriqués afin qu'une mutation
-            # postérieure au verrou ne puisse pas modifier le snapshot en cours.
-            data_copy: Dict[str, XPUserData] = {
-                uid: dict(payload) for uid, payload in self.data.items()
-            }
             update_count = self.stats["total_updates"]
+            if self._started:
+                dirty = list(self._dirty)
+                self._dirty.clear()
+                rows = [
+                    self._records[uid].row(uid)
+                    for uid in dirty
+                    if uid in self._records
+                ]
+            else:
+                document = {
+                    str(uid): record.payload()
+                    for uid, record in self._records.items()
+                }
+                rows = []
+            user_count = len(self._records)
 
         if self._started:
-            await self._database.upsert_xp(data_copy)
+            try:
+                await self._database.upsert_xp_rows(rows)
+            except BaseException:
+                self._dirty.update(dirty)
+                raise
         else:
             # Compatibilité pour les tests/outils bas niveau qui utilisent un
             # XPStore sans appeler start(). La production démarre toujours le
             # store via RefugeBot.setup_hook() et persiste donc dans SQLite.
-            await atomic_write_json_async(self.path, data_copy)
+            await atomic_write_json_async(self.path, document)
 
         self._last_flushed_update_count = max(
             self._last_flushed_update_count,
             update_count,
         )
         logger.info(
-            "XP flush: %d utilisateurs, %d updates totales",
-            len(data_copy),
+            "XP flush: %d utilisateurs (%d lignes), %d updates totales",
+            user_count,
+            len(rows) if self._started else user_count,
             self.stats["total_updates"],
         )
 
+    @staticmethod
+    def _clamp_amount(user_id: int | str, amount: int) -> int:
+        if abs(amount) > MAX_SINGLE_TRANSACTION:
+            logger.warning("Transaction XP trop grande: %d pour user %s", amount, user_id)
+            return MAX_SINGLE_TRANSACTION if amount > 0 else -MAX_SINGLE_TRANSACTION
+        return amount
+
+    def _apply_award_locked(self, user_id: int, amount: int) -> XPResult:
+        """Applique un gain (bonus double XP legacy inclus) sous ``self.lock``."""
+        record = self._record_locked(user_id)
+        old_level = record.level
+        old_xp = record.xp
+
+        # Appliquer le bonus double XP si actif
+        if amount > 0 and record.boost_until is not None:
+            if record.boost_until > time.time():
+                amount *= 2
+                logger.info("Double XP appliqué pour %s: %d XP", user_id, amount)
+            else:
+                record.boost_until = None
+
+        new_xp = max(0, old_xp + amount)
+        new_level = self._calc_level(new_xp)
+        record.xp = new_xp
+        record.level = new_level
+        self._touch_locked(user_id, record)
+        self.stats["total_updates"] += 1
+        return old_level, new_level, old_xp, new_xp
+
+    @staticmethod
+    def _emit_level_change(
+        user_id: int,
+        guild_id: int,
+        source: str,
+        result: XPResult,
+    ) -> None:
+        old_level, new_level, old_xp, new_xp = result
+        if new_level == old_level:
+            return
+        from utils.level_feed import LevelChange, emit
+
+        emit(
+            LevelChange(
+                user_id=user_id,
+                guild_id=guild_id,
+                old_level=old_level,
+                new_level=new_level,
+                old_xp=old_xp,
+                new_xp=new_xp,
+                source=source,
+            )
+        )
+
     async def add_xp(
         self,
         user_id: int,
@@ -287,7 +634,7 @@ class XPStore:
         guild_id: Optional[int] = None,
         source: str = "manual",
         batch: bool = False,
-    ) -> Tuple[int, int, int, int]:
+    ) -> XPResult:
         """
         Ajoute de l'XP à un utilisateur.
 
@@ -302,25 +649,15 @@ class XPStore:
             Tuple (old_level, new_level, old_xp, new_xp)
         """
         uid = str(user_id)
-
-        # Validation des montants
-        max_single_transaction = 10000
-        if abs(amount) > max_single_transaction:
-            logger.warning("Transaction XP trop grande: %d pour user %s", amount, uid)
-            amount = max_single_transaction if amount > 0 else -max_single_transaction
+        amount = self._clamp_amount(uid, amount)
 
         if batch and amount != 0:
-            # Ajouter au batch pour traitement ultérieur
+            # Ajouter au batch pour traitement ultérieur. Aucune attente entre
+            # l'ajout et la lecture : l'estimation est cohérente sans verrou.
             await self._batch_updates.add(uid, amount)
-
-            # Récupérer l'état actuel
-            async with self.lock:
-                user = self.data.get(uid, {"xp": 0, "level": 0})
-                base_xp = int(user.get("xp", 0))
-
-            # Tenir compte des mises à jour en attente pour estimer correctement
-            async with self._batch_updates.lock:
-                pending_total = self._batch_updates.pending.get(uid, 0)
+            record = self._records.get(int(user_id))
+            base_xp = record.xp if record is not None else 0
+            pending_total = self._batch_updates.pending.get(uid, 0)
 
             # XP avant cette transaction (y compris les updates précédentes)
             old_xp = max(0, base_xp + pending_total - amount)
@@ -334,62 +671,56 @@ class XPStore:
 
         # Traitement immédiat (non-batch)
         async with self.lock:
-            if uid not in self.data:
-                self.stats["cache_misses"] += 1
-                self.data[uid] = {"xp": 0, "level": 0}
-            else:
-                self.stats["cache_hits"] += 1
-
-            user = self.data[uid]
-            old_level = int(user.get("level", 0))
-            old_xp = int(user.get("xp", 0))
-
-            # Appliquer le bonus double XP si actif
-            if amount > 0:
-                double_until = user.get("double_xp_until")
-                if double_until:
-                    try:
-                        exp_dt = _parse_utc_datetime(double_until)
-                        if exp_dt > _utc_now():
-                            amount *= 2
-                            logger.info("Double XP appliqué pour %s: %d XP", uid, amount)
-                        else:
-                            del user["double_xp_until"]
-                    except ValueError:
-                        del user["double_xp_until"]
-
-            # Calculer les nouvelles valeurs
-            new_xp = max(0, old_xp + amount)
-            new_level = self._calc_level(new_xp)
-
-            # Mettre à jour
-            user["xp"] = new_xp
-            user["level"] = new_level
-            user["last_accessed"] = _utc_now().isoformat()
-
-            self.stats["total_updates"] += 1
+            result = self._apply_award_locked(int(user_id), amount)
 
         # Planifier la sauvegarde
         if amount != 0:
             self._schedule_flush()
 
         # Émettre l'événement de changement de niveau
-        if new_level != old_level and guild_id is not None:
-            from utils.level_feed import LevelChange, emit
-
-            emit(
-                LevelChange(
-                    user_id=user_id,
-                    guild_id=guild_id,
-                    old_level=old_level,
-                    new_level=new_level,
-                    old_xp=old_xp,
-                    new_xp=new_xp,
-                    source=source,
-                )
-            )
+        if guild_id is not None:
+            self._emit_level_change(user_id, guild_id, source, result)
 
-        return old_level, new_level, old_xp, new_xp
+        return result
+
+    async def add_xp_many(
+        self,
+        awards: Sequence[XPAward],
+        *,
+        guild_id: Optional[int] = None,
+    ) -> List[XPResult]:
+        """Applique plusieurs gains ``(user_id, amount, source)`` d'un coup.
+
+        Le lot entier est appliqué sous une seule acquisition de ``self.lock``,
+        dans l'ordre : un membre présent plusieurs fois voit ses gains
+        s'enchaîner et chaque résultat donne les niveaux exacts avant/après.
+        Les ``LevelChange`` sont émis après libération du verrou.
+
+        Returns:
+            Un tuple (old_level, new_level, old_xp, new_xp) par gain, dans
+            l'ordre de ``awards``.
+        """
+        if not awards:
+            return []
+        clamped = [
+            (int(user_id), self._clamp_amount(user_id, amount), source)
+            for user_id, amount, source in awards
+        ]
+
+        async with self.lock:
+            results = [
+                self._apply_award_locked(user_id, amount)
+                for user_id, amount, _source in clamped
+            ]
+
+        if any(amount != 0 for _user_id, amount, _source in clamped):
+            self._schedule_flush()
+
+        if guild_id is not None:
+            for (user_id, _amount, source), result in zip(clamped, results, strict=True):
+                self._emit_level_change(user_id, guild_id, source, result)
+
+        return results
 
     async def try_spend_xp(
         self,
@@ -414,72 +745,45 @@ class XPStore:
             raise ValueError("amount must be non-negative")
         if amount == 0:
             return True
-        if amount > 10000:
+        if amount > MAX_SINGLE_TRANSACTION:
             raise ValueError("amount exceeds maximum XP transaction")
 
-        uid = str(user_id)
-        old_level = 0
-        new_level = 0
-        old_xp = 0
-        new_xp = 0
-
+        key = int(user_id)
         async with self.lock:
-            if uid not in self.data:
-                self.stats["cache_misses"] += 1
-                self.data[uid] = {"xp": 0, "level": 0}
-            else:
-                self.stats["cache_hits"] += 1
-
-            user = self.data[uid]
-            old_xp = int(user.get("xp", 0))
-            old_level = int(user.get("level", self._calc_level(old_xp)))
+            record = self._record_locked(key)
+            old_xp = record.xp
+            old_level = record.level
+            self._touch_locked(key, record)
 
             if old_xp < amount:
-                user["last_accessed"] = _utc_now().isoformat()
                 return False
 
             new_xp = old_xp - amount
             new_level = self._calc_level(new_xp)
-            user["xp"] = new_xp
-            user["level"] = new_level
-            user["last_accessed"] = _utc_now().isoformat()
+            record.xp = new_xp
+            record.level = new_level
             self.stats["total_updates"] += 1
 
         self._schedule_flush()
 
-        if new_level != old_level and guild_id is not None:
-            from utils.level_feed import LevelChange, emit
-
-            emit(
-                LevelChange(
-                    user_id=user_id,
-                    guild_id=guild_id,
-                    old_level=old_level,
-                    new_level=new_level,
-                    old_xp=old_xp,
-                    new_xp=new_xp,
-                    source=source,
-                )
+        if guild_id is not None:
+            self._emit_level_change(
+                user_id, guild_id, source, (old_level, new_level, old_xp, new_xp)
             )
 
         return True
 
     async def get_user_data(self, user_id: int) -> XPUserData:
         """Récupère une copie des données d'un utilisateur depuis la mémoire."""
-        uid = str(user_id)
+        key = int(user_id)
         should_check_size = False
 
         async with self.lock:
-            if uid in self.data:
-                self.stats["cache_hits"] += 1
-            else:
-                self.stats["cache_misses"] += 1
-                self.data[uid] = {"xp": 0, "level": 0}
-                should_check_size = len(self.data) > self.cache_size * 1.2
-
-            user = self.data[uid]
-            user["last_accessed"] = _utc_now().isoformat()
-            user_data = dict(user)
+            if key not in self._records:
+                should_check_size = len(self._records) + 1 > self.cache_size * 1.2
+            record = self._record_locked(key)
+            self._touch_locked(key, record)
+            user_data = record.payload()
 
         # ``_cleanup_cache`` est un no-op d'intégrité aujourd'hui, mais on garde
         # le déclencheur historique hors du verrou pour ne pas imbriquer les locks.
@@ -491,17 +795,12 @@ class XPStore:
     async def get_top_users(self, limit: int = 10) -> List[Tuple[str, XPUserData]]:
         """Récupère le top depuis l'état mémoire chargé au démarrage."""
         async with self.lock:
-            all_data = [
-                (uid, dict(payload))
-                for uid, payload in self.data.items()
-            ]
-
-        sorted_users = sorted(
-            all_data,
-            key=lambda x: int(x[1].get("xp", 0)),
-            reverse=True,
-        )[:limit]
-        return sorted_users
+            top = heapq.nlargest(
+                limit,
+                self._records.items(),
+                key=lambda item: item[1].xp,
+            )
+            return [(str(uid), record.payload()) for uid, record in top]
 
     def read_json(self) -> Dict[str, XPUserData]:
         """Lit explicitement le snapshot JSON legacy de façon synchrone."""
@@ -510,7 +809,7 @@ class XPStore:
     async def get_stats(self) -> Dict[str, Any]:
         """Retourne les statistiques du store depuis l'état mémoire."""
         async with self.lock:
-            cache_users = len(self.data)
+            cache_users = len(self._records)
             total_users = cache_users
 
         return {
@@ -1,6 +1,8 @@
+import asyncio
 import json
 from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -108,3 +110,73 @@ async def test_unlock_batch_persists_multiple_members_in_one_snapshot(tmp_path)
     assert payload["users"]["2"] == {
         "casino_1_bet": unlocked_at.isoformat(),
     }
+
+
+@pytest.mark.asyncio
+async def test_level_and_casino_events_unlock_without_full_sweep(tmp_path, monkeypatch) -> None:
+    from cogs import achievements as achievements_cog
+    from services.casino_totals import CasinoTotalsReadModel
+    from utils.level_feed import LevelChange, LevelFeedRouter
+
+    store = AchievementStore(tmp_path / "achievements.json")
+    feed = LevelFeedRouter()
+    casino = CasinoTotalsReadModel()
+    monkeypatch.setattr(achievements_cog, "achievement_store", store)
+    monkeypatch.setattr(achievements_cog, "level_feed_router", feed)
+    monkeypatch.setattr(achievements_cog, "casino_totals", casino)
+    monkeypatch.setattr(achievements_cog.AchievementsCog.achievement_sync, "start", lambda *a, **k: None)
+    monkeypatch.setattr(achievements_cog.AchievementsCog.tenure_pass, "start", lambda *a, **k: None)
+
+    cog = achievements_cog.AchievementsCog(SimpleNamespace(guilds=[]))
+    await cog.cog_load()
+
+    assert feed._listeners == [cog._on_level_change]
+    cog._on_level_change(LevelChange(42, 1, 9, 10, 0, 0, "message"))
+    cog._on_level_change(LevelChange(7, 1, 6, 5, 0, 0, "pari_xp"))
+    casino.publish({"players": {}}, source_path=tmp_path / "state.json")
+    casino.record_player(
+        42, {"bets": 1}, total_bets=10, total_winnings=0, source_path=tmp_path / "state.json"
+    )
+
+    assert cog._pending == {42: {"level_5", "level_10", "casino_1_bet"}}
+    await cog.cog_unload()
+
+    assert set(await store.get_user_achievements(42)) == {"level_5", "level_10", "casino_1_bet"}
+    assert await store.get_user_achievements(7) == {}
+    assert feed._listeners == [] and casino._listeners == []
+
+
+@pytest.mark.asyncio
+async def test_failed_or_in_flight_unlock_batches_are_not_dropped(tmp_path, monkeypatch) -> None:
+    from cogs import achievements as achievements_cog
+
+    store = AchievementStore(tmp_path / "achievements.json")
+    monkeypatch.setattr(achievements_cog, "achievement_store", store)
+    monkeypatch.setattr(achievements_cog, "UNLOCK_DEBOUNCE_SECONDS", 0)
+    cog = achievements_cog.AchievementsCog(SimpleNamespace(guilds=[]))
+
+    original = store.unlock_batch
+    store.unlock_batch = AsyncMock(side_effect=OSError("disk full"))
+    cog._queue_unlocks(1, ["level_5"])
+    await cog._flush_task
+    assert cog._pending == {1: {"level_5"}}
+
+    writing = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_unlock_batch(unlocks):
+        writing.set()
+        await release.wait()
+        return await original(unlocks)
+
+    store.unlock_batch = slow_unlock_batch
+    cog._queue_unlocks(2, ["casino_1_bet"])
+    await writing.wait()
+    unload = asyncio.create_task(cog.cog_unload())
+    await asyncio.sleep(0)
+    release.set()
+    await unload
+
+    assert cog._pending == {}
+    assert set(await store.get_user_achievements(1)) == {"level_5"}
+    assert set(await store.get_user_achievements(2)) == {"casino_1_bet"}
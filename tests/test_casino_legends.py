@@ -92,12 +92,12 @@ async def test_v2_migration_resets_public_markers_once_and_preserves_secrets(tmp
     migration = next(
         event for event in second.state.events if event.event_id == "casino:legend_rules:v2"
     )
-    assert migration.data["reset_markers"] == [
+    assert migration.data["reset_markers"] == (
         "black_night",
         "break_in",
         "grand_heist",
         "house_always_wins",
-    ]
+    )
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from services.casino_totals import CasinoTotalsReadModel, casino_totals_from_raw
+from services.refuge_casino import (
+    RefugeCasinoConfig,
+    RefugeCasinoService,
+    casino_source_from_totals,
+)
+from services.refuge_world import RefugeWorldService
+from storage.refuge_casino_activity_store import RefugeCasinoActivityStore
+from storage.refuge_world_store import RefugeWorldStore
+
+
+RAW_STATE = {
+    "total_bets": 300,
+    "total_winnings": 120,
+    "players": {
+        "1": {"bets": 2, "wagered": 200, "winnings": 120},
+        "2": {"bets": 1, "wagered": 100, "winnings": 0},
+        "3": {"bets": 0},
+        "bad": "ignored",
+    },
+}
+
+
+def test_totals_from_raw_match_player_map():
+    totals = casino_totals_from_raw(RAW_STATE)
+
+    assert totals.version is None
+    assert totals.bet_count == 3
+    assert totals.unique_players == 2
+    assert totals.house_net_xp == 180
+
+
+def test_casino_source_uses_existing_roulette_counters_only():
+    source = casino_source_from_totals(
+        casino_totals_from_raw(
+            {
+                "total_bets": 900,
+                "total_winnings": 650,
+                "players": {
+                    "1": {"bets": 2, "wagered": 300, "winnings": 200},
+                    "2": {"bets": 4, "wagered": 600, "winnings": 450},
+                    "3": {"bets": 0},
+                },
+            }
+        )
+    )
+
+    assert source.roulette_bet_count == 6
+    assert source.roulette_unique_players == 2
+    assert source.roulette_wagered_xp == 900
+    assert source.roulette_winnings_xp == 650
+    assert source.roulette_house_net_xp == 250
+
+
+@pytest.mark.asyncio
+async def test_published_model_is_served_without_reading_the_file(tmp_path):
+    path = tmp_path / "pari_xp_state.json"
+    model = CasinoTotalsReadModel()
+    model.publish(RAW_STATE, source_path=path)
+
+    first = await model.get_totals(path)
+    model.record_player(
+        3,
+        {"bets": 1, "wagered": 50, "winnings": 100},
+        total_bets=350,
+        total_winnings=220,
+        source_path=path,
+    )
+    second = await model.get_totals(path)
+    version, players = await model.get_players(path)
+
+    assert not path.exists()
+    assert first.bet_count == 3
+    assert second.version == version and second.version > first.version
+    assert second.bet_count == 4
+    assert second.unique_players == 3
+    assert second.house_net_xp == 130
+    assert players["3"]["winnings"] == 100
+    with pytest.raises(TypeError):
+        players["3"]["bets"] = 9  # type: ignore[index]
+
+
+@pytest.mark.asyncio
+async def test_unpublished_path_falls_back_to_file_and_ignores_partial_updates(tmp_path):
+    path = tmp_path / "pari_xp_state.json"
+    path.write_text(json.dumps(RAW_STATE), encoding="utf-8")
+    model = CasinoTotalsReadModel()
+    model.record_player(
+        9,
+        {"bets": 5},
+        total_bets=1,
+        total_winnings=1,
+        source_path=path,
+    )
+
+    totals = await model.get_totals(path)
+    version, players = await model.get_players(path)
+
+    assert totals.version is None and version is None
+    assert totals.bet_count == 3
+    assert set(players) == {"1", "2", "3"}
+
+
+@pytest.mark.asyncio
+async def test_casino_service_prefers_published_totals(tmp_path):
+    path = tmp_path / "pari_xp_state.json"
+    path.write_text("{}", encoding="utf-8")
+    model = CasinoTotalsReadModel()
+    model.publish(RAW_STATE, source_path=path)
+    casino = RefugeCasinoService(
+        activity_store=RefugeCasinoActivityStore(tmp_path / "activity.json"),
+        world_service=RefugeWorldService(RefugeWorldStore(tmp_path / "world.json")),
+        state_file=path,
+        totals=model,
+    )
+
+    status = await casino.evaluate(
+        config=RefugeCasinoConfig(),
+        at=datetime(2026, 8, 9, 12, 0, tzinfo=timezone.utc),
+    )
+
+    assert status.roulette_bet_count == 3
+    assert status.roulette_unique_players == 2
+    assert status.roulette_lifetime_house_net_xp == 180
@@ -1,4 +1,5 @@
 import asyncio
+import json
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -40,3 +41,85 @@ async def test_f1_monitor_starts_on_cog_load_and_stops_on_unload():
 
     assert cog._task is None
     assert task.cancelled()
+
+
+class _FakeResponse:
+    def __init__(self, status, payload=None, headers=None):
+        self.status = status
+        self._body = b"" if payload is None else json.dumps(payload).encode()
+        self.headers = headers or {}
+
+    async def read(self):
+        return self._body
+
+    async def json(self):
+        return json.loads(self._body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeSession:
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    def get(self, url, timeout=None, headers=None):
+        self.calls.append((url, dict(headers or {})))
+        route = next(key for key in self.routes if key in url)
+        return self.routes[route](headers or {})
+
+
+@pytest.mark.asyncio
+async def test_parse_resolves_drivers_with_one_bulk_request_per_session():
+    cog = F1Standings(MagicMock())
+    drivers = [
+        {"driver_number": 1, "full_name": "Max Verstappen", "team_name": "Red Bull"},
+        {"driver_number": 16, "full_name": "Charles Leclerc", "team_name": "Ferrari"},
+    ]
+    cog.session = _FakeSession({"/drivers?session_key=": lambda _h: _FakeResponse(200, drivers)})
+    positions = [
+        {"driver_number": 16, "position": 1, "date": "2026-05-01T12:00:00Z"},
+        {"driver_number": 1, "position": 1, "date": "2026-05-01T12:05:00Z"},
+        {"driver_number": 16, "position": 2, "date": "2026-05-01T12:05:00Z"},
+    ]
+
+    first = await cog._parse_openf1_positions(positions, session_key=9001)
+    second = await cog._parse_openf1_positions(positions, session_key=9001)
+
+    assert [row["driver"] for row in first] == ["Max Verstappen", "Charles Leclerc"]
+    assert first == second
+    assert len(cog.session.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_unchanged_positions_skip_parsing():
+    cog = F1Standings(MagicMock())
+    positions = [{"driver_number": 1, "position": 1}]
+
+    def position_route(headers):
+        if headers.get("If-None-Match") == '"v1"':
+            return _FakeResponse(304)
+        return _FakeResponse(200, positions, {"ETag": '"v1"'})
+
+    cog.session = _FakeSession({"/position": position_route})
+
+    assert await cog._fetch_positions("race", 42) == positions
+    assert await cog._fetch_positions("race", 42) is None
+    assert cog.session.calls[1][1] == {"If-None-Match": '"v1"'}
+    # Une nouvelle session repart sans validateurs.
+    assert await cog._fetch_positions("race", 43) == positions
+
+
+@pytest.mark.asyncio
+async def test_identical_body_without_etag_is_detected_by_hash():
+    cog = F1Standings(MagicMock())
+    cog.session = _FakeSession(
+        {"/position": lambda _h: _FakeResponse(200, [{"driver_number": 1, "position": 1}])}
+    )
+
+    assert await cog._fetch_positions("fp1", 7) is not None
+    assert await cog._fetch_positions("fp1", 7) is None
@@ -267,3 +267,40 @@ async def test_missing_permissions(monkeypatch, caplog):
         await asyncio.sleep(0)
     assert chan.sent == []
     assert any("permission" in r.message for r in caplog.records)
+
+
+@pytest.mark.asyncio
+async def test_burst_is_merged_into_one_message(monkeypatch, setup_router):
+    chan = setup_router
+    monkeypatch.setattr(level_feed, "LEVEL_FEED_BATCH_SECONDS", 0.01)
+    fetches = []
+    bot = level_feed.router.bot
+    original_get_channel = bot.get_channel
+
+    def counting_get_channel(cid):
+        fetches.append(cid)
+        return original_get_channel(cid)
+
+    monkeypatch.setattr(bot, "get_channel", counting_get_channel)
+    saved_before = level_feed.router.messages_saved
+    for uid in range(40, 44):
+        xp_store.data[str(uid)] = {"xp": 14400, "level": 12}
+    await xp_store.add_xp_many(
+        [(uid, 2500, "message") for uid in range(40, 44)], guild_id=1
+    )
+    for _ in range(4):
+        await asyncio.sleep(0)
+
+    # Le premier part immédiatement, les suivants attendent la fin de fenêtre.
+    assert len(chan.sent) == 1
+    assert "+2500 XP" in chan.sent[0].embed.description
+    await asyncio.sleep(0.05)
+
+    assert len(chan.sent) == 2
+    merged = chan.sent[1].embed
+    assert merged.title == "⬆️ LEVEL UP DANS LE REFUGE ! 🎮"
+    assert merged.description.splitlines() == [
+        f"⬆️ <@{uid}> → **niveau 13** (+2500 XP)" for uid in range(41, 44)
+    ]
+    assert level_feed.router.messages_saved - saved_before == 2
+    assert fetches == [config.LEVEL_FEED_CHANNEL_ID]
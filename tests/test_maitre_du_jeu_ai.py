@@ -260,3 +260,81 @@ async def test_ai_rejects_oversized_question_before_api_call():
 
     assert reply.status is AIStatus.TOO_LONG
     requester.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_ai_caches_context_free_answers_by_normalized_question():
+    clock = [100.0]
+    requester = _fake_requester((200, _success_payload("Le casino ouvre à 20h."), {}))
+    ai = MaitreDuJeuAI(
+        requester=requester,
+        api_key="",
+        clock=lambda: clock[0],
+        user_cooldown_seconds=0,
+        max_requests_per_window=5,
+        cache_ttl_seconds=60,
+    )
+
+    first = await ai.answer(1, "Quand ouvre le casino ?")
+    second = await ai.answer(2, "quand OUVRE le Casino")
+
+    assert first == second == AIReply(AIStatus.SUCCESS, text="Le casino ouvre à 20h.")
+    assert requester.await_count == 1
+    assert ai.cache_hits == 1
+    assert ai.cache_hit_rate == pytest.approx(0.5)
+
+    clock[0] += 61
+    ai.sweep()
+    assert ai.tracked_users == 2
+    assert ai._answer_cache == {}
+
+
+@pytest.mark.asyncio
+async def test_ai_does_not_serve_cache_to_members_with_context():
+    requester = _fake_requester(
+        (200, _success_payload("Réponse générique."), {}),
+        (200, _success_payload("Premier échange."), {}),
+        (200, _success_payload("Réponse contextuelle."), {}),
+    )
+    ai = MaitreDuJeuAI(
+        requester=requester,
+        api_key="",
+        user_cooldown_seconds=0,
+        max_requests_per_window=5,
+    )
+
+    await ai.answer(1, "Et ensuite ?")
+    await ai.answer(2, "Bonjour")
+    reply = await ai.answer(2, "Et ensuite ?")
+
+    assert reply.text == "Réponse contextuelle."
+    assert requester.await_count == 3
+    assert ai.cache_hits == 0
+
+
+@pytest.mark.asyncio
+async def test_ai_per_user_state_is_bounded_and_swept():
+    clock = [100.0]
+    requester = AsyncMock(return_value=(200, _success_payload("Réponse."), {}))
+    ai = MaitreDuJeuAI(
+        requester=requester,
+        api_key="",
+        clock=lambda: clock[0],
+        user_cooldown_seconds=0,
+        user_window_seconds=60,
+        memory_ttl_seconds=30,
+        max_requests_per_window=5,
+        global_max_requests_per_window=100,
+        cache_max_entries=0,
+        max_tracked_users=10,
+    )
+
+    for user_id in range(25):
+        await ai.answer(user_id, f"Question {user_id}")
+
+    assert ai.tracked_users == 10
+    assert set(ai._users) == set(range(15, 25))
+
+    clock[0] += 61
+    assert ai.sweep() == 10
+    assert ai.tracked_users == 0
@@ -0,0 +1,166 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import cogs.maitre_du_jeu as maitre_du_jeu
+from cogs.maitre_du_jeu_ai import AIStatus, MaitreDuJeuAI
+
+
+def _chunk(text: str) -> bytes:
+    payload = {"choices": [{"index": 0, "delta": {"content": text}}]}
+    return f"data: {json.dumps(payload)}\n\n".encode()
+
+
+async def _start_sse_server(handler) -> TestServer:
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", handler)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+@pytest.mark.asyncio
+async def test_ai_streams_partial_text_from_local_sse_server():
+    received = {}
+
+    async def handler(request: web.Request) -> web.StreamResponse:
+        received["payload"] = await request.json()
+        received["accept"] = request.headers.get("Accept")
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for fragment in ("Bonjour", " depuis", " le flux."):
+            await response.write(_chunk(fragment))
+        await response.write(b": keep-alive\n\n")
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+    server = await _start_sse_server(handler)
+    ai = MaitreDuJeuAI(
+        api_key="test-key",
+        api_url=str(server.make_url("/v1/chat/completions")),
+        user_cooldown_seconds=0,
+        streaming=True,
+    )
+    partials: list[str] = []
+
+    async def on_partial(text: str) -> None:
+        partials.append(text)
+
+    try:
+        reply = await ai.answer(7, "Dis bonjour", on_partial=on_partial)
+    finally:
+        await ai.aclose()
+        await server.close()
+
+    assert reply.status is AIStatus.SUCCESS
+    assert reply.text == "Bonjour depuis le flux."
+    # Chaque texte partiel est un préfixe du suivant ; le dernier est complet.
+    assert partials[-1] == "Bonjour depuis le flux."
+    assert all(b.startswith(a) for a, b in zip(partials, partials[1:], strict=False))
+    assert received["payload"]["stream"] is True
+    assert received["accept"] == "text/event-stream"
+    timing = ai.stream_timings[-1]
+    assert timing.first_token_seconds is not None
+    assert 0 <= timing.first_token_seconds <= timing.total_seconds
+
+
+@pytest.mark.asyncio
+async def test_slow_partial_updates_do_not_block_the_stream_reader():
+    async def handler(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for fragment in ("Un", " deux", " trois", " quatre."):
+            await response.write(_chunk(fragment))
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+    server = await _start_sse_server(handler)
+    ai = MaitreDuJeuAI(
+        api_key="test-key",
+        api_url=str(server.make_url("/v1/chat/completions")),
+        user_cooldown_seconds=0,
+        streaming=True,
+    )
+    partials: list[str] = []
+
+    async def slow_on_partial(text: str) -> None:
+        partials.append(text)
+        await asyncio.sleep(0.2)  # édition Discord limitée
+
+    try:
+        reply = await ai.answer(7, "Compte", on_partial=slow_on_partial)
+    finally:
+        await ai.aclose()
+        await server.close()
+
+    assert reply.text == "Un deux trois quatre."
+    # Les textes intermédiaires arrivés pendant une édition sont fusionnés.
+    assert len(partials) < 4
+    assert partials[-1] == "Un deux trois quatre."
+
+
+@pytest.mark.asyncio
+async def test_ai_stream_rate_limit_maps_to_quota():
+    async def handler(request: web.Request) -> web.Response:
+        return web.json_response(
+            {"error": {"message": "slow down"}},
+            status=429,
+            headers={"Retry-After": "12"},
+        )
+
+    server = await _start_sse_server(handler)
+    ai = MaitreDuJeuAI(
+        api_key="test-key",
+        api_url=str(server.make_url("/v1/chat/completions")),
+        user_cooldown_seconds=0,
+        streaming=True,
+    )
+    on_partial = AsyncMock()
+
+    try:
+        reply = await ai.answer(7, "Question", on_partial=on_partial)
+    finally:
+        await ai.aclose()
+        await server.close()
+
+    assert reply.status is AIStatus.QUOTA
+    assert reply.retry_after == pytest.approx(12.0)
+    on_partial.assert_not_awaited()
+    assert not ai.stream_timings
+
+
+@pytest.mark.asyncio
+async def test_progressive_reply_throttles_edits(monkeypatch):
+    clock = [0.0]
+    acquire = AsyncMock()
+    edit = AsyncMock()
+    monkeypatch.setattr(maitre_du_jeu.limiter, "acquire", acquire)
+    monkeypatch.setattr(maitre_du_jeu, "safe_message_edit", edit)
+    sent = MagicMock()
+    message = SimpleNamespace(
+        channel=SimpleNamespace(id=55),
+        reply=AsyncMock(return_value=sent),
+    )
+    progress = maitre_du_jeu._ProgressiveReply(
+        message,
+        interval=1.5,
+        clock=lambda: clock[0],
+    )
+
+    await progress.update("Bon")
+    clock[0] = 0.5
+    await progress.update("Bonjour")
+    clock[0] = 2.0
+    await progress.update("Bonjour à")
+    await progress.finish(maitre_du_jeu.build_ai_partial_response("fin"))
+
+    message.reply.assert_awaited_once()
+    acquire.assert_awaited_once_with(bucket="channel:55")
+    assert edit.await_count == 2
+    assert edit.await_args_list[0].args[0] is sent
+    assert edit.await_args_list[0].kwargs["embed"].description == "Bonjour à ▌"
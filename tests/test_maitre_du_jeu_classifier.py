@@ -0,0 +1,108 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("DISCORD_TOKEN", "dummy")
+
+from cogs.maitre_du_jeu import AssistantIntent, classify_question
+
+
+# Corpus de référence produit par l'ancienne implémentation (une série de
+# `any(marker in text ...)` par intention) : le matcher compilé doit donner
+# exactement les mêmes intentions, y compris pour les marqueurs qui se
+# chevauchent (« ticket » / « ticket royal », « boost » / « boost xp »).
+GOLDEN_CORPUS = [
+    ('pourquoi je n ai pas gagne', AssistantIntent.DIAGNOSTIC),
+    ('pourquoi j ai pas gagne', AssistantIntent.DIAGNOSTIC),
+    ('pourquoi je n ai pas recu', AssistantIntent.DIAGNOSTIC),
+    ('pourquoi j ai pas recu', AssistantIntent.DIAGNOSTIC),
+    ('pas gagne d xp', AssistantIntent.DIAGNOSTIC),
+    ('pas recu d xp', AssistantIntent.DIAGNOSTIC),
+    ('aucun xp', AssistantIntent.DIAGNOSTIC),
+    ('quand est ce qu on t a cree', AssistantIntent.BOT_CREATED),
+    ('quand est ce qu on ta cree', AssistantIntent.BOT_CREATED),
+    ('tu as ete cree quand', AssistantIntent.BOT_CREATED),
+    ('quand as tu ete cree', AssistantIntent.BOT_CREATED),
+    ('date de creation', AssistantIntent.BOT_CREATED),
+    ('tu existes depuis quand', AssistantIntent.BOT_CREATED),
+    ('depuis quand tu existes', AssistantIntent.BOT_CREATED),
+    ('combien de membres', AssistantIntent.MEMBER_COUNT),
+    ('combien sommes nous', AssistantIntent.MEMBER_COUNT),
+    ('on est combien', AssistantIntent.MEMBER_COUNT),
+    ('nous sommes combien', AssistantIntent.MEMBER_COUNT),
+    ('nombre de membres', AssistantIntent.MEMBER_COUNT),
+    ('refuge vivant', AssistantIntent.REFUGE_GUIDE),
+    ('comment jouer au refuge', AssistantIntent.REFUGE_GUIDE),
+    ('comment on joue au refuge', AssistantIntent.REFUGE_GUIDE),
+    ('comment fonctionne le refuge', AssistantIntent.REFUGE_GUIDE),
+    ('a quoi sert le refuge', AssistantIntent.REFUGE_GUIDE),
+    ('casino', AssistantIntent.UNKNOWN),
+    ('heure', AssistantIntent.UNKNOWN),
+    ('horaire', AssistantIntent.UNKNOWN),
+    ('ouvre', AssistantIntent.UNKNOWN),
+    ('ouverture', AssistantIntent.UNKNOWN),
+    ('ferme', AssistantIntent.UNKNOWN),
+    ('fermeture', AssistantIntent.UNKNOWN),
+    ('ouvert', AssistantIntent.UNKNOWN),
+    ('boutique', AssistantIntent.SHOP),
+    ('acheter', AssistantIntent.SHOP),
+    ('achat', AssistantIntent.SHOP),
+    ('ticket royal', AssistantIntent.SHOP),
+    ('ticket', AssistantIntent.SHOP),
+    ('double xp', AssistantIntent.BOOST),
+    ('boost', AssistantIntent.BOOST),
+    ('prix', AssistantIntent.UNKNOWN),
+    ('coute', AssistantIntent.UNKNOWN),
+    ('combien vaut', AssistantIntent.UNKNOWN),
+    ('combien coute', AssistantIntent.UNKNOWN),
+    ('commande', AssistantIntent.COMMANDS),
+    ('commandes', AssistantIntent.COMMANDS),
+    ('slash', AssistantIntent.COMMANDS),
+    ('que peux tu faire', AssistantIntent.COMMANDS),
+    ('radio', AssistantIntent.RADIO),
+    ('musique', AssistantIntent.RADIO),
+    ('youtube', AssistantIntent.RADIO),
+    ('chanson', AssistantIntent.RADIO),
+    ('morceau', AssistantIntent.RADIO),
+    ('boost xp', AssistantIntent.BOOST),
+    ('xp', AssistantIntent.XP),
+    ('niveau', AssistantIntent.XP),
+    ('rang', AssistantIntent.XP),
+    ('level', AssistantIntent.XP),
+    ('progression', AssistantIntent.XP),
+    ('aide', AssistantIntent.HELP),
+    ('help', AssistantIntent.HELP),
+    ('bonjour', AssistantIntent.HELP),
+    ('salut', AssistantIntent.HELP),
+    ('', AssistantIntent.HELP),
+    ('   ', AssistantIntent.HELP),
+    ("Pourquoi je n'ai pas gagné d'XP ?", AssistantIntent.DIAGNOSTIC),
+    ("Quand est-ce qu'on t'a créé ?", AssistantIntent.BOT_CREATED),
+    ('On est combien sur le serveur ?', AssistantIntent.MEMBER_COUNT),
+    ("C'est quoi le Refuge vivant ?", AssistantIntent.REFUGE_GUIDE),
+    ('Le casino ouvre à quelle heure ?', AssistantIntent.CASINO_HOURS),
+    ('casino', AssistantIntent.UNKNOWN),
+    ('Où acheter un double XP ?', AssistantIntent.SHOP),
+    ('Combien coûte le boost ?', AssistantIntent.SHOP),
+    ('Le ticket royal coûte combien ?', AssistantIntent.SHOP),
+    ('Quelles commandes slash ?', AssistantIntent.COMMANDS),
+    ('Mets de la musique', AssistantIntent.RADIO),
+    ('Comment avoir un boost xp ?', AssistantIntent.BOOST),
+    ('Je suis expert en rangement', AssistantIntent.XP),
+    ('Quel est mon niveau ?', AssistantIntent.XP),
+    ('Bonjour !', AssistantIntent.HELP),
+    ('Raconte une blague', AssistantIntent.UNKNOWN),
+    ('aucun xp au casino ouvert', AssistantIntent.DIAGNOSTIC),
+    ('radio et boutique', AssistantIntent.SHOP),
+    ('help me with xp', AssistantIntent.XP),
+    ('Le refuge ferme quand ?', AssistantIntent.UNKNOWN),
+    ('double xp prix', AssistantIntent.SHOP),
+]
+
+
+@pytest.mark.parametrize(("question", "expected"), GOLDEN_CORPUS)
+def test_compiled_matcher_matches_golden_corpus(question, expected):
+    assert classify_question(question) is expected
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 import json
+from datetime import datetime, timezone
 
 import pytest
 
+import services.member_profile as member_profile
+from services.casino_totals import CasinoTotalsReadModel
 from services.member_profile import (
+    RANKED_FIELDS,
     MemberProfileService,
     build_member_profile_snapshot,
 )
+from storage.season_store import SeasonStore
 
 
 def test_build_member_profile_snapshot_combines_existing_sources() -> None:
@@ -174,3 +179,76 @@ async def test_service_reads_authoritative_sources_without_creating_storage(tmp_
     assert snapshot.season_messages == 5
     assert snapshot.casino_net == 70
     assert json.loads(casino_path.read_text(encoding="utf-8")) == original
+
+
+@pytest.mark.asyncio
+async def test_store_rank_index_matches_full_sort_as_counters_change(tmp_path) -> None:
+    store = SeasonStore(tmp_path / "season_stats.json")
+    at = datetime(2026, 8, 10, tzinfo=timezone.utc)
+    for user_id, (xp, bets, net) in {
+        1: (50, 0, 0),
+        2: (50, 1, -30),
+        3: (10, 2, 40),
+        12: (70, 0, 0),
+    }.items():
+        await store.record(user_id, at=at, xp_earned=xp, casino_bets=bets, casino_net=net)
+
+    async def assert_ranks_match() -> None:
+        users = (await store.get_season("2026-08"))["users"]
+        for user_id in (1, 2, 3, 12, 99):
+            ranks = await store.user_ranks("2026-08", user_id, RANKED_FIELDS)
+            expected = build_member_profile_snapshot(
+                user_id=user_id,
+                season_id="2026-08",
+                xp_payload={},
+                unlocked_achievements={},
+                season_payload={"users": users},
+                casino_payload={},
+            )
+            assert ranks == {
+                "xp_earned": expected.season_xp_rank,
+                "messages": expected.season_messages_rank,
+                "voice_seconds": expected.season_voice_rank,
+                "casino_net": expected.season_casino_rank,
+            }
+
+    await assert_ranks_match()
+    # Indexes are now built; increments must keep them in sync, including the
+    # casino_net eligibility that depends on casino_bets.
+    await store.record(3, at=at, xp_earned=45, messages=2)
+    await store.record(1, at=at, casino_bets=1)
+    await store.record(99, at=at, voice_seconds=30)
+    await assert_ranks_match()
+    assert (await store.user_ranks("2026-08", 1, ("casino_net",))) == {"casino_net": 2}
+
+
+@pytest.mark.asyncio
+async def test_service_uses_store_ranks_and_published_casino_player(
+    tmp_path, monkeypatch
+) -> None:
+    casino_totals = CasinoTotalsReadModel()
+    monkeypatch.setattr(member_profile, "casino_totals", casino_totals)
+    casino_path = tmp_path / "pari_xp_state.json"
+    store = SeasonStore(tmp_path / "season_stats.json")
+    at = datetime(2026, 8, 10, tzinfo=timezone.utc)
+    await store.record(42, at=at, xp_earned=100, messages=5)
+    await store.record(7, at=at, xp_earned=300)
+    casino_totals.publish(
+        {"players": {"42": {"bets": 3, "wagered": 150, "winnings": 220}}},
+        source_path=casino_path,
+    )
+    service = MemberProfileService(
+        xp_reader=_FakeXPReader(),
+        achievement_reader=_FakeAchievementReader(),
+        season_reader=store,
+        casino_state_file=casino_path,
+    )
+
+    snapshot = await service.get_snapshot(42, season_id="2026-08")
+
+    assert not casino_path.exists()
+    assert snapshot.season_xp == 100
+    assert snapshot.season_xp_rank == 2
+    assert snapshot.season_messages_rank == 1
+    assert snapshot.season_casino_rank is None
+    assert snapshot.casino_net == 70
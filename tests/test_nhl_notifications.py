@@ -0,0 +1,100 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+import cogs.nhl_notifications as nhl
+from cogs.nhl_notifications import MatchInfo, NHLDatabase, NHLNotificationsCog
+
+
+def _match(match_id: str, *, status: str, start_in: timedelta, home_id: int = 1, away_id: int = 2) -> MatchInfo:
+    return MatchInfo(
+        match_id=match_id,
+        home_team=f"H{home_id}",
+        away_team=f"A{away_id}",
+        start_time=datetime.now(timezone.utc) + start_in,
+        status=status,
+        home_score=0,
+        away_score=0,
+        home_id=home_id,
+        away_id=away_id,
+    )
+
+
+def _make_cog(db: NHLDatabase) -> NHLNotificationsCog:
+    cog = object.__new__(NHLNotificationsCog)
+    cog.db = db
+    cog.queue = AsyncMock()
+    cog._xg_cache = {}
+    cog._odds_cache = {}
+    cog._fetch_semaphore = asyncio.Semaphore(2)
+    cog._match_update_lock = asyncio.Lock()
+    return cog
+
+
+@pytest.mark.asyncio
+async def test_match_pass_diffs_schedule_and_writes_once(tmp_path, monkeypatch):
+    db = NHLDatabase(str(tmp_path / "nhl.sqlite"))
+    cog = _make_cog(db)
+    games = [
+        _match("1", status="Scheduled", start_in=timedelta(hours=8), home_id=10, away_id=20),
+        _match("2", status="Scheduled", start_in=timedelta(hours=8), home_id=10, away_id=30),
+        _match("3", status="Final", start_in=timedelta(hours=-3)),
+    ]
+    cog._fetch_schedule = AsyncMock(return_value=games)
+    xg_calls: list[int] = []
+
+    async def fake_fetch_json(url, params=None):
+        xg_calls.append(int(url.split("/teams/")[1].split("/")[0]))
+        return {"stats": [{"splits": [{"stat": {"goalsPerGame": 3.0}}]}]}
+
+    cog._fetch_json = fake_fetch_json
+    save = AsyncMock(wraps=db.save_matches)
+    monkeypatch.setattr(db, "save_matches", save)
+
+    await cog._run_match_updates()
+
+    assert sorted(xg_calls) == [10, 20, 30]
+    save.assert_awaited_once()
+    rows = await db.fetch_matches(["1", "2", "3"])
+    assert rows["1"]["notified_upcoming"] == 1
+    assert rows["1"]["notified_preview"] == 1
+    assert rows["3"]["notified_final"] == 1
+    sent = [call.args[1] for call in cog.queue.enqueue.await_args_list]
+    assert sum("PARIS" in message for message in sent) == 2
+    assert sum("FINAL" in message for message in sent) == 1
+
+    cog.queue.enqueue.reset_mock()
+    save.reset_mock()
+    await cog._run_match_updates()
+
+    cog.queue.enqueue.assert_not_awaited()
+    save.assert_awaited_once_with([], {})
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_save_matches_rejects_unknown_flag_columns(tmp_path):
+    db = NHLDatabase(str(tmp_path / "nhl.sqlite"))
+
+    with pytest.raises(ValueError):
+        await db.save_matches([], {"scores = 0; --": ["1"]})
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_odds_are_cached_per_matchup(tmp_path, monkeypatch):
+    monkeypatch.setattr(nhl, "ODDS_API_URL", "https://odds.invalid")
+    monkeypatch.setattr(nhl, "ODDS_API_KEY", "key")
+    db = NHLDatabase(str(tmp_path / "nhl.sqlite"))
+    cog = _make_cog(db)
+    cog._fetch_json = AsyncMock(return_value={"odds": {"home": 1.8, "away": 2.1}})
+    match = _match("1", status="Scheduled", start_in=timedelta(hours=2))
+
+    first = await cog._fetch_odds(match)
+    second = await cog._fetch_odds(match)
+
+    assert first == second == "A2 2.1 | H1 1.8"
+    cog._fetch_json.assert_awaited_once()
+    await db.close()
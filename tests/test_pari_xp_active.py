@@ -1,4 +1,4 @@
-import asyncio
+import weakref
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
@@ -17,7 +17,10 @@ def _make_cog(*, is_open: bool = True):
     cog._message_id = None
     cog._last_announced_state = None
     cog._last_panel_signature = None
-    cog._bet_lock = asyncio.Lock()
+    cog._bet_locks = weakref.WeakValueDictionary()
+    cog._journal = SimpleNamespace(append=AsyncMock(), compact=AsyncMock())
+    cog._journal_seq = 0
+    cog._persisted_seq = 0
     return cog
 
 
@@ -138,7 +141,7 @@ async def test_save_state_uses_deep_snapshot(monkeypatch):
     cog.state["players"] = {"42": {"bets": 1}}
     captured = {}
 
-    async def fake_write(path, payload):
+    async def fake_write(path, payload, **_kwargs):
         captured["path"] = path
         captured["payload"] = payload
         cog.state["players"]["42"]["bets"] = 99
@@ -187,7 +190,11 @@ async def test_handle_bet_win_uses_active_atomic_debit(monkeypatch):
     assert cog.state["total_bets"] == 20
     assert cog.state["total_winnings"] == 40
     assert cog.state["last_winner"]["user_id"] == 42
-    cog._save_state.assert_awaited_once()
+    cog._save_state.assert_not_awaited()
+    cog._journal.append.assert_awaited_once()
+    entry = cog._journal.append.await_args.args[0]
+    assert entry["seq"] == 1
+    assert (entry["user_id"], entry["wagered"], entry["payout"]) == (42, 20, 40)
     interaction.response.send_message.assert_awaited_once()
     result_message.edit.assert_awaited_once()
 
@@ -273,6 +280,7 @@ async def test_handle_bet_refunds_stake_when_payout_fails(monkeypatch):
     assert cog.state["total_bets"] == 0
     assert cog.state["total_winnings"] == 0
     cog._save_state.assert_not_awaited()
+    cog._journal.append.assert_not_awaited()
 
 
 @pytest.mark.asyncio
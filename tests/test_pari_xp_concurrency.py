@@ -1,4 +1,5 @@
 import asyncio
+import weakref
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
@@ -16,7 +17,10 @@ def _make_cog():
     cog._message_id = None
     cog._last_announced_state = None
     cog._last_panel_signature = None
-    cog._bet_lock = asyncio.Lock()
+    cog._bet_locks = weakref.WeakValueDictionary()
+    cog._journal = SimpleNamespace(append=AsyncMock(), compact=AsyncMock())
+    cog._journal_seq = 0
+    cog._persisted_seq = 0
     cog._save_state = AsyncMock()
     return cog
 
@@ -32,32 +36,35 @@ def _interaction(user_id: int):
     )
 
 
+def _patch_bet_dependencies(monkeypatch, debit):
+    monkeypatch.setattr(
+        pari_xp.xp_store,
+        "get_user_data",
+        AsyncMock(return_value={"xp": 100, "level": 1}),
+    )
+    monkeypatch.setattr(pari_xp.xp_adapter, "add_xp", debit)
+    monkeypatch.setattr(pari_xp, "award_xp", AsyncMock())
+    monkeypatch.setattr(pari_xp.random, "random", lambda: 0.90)
+    monkeypatch.setattr(pari_xp.asyncio, "sleep", AsyncMock())
+
+
 @pytest.mark.asyncio
-async def test_concurrent_bets_are_serialized_before_debit(monkeypatch):
+async def test_same_player_bets_are_serialized_before_debit(monkeypatch):
     cog = _make_cog()
     first_debit_started = asyncio.Event()
     release_first_debit = asyncio.Event()
     second_debit_started = asyncio.Event()
     debit_order: list[int] = []
 
-    monkeypatch.setattr(
-        pari_xp.xp_store,
-        "get_user_data",
-        AsyncMock(return_value={"xp": 100, "level": 1}),
-    )
-
     async def debit(user_id, *, amount, guild_id, source):
-        debit_order.append(user_id)
-        if user_id == 1:
+        debit_order.append(len(debit_order))
+        if not first_debit_started.is_set():
             first_debit_started.set()
             await release_first_debit.wait()
         else:
             second_debit_started.set()
 
-    monkeypatch.setattr(pari_xp.xp_adapter, "add_xp", debit)
-    monkeypatch.setattr(pari_xp, "award_xp", AsyncMock())
-    monkeypatch.setattr(pari_xp.random, "random", lambda: 0.90)
-    monkeypatch.setattr(pari_xp.asyncio, "sleep", AsyncMock())
+    _patch_bet_dependencies(monkeypatch, debit)
 
     first = asyncio.create_task(
         pari_xp.PariXPCog._handle_bet(cog, _interaction(1), "red", 20)
@@ -65,7 +72,7 @@ async def test_concurrent_bets_are_serialized_before_debit(monkeypatch):
     await first_debit_started.wait()
 
     second = asyncio.create_task(
-        pari_xp.PariXPCog._handle_bet(cog, _interaction(2), "red", 20)
+        pari_xp.PariXPCog._handle_bet(cog, _interaction(1), "red", 20)
     )
 
     with pytest.raises(asyncio.TimeoutError):
@@ -75,5 +82,42 @@ async def test_concurrent_bets_are_serialized_before_debit(monkeypatch):
     await asyncio.gather(first, second)
 
     assert second_debit_started.is_set()
-    assert debit_order == [1, 2]
     assert cog.state["total_bets"] == 40
+    assert cog.state["players"]["1"]["bets"] == 2
+
+
+@pytest.mark.asyncio
+async def test_different_players_do_not_wait_for_each_other(monkeypatch):
+    cog = _make_cog()
+    first_debit_started = asyncio.Event()
+    release_first_debit = asyncio.Event()
+    second_debit_done = asyncio.Event()
+
+    async def debit(user_id, *, amount, guild_id, source):
+        if user_id == 1:
+            first_debit_started.set()
+            await release_first_debit.wait()
+        else:
+            second_debit_done.set()
+
+    _patch_bet_dependencies(monkeypatch, debit)
+
+    first = asyncio.create_task(
+        pari_xp.PariXPCog._handle_bet(cog, _interaction(1), "red", 20)
+    )
+    await first_debit_started.wait()
+    second = asyncio.create_task(
+        pari_xp.PariXPCog._handle_bet(cog, _interaction(2), "red", 20)
+    )
+
+    await asyncio.wait_for(second_debit_done.wait(), timeout=1)
+    await second
+    assert cog.state["total_bets"] == 20
+
+    release_first_debit.set()
+    await first
+
+    assert cog.state["total_bets"] == 40
+    assert [
+        call.args[0]["seq"] for call in cog._journal.append.await_args_list
+    ] == [1, 2]
@@ -0,0 +1,126 @@
+import weakref
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+import cogs.pari_xp as pari_xp
+from storage.roulette_bet_journal import RouletteBetJournal
+
+
+def _make_cog(journal: RouletteBetJournal):
+    cog = object.__new__(pari_xp.PariXPCog)
+    cog.tz = pari_xp.PARIS_TZ
+    cog.state = {"is_open": True, "total_bets": 0, "total_winnings": 0, "players": {}}
+    cog._bet_locks = weakref.WeakValueDictionary()
+    cog._journal = journal
+    cog._journal_seq = 0
+    cog._persisted_seq = 0
+    return cog
+
+
+@pytest.mark.asyncio
+async def test_journal_replay_skips_checkpointed_entries(tmp_path):
+    journal = RouletteBetJournal(tmp_path / "pari_xp_journal.jsonl")
+    for seq in (1, 2, 3):
+        await journal.append(
+            {"seq": seq, "user_id": 7, "wagered": 10, "payout": 0, "at": "t"}
+        )
+    with journal.path.open("a", encoding="utf-8") as handle:
+        handle.write('{"seq": 4, "user_id"')  # truncated by a crash mid-write
+
+    assert [entry["seq"] for entry in journal.read_after(1)] == [2, 3]
+
+    remaining = await journal.compact(2)
+
+    assert remaining == 1
+    assert [entry["seq"] for entry in journal.read_after(0)] == [3]
+    assert await journal.compact(3) == 0
+    assert not journal.path.exists()
+
+
+@pytest.mark.asyncio
+async def test_bets_are_journaled_and_checkpoint_compacts(tmp_path, monkeypatch):
+    journal = RouletteBetJournal(tmp_path / "pari_xp_journal.jsonl")
+    cog = _make_cog(journal)
+    written = {}
+
+    async def fake_write(path, payload, **_kwargs):
+        written["payload"] = payload
+
+    monkeypatch.setattr(pari_xp, "atomic_write_json_async", fake_write)
+
+    for user_id, payout in ((1, 0), (2, 40), (1, 20)):
+        entry = cog._apply_bet_result(user_id, 10, payout, at="2026-08-09T12:00:00")
+        await cog._journal_bet(entry)
+
+    assert [entry["seq"] for entry in journal.read_after(0)] == [1, 2, 3]
+
+    await cog._save_state()
+
+    assert written["payload"]["journal_seq"] == 3
+    assert written["payload"]["total_bets"] == 30
+    assert written["payload"]["total_winnings"] == 60
+    assert written["payload"]["players"]["1"] == {
+        "bets": 2,
+        "wagered": 20,
+        "winnings": 20,
+    }
+    assert cog._persisted_seq == 3
+    assert journal.read_after(0) == []
+
+
+def test_replay_rebuilds_counters_after_restart(tmp_path):
+    journal = RouletteBetJournal(tmp_path / "pari_xp_journal.jsonl")
+    journal.path.write_text(
+        '{"seq":5,"user_id":9,"wagered":50,"payout":100,"at":"x"}\n'
+        '{"seq":6,"user_id":9,"wagered":50,"payout":0,"at":"y"}\n',
+        encoding="utf-8",
+    )
+    cog = _make_cog(journal)
+    cog.state.update({"total_bets": 400, "total_winnings": 300, "journal_seq": 5})
+    cog._persisted_seq = cog._journal_seq = 5
+
+    for entry in journal.read_after(cog._persisted_seq):
+        cog._apply_bet_result(
+            int(entry["user_id"]),
+            int(entry["wagered"]),
+            int(entry["payout"]),
+            at=entry["at"],
+            seq=int(entry["seq"]),
+        )
+
+    assert cog.state["total_bets"] == 450
+    assert cog.state["total_winnings"] == 300
+    assert cog._journal_seq == 6
+    assert cog.state["players"]["9"]["bets"] == 1
+
+
+@pytest.mark.asyncio
+async def test_journal_failure_keeps_bet_in_memory(tmp_path):
+    cog = _make_cog(SimpleNamespace(append=AsyncMock(side_effect=OSError("disk"))))
+
+    entry = cog._apply_bet_result(3, 10, 0, at="t")
+    await cog._journal_bet(entry)
+
+    assert cog.state["total_bets"] == 10
+    assert cog._journal_seq == 1
+    assert cog._persisted_seq == 0
+
+
+@pytest.mark.asyncio
+async def test_cog_unload_waits_for_final_checkpoint(tmp_path, monkeypatch):
+    journal = RouletteBetJournal(tmp_path / "pari_xp_journal.jsonl")
+    cog = _make_cog(journal)
+    cog.check_schedule = SimpleNamespace(cancel=lambda: None)
+    cog.prune_history = SimpleNamespace(cancel=lambda: None)
+    write = AsyncMock()
+    monkeypatch.setattr(pari_xp, "atomic_write_json_async", write)
+
+    entry = cog._apply_bet_result(1, 10, 0, at="2026-08-09T12:00:00")
+    await cog._journal_bet(entry)
+    await cog.cog_unload()
+
+    write.assert_awaited_once()
+    assert cog._persisted_seq == cog._journal_seq == 1
+    assert not journal.path.exists()
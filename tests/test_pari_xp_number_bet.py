@@ -1,4 +1,4 @@
-import asyncio
+import weakref
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
@@ -21,7 +21,10 @@ def _make_cog():
     cog._message_id = None
     cog._last_announced_state = None
     cog._save_state = AsyncMock()
-    cog._bet_lock = asyncio.Lock()
+    cog._bet_locks = weakref.WeakValueDictionary()
+    cog._journal = SimpleNamespace(append=AsyncMock(), compact=AsyncMock())
+    cog._journal_seq = 0
+    cog._persisted_seq = 0
     return cog
 
 
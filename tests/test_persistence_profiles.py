@@ -0,0 +1,66 @@
+import gzip
+
+import pytest
+
+from utils.persistence import (
+    ARCHIVE,
+    COMPACT,
+    atomic_write_json,
+    atomic_write_json_async,
+    json_write_stats,
+    read_json_safe,
+)
+
+DOCUMENT = {"users": {"1": {"xp": 12, "name": "Élodie"}}, "ids": [1, 2]}
+
+
+def test_default_profile_keeps_indented_output(tmp_path):
+    path = tmp_path / "state.json"
+    atomic_write_json(path, DOCUMENT)
+
+    text = path.read_text(encoding="utf-8")
+    assert '\n    "users": {' in text
+    assert "Élodie" in text
+    assert read_json_safe(path) == DOCUMENT
+
+
+def test_compact_profile_round_trips(tmp_path):
+    path = tmp_path / "state.json"
+    atomic_write_json(path, DOCUMENT, profile=COMPACT)
+
+    text = path.read_text(encoding="utf-8")
+    assert "\n" not in text and ": " not in text
+    assert read_json_safe(path) == DOCUMENT
+
+
+@pytest.mark.asyncio
+async def test_archive_profile_is_gzip_and_transparent_to_readers(tmp_path):
+    path = tmp_path / "event.json"
+    before = json_write_stats.get("archive")
+    writes_before = before.writes if before else 0
+
+    await atomic_write_json_async(path, DOCUMENT, profile=ARCHIVE)
+
+    assert gzip.decompress(path.read_bytes())
+    assert read_json_safe(path) == DOCUMENT
+    stats = json_write_stats["archive"]
+    assert stats.writes == writes_before + 1
+    assert stats.bytes_written >= path.stat().st_size
+
+
+def test_truncated_gzip_falls_back_to_backup(tmp_path):
+    path = tmp_path / "event.json"
+    atomic_write_json(path, DOCUMENT, profile=ARCHIVE)
+    atomic_write_json(path, {"newer": True}, profile=ARCHIVE)
+    path.write_bytes(path.read_bytes()[:10])
+
+    assert read_json_safe(path) == DOCUMENT
+
+
+def test_reader_keeps_stdlib_json_semantics(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text('{"ratio": NaN}', encoding="utf-8")
+
+    value = read_json_safe(path)
+
+    assert value["ratio"] != value["ratio"]
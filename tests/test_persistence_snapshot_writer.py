@@ -0,0 +1,113 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from utils.persistence import SnapshotWriter
+
+
+@pytest.mark.asyncio
+async def test_unchanged_snapshot_is_not_rewritten():
+    state = {1: "a"}
+    save = AsyncMock()
+    writer = SnapshotWriter(state.copy, save, name="test")
+    writer.mark_clean()
+
+    assert await writer.flush() is False
+    state[2] = "b"
+    assert await writer.flush() is True
+    assert await writer.flush() is False
+
+    save.assert_awaited_once_with({1: "a", 2: "b"})
+    assert (writer.writes, writer.skipped) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_mark_dirty_coalesces_a_burst_into_one_write():
+    state: dict[int, int] = {}
+    written = asyncio.Event()
+    payloads = []
+
+    async def save(payload):
+        payloads.append(payload)
+        written.set()
+
+    writer = SnapshotWriter(state.copy, save, delay=0.01, name="test")
+    writer.mark_clean()
+    for index in range(50):
+        state[index] = index
+        writer.mark_dirty()
+
+    await asyncio.wait_for(written.wait(), timeout=1)
+    await asyncio.sleep(0)
+
+    assert len(payloads) == 1
+    assert len(payloads[0]) == 50
+    assert not writer.dirty
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_state_dirty_and_aclose_retries():
+    state = {1: 1}
+    save = AsyncMock(side_effect=[OSError("disk full"), None])
+    writer = SnapshotWriter(state.copy, save, delay=60, name="test")
+
+    with pytest.raises(OSError):
+        await writer.flush()
+    assert writer.dirty
+
+    writer.mark_dirty()
+    assert writer.pending
+    await writer.aclose()
+
+    assert not writer.pending
+    assert not writer.dirty
+    assert save.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_mutation_during_a_slow_deferred_save_is_written_too():
+    state = {"a": 1}
+    saving = asyncio.Event()
+    release = asyncio.Event()
+    payloads = []
+
+    async def save(payload):
+        payloads.append(payload)
+        if len(payloads) == 1:
+            saving.set()
+            await release.wait()
+
+    writer = SnapshotWriter(state.copy, save, delay=0.01, name="test")
+    writer.mark_clean()
+    state["b"] = 2
+    writer.mark_dirty()
+    await asyncio.wait_for(saving.wait(), timeout=1)
+
+    # The first write already took its snapshot and is still awaiting save().
+    state["c"] = 3
+    writer.mark_dirty()
+    release.set()
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if not writer.pending:
+            break
+
+    assert payloads == [{"a": 1, "b": 2}, {"a": 1, "b": 2, "c": 3}]
+    assert not writer.dirty
+
+
+@pytest.mark.asyncio
+async def test_failed_deferred_write_is_retried_without_new_changes():
+    state = {1: 1}
+    save = AsyncMock(side_effect=[OSError("disk full"), None])
+    writer = SnapshotWriter(state.copy, save, delay=0.01, name="test")
+
+    writer.mark_dirty()
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if not writer.pending:
+            break
+
+    assert save.await_count == 2
+    assert not writer.dirty
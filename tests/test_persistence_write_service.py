@@ -0,0 +1,89 @@
+import asyncio
+import json
+import threading
+import time
+
+from utils import persistence
+from utils.persistence import atomic_write_json_async, read_json_safe
+
+
+def _reset_write_service(monkeypatch) -> None:
+    monkeypatch.setattr(persistence, "_writer", None)
+    monkeypatch.setattr(persistence, "_writer_loop", None)
+
+
+async def test_pending_snapshots_coalesce_latest_wins(monkeypatch, tmp_path):
+    _reset_write_service(monkeypatch)
+    path = tmp_path / "state.json"
+    original_write = persistence.atomic_write_json
+    first_started = threading.Event()
+    written: list[int] = []
+
+    def controlled_write(dest, data):
+        if data == {"n": 0}:
+            first_started.set()
+            time.sleep(0.05)
+        written.append(data["n"])
+        original_write(dest, data)
+
+    monkeypatch.setattr(persistence, "atomic_write_json", controlled_write)
+
+    first = asyncio.create_task(atomic_write_json_async(path, {"n": 0}))
+    assert await asyncio.to_thread(first_started.wait, 1.0)
+    service = persistence.write_service()
+    queued = [
+        asyncio.create_task(atomic_write_json_async(path, {"n": n}))
+        for n in range(1, 5)
+    ]
+    await asyncio.sleep(0)
+    assert service.queue_depth == 1
+    assert service.in_flight == 1
+
+    await asyncio.gather(first, *queued)
+
+    assert written == [0, 4]
+    assert read_json_safe(path) == {"n": 4}
+    stats = service.path_stats[str(path)]
+    assert stats.writes == 2
+    assert stats.coalesced == 3
+    assert stats.max_seconds >= 0.05
+    assert service.queue_depth == 0
+
+
+async def test_distinct_paths_write_concurrently(monkeypatch, tmp_path):
+    _reset_write_service(monkeypatch)
+    barrier = threading.Barrier(2, timeout=1.0)
+    original_write = persistence.atomic_write_json
+
+    def blocking_write(dest, data):
+        # Deadlocks (BrokenBarrierError) if the two paths were serialized.
+        barrier.wait()
+        original_write(dest, data)
+
+    monkeypatch.setattr(persistence, "atomic_write_json", blocking_write)
+
+    await asyncio.gather(
+        atomic_write_json_async(tmp_path / "a.json", {"a": 1}),
+        atomic_write_json_async(tmp_path / "b.json", {"b": 2}),
+    )
+
+    assert json.loads((tmp_path / "a.json").read_text(encoding="utf-8")) == {"a": 1}
+    assert json.loads((tmp_path / "b.json").read_text(encoding="utf-8")) == {"b": 2}
+    assert persistence.write_service().dir_sync_batches >= 1
+
+
+async def test_write_failure_reaches_every_coalesced_caller(monkeypatch, tmp_path):
+    _reset_write_service(monkeypatch)
+
+    def failing_write(dest, data):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(persistence, "atomic_write_json", failing_write)
+    results = await asyncio.gather(
+        atomic_write_json_async(tmp_path / "x.json", {"n": 1}),
+        atomic_write_json_async(tmp_path / "x.json", {"n": 2}),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, OSError) for result in results)
+    assert persistence.write_service().path_stats[str(tmp_path / "x.json")].failures >= 1
@@ -14,7 +14,6 @@ from services.refuge_casino import (
     RefugeCasinoService,
     casino_fortune_for_net,
     casino_prestige_points,
-    casino_source_snapshot,
 )
 from services.refuge_world import RefugeWorldService
 from storage.refuge_casino_activity_store import RefugeCasinoActivityStore
@@ -88,26 +87,6 @@ def test_casino_config_reads_only_explicit_environment_values(monkeypatch):
     assert config.fortune_thresholds_xp == (-500, -50, 50, 500)
 
 
-def test_casino_source_snapshot_uses_existing_roulette_counters_only():
-    snapshot = casino_source_snapshot(
-        {
-            "total_bets": 900,
-            "total_winnings": 650,
-            "players": {
-                "1": {"bets": 2, "wagered": 300, "winnings": 200},
-                "2": {"bets": 4, "wagered": 600, "winnings": 450},
-                "3": {"bets": 0},
-            },
-        }
-    )
-
-    assert snapshot.roulette_bet_count == 6
-    assert snapshot.roulette_unique_players == 2
-    assert snapshot.roulette_wagered_xp == 900
-    assert snapshot.roulette_winnings_xp == 650
-    assert snapshot.roulette_house_net_xp == 250
-
-
 @pytest.mark.parametrize(
     ("net", "transactions", "expected"),
     [
@@ -333,8 +312,8 @@ async def test_casino_event_and_secret_unlock_are_idempotent(tmp_path):
     state = await casino.unlock_secret("black_cat", at=at + timedelta(minutes=1), config=RefugeCasinoConfig())
 
     building = _casino_building(state)
-    assert building.state["casino_events"] == ["grand_heist"]
-    assert building.state["secret_events"] == ["black_cat"]
+    assert building.state["casino_events"] == ("grand_heist",)
+    assert building.state["secret_events"] == ("black_cat",)
     assert len([event for event in state.events if event.event_id == "casino:casino_events:grand_heist"]) == 1
     assert len([event for event in state.events if event.event_id == "casino:secret_events:black_cat"]) == 1
     assert CASINO_EVENTS["grand_heist"] == "Le Grand Braquage"
@@ -348,3 +327,15 @@ async def test_unknown_casino_markers_are_rejected(tmp_path):
         await casino.unlock_event("unknown")
     with pytest.raises(ValueError):
         await casino.unlock_secret("unknown")
+
+
+@pytest.mark.asyncio
+async def test_repeated_evaluation_with_markers_is_not_a_change(tmp_path):
+    _state_file, _activity, _world_store, casino = _service(tmp_path)
+    at = datetime(2026, 8, 9, 12, 0, tzinfo=timezone.utc)
+    await casino.unlock_event("grand_heist", at=at, config=RefugeCasinoConfig())
+
+    await casino.evaluate(config=RefugeCasinoConfig(), at=at)
+    status = await casino.evaluate(config=RefugeCasinoConfig(), at=at)
+
+    assert status.changed is False
@@ -45,16 +45,16 @@ async def test_award_xp_preserves_nominal_machine_jackpot_when_double_xp_applies
     store_amounts = []
     now = datetime.now(timezone.utc)
 
-    async def fake_add_xp(user_id, amount, *, guild_id=None, source="manual"):
-        store_amounts.append(amount)
-        return 1, 2, 100, 100 + amount
+    async def fake_add_xp_many(awards, *, guild_id=None):
+        store_amounts.extend(amount for _user_id, amount, _source in awards)
+        return [(1, 2, 100, 100 + amount) for _user_id, amount, _source in awards]
 
-    async def fake_season_record(*args, **kwargs):
+    async def fake_season_record_many(*args, **kwargs):
         return None
 
     monkeypatch.setitem(xp_cog.XP_BOOSTS, "42", now + timedelta(hours=1))
-    monkeypatch.setattr(xp_cog.xp_store, "add_xp", fake_add_xp)
-    monkeypatch.setattr(xp_cog.season_store, "record", fake_season_record)
+    monkeypatch.setattr(xp_cog.xp_store, "add_xp_many", fake_add_xp_many)
+    monkeypatch.setattr(xp_cog.season_store, "record_many", fake_season_record_many)
     monkeypatch.setattr(
         xp_cog,
         "observe_casino_xp_transaction",
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import storage.snapshot_store as snapshot_store_module
+from models.refuge_world import RefugeHistoricalEvent, RefugeWorldState
+from storage.refuge_world_store import (
+    REFUGE_WORLD_RECENT_EVENTS,
+    RefugeWorldSchemaError,
+    RefugeWorldStore,
+)
+from utils.persistence import read_json_safe
+
+
+START = datetime(2026, 8, 9, 4, 0, tzinfo=timezone.utc)
+
+
+def _event(index: int) -> RefugeHistoricalEvent:
+    return RefugeHistoricalEvent(
+        event_id=f"event-{index}",
+        event_type="building_level_reached",
+        occurred_at=(START + timedelta(hours=index)).isoformat(),
+        data={"building_id": "fire", "level": index},
+    )
+
+
+def _append(state: RefugeWorldState, *indexes: int) -> RefugeWorldState:
+    return replace(state, events=state.events + tuple(_event(i) for i in indexes))
+
+
+@pytest.mark.asyncio
+async def test_document_keeps_a_bounded_window_and_history_survives_restart(tmp_path):
+    path = tmp_path / "refuge_world.json"
+    store = RefugeWorldStore(path)
+    state = await store.initialize(created_at=START)
+    total = REFUGE_WORLD_RECENT_EVENTS + 150
+    for first in range(0, total, 50):
+        state = await store.save_state(_append(state, *range(first, first + 50)))
+
+    persisted = read_json_safe(path, {})
+    restarted = RefugeWorldStore(path)
+    restored = await restarted.get_state()
+
+    window = [f"event-{index}" for index in range(total - REFUGE_WORLD_RECENT_EVENTS, total)]
+    assert len(persisted["events"]) == REFUGE_WORLD_RECENT_EVENTS
+    assert persisted["events"][-1]["event_id"] == f"event-{total - 1}"
+    assert persisted["event_log"] == {"revision": 5, "event_count": total}
+    assert restored == state
+    assert [event.event_id for event in state.events] == window
+    assert [event.event_id for event in restored.events] == window
+    # Older events stay known by ID and readable from the log.
+    assert restored.has_event("event-0")
+    assert not restored.has_event("event-missing")
+    history = await restarted.events_between(START, START + timedelta(hours=total))
+    assert len(history) == total
+
+
+@pytest.mark.asyncio
+async def test_saves_diff_only_the_window(tmp_path, monkeypatch):
+    store = RefugeWorldStore(tmp_path / "refuge_world.json")
+    state = await store.initialize(created_at=START)
+    state = await store.save_state(_append(state, *range(REFUGE_WORLD_RECENT_EVENTS * 3)))
+    applied = []
+    original_apply = store.event_log.apply
+
+    def recording_apply(revision, *, added, removed_ids):
+        applied.append(([event.event_id for event in added], set(removed_ids)))
+        original_apply(revision, added=added, removed_ids=removed_ids)
+
+    monkeypatch.setattr(store.event_log, "apply", recording_apply)
+
+    state = await store.save_state(_append(state, 1000))
+    # A stale copy re-listing an event that already left the window adds nothing.
+    state = await store.save_state(replace(state, events=(_event(0),) + state.events))
+    state = await store.save_state(state, removed_event_ids=("event-1", "event-unknown"))
+
+    assert applied == [(["event-1000"], set()), ([], {"event-1"})]
+    assert len(state.events) == REFUGE_WORLD_RECENT_EVENTS
+    assert not state.has_event("event-1")
+    restarted = await RefugeWorldStore(tmp_path / "refuge_world.json").get_state()
+    assert not restarted.has_event("event-1")
+    assert restarted.has_event("event-2")
+
+
+@pytest.mark.asyncio
+async def test_find_events_filters_the_whole_history(tmp_path):
+    store = RefugeWorldStore(tmp_path / "refuge_world.json")
+    state = RefugeWorldState(created_at="c")
+    events = [
+        replace(_event(index), data={"building_id": "hall", "user_id": str(index % 3)})
+        for index in range(REFUGE_WORLD_RECENT_EVENTS + 20)
+    ]
+    events.append(
+        RefugeHistoricalEvent(
+            event_id="secret",
+            event_type="hall_secret_discovered",
+            occurred_at=START.isoformat(),
+            data={"building_id": "hall", "user_id": 1},
+        )
+    )
+    await store.save_state(replace(state, events=tuple(events)))
+
+    latest = await store.find_events(building_id="hall", limit=2)
+    mine = await store.find_events(user_id=1)
+    secrets = await store.find_events(type_suffix="secret_discovered")
+
+    assert [event.event_id for event in latest] == ["event-119", "event-118"]
+    assert len(mine) == 41
+    assert [event.event_id for event in secrets] == ["secret"]
+
+
+@pytest.mark.asyncio
+async def test_legacy_inline_events_are_imported_into_the_log(tmp_path):
+    path = tmp_path / "refuge_world.json"
+    path.write_text(
+        json.dumps(
+            {
+                "schema_version": 1,
+                "created_at": START.isoformat(),
+                "events": [_event(index).to_dict() for index in range(3)],
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    migrated = await RefugeWorldStore(path).get_state()
+    persisted = read_json_safe(path, {})
+    restarted = await RefugeWorldStore(path).get_state()
+
+    assert len(migrated.events) == 3
+    assert persisted["schema_version"] == 2
+    assert persisted["event_log"]["revision"] == 1
+    assert restarted == migrated
+
+
+@pytest.mark.asyncio
+async def test_uncommitted_log_revision_is_rolled_back_on_load(tmp_path, monkeypatch):
+    path = tmp_path / "refuge_world.json"
+    store = RefugeWorldStore(path)
+    state = await store.save_state(_append(RefugeWorldState(created_at="c"), 0, 1))
+
+    async def crash(_path, _payload):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(snapshot_store_module, "atomic_write_bytes_async", crash)
+    trimmed = replace(state, events=state.events[1:])
+    with pytest.raises(OSError):
+        await store.save_state(_append(trimmed, 2))
+    monkeypatch.undo()
+
+    restarted = await RefugeWorldStore(path).get_state()
+
+    assert restarted == state
+
+
+@pytest.mark.asyncio
+async def test_removed_and_re_added_events_replay_in_log_order(tmp_path):
+    path = tmp_path / "refuge_world.json"
+    store = RefugeWorldStore(path)
+    state = await store.save_state(_append(RefugeWorldState(created_at="c"), 0, 1, 2))
+    state = await store.save_state(
+        replace(state, events=(state.events[0], state.events[2]))
+    )
+    state = await store.save_state(_append(state, 1))
+
+    restarted = await RefugeWorldStore(path).get_state()
+
+    assert [event.event_id for event in restarted.events] == [
+        "event-0",
+        "event-2",
+        "event-1",
+    ]
+    assert restarted.has_event("event-1")
+
+
+@pytest.mark.asyncio
+async def test_missing_log_is_rejected_instead_of_dropping_history(tmp_path):
+    path = tmp_path / "refuge_world.json"
+    store = RefugeWorldStore(path)
+    await store.save_state(_append(RefugeWorldState(created_at="c"), 0))
+    store.event_log.path.unlink()
+
+    with pytest.raises(RefugeWorldSchemaError, match="event log is missing"):
+        await RefugeWorldStore(path).get_state()
+
+
+@pytest.mark.asyncio
+async def test_events_between_reads_only_the_requested_time_range(tmp_path):
+    store = RefugeWorldStore(tmp_path / "refuge_world.json")
+    await store.save_state(_append(RefugeWorldState(created_at="c"), *range(10)))
+
+    page = await store.events_between(
+        START + timedelta(hours=3),
+        START + timedelta(hours=6),
+    )
+
+    assert [event.event_id for event in page] == ["event-5", "event-4", "event-3"]
+    assert page[0].data["level"] == 5
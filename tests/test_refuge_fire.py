@@ -229,9 +229,9 @@ async def test_fire_secret_unlock_is_persistent_and_idempotent(tmp_path):
     )
     restarted = await world_store.get_state()
 
-    assert _fire_building(first).state["secret_events"] == ["first_visitor"]
-    assert _fire_building(second).state["secret_events"] == ["first_visitor"]
-    assert _fire_building(restarted).state["secret_events"] == ["first_visitor"]
+    assert _fire_building(first).state["secret_events"] == ("first_visitor",)
+    assert _fire_building(second).state["secret_events"] == ("first_visitor",)
+    assert _fire_building(restarted).state["secret_events"] == ("first_visitor",)
 
     matching = [
         event
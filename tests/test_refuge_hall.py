@@ -90,11 +90,17 @@ async def test_achievement_snapshot_is_defensive_and_read_only(tmp_path):
     await store.unlock_many(1, ["level_5"], unlocked_at=at)
 
     snapshot = await store.get_snapshot()
-    snapshot["users"]["1"]["level_5"] = "changed"
+    with pytest.raises(TypeError):
+        snapshot["users"]["1"]["level_5"] = "changed"
 
     again = await store.get_snapshot()
+    assert again is snapshot
     assert again["users"]["1"]["level_5"] == at.isoformat()
 
+    await store.unlock_many(1, ["level_10"], unlocked_at=at)
+    assert "level_10" not in snapshot["users"]["1"]
+    assert "level_10" in (await store.get_snapshot())["users"]["1"]
+
 
 @pytest.mark.asyncio
 async def test_hall_starts_at_level_one_without_calibrated_weights_or_thresholds(tmp_path):
@@ -299,7 +305,7 @@ async def test_hall_secret_unlock_is_persistent_and_idempotent(tmp_path):
     await hall.unlock_secret("memory_flame", at=at + timedelta(hours=1))
     restarted = await world_store.get_state()
 
-    assert _hall_building(restarted).state["secret_events"] == ["memory_flame"]
+    assert _hall_building(restarted).state["secret_events"] == ("memory_flame",)
     matching = [
         event
         for event in restarted.events
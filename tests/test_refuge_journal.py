@@ -33,8 +33,9 @@ class FakeWorldStore:
     def __init__(self, events=()) -> None:
         self.events = events
 
-    async def get_state(self):
-        return SimpleNamespace(events=self.events)
+    async def events_between(self, start, end):
+        # The service re-checks the window on every event.
+        return self.events
 
 
 def _user(**values: int) -> dict[str, int]:
@@ -13,7 +13,7 @@ from services.refuge_timeline import (
     TIMELINE_STATE_KEY,
     RefugeTimelineService,
 )
-from storage.refuge_world_store import RefugeWorldStore
+from storage.refuge_world_store import REFUGE_WORLD_RECENT_EVENTS, RefugeWorldStore
 
 
 class _Renderer:
@@ -158,3 +158,46 @@ async def test_selected_unknown_season_falls_back_to_latest_archive(tmp_path):
         at=datetime(2026, 9, 1, 12, 0, tzinfo=timezone.utc),
     )
     assert timeline.selected_season_id == "2026-08"
+
+
+@pytest.mark.asyncio
+async def test_chapters_read_history_beyond_the_window_in_one_query(tmp_path, monkeypatch):
+    store = RefugeWorldStore(tmp_path / "world.json")
+    service = RefugeTimelineService(world_store=store, renderer=_Renderer())
+
+    await service.sync(at=datetime(2026, 7, 1, 12, 0, tzinfo=timezone.utc))
+    state = await store.get_state()
+    july = tuple(
+        RefugeHistoricalEvent(
+            event_id=f"jul-{index}",
+            event_type="building_level_reached",
+            occurred_at=datetime(2026, 7, 2, 0, index % 60, tzinfo=timezone.utc).isoformat(),
+        )
+        for index in range(REFUGE_WORLD_RECENT_EVENTS + 30)
+    )
+    await store.save_state(replace(state, events=state.events + july))
+    await service.sync(at=datetime(2026, 8, 1, 12, 0, tzinfo=timezone.utc))
+    state = await store.get_state()
+    august = RefugeHistoricalEvent(
+        event_id="aug-0",
+        event_type="construction_started",
+        occurred_at="2026-08-02T00:00:00+00:00",
+    )
+    await store.save_state(replace(state, events=state.events + (august,)))
+    await service.sync(at=datetime(2026, 9, 1, 12, 0, tzinfo=timezone.utc))
+
+    reads = []
+    original = store.events_between
+
+    async def counting_events_between(start, end):
+        reads.append((start, end))
+        return await original(start, end)
+
+    monkeypatch.setattr(store, "events_between", counting_events_between)
+    timeline = await service.get_timeline(at=datetime(2026, 9, 2, tzinfo=timezone.utc))
+
+    counts = {chapter.season_id: chapter.chapter_event_count for chapter in timeline.chapters}
+    assert counts == {"2026-07": len(july), "2026-08": 1}
+    august_chapter = next(c for c in timeline.chapters if c.season_id == "2026-08")
+    assert len(august_chapter.state.events) == len(july) + 1
+    assert len(reads) == 1
@@ -5,6 +5,8 @@ from datetime import datetime, timedelta, timezone
 
 import pytest
 
+import services.refuge_world as refuge_world_module
+
 from models.refuge_world import (
     RefugeBuildingState,
     RefugeHistoricalEvent,
@@ -253,3 +255,24 @@ async def test_service_rejects_multiple_rules_for_same_building(tmp_path):
                 BuildingProgressionRule("fire", "b"),
             ],
         )
+
+
+def test_world_render_signature_is_memoized_per_state(monkeypatch):
+    state = RefugeWorldState(
+        buildings=(RefugeBuildingState(building_id="fire", level=2),),
+        state={"refuge_timeline": {"enabled_at": "x"}},
+    )
+    calls = []
+    original = refuge_world_module.content_hash
+
+    def counting_hash(payload):
+        calls.append(payload)
+        return original(payload)
+
+    monkeypatch.setattr(refuge_world_module, "content_hash", counting_hash)
+
+    first = world_render_signature(state)
+    assert world_render_signature(state) == first
+    assert len(calls) == 1
+    assert world_render_signature(replace(state, state={})) == first
+    assert len(calls) == 2
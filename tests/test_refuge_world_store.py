@@ -184,3 +184,51 @@ async def test_future_schema_is_rejected_without_overwrite(tmp_path):
         await RefugeWorldStore(path).get_state()
 
     assert json.loads(path.read_text(encoding="utf-8")) == payload
+
+
+@pytest.mark.asyncio
+async def test_readers_share_one_deeply_immutable_state(tmp_path, monkeypatch):
+    path = tmp_path / "refuge_world.json"
+    store = RefugeWorldStore(path)
+    saved = await store.save_state(
+        RefugeWorldState(
+            created_at="2026-08-09T04:00:00+00:00",
+            buildings=(
+                RefugeBuildingState(
+                    building_id="fire",
+                    level=1,
+                    state={"secret_events": ["first_visitor"], "glow": {"lit": True}},
+                ),
+            ),
+        )
+    )
+
+    first = await store.get_state()
+    second = await store.load()
+    fire = first.buildings[0]
+
+    assert first is second is saved
+    assert fire.state["secret_events"] == ("first_visitor",)
+    with pytest.raises(TypeError):
+        fire.state["glow"]["lit"] = False  # type: ignore[index]
+    assert read_json_safe(path, {})["buildings"]["fire"]["state"] == {
+        "secret_events": ["first_visitor"],
+        "glow": {"lit": True},
+    }
+
+    writes = []
+
+    async def counting_write(target, payload):
+        writes.append(payload)
+
+    monkeypatch.setattr(
+        "storage.snapshot_store.atomic_write_bytes_async",
+        counting_write,
+    )
+    rebuilt = RefugeWorldState.from_dict(first.to_dict())
+    await store.save_state(rebuilt)
+    unchanged = await store.update_state(lambda state: state)
+
+    assert writes == []
+    assert unchanged is rebuilt
+    assert rebuilt.content_hash == first.content_hash
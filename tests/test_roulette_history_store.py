@@ -1,3 +1,6 @@
+import asyncio
+import random
+import sqlite3
 from datetime import datetime, timedelta, timezone
 
 import pytest
@@ -165,3 +168,71 @@ async def test_roulette_history_ignores_non_positive_spotlight_and_bounds_input(
             selected_number=None,
             at=now,
         )
+
+
+@pytest.mark.asyncio
+async def test_living_snapshot_matches_sql_aggregation(tmp_path):
+    store = RouletteHistoryStore(tmp_path / "refuge.db")
+    rng = random.Random(7)
+    start = datetime(2026, 8, 19, 0, 0, tzinfo=timezone.utc)
+    bet_types = ("red", "black", "even", "odd", "number")
+    moment = start
+    for _ in range(200):
+        moment += timedelta(minutes=rng.randint(1, 20))
+        bet_type = rng.choice(bet_types)
+        won = rng.random() < 0.45
+        wager = rng.choice((10, 20, 50, 100, 500))
+        await store.record_event(
+            user_id=rng.randint(1, 8),
+            bet_type=bet_type,
+            wager_xp=wager,
+            payout_xp=wager * (10 if bet_type == "number" else 2) if won else 0,
+            won=won,
+            zero_hit=False,
+            selected_number=rng.randint(1, 36) if bet_type == "number" else None,
+            at=moment,
+        )
+
+    for offset in (timedelta(minutes=1), timedelta(hours=6), timedelta(hours=30)):
+        at = moment + offset
+        live = await store.get_living_snapshot(at=at)
+        expected = await asyncio.to_thread(
+            store._snapshot_sync,
+            6,
+            (at - timedelta(hours=24)).isoformat(),
+        )
+        assert live == expected
+
+    reopened = RouletteHistoryStore(tmp_path / "refuge.db")
+    assert await reopened.get_living_snapshot(at=moment + timedelta(hours=30)) == expected
+
+
+@pytest.mark.asyncio
+async def test_snapshot_window_expires_and_retention_is_pruned_in_batches(tmp_path):
+    path = tmp_path / "refuge.db"
+    store = RouletteHistoryStore(path)
+    old = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+    for index in range(5):
+        await store.record_event(
+            user_id=1,
+            bet_type="red",
+            wager_xp=10,
+            payout_xp=20,
+            won=True,
+            zero_hit=False,
+            at=old + timedelta(minutes=index),
+        )
+    snapshot = await store.get_living_snapshot(at=old + timedelta(hours=1))
+    assert snapshot["spotlight"]["bets"] == 5
+    assert snapshot["streak"] == {"side": "players", "count": 5}
+
+    later = await store.get_living_snapshot(at=old + timedelta(hours=25))
+    assert later["spotlight"] is None
+    assert later["biggest_win"] is None
+    assert len(later["recent"]) == 5
+
+    deleted = await store.prune_expired(at=old + timedelta(days=31), batch_size=2)
+
+    assert deleted == 5
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM roulette_events").fetchone()[0] == 0
@@ -80,6 +80,35 @@ async def test_store_keeps_months_separate_and_persists(tmp_path):
     assert persisted["seasons"]["2026-09"]["users"]["42"]["xp_earned"] == 16
 
 
+@pytest.mark.asyncio
+async def test_store_running_totals_match_full_rebuild_across_restart(tmp_path):
+    path = tmp_path / "season_stats.json"
+    store = SeasonStore(path)
+    august = datetime(2026, 8, 10, 12, tzinfo=timezone.utc)
+    september = datetime(2026, 9, 10, 12, tzinfo=timezone.utc)
+
+    for user_id in range(1, 6):
+        await store.record(user_id, at=august, messages=user_id, voice_seconds=60)
+    await store.record(3, at=september, messages=10)
+    await store.sync_casino_totals({"3": {"bets": 1, "wagered": 10, "winnings": 0}}, at=september)
+    await store.sync_casino_totals({"3": {"bets": 4, "wagered": 40, "winnings": 5}}, at=september)
+
+    assert await store.metric_total("messages") == 25
+    assert await store.metric_total("messages", season_id="2026-08") == 15
+    assert await store.metric_total("voice_seconds", season_id="2026-09") == 0
+    assert await store.metric_total("casino_bets", season_id="2026-09") == 3
+    assert await store.metric_total("casino_net") == -25
+    assert await store.metric_total("messages", season_id="2030-01") == 0
+    assert await store.verify_totals()
+    assert (await store.season_metadata("2026-08"))["label"]
+    assert "users" not in await store.season_metadata("2026-08")
+
+    await store.flush()
+    restarted = SeasonStore(path)
+    assert await restarted.metric_total("messages") == 25
+    assert await restarted.verify_totals()
+
+
 @pytest.mark.asyncio
 async def test_first_casino_snapshot_is_baseline_only_and_survives_restart(tmp_path):
     path = tmp_path / "season_stats.json"
@@ -131,17 +160,16 @@ async def test_new_casino_player_counts_from_zero_after_global_baseline(tmp_path
 @pytest.mark.asyncio
 async def test_award_xp_records_actual_positive_delta(monkeypatch):
     xp.XP_BOOSTS.clear()
-    add_xp = AsyncMock(return_value=(2, 2, 200, 208))
-    record = AsyncMock()
-    monkeypatch.setattr(xp.xp_store, "add_xp", add_xp)
-    monkeypatch.setattr(xp.season_store, "record", record)
+    add_xp_many = AsyncMock(return_value=[(2, 2, 200, 208)])
+    record_many = AsyncMock()
+    monkeypatch.setattr(xp.xp_store, "add_xp_many", add_xp_many)
+    monkeypatch.setattr(xp.season_store, "record_many", record_many)
 
     result = await xp.award_xp(7, 8, guild_id=123, source="message")
 
     assert result == (2, 2, 200, 208)
-    record.assert_awaited_once()
-    kwargs = record.await_args.kwargs
-    assert kwargs["xp_earned"] == 8
+    record_many.assert_awaited_once()
+    assert record_many.await_args.args[0] == [(7, {"xp_earned": 8})]
 
 
 @pytest.mark.asyncio
@@ -149,12 +177,12 @@ async def test_award_xp_excludes_staff_grants(monkeypatch):
     xp.XP_BOOSTS.clear()
     monkeypatch.setattr(
         xp.xp_store,
-        "add_xp",
-        AsyncMock(return_value=(2, 3, 200, 700)),
+        "add_xp_many",
+        AsyncMock(return_value=[(2, 3, 200, 700)]),
     )
-    record = AsyncMock()
-    monkeypatch.setattr(xp.season_store, "record", record)
+    record_many = AsyncMock()
+    monkeypatch.setattr(xp.season_store, "record_many", record_many)
 
     await xp.award_xp(7, 500, guild_id=123, source="don_xp")
 
-    record.assert_not_awaited()
+    record_many.assert_not_awaited()
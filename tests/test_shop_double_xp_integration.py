@@ -30,8 +30,8 @@ async def test_shop_double_xp_activates_real_award_path(monkeypatch):
         SimpleNamespace(add=AsyncMock()),
     )
 
-    store_add = AsyncMock(return_value=(0, 0, 0, 20))
-    monkeypatch.setattr(xp.xp_store, "add_xp", store_add)
+    store_add = AsyncMock(return_value=[(0, 0, 0, 20)])
+    monkeypatch.setattr(xp.xp_store, "add_xp_many", store_add)
 
     cog = economy_ui.EconomyUICog(object())
     send = AsyncMock()
@@ -50,10 +50,8 @@ async def test_shop_double_xp_activates_real_award_path(monkeypatch):
 
     await xp.award_xp(42, 10, guild_id=123, source="integration_test")
     store_add.assert_awaited_once_with(
-        42,
-        20,
+        [(42, 20, "integration_test")],
         guild_id=123,
-        source="integration_test",
     )
 
 
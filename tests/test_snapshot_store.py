@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from storage.refuge_casino_activity_store import RefugeCasinoActivityStore
+from storage.season_store import SeasonStore
+from storage import season_store as season_store_module
+from storage.snapshot_store import JsonSnapshotStore
+from utils.frozen import freeze, thaw
+
+
+def test_freeze_round_trips_through_thaw() -> None:
+    document = {"users": {"1": {"xp": 3}}, "jackpots": [{"tier": 500}]}
+
+    frozen = freeze(document)
+
+    assert frozen == {"users": {"1": {"xp": 3}}, "jackpots": ({"tier": 500},)}
+    with pytest.raises(TypeError):
+        frozen["users"]["1"]["xp"] = 4
+    assert thaw(frozen) == document
+
+
+def test_base_store_requires_a_loader() -> None:
+    with pytest.raises(TypeError):
+        JsonSnapshotStore("unused.json")  # type: ignore[abstract]
+
+
+@pytest.mark.asyncio
+async def test_season_view_follows_increments_without_refreezing(
+    tmp_path, monkeypatch
+) -> None:
+    store = SeasonStore(tmp_path / "season_stats.json")
+    at = datetime(2026, 8, 10, tzinfo=timezone.utc)
+    for user_id in range(1, 51):
+        await store.record(user_id, at=at, messages=1)
+    season = await store.get_season("2026-08")
+
+    frozen: list[object] = []
+
+    def counting_freeze(value):
+        frozen.append(value)
+        return freeze(value)
+
+    monkeypatch.setattr(season_store_module, "freeze", counting_freeze)
+    await store.record(7, at=at, messages=2)
+    await store.record(99, at=at, xp_earned=5)
+
+    assert await store.get_season("2026-08") is season
+    assert len(frozen) == 2
+    assert season["users"]["7"]["messages"] == 3
+    assert season["users"]["99"] == {"xp_earned": 5}
+    assert len(season["users"]) == 51
+    with pytest.raises(TypeError):
+        season["users"]["7"]["messages"] = 0
+
+
+@pytest.mark.asyncio
+async def test_store_writes_compact_json_and_skips_identical_payloads(tmp_path) -> None:
+    path = tmp_path / "season_stats.json"
+    store = SeasonStore(path)
+    at = datetime(2026, 8, 10, tzinfo=timezone.utc)
+
+    await store.record(1, at=at, messages=2)
+    await store.flush()
+    text = path.read_text(encoding="utf-8")
+    assert "\n" not in text and ": " not in text
+    assert store.stats.writes == 1
+    assert store.stats.bytes_written == len(text.encode("utf-8"))
+
+    # Marked dirty but serialized to the same bytes: no rewrite.
+    store._mark_dirty_locked()
+    await store.flush()
+    assert store.stats.writes == 1
+    assert store.stats.skipped_writes == 1
+
+    restarted = SeasonStore(path)
+    season = await restarted.get_season("2026-08")
+    assert season["users"]["1"]["messages"] == 2
+    assert restarted.stats.loads == 1
+    assert restarted.stats.bytes_read == len(text.encode("utf-8"))
+    assert await restarted.get_season("2026-08") is season
+
+
+@pytest.mark.asyncio
+async def test_casino_activity_writes_are_debounced(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(RefugeCasinoActivityStore, "flush_delay", 0.01)
+    path = tmp_path / "refuge_casino_activity.json"
+    store = RefugeCasinoActivityStore(path)
+    at = datetime(2026, 8, 10, tzinfo=timezone.utc)
+
+    for _ in range(5):
+        await store.record_transaction(
+            user_id=1, source="pari_xp", requested_amount=10, applied_delta=-10, at=at
+        )
+    assert not path.exists()
+
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if store.stats.writes:
+            break
+    assert store.stats.writes == 1
+    restarted = RefugeCasinoActivityStore(path)
+    snapshot = await restarted.get_snapshot(at=at)
+    assert snapshot["totals"]["roulette_wagered_xp"] == 50
@@ -163,3 +163,110 @@ async def test_startup_updates_channels_on_empty_cache(monkeypatch, tmp_path):
     assert ch2.name == f"🟢 En ligne : {online}"
     voice = sum(len([m for m in vc.members if not m.bot]) for vc in guild.voice_channels)
     assert ch3.name == f"🔊 Voc : {voice}"
+
+
+@pytest.mark.asyncio
+async def test_events_maintain_counters_and_skip_unchanged_writes(monkeypatch, tmp_path):
+    online_channel = DummyChannel()
+    members_channel = DummyChannel()
+    channels = {
+        config.STATS_MEMBERS_CHANNEL_ID: members_channel,
+        config.STATS_ONLINE_CHANNEL_ID: online_channel,
+    }
+    alice = DummyMember(discord.Status.online)
+    guild = DummyGuild([alice, DummyMember(discord.Status.online, bot=True)], channels, [])
+    guild.id = 1
+    alice.guild = guild
+
+    requests = []
+
+    async def fake_request(channel, name):
+        requests.append(name)
+        channel.name = name
+
+    writes = []
+
+    async def fake_write(path, data):
+        writes.append(dict(data))
+
+    monkeypatch.setattr("cogs.stats.rename_manager.request", fake_request)
+    monkeypatch.setattr("cogs.stats._ensure_rename_manager_started", AsyncMock())
+    monkeypatch.setattr("cogs.stats.atomic_write_json_async", fake_write)
+    monkeypatch.setattr("cogs.stats.read_json_safe", lambda *_a, **_k: {})
+    monkeypatch.setattr(asyncio, "create_task", lambda coro, **_k: coro.close())
+
+    cog = StatsCog(SimpleNamespace(guilds=[guild]))
+    await cog.update_online(guild)
+    await cog.update_members(guild)
+    assert requests == ["🟢 En ligne : 1", "👥 Membres : 1"]
+
+    # Plus aucun parcours des membres : les événements suffisent.
+    guild.members = None
+    await cog.on_presence_update(
+        SimpleNamespace(status=discord.Status.online, bot=False, guild=guild),
+        SimpleNamespace(status=discord.Status.offline, bot=False, guild=guild),
+    )
+    newcomer = DummyMember(discord.Status.online)
+    newcomer.guild = guild
+    guild.member_count += 1
+    await cog.on_member_join(newcomer)
+    await cog.update_online(guild)
+    # Même valeur affichée : ni renommage ni écriture disque.
+    assert len(requests) == 2
+    assert len(writes) == 2
+
+    await cog.on_member_remove(alice)
+    guild.member_count -= 1
+    await cog.update_online(guild)
+    await cog.update_members(guild)
+    assert requests[2:] == ["🟢 En ligne : 0"]
+    assert len(writes) == 3
+
+
+@pytest.mark.asyncio
+async def test_safety_net_loops_repush_names_after_a_lost_rename(monkeypatch):
+    online_channel = DummyChannel()
+    voice_channel = DummyChannel()
+    channels = {
+        config.STATS_ONLINE_CHANNEL_ID: online_channel,
+        config.STATS_VOICE_CHANNEL_ID: voice_channel,
+    }
+    guild = DummyGuild([DummyMember(discord.Status.online)], channels, [])
+    guild.id = 1
+
+    lost = True
+    requests = []
+
+    async def fake_request(channel, name):
+        requests.append(name)
+        # Le premier renommage échoue dans rename_manager (429, 403...).
+        if not lost:
+            channel.name = name
+
+    async def fake_write(path, data):
+        pass
+
+    monkeypatch.setattr("cogs.stats.rename_manager.request", fake_request)
+    monkeypatch.setattr("cogs.stats._ensure_rename_manager_started", AsyncMock())
+    monkeypatch.setattr("cogs.stats.atomic_write_json_async", fake_write)
+    monkeypatch.setattr("cogs.stats.read_json_safe", lambda *_a, **_k: {})
+    monkeypatch.setattr("cogs.stats.voice_presence.human_count", lambda _g: 2)
+    monkeypatch.setattr(asyncio, "create_task", lambda coro, **_k: coro.close())
+
+    bot = SimpleNamespace(guilds=[guild], wait_until_ready=AsyncMock())
+    cog = StatsCog(bot)
+    await cog.update_online(guild)
+    await cog.update_voice(guild)
+    assert online_channel.name is None and voice_channel.name is None
+
+    # Les événements ne renomment pas une valeur déjà demandée...
+    lost = False
+    await cog.update_online(guild)
+    await cog.update_voice(guild)
+    assert len(requests) == 2
+
+    # ...mais les boucles de sécurité republient sans consulter ``_displayed``.
+    await cog.refresh_online.coro(cog)
+    await cog.refresh_voice.coro(cog)
+    assert online_channel.name == "🟢 En ligne : 1"
+    assert voice_channel.name == "🔊 Voc : 2"
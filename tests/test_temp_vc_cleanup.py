@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
+import discord
 import pytest
 
 from storage.temp_vc_store import GENERIC_TEMP_VC_TYPE, build_temp_vc_record
@@ -155,7 +156,7 @@ async def test_legacy_migration_requires_persisted_owner_and_ignores_name(monkey
 
 
 @pytest.mark.asyncio
-async def test_rename_task_cancelled_on_channel_delete(monkeypatch):
+async def test_pending_rename_dropped_on_channel_delete(monkeypatch):
     temp_vc.TEMP_VC_IDS.clear()
     temp_vc.TEMP_VC_REGISTRY.clear()
     temp_vc.TEMP_VC_IDS.add(42)
@@ -186,27 +187,54 @@ async def test_rename_task_cancelled_on_channel_delete(monkeypatch):
     channel = SimpleNamespace(id=42, name="Temp", members=[], delete=AsyncMock())
     member = SimpleNamespace(id=1)
 
-    # Create a dummy rename task and track pop calls
-    class TrackingDict(dict):
-        def __init__(self, *a, **k):
-            super().__init__(*a, **k)
-            self.popped = False
-
-        def pop(self, key, default=None):
-            self.popped = True
-            return super().pop(key, default)
-
-    task = loop.create_task(asyncio.sleep(3600))
-    cog._rename_tasks = TrackingDict({channel.id: task})
+    cog._dirty[channel.id] = (0.0, channel)
+    cog._name_cache[channel.id] = ((), "Temp")
 
     before = SimpleNamespace(channel=channel)
     after = SimpleNamespace(channel=None)
 
     await cog.on_voice_state_update(member, before, after)
-    await asyncio.sleep(0)
+    await cog._drain_renames(now=float("inf"))
 
     channel.delete.assert_awaited_once()
-    assert channel.id not in cog._rename_tasks
+    assert channel.id not in cog._dirty
+    assert channel.id not in cog._name_cache
     assert channel.id not in temp_vc.TEMP_VC_REGISTRY
-    assert task.cancelled()
-    assert cog._rename_tasks.popped
+
+
+@pytest.mark.asyncio
+async def test_cleanup_deletes_planned_channels_concurrently_through_limiter(monkeypatch):
+    channels = {cid: DummyVoiceChannel(cid, "PC") for cid in range(100, 108)}
+    channels[103].members = [object()]
+    bot = SimpleNamespace(get_channel=channels.get)
+    records = {
+        cid: build_temp_vc_record(cid, 1, channel.created_at.isoformat())
+        for cid, channel in channels.items()
+    }
+
+    in_flight = 0
+    peak = 0
+
+    async def slow_delete(**_kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    for channel in channels.values():
+        channel.delete = AsyncMock(side_effect=slow_delete)
+    channels[105].delete.side_effect = discord.HTTPException(
+        SimpleNamespace(status=500, reason="boom"), "boom"
+    )
+
+    acquire = AsyncMock()
+    monkeypatch.setattr("utils.temp_vc_cleanup.limiter.acquire", acquire)
+
+    with patch("utils.temp_vc_cleanup.discord.VoiceChannel", DummyVoiceChannel):
+        deleted = await delete_empty_managed_temp_vcs(bot, records, concurrency=3)
+
+    assert deleted == {100, 101, 102, 104, 106, 107}
+    assert 1 < peak <= 3
+    assert acquire.await_count == 7
+    acquire.assert_awaited_with(bucket="channel_delete")
@@ -2,33 +2,83 @@ import asyncio
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
+import discord
 import pytest
 import cogs.temp_vc as temp_vc
 from config import RENAME_DELAY
 
 
-@pytest.mark.asyncio
-async def test_rename_channel_uses_config_delay(monkeypatch):
-    channel = SimpleNamespace(id=1, name="Old", members=[object()])
-    loop = asyncio.get_running_loop()
-    bot = SimpleNamespace(loop=loop)
-
-    delays = []
+def _make_cog(monkeypatch):
+    bot = SimpleNamespace(loop=asyncio.get_running_loop(), get_channel=lambda _id: None)
+    monkeypatch.setattr(temp_vc.rename_manager, "request", AsyncMock())
+    monkeypatch.setattr(temp_vc.rename_manager, "start", AsyncMock())
+    monkeypatch.setattr(temp_vc, "save_last_names_cache", AsyncMock())
+    with patch.object(temp_vc.tasks.Loop, "start", lambda self, *a, **k: None):
+        return temp_vc.TempVCCog(bot)
 
-    async def fake_sleep(delay):
-        delays.append(delay)
 
-    monkeypatch.setattr(temp_vc.asyncio, "sleep", fake_sleep)
-    monkeypatch.setattr(temp_vc.rename_manager, "request", AsyncMock())
+def _channel(channel_id, members):
+    guild = SimpleNamespace()
+    channel = SimpleNamespace(id=channel_id, name="Old", members=members, guild=guild)
+    guild.get_channel = lambda cid: channel if cid == channel_id else None
+    return channel
 
-    with patch.object(temp_vc.tasks.Loop, "start", lambda self, *a, **k: None):
-        cog = temp_vc.TempVCCog(bot)
 
+@pytest.mark.asyncio
+async def test_rename_waits_for_config_delay(monkeypatch):
+    temp_vc.TEMP_VC_IDS.add(1)
+    cog = _make_cog(monkeypatch)
     cog._compute_channel_name = lambda ch: "New"
+    channel = _channel(1, [SimpleNamespace(activities=[], roles=[], voice=None)])
+
+    await cog._update_channel_name(channel)
+    deadline = cog._dirty[channel.id][0]
 
-    task = loop.create_task(cog._rename_channel(channel))
-    cog._rename_tasks[channel.id] = task
-    await task
+    await cog._drain_renames(now=deadline - RENAME_DELAY / 2)
+    temp_vc.rename_manager.request.assert_not_awaited()
 
-    assert delays == [RENAME_DELAY]
+    await cog._drain_renames(now=deadline)
     temp_vc.rename_manager.request.assert_awaited_once_with(channel, "New")
+    # Le cache des noms est marqué sale, pas écrit à chaque renommage.
+    temp_vc.save_last_names_cache.assert_not_awaited()
+    assert cog._names_writer.pending
+    assert await cog._names_writer.flush() is True
+    temp_vc.save_last_names_cache.assert_awaited_once_with({1: "New"})
+    assert channel.id not in cog._dirty
+    temp_vc.TEMP_VC_IDS.discard(1)
+
+
+@pytest.mark.asyncio
+async def test_event_burst_is_coalesced_into_one_rename(monkeypatch):
+    temp_vc.TEMP_VC_IDS.add(2)
+    cog = _make_cog(monkeypatch)
+    computed = []
+
+    def compute(channel):
+        computed.append(channel.id)
+        return "PC • Minecraft"
+
+    cog._compute_channel_name = compute
+    members = [
+        SimpleNamespace(id=index, activities=[discord.Game("Minecraft")], roles=[], voice=None)
+        for index in range(10)
+    ]
+    channel = _channel(2, members)
+
+    for _ in range(30):
+        await cog._update_channel_name(channel)
+    await cog._drain_renames(now=float("inf"))
+
+    assert cog.rename_counters == {"events": 30, "renames": 1}
+    assert computed == [2]
+    temp_vc.rename_manager.request.assert_awaited_once_with(channel, "PC • Minecraft")
+    await cog._names_writer.flush()
+
+    # Même empreinte de membres : ni recalcul, ni écriture supplémentaire.
+    channel.name = "PC • Minecraft"
+    await cog._update_channel_name(channel)
+    await cog._drain_renames(now=float("inf"))
+    assert computed == [2]
+    assert await cog._names_writer.flush() is False
+    temp_vc.save_last_names_cache.assert_awaited_once()
+    temp_vc.TEMP_VC_IDS.discard(2)
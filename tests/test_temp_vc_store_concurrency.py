@@ -9,14 +9,14 @@ import storage.temp_vc_store as temp_vc_store
 import utils.persistence as persistence
 
 
-def _reset_async_write_lock(monkeypatch) -> None:
-    monkeypatch.setattr(persistence, "_write_lock", None)
-    monkeypatch.setattr(persistence, "_write_lock_loop", None)
+def _reset_write_service(monkeypatch) -> None:
+    monkeypatch.setattr(persistence, "_writer", None)
+    monkeypatch.setattr(persistence, "_writer_loop", None)
 
 
 @pytest.mark.asyncio
 async def test_temp_vc_ids_newer_snapshot_wins(monkeypatch, tmp_path):
-    _reset_async_write_lock(monkeypatch)
+    _reset_write_service(monkeypatch)
     path = tmp_path / "temp_vc_ids.json"
     monkeypatch.setattr(temp_vc_store, "DATA_FILE", path)
 
@@ -42,7 +42,7 @@ async def test_temp_vc_ids_newer_snapshot_wins(monkeypatch, tmp_path):
 
 @pytest.mark.asyncio
 async def test_temp_vc_names_newer_snapshot_wins(monkeypatch, tmp_path):
-    _reset_async_write_lock(monkeypatch)
+    _reset_write_service(monkeypatch)
     path = tmp_path / "temp_vc_last_names.json"
     monkeypatch.setattr(temp_vc_store, "LAST_NAMES_FILE", path)
 
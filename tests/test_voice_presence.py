@@ -0,0 +1,92 @@
+import random
+from types import SimpleNamespace
+
+import discord
+
+from utils.voice_presence import VoicePresenceIndex
+
+
+def _member(member_id, guild, *, bot=False):
+    return SimpleNamespace(id=member_id, guild=guild, bot=bot)
+
+
+def _state(channel):
+    return SimpleNamespace(channel=channel)
+
+
+def _guild():
+    guild = SimpleNamespace(id=1)
+    lobby = SimpleNamespace(id=10, guild=guild, members=[])
+    gaming = SimpleNamespace(id=11, guild=guild, members=[])
+    guild.voice_channels = [lobby, gaming]
+    return guild, lobby, gaming
+
+
+def test_index_follows_joins_moves_and_leaves():
+    guild, lobby, gaming = _guild()
+    alice, bob, radio = _member(1, guild), _member(2, guild), _member(3, guild, bot=True)
+    lobby.members = [alice, radio]
+    index = VoicePresenceIndex()
+    index.rebuild(guild)
+
+    assert index.human_count(guild) == 1
+    assert index.channel_human_count(lobby) == 1
+
+    index.update(bob, _state(None), _state(gaming))
+    index.update(alice, _state(lobby), _state(gaming))
+
+    assert index.human_count(guild) == 2
+    assert index.channel_human_count(lobby) == 0
+    assert {m.id for m in index.channel_humans(gaming)} == {1, 2}
+    assert index.channel_of(guild.id, alice.id) == gaming.id
+
+    # Un « before » obsolète ne doit pas laisser de fantôme dans l'index.
+    index.update(bob, _state(lobby), _state(None))
+    assert index.human_count(guild) == 1
+    assert index.channel_of(guild.id, bob.id) is None
+
+
+def test_untracked_guild_falls_back_to_scan_and_sample_excludes():
+    guild, lobby, gaming = _guild()
+    alice, bob = _member(1, guild), _member(2, guild)
+    lobby.members = [alice]
+    gaming.members = [bob, _member(9, guild, bot=True)]
+    index = VoicePresenceIndex()
+
+    assert not index.is_tracking(guild)
+    assert index.human_count(guild) == 2
+    assert index.sample(guild, exclude=(alice.id,), rng=random.Random(0)) == [bob]
+
+    index.rebuild(guild)
+    assert index.sample(guild, k=5, exclude=(alice.id, bob.id)) == []
+    assert sorted(m.id for m in index.sample(guild, k=5)) == [1, 2]
+
+
+class _Stage(discord.StageChannel):
+    members = ()
+
+    def __init__(self, channel_id, guild, members=()):
+        self.id = channel_id
+        self.guild = guild
+        self.members = list(members)
+
+
+def test_stage_channels_are_not_counted_as_voice():
+    guild, lobby, _gaming = _guild()
+    alice, bob = _member(1, guild), _member(2, guild)
+    stage = _Stage(20, guild, [alice])
+    index = VoicePresenceIndex()
+    index.rebuild(guild)
+
+    index.update(alice, _state(None), _state(stage))
+    assert index.human_count(guild) == 0
+    assert index.channel_of(guild.id, alice.id) is None
+    # The stage audience itself is still readable from the channel.
+    assert index.channel_humans(stage) == [alice]
+    assert index.channel_human_count(stage) == 1
+
+    index.update(bob, _state(None), _state(lobby))
+    index.update(bob, _state(lobby), _state(stage))
+    index.update(alice, _state(stage), _state(lobby))
+    assert [m.id for m in index.humans(guild)] == [1]
+    assert index.channel_of(guild.id, bob.id) is None
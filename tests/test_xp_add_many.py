@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+import cogs.xp as xp
+from storage.xp_store import XPStore
+from utils import level_feed
+
+
+@pytest.mark.asyncio
+async def test_add_xp_many_applies_batch_in_order_and_emits_after_release(
+    tmp_path, monkeypatch
+):
+    store = XPStore(path=str(tmp_path / "xp.json"))
+    monkeypatch.setattr(store, "_schedule_flush", lambda: None)
+    store.data["1"] = {"xp": 300, "level": 1}
+    emitted = []
+
+    def fake_emit(event):
+        assert not store.lock.locked()
+        emitted.append(event)
+
+    monkeypatch.setattr(level_feed, "emit", fake_emit)
+
+    results = await store.add_xp_many(
+        [(1, 50, "voice_leave"), (2, 120, "voice_leave"), (1, 600, "machine_a_sous")],
+        guild_id=9,
+    )
+
+    assert results == [(1, 1, 300, 350), (0, 1, 0, 120), (1, 3, 350, 950)]
+    assert store.get_record(1).xp == 950
+    assert store.stats["total_updates"] == 3
+    assert [(e.user_id, e.old_level, e.new_level, e.source) for e in emitted] == [
+        (2, 0, 1, "voice_leave"),
+        (1, 1, 3, "machine_a_sous"),
+    ]
+    assert (await store.add_xp_many([(3, 50_000, "manual")]))[0][3] == 10000
+
+
+@pytest.mark.asyncio
+async def test_voice_leaves_in_one_window_share_one_batch(monkeypatch):
+    monkeypatch.setattr(xp.XPCog.auto_backup_xp, "start", lambda *a, **k: None)
+    batches = []
+
+    async def fake_award_xp_many(awards, guild_id=None, *, apply_personal_boost=True):
+        batches.append((list(awards), guild_id, apply_personal_boost))
+        return [(0, 0, 0, amount) for _uid, amount, _source in awards]
+
+    monkeypatch.setattr(xp, "award_xp_many", fake_award_xp_many)
+    batcher = xp._AwardBatcher(0.01, apply_personal_boost=False)
+
+    results = await asyncio.gather(
+        *(batcher.award(uid, uid * 3, 1, "voice_leave") for uid in range(1, 51)),
+        batcher.award(99, 6, 2, "voice_leave"),
+    )
+
+    assert [result[3] for result in results[:50]] == [uid * 3 for uid in range(1, 51)]
+    assert results[50] == (0, 0, 0, 6)
+    assert [(len(awards), guild, boost) for awards, guild, boost in batches] == [
+        (50, 1, False),
+        (1, 2, False),
+    ]
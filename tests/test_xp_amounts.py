@@ -14,7 +14,7 @@ def _disable_auto_backup(monkeypatch):
 @pytest.mark.asyncio
 async def test_message_awards_8_xp(monkeypatch):
     _disable_auto_backup(monkeypatch)
-    monkeypatch.setattr(xp, "schedule_checkpoint", AsyncMock())
+    monkeypatch.setattr(xp, "request_checkpoint", lambda *a, **k: None)
     award = AsyncMock(return_value=(0, 0, 0, 0))
     monkeypatch.setattr(xp, "award_xp", award)
     bot = SimpleNamespace(announce_level_up=AsyncMock())
@@ -40,8 +40,9 @@ async def test_voice_awards_3_xp_per_minute(monkeypatch):
     xp.XP_BOOST_STARTS.clear()
     xp.XP_BOOST_HISTORY.clear()
 
-    award = AsyncMock(return_value=(0, 0, 0, 0))
-    monkeypatch.setattr(xp, "award_xp", award)
+    award = AsyncMock(return_value=[(0, 0, 0, 0)])
+    monkeypatch.setattr(xp, "award_xp_many", award)
+    monkeypatch.setattr(xp, "VOICE_AWARD_BATCH_SECONDS", 0.0)
     bot = SimpleNamespace(announce_level_up=AsyncMock())
     cog = xp.XPCog(bot)
 
@@ -68,4 +69,33 @@ async def test_voice_awards_3_xp_per_minute(monkeypatch):
 
     await cog.on_voice_state_update(member, before, after)
     award.assert_awaited_once()
-    assert award.await_args.args[1] == 3
+    assert award.await_args.args == ([(42, 3, "voice_leave")], 1)
+    assert award.await_args.kwargs == {"apply_personal_boost": False}
+
+
+@pytest.mark.asyncio
+async def test_message_cooldown_counts_every_message_but_awards_once(monkeypatch):
+    _disable_auto_backup(monkeypatch)
+    monkeypatch.setattr(xp, "request_checkpoint", lambda *a, **k: None)
+    award = AsyncMock(return_value=(0, 0, 0, 0))
+    monkeypatch.setattr(xp, "award_xp", award)
+    xp.MESSAGE_COUNTS.clear()
+    cog = xp.XPCog(SimpleNamespace(announce_level_up=AsyncMock()))
+    msg = SimpleNamespace(
+        author=SimpleNamespace(bot=False, id=77),
+        guild=SimpleNamespace(id=123),
+        channel=SimpleNamespace(id=456),
+    )
+
+    for _ in range(3):
+        await cog.on_message(msg)
+
+    assert xp.MESSAGE_COUNTS[77] == 3
+    award.assert_awaited_once()
+
+    cog._message_ready_at[77] = 0.0
+    cog._prune_message_cooldowns()
+    assert 77 not in cog._message_ready_at
+    await cog.on_message(msg)
+    assert award.await_count == 2
+    xp.MESSAGE_COUNTS.clear()
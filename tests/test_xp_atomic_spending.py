@@ -1,4 +1,5 @@
 import asyncio
+import weakref
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
@@ -71,7 +72,10 @@ async def test_shop_does_not_grant_item_when_atomic_debit_fails(monkeypatch):
 async def test_roulette_rejects_bet_when_atomic_debit_fails(monkeypatch):
     cog = object.__new__(pari_xp.PariXPCog)
     cog.is_open = True
-    cog._bet_lock = asyncio.Lock()
+    cog._bet_locks = weakref.WeakValueDictionary()
+    cog._journal = SimpleNamespace(append=AsyncMock(), compact=AsyncMock())
+    cog._journal_seq = 0
+    cog._persisted_seq = 0
 
     monkeypatch.setattr(
         pari_xp.xp_store,
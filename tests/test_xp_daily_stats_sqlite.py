@@ -72,3 +72,34 @@ async def test_load_daily_stats_imports_legacy_once(tmp_path, monkeypatch):
     }
     assert first == expected
     assert second == expected
+
+
+@pytest.mark.asyncio
+async def test_message_counts_are_folded_on_save_and_rollover(tmp_path, monkeypatch):
+    db = SQLiteDatabase(tmp_path / "refuge.db")
+    monkeypatch.setattr(xp, "database", db)
+    monkeypatch.setattr(xp, "MESSAGE_DAY", "2026-08-19")
+    xp.DAILY_STATS.clear()
+    xp.DAILY_STATS["2026-08-19"] = {"42": {"messages": 3, "voice": 120}}
+    xp.MESSAGE_COUNTS.clear()
+    xp.MESSAGE_COUNTS.update({42: 2, 7: 1})
+
+    await xp.save_daily_stats_to_disk()
+
+    assert not xp.MESSAGE_COUNTS
+    assert await db.load_daily_stats() == {
+        "2026-08-19": {
+            "42": {"messages": 5, "voice": 120},
+            "7": {"messages": 1, "voice": 0},
+        }
+    }
+
+    # À minuit, les messages restants comptent pour la veille puis l'ancien
+    # jour quitte le cache.
+    xp.MESSAGE_COUNTS[7] += 4
+    xp._roll_daily_stats("2026-08-20")
+    assert xp.MESSAGE_DAY == "2026-08-20"
+    assert xp.DAILY_STATS == {}
+    xp.MESSAGE_COUNTS[7] += 1
+    xp._fold_message_counts()
+    assert xp.DAILY_STATS == {"2026-08-20": {"7": {"messages": 1, "voice": 0}}}
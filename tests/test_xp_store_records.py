@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from storage.xp_store import XPRecord, XPStore
+
+
+def test_data_view_round_trips_legacy_payloads(tmp_path):
+    store = XPStore(path=str(tmp_path / "xp.json"))
+    expiry = datetime(2026, 8, 19, 12, 0, tzinfo=timezone.utc)
+    store.data["7"] = {"xp": 500, "level": 2, "double_xp_until": expiry.isoformat()}
+
+    record = store.get_record(7)
+    assert isinstance(record, XPRecord)
+    assert record.boost_until == expiry.timestamp()
+    assert store.data["7"] == {
+        "xp": 500,
+        "level": 2,
+        "double_xp_until": "2026-08-19T12:00:00+00:00",
+    }
+
+    user = store.data.setdefault("7", {"xp": 0, "level": 0})
+    user["xp"] = 650
+    del user["double_xp_until"]
+
+    assert record.xp == 650
+    assert record.boost_until is None
+    assert "double_xp_until" not in store.data["7"]
+    assert "abc" not in store.data
+
+
+@pytest.mark.asyncio
+async def test_started_flush_upserts_only_touched_members(tmp_path):
+    store = XPStore(path=str(tmp_path / "xp.json"))
+    await store.start()
+    store.data = {str(uid): {"xp": uid * 100, "level": 1} for uid in range(1, 6)}
+    await store.flush()
+    assert store._dirty == set()
+
+    await store.add_xp(3, 50)
+    before = datetime.now(timezone.utc) - timedelta(seconds=2)
+    written: list[list[tuple]] = []
+    original = store._database.upsert_xp_rows
+
+    async def spy(rows):
+        written.append(list(rows))
+        await original(rows)
+
+    store._database.upsert_xp_rows = spy
+    await store.flush()
+
+    assert [row[:3] for row in written[0]] == [(3, 350, 1)]
+    last_accessed = datetime.fromisoformat(written[0][0][4])
+    assert last_accessed >= before.replace(microsecond=0)
+    assert (await store._database.load_xp())["3"]["xp"] == 350
+
+    await store.aclose()
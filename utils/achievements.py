@@ -123,6 +123,16 @@ def qualifying_achievement_ids(metrics: Mapping[str, int]) -> list[str]:
     return qualified
 
 
+def achievements_for_metric(metric: str, value: int) -> list[str]:
+    """Return the achievements of one metric reached by ``value``."""
+
+    return [
+        achievement.id
+        for achievement in ACHIEVEMENTS
+        if achievement.metric == metric and value >= achievement.threshold
+    ]
+
+
 def achievement_progress(
     achievement: AchievementDefinition,
     metrics: Mapping[str, int],
@@ -0,0 +1,42 @@
+"""Read-only deep views of JSON-like values.
+
+Shared by the models and the storage layer: stores hand frozen snapshots to
+readers, and models keep their nested payloads frozen so states can be shared
+without defensive copies.
+"""
+
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Any, Mapping
+
+
+def freeze(value: Any) -> Any:
+    """Return a read-only deep view of a JSON-like value.
+
+    Mappings become ``MappingProxyType`` over fresh dicts with string keys and
+    lists become tuples, so a snapshot can be handed to any number of readers
+    without copying it again or letting them alter the store. Already frozen
+    mappings are returned unchanged.
+    """
+
+    if isinstance(value, MappingProxyType):
+        return value
+    if isinstance(value, Mapping):
+        return MappingProxyType({str(key): freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable, JSON-serializable deep copy of a frozen value."""
+
+    if isinstance(value, Mapping):
+        return {str(key): thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+__all__ = ["freeze", "thaw"]
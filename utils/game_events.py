@@ -7,7 +7,12 @@ from datetime import datetime, timezone
 from typing import Dict, Optional, Set
 
 from config import GAMES_DATA_DIR
-from utils.persistence import ensure_dir, read_json_safe, atomic_write_json_async
+from utils.persistence import (
+    ARCHIVE,
+    ensure_dir,
+    read_json_safe,
+    atomic_write_json_async,
+)
 
 __all__ = [
     "GameEvent",
@@ -119,7 +124,11 @@ def _path_for(event_id: str) -> str:
 
 async def save_event(evt: GameEvent) -> None:
     ensure_dir(GAMES_DATA_DIR)
-    await atomic_write_json_async(_path_for(evt.id), evt.to_dict())
+    if evt.state in {"finished", "cancelled"}:
+        # Événement clos : archive compressée, relue par read_json_safe.
+        await atomic_write_json_async(_path_for(evt.id), evt.to_dict(), profile=ARCHIVE)
+    else:
+        await atomic_write_json_async(_path_for(evt.id), evt.to_dict())
 
 
 def set_voice_channel(evt: GameEvent, vc_id: Optional[int]) -> None:
@@ -2,13 +2,15 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from dataclasses import dataclass
 from collections import Counter
-from typing import Dict, Tuple
+from typing import Callable, Dict, List, Tuple
 
 import discord
 
 from config import LEVEL_FEED_CHANNEL_ID, ENABLE_GAME_LEVEL_FEED
+from utils.background_tasks import background_tasks
 from utils.messages import LEVEL_FEED_TEMPLATES
 from utils.discord_utils import safe_message_edit
 
@@ -19,6 +21,13 @@ GAME_SOURCES = {"pari_xp", "machine_a_sous"}
 TEMPLATE_SOURCES = {key.rsplit("_", 1)[0] for key in LEVEL_FEED_TEMPLATES}
 SUPPORTED_SOURCES = GAME_SOURCES | TEMPLATE_SOURCES
 REFUGE_GAMER_COLOR = discord.Color(0xFF5DA2)
+LEVEL_UP_TITLE = "⬆️ LEVEL UP DANS LE REFUGE ! 🎮"
+LEVEL_DOWN_TITLE = "⬇️ LEVEL DOWN"
+# After an announcement, the ones arriving within this window are merged into
+# a single message sent when it ends.
+LEVEL_FEED_BATCH_SECONDS = 2.0
+# Lines per merged embed; keeps the description far below Discord's limit.
+LEVEL_FEED_BATCH_MAX_LINES = 25
 
 
 @dataclass
@@ -32,6 +41,49 @@ class LevelChange:
     source: str
 
 
+@dataclass(frozen=True, slots=True)
+class FeedAnnouncement:
+    """One level-feed announcement.
+
+    ``embed`` is sent when the announcement goes out alone; ``line`` is its
+    one-line form in a merged embed.
+    """
+
+    embed: discord.Embed
+    line: str
+    direction: str
+    source: str
+
+
+def announcement_line(
+    mention: str, direction: str, new_level: int, xp_delta: int
+) -> str:
+    if direction == "up":
+        return f"⬆️ {mention} → **niveau {new_level}** (+{abs(xp_delta)} XP)"
+    return f"⬇️ {mention} → **niveau {new_level}** (—{abs(xp_delta)} XP)"
+
+
+def merged_embed(
+    announcements: List[FeedAnnouncement], *, total: int
+) -> discord.Embed:
+    """Build one multi-line embed for a chunk of a merged batch."""
+    directions = {announcement.direction for announcement in announcements}
+    if directions == {"up"}:
+        title = LEVEL_UP_TITLE
+    elif directions == {"down"}:
+        title = LEVEL_DOWN_TITLE
+    else:
+        title = "🎮 MOUVEMENTS DE NIVEAU DANS LE REFUGE"
+    embed = discord.Embed(
+        title=title,
+        description="\n".join(announcement.line for announcement in announcements),
+        color=REFUGE_GAMER_COLOR,
+    )
+    embed.set_footer(text=f"{total} changements de niveau regroupés")
+    embed.timestamp = discord.utils.utcnow()
+    return embed
+
+
 class LevelFeedRouter:
     def __init__(self) -> None:
         self.bot: discord.Client | None = None
@@ -39,11 +91,43 @@ class LevelFeedRouter:
         self._tasks: Dict[Tuple[int, str], asyncio.Task] = {}
         self.metrics: Counter[str] = Counter()
         self._pari_xp_messages: Dict[Tuple[int, str], discord.Message] = {}
+        self._listeners: List[Callable[[LevelChange], None]] = []
+        self._reset_channel_state()
+
+    def _reset_channel_state(self) -> None:
+        self._channel: discord.abc.Messageable | None = None
+        self._batch: List[FeedAnnouncement] = []
+        self._batch_task: asyncio.Task | None = None
+        self._window_until = 0.0
 
     def setup(self, bot: discord.Client) -> None:
         self.bot = bot
+        self._reset_channel_state()
+
+    @property
+    def messages_saved(self) -> int:
+        """Return how many feed messages batching has avoided so far."""
+        return self.metrics["level_feed.messages_saved"]
+
+    def add_listener(self, callback: Callable[[LevelChange], None]) -> None:
+        """Call ``callback`` synchronously for every emitted level change.
+
+        Listeners see each event immediately, before feed coalescing, and must
+        not block: they should only record or schedule work.
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[LevelChange], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
 
     def emit(self, event: LevelChange) -> None:
+        for callback in tuple(self._listeners):
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("level change listener failed")
         key = (event.user_id, event.source)
         self._pending[key] = event
         if key in self._tasks:
@@ -65,16 +149,6 @@ class LevelFeedRouter:
             return
         if not self.bot:
             return
-        channel = self.bot.get_channel(LEVEL_FEED_CHANNEL_ID)
-        if channel is None:
-            try:
-                channel = await self.bot.fetch_channel(LEVEL_FEED_CHANNEL_ID)
-            except Exception:
-                channel = None
-        if not isinstance(channel, discord.abc.Messageable):
-            self.metrics["level_feed.skipped_no_channel"] += 1
-            logger.warning("level feed channel unavailable or invalid")
-            return
         user = self.bot.get_user(event.user_id)
         mention = user.mention if user else f"<@{event.user_id}>"
         avatar_url = None
@@ -95,20 +169,25 @@ class LevelFeedRouter:
             return embed
 
         if event.source == "pari_xp":
+            # Pari XP edits the member's last message in place instead of
+            # posting a new one, so it never goes through the batch.
+            channel = await self.resolve_channel()
+            if channel is None:
+                return
             if direction == "up":
                 description = LEVEL_FEED_TEMPLATES["pari_xp_up"].format(
                     mention=mention,
                     new_level=event.new_level,
                     xp_gain=int(abs(xp_delta)),
                 )
-                embed = _build_embed("⬆️ LEVEL UP DANS LE REFUGE ! 🎮", description)
+                embed = _build_embed(LEVEL_UP_TITLE, description)
             else:
                 description = LEVEL_FEED_TEMPLATES["pari_xp_down"].format(
                     mention=mention,
                     new_level=event.new_level,
                     xp_loss=int(abs(xp_delta)),
                 )
-                embed = _build_embed("⬇️ LEVEL DOWN", description)
+                embed = _build_embed(LEVEL_DOWN_TITLE, description)
             key = (event.user_id, direction)
             last_msg = self._pari_xp_messages.get(key)
             try:
@@ -136,18 +215,104 @@ class LevelFeedRouter:
             xp_gain=int(abs(xp_delta)),
             xp_loss=int(abs(xp_delta)),
         )
-        title = (
-            "⬆️ LEVEL UP DANS LE REFUGE ! 🎮" if direction == "up" else "⬇️ LEVEL DOWN"
+        title = LEVEL_UP_TITLE if direction == "up" else LEVEL_DOWN_TITLE
+        await self.publish(
+            FeedAnnouncement(
+                embed=_build_embed(title, description),
+                line=announcement_line(mention, direction, event.new_level, xp_delta),
+                direction=direction,
+                source=event.source,
+            )
         )
-        embed = _build_embed(title, description)
+
+    async def resolve_channel(self) -> discord.abc.Messageable | None:
+        """Return the feed channel, resolved once and then cached."""
+        if self._channel is not None:
+            return self._channel
+        if not self.bot:
+            return None
+        channel = self.bot.get_channel(LEVEL_FEED_CHANNEL_ID)
+        if channel is None:
+            try:
+                channel = await self.bot.fetch_channel(LEVEL_FEED_CHANNEL_ID)
+            except Exception:
+                channel = None
+        if not isinstance(channel, discord.abc.Messageable):
+            self.metrics["level_feed.skipped_no_channel"] += 1
+            logger.warning("level feed channel unavailable or invalid")
+            return None
+        self._channel = channel
+        return channel
+
+    async def publish(self, announcement: FeedAnnouncement) -> None:
+        """Send ``announcement`` now, or merge it into the pending batch.
+
+        The first announcement after a quiet period goes out immediately and
+        opens a ``LEVEL_FEED_BATCH_SECONDS`` window; everything published
+        during that window is sent as one multi-line message when it closes.
+        """
+        now = time.monotonic()
+        if self._batch_task is None and now >= self._window_until:
+            self._window_until = now + LEVEL_FEED_BATCH_SECONDS
+            await self._send([announcement])
+            return
+        self._batch.append(announcement)
+        if self._batch_task is None:
+            self._batch_task = background_tasks.create_task(
+                self._flush_batch_later(), name="level-feed-batch"
+            )
+
+    async def _flush_batch_later(self) -> None:
         try:
-            await channel.send(embed=embed)
-            self.metrics[f"level_feed.sent.{event.source}"] += 1
+            await asyncio.sleep(max(0.0, self._window_until - time.monotonic()))
+        finally:
+            self._batch_task = None
+        batch, self._batch = self._batch, []
+        self._window_until = time.monotonic() + LEVEL_FEED_BATCH_SECONDS
+        await self._send(batch)
+
+    async def _send(self, announcements: List[FeedAnnouncement]) -> None:
+        if not announcements:
+            return
+        channel = await self.resolve_channel()
+        if channel is None:
+            return
+        if len(announcements) == 1:
+            embeds = [announcements[0].embed]
+        else:
+            embeds = [
+                merged_embed(
+                    announcements[start : start + LEVEL_FEED_BATCH_MAX_LINES],
+                    total=len(announcements),
+                )
+                for start in range(0, len(announcements), LEVEL_FEED_BATCH_MAX_LINES)
+            ]
+        try:
+            for embed in embeds:
+                await channel.send(embed=embed)
         except discord.Forbidden:
             self.metrics["level_feed.skipped_no_channel"] += 1
             logger.warning("missing permission to send level feed message")
+            return
+        except discord.NotFound:
+            # Channel deleted: resolve it again next time.
+            self._channel = None
+            logger.warning("level feed channel not found")
+            return
         except Exception as exc:  # pragma: no cover - defensive
             logger.warning("failed to send level feed message: %s", exc)
+            return
+        for announcement in announcements:
+            self.metrics[f"level_feed.sent.{announcement.source}"] += 1
+        self.metrics["level_feed.messages"] += len(embeds)
+        saved = len(announcements) - len(embeds)
+        if saved:
+            self.metrics["level_feed.messages_saved"] += saved
+            logger.info(
+                "level feed: %d announcements merged into %d message(s)",
+                len(announcements),
+                len(embeds),
+            )
 
 
 router = LevelFeedRouter()
@@ -161,4 +326,11 @@ def emit(event: LevelChange) -> None:
     router.emit(event)
 
 
-__all__ = ["LevelChange", "router", "setup", "emit"]
+__all__ = [
+    "FeedAnnouncement",
+    "LevelChange",
+    "announcement_line",
+    "emit",
+    "router",
+    "setup",
+]
@@ -1,24 +1,111 @@
 import asyncio
+import gzip
+import hashlib
 import json
 import os
 import tempfile
 import logging
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Awaitable, Callable
 
 from utils.background_tasks import background_tasks
 
 __all__ = [
+    "ARCHIVE",
+    "COMPACT",
+    "JsonProfile",
+    "JsonWriteStats",
+    "PRETTY",
+    "PathWriteStats",
+    "WriteService",
+    "decode_json",
+    "encode_json",
     "ensure_dir",
+    "json_write_stats",
     "read_json_safe",
+    "atomic_write_bytes",
+    "atomic_write_bytes_async",
     "atomic_write_json",
     "atomic_write_json_async",
     "schedule_checkpoint",
+    "write_service",
+    "request_checkpoint",
+    "SnapshotWriter",
 ]
 
-_write_lock: asyncio.Lock | None = None
-_write_lock_loop: asyncio.AbstractEventLoop | None = None
+_writer: "WriteService | None" = None
+_writer_loop: asyncio.AbstractEventLoop | None = None
+_writer_executor: ThreadPoolExecutor | None = None
+# Worker threads shared by every asynchronous atomic write. Writes to the
+# same path never overlap; distinct paths proceed in parallel up to this limit.
+WRITER_THREADS = 4
 _DEFAULT_JSON_FALLBACK = object()
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass(frozen=True, slots=True)
+class JsonProfile:
+    """How a JSON document is serialized on disk.
+
+    ``indent=None`` writes compact separators. ``gzip`` compresses the payload,
+    for archive-type files that are written once and rarely read; readers detect
+    it from the magic bytes, so the file name does not change.
+    """
+
+    name: str
+    indent: int | None = 4
+    gzip: bool = False
+
+
+# Historical format: human-readable, the default for every caller.
+PRETTY = JsonProfile("pretty")
+# Large or hot documents read by the bot only.
+COMPACT = JsonProfile("compact", indent=None)
+# Finished records kept for history.
+ARCHIVE = JsonProfile("archive", indent=None, gzip=True)
+
+
+@dataclass(slots=True)
+class JsonWriteStats:
+    """Cumulative serialization counters of one profile."""
+
+    writes: int = 0
+    bytes_written: int = 0
+    encode_seconds: float = 0.0
+    write_seconds: float = 0.0
+
+
+# Profile name -> counters, updated by atomic_write_json.
+json_write_stats: dict[str, JsonWriteStats] = {}
+
+
+def encode_json(data: Any, profile: JsonProfile = PRETTY) -> bytes:
+    """Serialize ``data`` to UTF-8 bytes according to ``profile``."""
+    if profile.indent is None:
+        payload = json.dumps(
+            data, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+    else:
+        payload = json.dumps(
+            data, ensure_ascii=False, indent=profile.indent
+        ).encode("utf-8")
+    if profile.gzip:
+        payload = gzip.compress(payload, compresslevel=6, mtime=0)
+    return payload
+
+
+def decode_json(payload: bytes) -> Any:
+    """Decode bytes written with any :class:`JsonProfile`."""
+    try:
+        if payload[:2] == _GZIP_MAGIC:
+            payload = gzip.decompress(payload)
+    except (EOFError, OSError, zlib.error) as exc:
+        raise ValueError(f"corrupted gzip payload: {exc}") from exc
+    return json.loads(payload)
 
 
 def ensure_dir(path: str | os.PathLike[str]) -> None:
@@ -38,21 +125,21 @@ def read_json_safe(
     fallback = {} if default is _DEFAULT_JSON_FALLBACK else default
     p = Path(path)
     try:
-        return json.loads(p.read_text(encoding="utf-8"))
+        return decode_json(p.read_bytes())
     except FileNotFoundError:
         logging.warning("JSON file %s not found; trying backup", p)
-    except json.JSONDecodeError:
+    except ValueError:
         logging.warning("JSON file %s is corrupted; trying backup", p)
     except OSError as e:
         logging.warning("Error reading %s: %s", p, e)
 
     bak = p.with_suffix(p.suffix + ".bak")
     try:
-        return json.loads(bak.read_text(encoding="utf-8"))
+        return decode_json(bak.read_bytes())
     except FileNotFoundError:
         logging.warning("Backup file %s not found", bak)
         return fallback
-    except json.JSONDecodeError:
+    except ValueError:
         logging.warning("Backup file %s is corrupted", bak)
         return fallback
     except OSError as e:
@@ -60,10 +147,10 @@ def read_json_safe(
         return fallback
 
 
-def atomic_write_json(path: str | os.PathLike[str], data: Any) -> None:
-    """Atomically write ``data`` to ``path`` and keep a ``.bak`` backup.
+def atomic_write_bytes(path: str | os.PathLike[str], payload: bytes) -> None:
+    """Atomically write ``payload`` to ``path`` and keep a ``.bak`` backup.
 
-    This function blocks; use :func:`atomic_write_json_async` in async code.
+    This function blocks; use :func:`atomic_write_bytes_async` in async code.
     """
     dest = Path(path)
     ensure_dir(dest.parent)
@@ -71,8 +158,8 @@ def atomic_write_json(path: str | os.PathLike[str], data: Any) -> None:
 
     fd, tmp_path = tempfile.mkstemp(dir=str(dest.parent))
     try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
             f.flush()
             os.fsync(f.fileno())
         if dest.exists():
@@ -88,19 +175,246 @@ def atomic_write_json(path: str | os.PathLike[str], data: Any) -> None:
             pass
 
 
-async def atomic_write_json_async(path: str | os.PathLike[str], data: Any) -> None:
-    """Asynchronously write JSON data using :func:`atomic_write_json`.
+def atomic_write_json(
+    path: str | os.PathLike[str],
+    data: Any,
+    *,
+    profile: JsonProfile = PRETTY,
+) -> None:
+    """Atomically write ``data`` to ``path`` and keep a ``.bak`` backup.
+
+    ``profile`` selects the on-disk format (indented by default). This
+    function blocks; use :func:`atomic_write_json_async` in async code.
+    """
+    started = time.perf_counter()
+    payload = encode_json(data, profile)
+    encoded = time.perf_counter()
+    atomic_write_bytes(path, payload)
+    stats = json_write_stats.setdefault(profile.name, JsonWriteStats())
+    stats.writes += 1
+    stats.bytes_written += len(payload)
+    stats.encode_seconds += encoded - started
+    stats.write_seconds += time.perf_counter() - encoded
+    logging.debug(
+        "wrote %s (%s, %d bytes, encode %.3fs, write %.3fs)",
+        path,
+        profile.name,
+        len(payload),
+        encoded - started,
+        time.perf_counter() - encoded,
+    )
 
-    The write is executed in a thread and serialized with an event-loop-aware
-    lock to avoid concurrent writes across different loops.
+
+def _fsync_dirs(directories: tuple[str, ...]) -> int:
+    """Flush directory entries so completed renames survive a crash."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return 0
+    synced = 0
+    for directory in directories:
+        try:
+            fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            continue
+        try:
+            os.fsync(fd)
+            synced += 1
+        except OSError:
+            logging.debug("Directory fsync unsupported for %s", directory)
+        finally:
+            os.close(fd)
+    return synced
+
+
+@dataclass(slots=True)
+class PathWriteStats:
+    """Cumulative write counters of one destination path."""
+
+    writes: int = 0
+    coalesced: int = 0
+    failures: int = 0
+    write_seconds: float = 0.0
+    last_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+@dataclass(slots=True)
+class _PathSlot:
+    pending: Callable[[], None] | None = None
+    waiters: list[asyncio.Future[None]] = field(default_factory=list)
+    running: bool = False
+
+
+class WriteService:
+    """Group-commit scheduler behind the asynchronous atomic writes.
+
+    Each path owns a slot holding at most one pending snapshot: a snapshot
+    submitted while an older one is still queued replaces it, and both
+    callers are released by the newer write (latest wins). Writes to one
+    path run one at a time and in submission order; distinct paths run in
+    parallel on a small shared thread pool. Renamed files are made durable
+    by fsyncing their directories, batched across every write that
+    completed while the previous directory flush was running.
+
+    ``queue_depth``, ``in_flight`` and ``path_stats`` expose the backlog and
+    per-path write latency.
     """
-    global _write_lock, _write_lock_loop
+
+    def __init__(self, executor: ThreadPoolExecutor) -> None:
+        self._executor = executor
+        self._slots: dict[str, _PathSlot] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._dirs: set[str] = set()
+        self._dir_waiters: list[asyncio.Future[None]] = []
+        self._dir_sync_running = False
+        self.path_stats: dict[str, PathWriteStats] = {}
+        self.dir_sync_batches = 0
+        self.dir_syncs = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of snapshots waiting for their path to be free."""
+        return sum(1 for slot in self._slots.values() if slot.pending is not None)
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of paths currently being written."""
+        return sum(1 for slot in self._slots.values() if slot.running)
+
+    async def submit(
+        self, path: str | os.PathLike[str], write: Callable[[], None]
+    ) -> None:
+        """Queue ``write`` (a blocking writer of ``path``) and await it.
+
+        Returns once ``write`` or a newer snapshot of the same path has been
+        written and its directory flushed; re-raises the write's failure.
+        """
+        key = os.path.abspath(path)
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = _PathSlot()
+        if slot.pending is not None:
+            self.path_stats.setdefault(key, PathWriteStats()).coalesced += 1
+        slot.pending = write
+        waiter = asyncio.get_running_loop().create_future()
+        slot.waiters.append(waiter)
+        if not slot.running:
+            slot.running = True
+            self._spawn(self._drain(key, slot), name=f"json-write:{Path(key).name}")
+        await waiter
+
+    def _spawn(self, coro: Any, *, name: str) -> None:
+        # Not owned by background_tasks: its shutdown cancels tasks, and a
+        # write must never be interrupted half-way; RefugeBot.close() awaits
+        # drain() instead.
+        task = asyncio.get_running_loop().create_task(coro, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _drain(self, key: str, slot: _PathSlot) -> None:
+        loop = asyncio.get_running_loop()
+        stats = self.path_stats.setdefault(key, PathWriteStats())
+        try:
+            while slot.pending is not None:
+                write, slot.pending = slot.pending, None
+                waiters, slot.waiters = slot.waiters, []
+                started = time.perf_counter()
+                try:
+                    await loop.run_in_executor(self._executor, write)
+                    await self._sync_dir(os.path.dirname(key))
+                except Exception as exc:
+                    stats.failures += 1
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(exc)
+                    continue
+                elapsed = time.perf_counter() - started
+                stats.writes += 1
+                stats.write_seconds += elapsed
+                stats.last_seconds = elapsed
+                stats.max_seconds = max(stats.max_seconds, elapsed)
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+        finally:
+            slot.running = False
+            if slot.pending is None:
+                self._slots.pop(key, None)
+
+    async def _sync_dir(self, directory: str) -> None:
+        self._dirs.add(directory)
+        waiter = asyncio.get_running_loop().create_future()
+        self._dir_waiters.append(waiter)
+        if not self._dir_sync_running:
+            self._dir_sync_running = True
+            self._spawn(self._run_dir_syncs(), name="json-write:dirsync")
+        await waiter
+
+    async def _run_dir_syncs(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while self._dir_waiters:
+                directories, self._dirs = tuple(self._dirs), set()
+                waiters, self._dir_waiters = self._dir_waiters, []
+                try:
+                    self.dir_syncs += await loop.run_in_executor(
+                        self._executor, _fsync_dirs, directories
+                    )
+                except Exception:
+                    logging.exception("Directory fsync failed for %s", directories)
+                self.dir_sync_batches += 1
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+        finally:
+            self._dir_sync_running = False
+
+    async def drain(self) -> None:
+        """Wait until every queued write has completed."""
+        while self._tasks:
+            await asyncio.gather(*tuple(self._tasks), return_exceptions=True)
+
+
+def write_service() -> WriteService:
+    """Return the write service of the running event loop."""
+    global _writer, _writer_loop, _writer_executor
     loop = asyncio.get_running_loop()
-    if _write_lock is None or _write_lock_loop is not loop:
-        _write_lock = asyncio.Lock()
-        _write_lock_loop = loop
-    async with _write_lock:
-        await asyncio.to_thread(atomic_write_json, path, data)
+    if _writer is None or _writer_loop is not loop:
+        if _writer_executor is None:
+            _writer_executor = ThreadPoolExecutor(
+                max_workers=WRITER_THREADS, thread_name_prefix="json-writer"
+            )
+        _writer = WriteService(_writer_executor)
+        _writer_loop = loop
+    return _writer
+
+
+async def atomic_write_json_async(
+    path: str | os.PathLike[str],
+    data: Any,
+    *,
+    profile: JsonProfile | None = None,
+) -> None:
+    """Asynchronously write JSON data using :func:`atomic_write_json`.
+
+    The write goes through :func:`write_service`: a snapshot still queued
+    behind an in-progress write of the same path is replaced by newer ones,
+    and other paths are written concurrently. ``profile`` defaults to the
+    indented :data:`PRETTY` format.
+    """
+    if profile is None:
+        await write_service().submit(path, lambda: atomic_write_json(path, data))
+    else:
+        await write_service().submit(
+            path, lambda: atomic_write_json(path, data, profile=profile)
+        )
+
+
+async def atomic_write_bytes_async(path: str | os.PathLike[str], payload: bytes) -> None:
+    """Asynchronously write pre-encoded bytes using :func:`atomic_write_bytes`.
+
+    Shares the write service of :func:`atomic_write_json_async`.
+    """
+    await write_service().submit(path, lambda: atomic_write_bytes(path, payload))
 
 
 _checkpoint_lock = asyncio.Lock()
@@ -125,28 +439,162 @@ async def schedule_checkpoint(
     exceptions.
     """
     async with _checkpoint_lock:
-        existing_task = _checkpoint_tasks.get(save_fn)
-        if existing_task and not existing_task.done():
-            return
+        request_checkpoint(save_fn, delay)
+
+
+def request_checkpoint(
+    save_fn: Callable[[], Awaitable[None]],
+    delay: float = VOICE_CP_DEBOUNCE_SECONDS,
+) -> None:
+    """Synchronous variant of :func:`schedule_checkpoint` for hot paths.
+
+    Only marks ``save_fn`` as due: the check-and-schedule below never awaits,
+    so it cannot interleave with another coroutine and needs no lock.
+    """
+    existing_task = _checkpoint_tasks.get(save_fn)
+    if existing_task and not existing_task.done():
+        return
+
+    save_name = getattr(
+        save_fn,
+        "__qualname__",
+        getattr(save_fn, "__name__", repr(save_fn)),
+    )
+    _checkpoint_tasks[save_fn] = background_tasks.create_task(
+        _run_checkpoint(save_fn, delay, save_name),
+        name=f"checkpoint:{save_name}",
+    )
 
-        save_name = getattr(
-            save_fn,
-            "__qualname__",
-            getattr(save_fn, "__name__", repr(save_fn)),
+
+async def _run_checkpoint(
+    save_fn: Callable[[], Awaitable[None]], delay: float, save_name: str
+) -> None:
+    try:
+        await asyncio.sleep(delay)
+        await save_fn()
+        logging.info("💾 checkpoint saved: %s", save_name)
+    finally:
+        current_task = asyncio.current_task()
+        if _checkpoint_tasks.get(save_fn) is current_task:
+            _checkpoint_tasks.pop(save_fn, None)
+
+
+class SnapshotWriter:
+    """Coalesce writes of a small in-memory registry to disk.
+
+    ``snapshot`` returns the current payload and ``save`` persists it (usually
+    a store helper built on :func:`atomic_write_json_async`, so each write is
+    still atomic with a ``.bak`` copy). A write is skipped when the payload
+    hashes to what was last persisted, and :meth:`mark_dirty` collapses bursts
+    of mutations into a single write ``delay`` seconds later. :meth:`flush`
+    writes immediately and re-raises failures, for callers that must not go on
+    without a durable record; the state then stays dirty for the next attempt.
+    """
+
+    def __init__(
+        self,
+        snapshot: Callable[[], Any],
+        save: Callable[[Any], Awaitable[None]],
+        *,
+        delay: float = 2.0,
+        name: str = "snapshot",
+    ) -> None:
+        self._snapshot = snapshot
+        self._save = save
+        self.delay = delay
+        self.name = name
+        self._persisted: str | None = None
+        self._generation = 0
+        self._task: asyncio.Task[None] | None = None
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+        self.writes = 0
+        self.skipped = 0
+
+    @staticmethod
+    def _digest(payload: Any) -> str:
+        encoded = json.dumps(
+            payload, sort_keys=True, ensure_ascii=False, default=str, separators=(",", ":")
+        ).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    @property
+    def dirty(self) -> bool:
+        """Return whether the current snapshot differs from the persisted one."""
+        return self._digest(self._snapshot()) != self._persisted
+
+    @property
+    def pending(self) -> bool:
+        """Return whether a debounced write is scheduled."""
+        return self._task is not None and not self._task.done()
+
+    def mark_clean(self) -> None:
+        """Record the current snapshot as persisted (e.g. right after loading)."""
+        self._persisted = self._digest(self._snapshot())
+
+    def mark_dirty(self) -> None:
+        """Schedule a debounced write unless one is already pending.
+
+        The generation is bumped even while a write is in flight, so a change
+        made after that write took its snapshot gets a write of its own.
+        """
+        self._generation += 1
+        if self.pending:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop yet: the next explicit flush() will pick the change up.
+            return
+        self._task = background_tasks.create_task(
+            self._flush_later(), name=f"snapshot:{self.name}"
         )
 
-        async def _run() -> None:
+    async def _flush_later(self) -> None:
+        while True:
+            await asyncio.sleep(self.delay)
+            generation = self._generation
             try:
-                await asyncio.sleep(delay)
-                await save_fn()
-                logging.info("💾 checkpoint saved: %s", save_name)
-            finally:
-                async with _checkpoint_lock:
-                    current_task = asyncio.current_task()
-                    if _checkpoint_tasks.get(save_fn) is current_task:
-                        _checkpoint_tasks.pop(save_fn, None)
-
-        _checkpoint_tasks[save_fn] = background_tasks.create_task(
-            _run(),
-            name=f"checkpoint:{save_name}",
-        )
+                await self.flush()
+            except Exception:
+                # Retry after another delay rather than waiting for the next
+                # mark_dirty(), which may never come.
+                logging.exception("Deferred snapshot write failed for %s", self.name)
+                continue
+            if generation == self._generation and not self.dirty:
+                return
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def flush(self) -> bool:
+        """Persist the snapshot now if it changed; return whether it was written."""
+        async with self._get_lock():
+            generation = self._generation
+            payload = self._snapshot()
+            digest = self._digest(payload)
+            if digest == self._persisted:
+                self.skipped += 1
+                return False
+            await self._save(payload)
+            self._persisted = digest
+            self.writes += 1
+        if generation != self._generation:
+            # Mutated while saving: make sure that change is written too.
+            self.mark_dirty()
+        return True
+
+    async def aclose(self) -> None:
+        """Cancel any pending debounced write and flush outstanding changes."""
+        task, self._task = self._task, None
+        if task is not None and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
@@ -84,6 +84,8 @@ class GlobalRateLimiter:
                 bucket = TokenBucket(1, 1)  # 1 channel edit per second globally
             elif name.startswith("channel_edit:"):
                 bucket = TokenBucket(2, 1 / 300)  # 2 edits / 10 min per channel
+            elif name == "channel_delete":
+                bucket = TokenBucket(5, 1)  # burst of 5 deletions, then 1/s globally
             else:
                 bucket = TokenBucket(self.global_rps, self.global_rps)
             self.buckets[name] = bucket
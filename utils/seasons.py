@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -133,14 +134,14 @@ def format_metric_value(metric_key: str, value: int) -> str:
 
 
 def rank_rows(
-    users: dict[str, dict[str, int]],
+    users: Mapping[str, Mapping[str, int]],
     field: str,
 ) -> list[tuple[str, int]]:
     """Return positive/meaningful rows sorted descending for one metric."""
 
     rows: list[tuple[str, int]] = []
     for user_id, payload in users.items():
-        if not isinstance(payload, dict):
+        if not isinstance(payload, Mapping):
             continue
         try:
             value = int(payload.get(field, 0))
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Mapping
 
@@ -5,9 +6,13 @@ import discord
 from discord.ext import commands
 
 from storage.temp_vc_store import GENERIC_TEMP_VC_TYPE, TempVCRecord
+from utils.rate_limit import limiter
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of channel deletions in flight during one sweep.
+DELETE_CONCURRENCY = 5
+
 
 def _is_complete_provenance_record(
     channel_id: int,
@@ -27,21 +32,23 @@ def _is_complete_provenance_record(
         return False
 
 
-async def delete_empty_managed_temp_vcs(
+def plan_empty_temp_vc_deletions(
     bot: commands.Bot,
     records: Mapping[int, TempVCRecord],
     *,
     expected_type: str = GENERIC_TEMP_VC_TYPE,
-) -> set[int]:
-    """Delete only empty Temp VCs backed by complete provenance records.
+) -> list[discord.VoiceChannel]:
+    """Return the empty Temp VCs that ``records`` prove the bot owns.
 
     The cleanup deliberately never discovers channels from category membership or
     channel names. A channel is eligible for deletion only when its ``channel_id``
     is present in the persisted registry with ``owner_id``, ``created_at`` and the
     expected ``type``. The stored creation timestamp must also match Discord's
     snowflake-backed ``created_at`` value for the live channel.
+
+    This pass only reads the gateway cache and performs no REST call.
     """
-    deleted: set[int] = set()
+    planned: list[discord.VoiceChannel] = []
 
     for channel_id, record in records.items():
         if not _is_complete_provenance_record(
@@ -68,12 +75,47 @@ async def delete_empty_managed_temp_vcs(
             continue
         if channel.members:
             continue
+        planned.append(channel)
 
+    return planned
+
+
+async def _delete_channel(
+    channel: discord.VoiceChannel, semaphore: asyncio.Semaphore
+) -> int | None:
+    async with semaphore:
+        await limiter.acquire(bucket="channel_delete")
+        # The channel may have been joined while waiting for a token.
+        if channel.members:
+            return None
         try:
             await channel.delete(reason="Salon temporaire vide (registre bot)")
         except discord.HTTPException as exc:
             logger.warning("Suppression salon %s échouée: %s", channel.id, exc)
-        else:
-            deleted.add(channel.id)
+            return None
+    return channel.id
+
+
+async def delete_empty_managed_temp_vcs(
+    bot: commands.Bot,
+    records: Mapping[int, TempVCRecord],
+    *,
+    expected_type: str = GENERIC_TEMP_VC_TYPE,
+    concurrency: int = DELETE_CONCURRENCY,
+) -> set[int]:
+    """Delete only empty Temp VCs backed by complete provenance records.
+
+    Eligible channels are selected by :func:`plan_empty_temp_vc_deletions`, then
+    deleted concurrently (at most ``concurrency`` at a time) through the
+    ``channel_delete`` bucket of the global rate limiter. Returns the IDs that
+    were actually deleted.
+    """
+    planned = plan_empty_temp_vc_deletions(bot, records, expected_type=expected_type)
+    if not planned:
+        return set()
 
-    return deleted
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    results = await asyncio.gather(
+        *(_delete_channel(channel, semaphore) for channel in planned)
+    )
+    return {channel_id for channel_id in results if channel_id is not None}
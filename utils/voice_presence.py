@@ -0,0 +1,180 @@
+"""Per-guild index of who is connected to which voice channel.
+
+``discord.VoiceChannel.members`` is computed on every access by walking the
+guild's voice states, so counting or sampling people in voice by iterating
+``guild.voice_channels`` costs O(channels × voice states). The index below is
+kept up to date from ``on_voice_state_update`` by ``cogs.voice_presence`` and
+answers counts in O(1) and lists or samples in O(people in voice).
+
+Only regular voice channels are indexed, matching ``guild.voice_channels``
+that the guild-wide counts used to scan: members on a stage are not "in
+voice" for stats, XP or the Refuge counter. Asking for the members of a stage
+channel itself reads ``channel.members`` directly.
+
+Guilds that have not been indexed yet (cog not loaded, before ``on_ready`` or
+in tests) transparently fall back to scanning the guild, without caching.
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Iterable
+from typing import Any, Dict
+
+import discord
+
+__all__ = ["VoicePresenceIndex", "voice_presence"]
+
+
+class VoicePresenceIndex:
+    """Track channel → members and member → channel for every indexed guild."""
+
+    def __init__(self) -> None:
+        # guild_id -> channel_id -> member_id -> member
+        self._channels: Dict[int, Dict[int, Dict[int, Any]]] = {}
+        # guild_id -> member_id -> channel_id
+        self._member_channel: Dict[int, Dict[int, int]] = {}
+        # guild_id -> member_id -> member, humans only (random sampling pool)
+        self._humans: Dict[int, Dict[int, Any]] = {}
+        # channel_id -> number of humans connected
+        self._channel_humans: Dict[int, int] = {}
+
+    # ---------- maintenance ----------
+
+    def is_tracking(self, guild: Any) -> bool:
+        return getattr(guild, "id", None) in self._channels
+
+    def rebuild(self, guild: discord.Guild) -> None:
+        """(Re)build the index of ``guild`` from the gateway cache."""
+        self.forget_guild(guild.id)
+        self._channels[guild.id] = {}
+        self._member_channel[guild.id] = {}
+        self._humans[guild.id] = {}
+        for channel in guild.voice_channels:
+            for member in channel.members:
+                self._join(guild.id, channel.id, member)
+
+    def forget_guild(self, guild_id: int) -> None:
+        for channel_id in self._channels.pop(guild_id, {}):
+            self._channel_humans.pop(channel_id, None)
+        self._member_channel.pop(guild_id, None)
+        self._humans.pop(guild_id, None)
+
+    def update(
+        self,
+        member: discord.Member,
+        before: discord.VoiceState,
+        after: discord.VoiceState,
+    ) -> None:
+        """Apply one ``on_voice_state_update`` event."""
+        guild_id = member.guild.id
+        if guild_id not in self._channels:
+            return
+        before_id = _indexed_channel_id(before.channel)
+        after_id = _indexed_channel_id(after.channel)
+        # Trust the indexed channel over ``before`` in case an event was missed.
+        known_id = self._member_channel[guild_id].get(member.id)
+        if known_id is not None:
+            self._leave(guild_id, known_id, member.id)
+        elif before_id is not None:
+            self._leave(guild_id, before_id, member.id)
+        if after_id is not None:
+            self._join(guild_id, after_id, member)
+
+    def _join(self, guild_id: int, channel_id: int, member: Any) -> None:
+        self._channels[guild_id].setdefault(channel_id, {})[member.id] = member
+        self._member_channel[guild_id][member.id] = channel_id
+        if not getattr(member, "bot", False):
+            self._humans[guild_id][member.id] = member
+            self._channel_humans[channel_id] = self._channel_humans.get(channel_id, 0) + 1
+
+    def _leave(self, guild_id: int, channel_id: int, member_id: int) -> None:
+        members = self._channels[guild_id].get(channel_id)
+        if members is None or member_id not in members:
+            return
+        members.pop(member_id)
+        if not members:
+            del self._channels[guild_id][channel_id]
+        self._member_channel[guild_id].pop(member_id, None)
+        if self._humans[guild_id].pop(member_id, None) is not None:
+            remaining = self._channel_humans.get(channel_id, 0) - 1
+            if remaining > 0:
+                self._channel_humans[channel_id] = remaining
+            else:
+                self._channel_humans.pop(channel_id, None)
+
+    # ---------- queries ----------
+
+    def human_count(self, guild: Any) -> int:
+        """Return the number of non-bot members connected to ``guild`` voice."""
+        humans = self._humans.get(getattr(guild, "id", None))
+        if humans is not None:
+            return len(humans)
+        return sum(1 for _ in _scan_humans(guild))
+
+    def humans(self, guild: Any) -> list[Any]:
+        """Return the non-bot members connected to ``guild`` voice."""
+        humans = self._humans.get(getattr(guild, "id", None))
+        if humans is not None:
+            return list(humans.values())
+        return list(_scan_humans(guild))
+
+    def channel_humans(self, channel: Any) -> list[Any]:
+        """Return the non-bot members connected to ``channel``."""
+        guild_channels = self._channels.get(getattr(getattr(channel, "guild", None), "id", None))
+        if guild_channels is not None and _indexed_channel_id(channel) is not None:
+            members = guild_channels.get(getattr(channel, "id", None), {})
+            return [member for member in members.values() if not getattr(member, "bot", False)]
+        return [
+            member
+            for member in (getattr(channel, "members", ()) or ())
+            if not getattr(member, "bot", False)
+        ]
+
+    def channel_human_count(self, channel: Any) -> int:
+        guild = getattr(channel, "guild", None)
+        if self.is_tracking(guild) and _indexed_channel_id(channel) is not None:
+            return self._channel_humans.get(channel.id, 0)
+        return len(self.channel_humans(channel))
+
+    def channel_of(self, guild_id: int, member_id: int) -> int | None:
+        """Return the voice channel ID ``member_id`` is connected to, if any."""
+        return self._member_channel.get(guild_id, {}).get(member_id)
+
+    def sample(
+        self,
+        guild: Any,
+        k: int = 1,
+        *,
+        exclude: Iterable[int] = (),
+        rng: random.Random | None = None,
+    ) -> list[Any]:
+        """Return up to ``k`` distinct random humans connected to ``guild`` voice."""
+        excluded = set(exclude)
+        pool = [member for member in self._pool(guild) if member.id not in excluded]
+        if not pool or k <= 0:
+            return []
+        return (rng or random).sample(pool, min(k, len(pool)))
+
+    def _pool(self, guild: Any) -> Iterable[Any]:
+        humans = self._humans.get(getattr(guild, "id", None))
+        if humans is not None:
+            return humans.values()
+        return _scan_humans(guild)
+
+
+def _indexed_channel_id(channel: Any) -> int | None:
+    """Return the ID of ``channel`` if the index tracks it (not a stage)."""
+    if channel is None or isinstance(channel, discord.StageChannel):
+        return None
+    return getattr(channel, "id", None)
+
+
+def _scan_humans(guild: Any) -> Iterable[Any]:
+    for channel in getattr(guild, "voice_channels", ()) or ():
+        for member in getattr(channel, "members", ()) or ():
+            if not getattr(member, "bot", False):
+                yield member
+
+
+voice_presence = VoicePresenceIndex()
@@ -1,7 +1,6 @@
 """XP adapter bridging Machine à sous with the global XP store."""
 from __future__ import annotations
 
-from datetime import datetime, timezone
 import logging
 
 from storage.xp_store import xp_store
@@ -24,10 +23,10 @@ def get_balance(user_id: int) -> int:
     updated and could return stale XP.
     """
 
-    cached = xp_store.data.get(str(user_id))
-    if cached is None:
+    record = xp_store.get_record(user_id)
+    if record is None:
         return 0
-    return int(cached.get("xp", 0))
+    return record.xp
 
 
 async def add_xp(user_id: int, amount: int, guild_id: int, source: str) -> None:
@@ -93,17 +92,16 @@ async def refund_xp_exact(
     if amount > 10_000:
         raise ValueError("refund amount exceeds maximum XP transaction")
 
-    uid = str(user_id)
     async with xp_store.lock:
-        user = xp_store.data.setdefault(uid, {"xp": 0, "level": 0})
-        old_xp = int(user.get("xp", 0))
-        old_level = int(user.get("level", xp_store._calc_level(old_xp)))
+        record = xp_store._record_locked(int(user_id))
+        old_xp = record.xp
+        old_level = record.level
         new_xp = old_xp + amount
         new_level = xp_store._calc_level(new_xp)
 
-        user["xp"] = new_xp
-        user["level"] = new_level
-        user["last_accessed"] = datetime.now(timezone.utc).isoformat()
+        record.xp = new_xp
+        record.level = new_level
+        xp_store._touch_locked(int(user_id), record)
         xp_store.stats["total_updates"] += 1
 
     # A compensation must survive a process crash immediately after the failed